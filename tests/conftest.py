@@ -5,10 +5,11 @@ Shared pytest fixtures for woolly tests.
 from datetime import datetime
 from unittest.mock import MagicMock
 
+import httpx
 import pytest
 from rich.console import Console
-from rich.tree import Tree
 
+from woolly.graph import DependencyEdge, DependencyGraph, PackageNode, ReleaseStatus
 from woolly.languages.base import Dependency, FedoraPackageStatus, PackageInfo
 from woolly.reporters.base import ReportData
 
@@ -28,6 +29,25 @@ def temp_cache_dir(tmp_path, monkeypatch):
     import woolly.cache as _cache_mod
 
     _cache_mod._ensured_namespaces.clear()
+    monkeypatch.setattr(_cache_mod, "_backend", None)
+    monkeypatch.setattr(_cache_mod, "_memory", _cache_mod.MemoryCache())
+    monkeypatch.setattr(_cache_mod, "_namespace_encodings", {})
+    monkeypatch.delenv(_cache_mod.CACHE_ENCODING_ENV, raising=False)
+    monkeypatch.delenv(_cache_mod.CACHE_BACKEND_ENV, raising=False)
+    monkeypatch.delenv(_cache_mod.CACHE_MAX_SIZE_ENV, raising=False)
+    monkeypatch.setattr(_cache_mod, "_size_limits", {})
+    monkeypatch.setattr(_cache_mod, "_namespace_ttls", {})
+    monkeypatch.delenv(_cache_mod.CACHE_SHARED_ENV, raising=False)
+    monkeypatch.setattr(_cache_mod, "_shared", None)
+    monkeypatch.delenv(_cache_mod.CACHE_STALE_ENV, raising=False)
+    monkeypatch.setattr(_cache_mod, "_stale_mode", None)
+    monkeypatch.setattr(_cache_mod, "_refreshing", {})
+    _cache_mod._stale_served.clear()
+    import woolly.feeds as _feeds_mod
+
+    monkeypatch.delenv(_feeds_mod.CACHE_FEED_ENV, raising=False)
+    monkeypatch.setattr(_feeds_mod, "_feed_mode", None)
+    _cache_mod._counters.clear()
     return cache_dir
 
 
@@ -227,21 +247,43 @@ def mock_console():
 
 
 @pytest.fixture
-def sample_tree():
-    """Create a sample Rich Tree for testing."""
-    tree = Tree(
-        "[bold]root-package[/bold] [dim]v1.0.0[/dim] • [green]✓ packaged[/green] [dim](1.0.0)[/dim]"
+def sample_graph():
+    """Create a sample DependencyGraph for testing.
+
+    root-package -> dep-b (not packaged), dep-a (packaged)
+    """
+    graph = DependencyGraph(root="root-package", registry="crates.io")
+    graph.add_node(
+        PackageNode(
+            name="root-package",
+            version="1.0.0",
+            is_packaged=True,
+            fedora_versions=["1.0.0"],
+        )
+    )
+    graph.add_node(PackageNode(name="dep-b", version="1.5.0"))
+    graph.add_node(
+        PackageNode(
+            name="dep-a",
+            version="2.0.0",
+            license="MIT",
+            is_packaged=True,
+            fedora_versions=["2.0.0"],
+            fedora_packages=["rust-dep-a"],
+        )
     )
-    child1 = Tree(
-        "[bold]dep-a[/bold] [dim]v2.0.0[/dim] • [green]✓ packaged[/green] [dim](2.0.0)[/dim]"
+    graph.add_edge(DependencyEdge(child="root-package"))
+    graph.add_edge(
+        DependencyEdge(parent="root-package", child="dep-b", requirement="^1.5")
     )
-    tree.add("[bold]dep-b[/bold] [dim]v1.5.0[/dim] • [red]✗ not packaged[/red]")
-    tree.children.append(child1)
-    return tree
+    graph.add_edge(
+        DependencyEdge(parent="root-package", child="dep-a", requirement="^2")
+    )
+    return graph
 
 
 @pytest.fixture
-def sample_report_data(sample_tree):
+def sample_report_data(sample_graph):
     """Create a sample ReportData for testing."""
     return ReportData(
         root_package="test-package",
@@ -252,13 +294,33 @@ def sample_report_data(sample_tree):
         missing_count=2,
         missing_packages=["missing-a", "missing-b"],
         packaged_packages=["packaged-a", "packaged-b", "packaged-c"],
-        tree=sample_tree,
+        graph=sample_graph,
         max_depth=50,
         version="1.0.0",
         timestamp=datetime(2024, 1, 15, 12, 0, 0),
     )
 
 
+@pytest.fixture
+def release_report_data(sample_report_data):
+    """ReportData whose graph was checked against two Fedora releases."""
+    graph = sample_report_data.graph
+    graph.releases = ["41", "42"]
+    graph.nodes["root-package"].releases = {
+        "41": ReleaseStatus(is_packaged=True, versions=["1.0.0"]),
+        "42": ReleaseStatus(is_packaged=True, versions=["1.0.0"]),
+    }
+    graph.nodes["dep-a"].releases = {
+        "41": ReleaseStatus(is_packaged=False),
+        "42": ReleaseStatus(is_packaged=True, versions=["2.0.0"]),
+    }
+    graph.nodes["dep-b"].releases = {
+        "41": ReleaseStatus(is_packaged=False),
+        "42": ReleaseStatus(is_packaged=False),
+    }
+    return sample_report_data
+
+
 # ============================================================================
 # HTTP response helper fixtures
 # ============================================================================
@@ -268,9 +330,10 @@ def sample_report_data(sample_tree):
 def make_httpx_response():
     """Factory to create mock httpx responses."""
 
-    def _make_response(status_code: int, json_data=None, text: str = ""):
+    def _make_response(status_code: int, json_data=None, text: str = "", headers=None):
         response = MagicMock()
         response.status_code = status_code
+        response.headers = httpx.Headers(headers or {})
         response.text = text or (str(json_data) if json_data else "")
         if json_data is not None:
             response.json.return_value = json_data
@@ -279,6 +342,116 @@ def make_httpx_response():
     return _make_response
 
 
+# ============================================================================
+# Repodata fixtures
+# ============================================================================
+
+# (name, arch, version, [(provide, provide version)]) for the generated repo
+REPODATA_PACKAGES = [
+    (
+        "rust-serde",
+        "noarch",
+        "1.0.200",
+        [("crate(serde)", "1.0.200"), ("crate(serde/default)", "1.0.200")],
+    ),
+    ("rust-syn1", "noarch", "1.0.109", [("crate(syn)", "1.0.109")]),
+    ("rust-syn", "noarch", "2.0.60", [("crate(syn)", "2.0.60"), ("rust-syn", None)]),
+    ("rust-tokio", "src", "1.37.0", [("crate(tokio)", "1.37.0")]),
+    ("python3-requests", "noarch", "2.31.0", [("python3dist(requests)", "2.31")]),
+]
+
+
+def _primary_xml(packages) -> bytes:
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<metadata xmlns="http://linux.duke.edu/metadata/common" '
+        'xmlns:rpm="http://linux.duke.edu/metadata/rpm" '
+        f'packages="{len(packages)}">',
+    ]
+    for name, arch, version, provides in packages:
+        entries = "".join(
+            f'<rpm:entry name="{p}" flags="EQ" epoch="0" ver="{v}"/>'
+            if v
+            else f'<rpm:entry name="{p}"/>'
+            for p, v in provides
+        )
+        parts.append(
+            f'<package type="rpm"><name>{name}</name><arch>{arch}</arch>'
+            f'<version epoch="0" ver="{version}" rel="1.fc41"/>'
+            f"<format><rpm:provides>{entries}</rpm:provides></format></package>"
+        )
+    parts.append("</metadata>")
+    return "\n".join(parts).encode()
+
+
+def _primary_sqlite(path, packages) -> None:
+    import sqlite3
+
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE packages (pkgKey INTEGER PRIMARY KEY, name TEXT, "
+        "arch TEXT, version TEXT, release TEXT)"
+    )
+    conn.execute(
+        "CREATE TABLE provides (name TEXT, flags TEXT, epoch TEXT, "
+        "version TEXT, release TEXT, pkgKey INTEGER)"
+    )
+    for key, (name, arch, version, provides) in enumerate(packages, start=1):
+        conn.execute(
+            "INSERT INTO packages VALUES (?, ?, ?, ?, ?)",
+            (key, name, arch, version, "1.fc41"),
+        )
+        for provide, provide_version in provides:
+            conn.execute(
+                "INSERT INTO provides VALUES (?, ?, ?, ?, ?, ?)",
+                (provide, "EQ", "0", provide_version, None, key),
+            )
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def make_repodata(tmp_path):
+    """Factory generating a small local repository with repodata.
+
+    ``fmt`` selects the primary metadata flavour: ``"xml"``, ``"xml.gz"``,
+    ``"xml.zst"`` or ``"sqlite"``.  Returns the repository root.
+    """
+
+    def _make_repodata(fmt: str = "xml.gz", packages=None, name: str = "repo"):
+        import gzip
+
+        packages = REPODATA_PACKAGES if packages is None else packages
+        root = tmp_path / name
+        repodata = root / "repodata"
+        repodata.mkdir(parents=True)
+
+        if fmt == "sqlite":
+            data_type, filename = "primary_db", "abc-primary.sqlite"
+            _primary_sqlite(repodata / filename, packages)
+        else:
+            data_type, filename = "primary", f"abc-primary.{fmt}"
+            content = _primary_xml(packages)
+            if fmt == "xml.gz":
+                content = gzip.compress(content)
+            elif fmt == "xml.zst":
+                zstandard = pytest.importorskip("zstandard")
+                content = zstandard.ZstdCompressor().compress(content)
+            (repodata / filename).write_bytes(content)
+
+        (repodata / "repomd.xml").write_text(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<repomd xmlns="http://linux.duke.edu/metadata/repo">'
+            "<revision>1700000000</revision>"
+            f'<data type="{data_type}">'
+            f'<location href="repodata/{filename}"/></data>'
+            "</repomd>"
+        )
+        return root
+
+    return _make_repodata
+
+
 # ============================================================================
 # Cache data fixtures
 # ============================================================================
@@ -305,6 +478,26 @@ def cache_entry_expired():
 # ============================================================================
 
 
+@pytest.fixture
+def dnf_revision():
+    """Opt out of :func:`stub_dnf_revision`: let dnf report the revision."""
+
+
+@pytest.fixture(autouse=True)
+def stub_dnf_revision(request, monkeypatch):
+    """Skip the ``dnf repoinfo`` metadata revision lookup.
+
+    Fedora cache keys look the revision up once per target, which would
+    add a dnf call to every test counting them; tests of the lookup
+    itself request the ``dnf_revision`` fixture.
+    """
+    if "dnf_revision" not in request.fixturenames:
+        monkeypatch.setattr(
+            "woolly.fedora.backends.DnfBackend.metadata_revision",
+            lambda self, provider: None,
+        )
+
+
 @pytest.fixture(autouse=True)
 def reset_logger():
     """Reset the global logger state before each test."""
@@ -0,0 +1,72 @@
+"""
+Benchmark of the cache encodings on real registry payloads.
+
+Fetches full crates.io and PyPI documents, then compares size and
+encode/decode time of every encoding in ``woolly.cache.CACHE_ENCODINGS``
+against the JSON envelope.  Run with ``pytest -s`` to see the table.
+
+Note: These tests make real API calls and may be slow.
+"""
+
+import time
+
+import httpx
+import pytest
+
+from woolly.cache import CACHE_ENCODINGS, CacheEntry, decode_entry, encode_entry
+
+PAYLOAD_URLS = [
+    "https://crates.io/api/v1/crates/tokio",
+    "https://crates.io/api/v1/crates/serde",
+    "https://pypi.org/pypi/boto3/json",
+    "https://pypi.org/pypi/numpy/json",
+]
+
+ROUNDS = 20
+
+
+def _time_per_call(func, *args) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        func(*args)
+    return (time.perf_counter() - start) / ROUNDS
+
+
+@pytest.fixture(scope="module")
+def payloads():
+    headers = {"User-Agent": "woolly-benchmark"}
+    try:
+        return {
+            url: httpx.get(url, headers=headers, timeout=30).json()
+            for url in PAYLOAD_URLS
+        }
+    except httpx.HTTPError as e:
+        pytest.skip(f"registries unreachable: {e}")
+
+
+@pytest.mark.functional
+@pytest.mark.slow
+@pytest.mark.parametrize("url", PAYLOAD_URLS)
+def test_encodings_on_real_payloads(payloads, url):
+    """Critical path: binary encodings round-trip and beat the JSON envelope."""
+    entry = CacheEntry(value=payloads[url])
+    results = {}
+    for encoding in CACHE_ENCODINGS:
+        data = encode_entry(entry, encoding)
+        assert decode_entry(data).value == entry.value
+        results[encoding] = (
+            len(data),
+            _time_per_call(encode_entry, entry, encoding),
+            _time_per_call(decode_entry, data),
+        )
+
+    print(f"\n{url}")
+    for encoding, (size, encode_s, decode_s) in results.items():
+        print(
+            f"  {encoding:8} {size:>10,} B  "
+            f"encode {encode_s * 1000:7.2f} ms  decode {decode_s * 1000:7.2f} ms"
+        )
+
+    json_size = results["json"][0]
+    for encoding in ("zlib", "lzma", "marshal"):
+        assert results[encoding][0] < json_size
@@ -7,18 +7,61 @@ Tests cover:
 - Bad path: corrupted cache, missing directories
 """
 
+import hashlib
 import json
+import os
+import sqlite3
+import struct
+import subprocess
+import sys
+import threading
 import time
+import zlib
 
 import pytest
 
 from woolly.cache import (
+    CACHE_ENCODING_ENV,
+    CACHE_ENCODINGS,
+    DEFAULT_CACHE_ENCODINGS,
     DEFAULT_CACHE_TTL,
     FEDORA_CACHE_TTL,
+    FEDORA_REVISION_TTL,
+    FEED_STATE_NAMESPACE,
+    CacheEntry,
+    CacheLock,
+    JsonCacheBackend,
+    MemoryCache,
+    SqliteCacheBackend,
+    cache_fill_lock,
+    cache_stats,
     clear_cache,
+    configure_memory_cache,
+    decode_entry,
+    encode_entry,
     ensure_cache_dir,
+    flush_cache_counters,
+    gc_cache,
+    get_cache_backend,
+    get_cache_encoding,
     get_cache_path,
+    get_cache_size_limit,
+    get_memory_cache,
+    parse_size,
+    peek_cache,
     read_cache,
+    read_cache_entry,
+    reset_stale_reads,
+    set_cache_backend,
+    set_cache_encoding,
+    set_cache_shared,
+    set_cache_size_limit,
+    set_namespace_ttl,
+    set_stale_while_revalidate,
+    stale_reads,
+    stale_while_revalidate_enabled,
+    touch_cache,
+    wait_for_refreshes,
     write_cache,
 )
 
@@ -222,6 +265,817 @@ class TestClearCache:
         assert cleared == []
 
 
+class TestCacheBackendSelection:
+    """Tests for choosing the cache backend."""
+
+    @pytest.mark.unit
+    def test_defaults_to_json(self, temp_cache_dir):
+        """Good path: JSON files remain the default storage."""
+        assert isinstance(get_cache_backend(), JsonCacheBackend)
+
+    @pytest.mark.unit
+    def test_environment_selects_sqlite(self, temp_cache_dir, monkeypatch):
+        """Good path: WOOLLY_CACHE_BACKEND=sqlite selects the SQLite backend."""
+        monkeypatch.setenv("WOOLLY_CACHE_BACKEND", "sqlite")
+
+        write_cache("ns", "key", "value")
+
+        assert isinstance(get_cache_backend(), SqliteCacheBackend)
+        assert (temp_cache_dir / "cache.sqlite3").exists()
+        assert not (temp_cache_dir / "ns").exists()
+
+    @pytest.mark.unit
+    def test_unknown_backend(self, temp_cache_dir):
+        """Bad path: unknown backend names are rejected."""
+        with pytest.raises(ValueError, match="Unknown cache backend"):
+            set_cache_backend("redis")
+
+
+class TestSqliteCacheBackend:
+    """Tests for the single-file SQLite cache backend."""
+
+    @pytest.fixture
+    def sqlite_cache(self, temp_cache_dir):
+        set_cache_backend("sqlite")
+        return get_cache_backend()
+
+    @pytest.mark.unit
+    def test_round_trips_values(self, sqlite_cache):
+        """Good path: values of every JSON type come back unchanged."""
+        for value in ["s", 1, 1.5, True, None, [1, 2], {"a": {"b": [1]}}]:
+            write_cache("ns", "key", value)
+            assert read_cache("ns", "key") == value
+
+    @pytest.mark.unit
+    def test_uses_wal_and_timestamp_column(self, sqlite_cache):
+        """Good path: WAL journal and the timestamp stored in its own column."""
+        write_cache("ns", "key", "value")
+
+        conn = sqlite3.connect(sqlite_cache.path)
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        (timestamp,) = conn.execute("SELECT timestamp FROM entries").fetchone()
+        assert time.time() - timestamp < 60
+
+    @pytest.mark.unit
+    def test_expired_entry(self, sqlite_cache):
+        """Critical path: entries older than the TTL are ignored."""
+        write_cache("ns", "key", "value")
+        sqlite3.connect(sqlite_cache.path, isolation_level=None).execute(
+            "UPDATE entries SET timestamp = timestamp - 100"
+        )
+
+        assert sqlite_cache.read("ns", "key", ttl=50) is None
+        assert sqlite_cache.read("ns", "key", ttl=500) == "value"
+
+    @pytest.mark.unit
+    def test_namespace_isolation_and_clear(self, sqlite_cache):
+        """Critical path: clearing one namespace keeps the others."""
+        write_cache("ns1", "key", "one")
+        write_cache("ns2", "key", "two")
+
+        assert clear_cache("ns1") == ["ns1"]
+        assert read_cache("ns1", "key") is None
+        assert read_cache("ns2", "key") == "two"
+        assert clear_cache() == ["ns2"]
+        assert clear_cache("ns2") == []
+
+    @pytest.mark.unit
+    def test_concurrent_threads(self, sqlite_cache):
+        """Critical path: threads write and read through their own connections."""
+
+        def work(i):
+            write_cache("ns", f"key{i}", i)
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert [read_cache("ns", f"key{i}") for i in range(8)] == list(range(8))
+
+    @pytest.mark.unit
+    def test_migrates_json_cache(self, temp_cache_dir):
+        """Good path: existing JSON entries are imported once, then removed."""
+        write_cache("pypi", "info:requests", {"name": "requests"})
+        write_cache("fedora", "old", "stale")
+        old = get_cache_path("fedora", "old")
+        old.write_text(json.dumps({"timestamp": time.time() - 1000, "value": "x"}))
+        (temp_cache_dir / "pypi" / "broken.json").write_text("not json")
+
+        set_cache_backend("sqlite")
+        get_memory_cache().clear()
+
+        assert read_cache("pypi", "info:requests") == {"name": "requests"}
+        assert read_cache("fedora", "old", ttl=100) is None
+        assert read_cache("fedora", "old", ttl=10000) == "x"
+        assert not (temp_cache_dir / "fedora").exists()
+        assert [p.name for p in (temp_cache_dir / "pypi").iterdir()] == ["broken.json"]
+
+    @pytest.mark.unit
+    def test_migration_runs_once(self, temp_cache_dir):
+        """Critical path: JSON files written after the migration are left alone."""
+        set_cache_backend("sqlite")
+        write_cache("ns", "key", "sqlite")
+
+        JsonCacheBackend().write("ns", "key", "json")
+        set_cache_backend("sqlite")
+
+        assert read_cache("ns", "key") == "sqlite"
+        assert get_cache_path("ns", "key").exists()
+
+    @pytest.mark.unit
+    def test_corrupted_database(self, temp_cache_dir):
+        """Bad path: an unreadable database reads as a cache miss."""
+        (temp_cache_dir / "cache.sqlite3").write_text("not a database" * 100)
+        backend = SqliteCacheBackend()
+
+        with pytest.raises(sqlite3.DatabaseError):
+            backend.write("ns", "key", "value")
+        assert backend.read("ns", "key", DEFAULT_CACHE_TTL) is None
+
+
+class TestMemoryCache:
+    """Tests for the in-process LRU tier."""
+
+    @pytest.mark.unit
+    def test_repeated_reads_skip_the_backend(self, temp_cache_dir, mocker):
+        """Good path: only the first read of a key reaches the disk."""
+        write_cache("ns", "key", {"a": 1})
+        configure_memory_cache()
+        spy = mocker.spy(get_cache_backend(), "read_entry")
+
+        for _ in range(3):
+            assert read_cache("ns", "key") == {"a": 1}
+
+        assert spy.call_count == 1
+        stats = get_memory_cache().stats()
+        assert (stats.hits, stats.misses, stats.entries) == (2, 1, 1)
+
+    @pytest.mark.unit
+    def test_writes_populate_memory(self, temp_cache_dir, mocker):
+        """Good path: a written value is read back without touching disk."""
+        spy = mocker.spy(get_cache_backend(), "read_entry")
+
+        write_cache("ns", "key", "value")
+
+        assert read_cache("ns", "key") == "value"
+        spy.assert_not_called()
+
+    @pytest.mark.unit
+    def test_ttl_applies_to_memory_entries(self, temp_cache_dir):
+        """Critical path: expired entries are not served from memory."""
+        entry = CacheEntry(value="value", timestamp=time.time() - 100)
+        get_cache_backend().write_entry("ns", "key", entry)
+        get_memory_cache().put("ns", "key", entry)
+
+        assert read_cache("ns", "key", ttl=50) is None
+
+    @pytest.mark.unit
+    def test_expired_memory_entry_rereads_disk(self, temp_cache_dir):
+        """Critical path: an entry refreshed by another process is picked up."""
+        write_cache("ns", "key", "new")
+        get_memory_cache().put(
+            "ns", "key", CacheEntry(value="old", timestamp=time.time() - 100)
+        )
+
+        assert read_cache("ns", "key", ttl=50) == "new"
+        assert get_memory_cache().get("ns", "key").value == "new"
+
+    @pytest.mark.unit
+    def test_entry_budget_evicts_least_recently_used(self):
+        """Critical path: the oldest unused entry is evicted first."""
+        memory = MemoryCache(max_entries=2)
+        for key in ("a", "b"):
+            memory.put("ns", key, CacheEntry(value=key))
+        memory.get("ns", "a")
+        memory.put("ns", "c", CacheEntry(value="c"))
+
+        assert memory.get("ns", "b") is None
+        assert memory.get("ns", "a").value == "a"
+        assert len(memory) == 2
+
+    @pytest.mark.unit
+    def test_byte_budget(self):
+        """Critical path: the byte budget counts JSON-encoded value sizes."""
+        memory = MemoryCache(max_entries=None, max_bytes=20)
+        memory.put("ns", "a", CacheEntry(value="x" * 8))  # 10 bytes
+        memory.put("ns", "b", CacheEntry(value="y" * 8))
+        memory.put("ns", "c", CacheEntry(value="z" * 8))
+        memory.put("ns", "huge", CacheEntry(value="w" * 100))
+
+        assert memory.get("ns", "a") is None
+        assert memory.get("ns", "huge") is None
+        assert memory.stats().size_bytes == 20
+
+    @pytest.mark.unit
+    def test_clear_cache_clears_memory(self, temp_cache_dir):
+        """Critical path: clearing a namespace also drops its memory entries."""
+        write_cache("ns1", "key", "one")
+        write_cache("ns2", "key", "two")
+
+        clear_cache("ns1")
+
+        assert read_cache("ns1", "key") is None
+        assert len(get_memory_cache()) == 1
+
+    @pytest.mark.unit
+    def test_disabled(self, temp_cache_dir, mocker):
+        """Bad path: a zero budget disables the tier."""
+        configure_memory_cache(max_entries=0)
+        write_cache("ns", "key", "value")
+        spy = mocker.spy(get_cache_backend(), "read_entry")
+
+        assert read_cache("ns", "key") == "value"
+        assert read_cache("ns", "key") == "value"
+        assert spy.call_count == 2
+
+
+class TestCacheEncoding:
+    """Tests for the per-namespace on-disk encodings."""
+
+    PAYLOAD = {"info": {"name": "pkg", "requires_dist": ["a>=1", "b; extra == 'x'"]}}
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("encoding", CACHE_ENCODINGS)
+    def test_round_trip(self, encoding):
+        """Good path: every encoding restores timestamp and value."""
+        entry = CacheEntry(timestamp=1234.5, value=self.PAYLOAD)
+
+        decoded = decode_entry(encode_entry(entry, encoding))
+
+        assert decoded.timestamp == 1234.5
+        assert decoded.value == self.PAYLOAD
+
+    @pytest.mark.unit
+    def test_binary_payload_is_compressed(self):
+        """Good path: binary encodings are smaller than the JSON envelope."""
+        entry = CacheEntry(value={"files": ["wheel-1.0-py3-none-any.whl"] * 200})
+
+        json_size = len(encode_entry(entry, "json"))
+
+        for encoding in ("zlib", "lzma", "marshal"):
+            assert len(encode_entry(entry, encoding)) < json_size / 5
+
+    @pytest.mark.unit
+    def test_binary_decode_skips_validation(self, mocker):
+        """Critical path: binary entries are not run through pydantic."""
+        data = encode_entry(CacheEntry(value=self.PAYLOAD), "zlib")
+        validate = mocker.spy(CacheEntry, "model_validate_json")
+
+        decode_entry(data)
+
+        validate.assert_not_called()
+
+    @pytest.mark.unit
+    def test_encoding_chosen_per_namespace(self, temp_cache_dir):
+        """Good path: registry namespaces default to zlib, others to JSON."""
+        set_cache_encoding("ns", "lzma")
+        write_cache("ns", "key", self.PAYLOAD)
+        write_cache("other", "key", self.PAYLOAD)
+
+        assert get_cache_encoding("pypi") == "zlib"
+        assert get_cache_path("ns", "key").suffix == ".bin"
+        assert get_cache_path("ns", "key").read_bytes().startswith(b"WLYC")
+        assert get_cache_path("other", "key").suffix == ".json"
+        assert json.loads(get_cache_path("other", "key").read_text())["value"]
+        configure_memory_cache()
+        assert read_cache("ns", "key") == self.PAYLOAD
+
+    @pytest.mark.unit
+    def test_marshal_is_opt_in(self, temp_cache_dir, monkeypatch):
+        """Critical path: marshal is only used when asked for."""
+        assert "marshal" not in DEFAULT_CACHE_ENCODINGS.values()
+
+        monkeypatch.setenv(CACHE_ENCODING_ENV, "pypi=marshal,crates=bogus")
+
+        assert get_cache_encoding("pypi") == "marshal"
+        assert get_cache_encoding("crates") == "zlib"
+        monkeypatch.setenv(CACHE_ENCODING_ENV, "lzma")
+        assert get_cache_encoding("fedora") == "lzma"
+
+    @pytest.mark.unit
+    def test_binary_entries_not_globbed_as_json(self, temp_cache_dir):
+        """Critical path: binary entries never sit in .json files."""
+        set_cache_encoding("ns", "zlib")
+        write_cache("ns", "a", self.PAYLOAD)
+        set_cache_encoding("ns", "json")
+        write_cache("ns", "b", self.PAYLOAD)
+
+        for path in (temp_cache_dir / "ns").glob("*.json"):
+            assert json.loads(path.read_text())["value"] == self.PAYLOAD
+        assert len(list((temp_cache_dir / "ns").glob("*.bin"))) == 1
+        assert {info.key for info in get_cache_backend().scan("ns")} == {
+            get_cache_path("ns", "a").stem,
+            get_cache_path("ns", "b").stem,
+        }
+
+        clear_cache("ns")
+
+        assert list((temp_cache_dir / "ns").iterdir()) == []
+
+    @pytest.mark.unit
+    def test_rewrite_in_new_encoding_drops_old_file(self, temp_cache_dir):
+        """Good path: an entry lives in one file whatever its encoding."""
+        write_cache("ns", "key", {"old": True})
+        set_cache_encoding("ns", "zlib")
+        write_cache("ns", "key", self.PAYLOAD)
+        configure_memory_cache()
+
+        assert [p.suffix for p in (temp_cache_dir / "ns").iterdir()] == [".bin"]
+        assert read_cache("ns", "key") == self.PAYLOAD
+
+    @pytest.mark.unit
+    def test_switching_encoding_keeps_entries_readable(self, temp_cache_dir):
+        """Critical path: entries are self-describing across encoding changes."""
+        write_cache("ns", "key", self.PAYLOAD)
+        set_cache_encoding("ns", "marshal")
+        configure_memory_cache()
+
+        assert read_cache("ns", "key") == self.PAYLOAD
+
+    @pytest.mark.unit
+    def test_sqlite_stores_binary_blob(self, temp_cache_dir):
+        """Good path: the SQLite backend stores binary entries as BLOBs."""
+        set_cache_backend("sqlite")
+        set_cache_encoding("ns", "zlib")
+        write_cache("ns", "key", self.PAYLOAD)
+        configure_memory_cache()
+
+        conn = sqlite3.connect(get_cache_backend().path)
+        (kind,) = conn.execute("SELECT typeof(value) FROM entries").fetchone()
+        assert kind == "blob"
+        assert read_cache("ns", "key") == self.PAYLOAD
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "data",
+        [b"WLYC", b"WLYC\x01\x09" + bytes(8) + b"x", b"WLYC\x01\x01" + bytes(8) + b"x"],
+    )
+    def test_corrupted_binary_entry(self, data):
+        """Bad path: truncated, unknown-codec or corrupted entries decode to None."""
+        assert decode_entry(data) is None
+
+    @pytest.mark.unit
+    def test_unknown_encoding(self):
+        """Bad path: unknown encodings are rejected."""
+        with pytest.raises(ValueError, match="Unknown cache encoding"):
+            set_cache_encoding("ns", "bson")
+
+
+class TestCacheValidators:
+    """Tests for the HTTP validators stored with entries."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("encoding", CACHE_ENCODINGS)
+    def test_round_trip(self, encoding):
+        """Good path: every encoding keeps ETag and Last-Modified."""
+        entry = CacheEntry(
+            value=[1], etag='W/"abc"', last_modified="Wed, 01 Jan 2025 00:00:00 GMT"
+        )
+
+        decoded = decode_entry(encode_entry(entry, encoding))
+
+        assert decoded.etag == 'W/"abc"'
+        assert decoded.last_modified == "Wed, 01 Jan 2025 00:00:00 GMT"
+        assert decoded.value == [1]
+
+    @pytest.mark.unit
+    def test_reads_format_1_entries(self):
+        """Critical path: binary entries written before validators still decode."""
+        data = struct.pack(">4sBBd", b"WLYC", 1, 1, 1234.5) + zlib.compress(b"[1]")
+
+        decoded = decode_entry(data)
+
+        assert decoded.value == [1]
+        assert decoded.etag is None
+
+    @pytest.mark.unit
+    def test_backends_persist_validators(self, any_backend):
+        """Good path: validators survive a round trip through either backend."""
+        for namespace in ("crates", "other"):  # binary and JSON encodings
+            write_cache(namespace, "key", {"a": 1}, etag='"v1"')
+        configure_memory_cache()
+
+        assert read_cache_entry("crates", "key").etag == '"v1"'
+        assert read_cache_entry("other", "key").etag == '"v1"'
+
+    @pytest.mark.unit
+    def test_touch_restamps_expired_entry(self, any_backend):
+        """Critical path: a revalidated entry is fresh again with its validators."""
+        any_backend.write_entry(
+            "crates",
+            "key",
+            CacheEntry(value={"a": 1}, etag='"v1"', timestamp=time.time() - 10**7),
+        )
+        stale = read_cache_entry("crates", "key")
+        assert read_cache("crates", "key") is None
+
+        touch_cache("crates", "key", stale)
+        configure_memory_cache()
+
+        assert read_cache("crates", "key") == {"a": 1}
+        assert read_cache_entry("crates", "key").etag == '"v1"'
+
+    @pytest.mark.unit
+    def test_sqlite_upgrades_old_schema(self, temp_cache_dir):
+        """Critical path: databases without validator columns are upgraded."""
+        conn = sqlite3.connect(temp_cache_dir / "cache.sqlite3")
+        conn.executescript(
+            "CREATE TABLE entries (namespace TEXT NOT NULL, key TEXT NOT NULL,"
+            " timestamp REAL NOT NULL, value NOT NULL,"
+            " PRIMARY KEY (namespace, key)) WITHOUT ROWID;"
+            "CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);"
+            "INSERT INTO meta VALUES ('json_migrated', '0');"
+        )
+        conn.execute(
+            "INSERT INTO entries VALUES (?, ?, ?, ?)",
+            ("other", hashlib.md5(b"key").hexdigest(), time.time(), '"old"'),
+        )
+        conn.commit()
+        conn.close()
+        set_cache_backend("sqlite")
+
+        assert read_cache("other", "key") == "old"
+        write_cache("other", "new", "value", last_modified="yesterday")
+        configure_memory_cache()
+        assert read_cache_entry("other", "new").last_modified == "yesterday"
+
+
+class TestStaleWhileRevalidate:
+    """Tests for serving expired registry entries while refreshing them."""
+
+    @pytest.fixture
+    def expired(self, temp_cache_dir):
+        """An expired crates.io entry, and stale mode turned on."""
+        get_cache_backend().write_entry(
+            "crates", "key", CacheEntry(value="old", timestamp=time.time() - 10**7)
+        )
+        set_stale_while_revalidate(True)
+
+    @pytest.mark.unit
+    def test_serves_expired_entry_and_refreshes(self, expired):
+        """Good path: the stale value is returned and refreshed in the background."""
+
+        def refresh():
+            write_cache("crates", "key", "new")
+
+        assert read_cache("crates", "key", refresh=refresh) == "old"
+        assert wait_for_refreshes(timeout=5) == 0
+        assert read_cache("crates", "key") == "new"
+        assert stale_reads() == {"crates": 1}
+
+    @pytest.mark.unit
+    def test_refreshes_each_key_once(self, expired):
+        """Critical path: concurrent stale reads of one key share a refresh."""
+        release = threading.Event()
+        calls = []
+
+        def refresh():
+            calls.append(1)
+            release.wait(5)
+
+        for _ in range(3):
+            assert read_cache("crates", "key", refresh=refresh) == "old"
+        release.set()
+        wait_for_refreshes(timeout=5)
+
+        assert len(calls) == 1
+        assert stale_reads() == {"crates": 3}
+
+    @pytest.mark.unit
+    def test_failed_refresh_keeps_stale_entry(self, expired):
+        """Bad path: a refresh error is logged and the entry stays servable."""
+
+        def refresh():
+            raise RuntimeError("offline")
+
+        read_cache("crates", "key", refresh=refresh)
+        assert wait_for_refreshes(timeout=5) == 0
+
+        assert read_cache("crates", "key", refresh=refresh) == "old"
+        wait_for_refreshes(timeout=5)
+
+    @pytest.mark.unit
+    def test_needs_refresh_and_registry_namespace(self, expired):
+        """Bad path: without a refresh or outside crates/pypi, expired is a miss."""
+        get_cache_backend().write_entry(
+            "fedora", "key", CacheEntry(value="old", timestamp=time.time() - 10**7)
+        )
+
+        assert read_cache("crates", "key") is None
+        assert read_cache("fedora", "key", refresh=lambda: None) is None
+        assert stale_reads() == {}
+
+    @pytest.mark.unit
+    def test_disabled_by_default(self, temp_cache_dir, monkeypatch):
+        """Good path: the mode is off unless enabled or set in the environment."""
+        assert stale_while_revalidate_enabled() is False
+        get_cache_backend().write_entry(
+            "pypi", "key", CacheEntry(value="old", timestamp=time.time() - 10**7)
+        )
+        assert read_cache("pypi", "key", refresh=lambda: None) is None
+
+        monkeypatch.setenv("WOOLLY_CACHE_STALE", "1")
+        assert stale_while_revalidate_enabled() is True
+
+    @pytest.mark.unit
+    def test_reset_counts(self, expired):
+        """Good path: stale answer counts can be reset between runs."""
+        read_cache("crates", "key", refresh=lambda: None)
+        wait_for_refreshes(timeout=5)
+
+        reset_stale_reads()
+
+        assert stale_reads() == {}
+
+
+def _age(namespace, key, seconds, accessed=None):
+    """Backdate an entry's write time (and access time) in either backend."""
+    backend = get_cache_backend()
+    now = time.time()
+    if isinstance(backend, SqliteCacheBackend):
+        conn = sqlite3.connect(backend.path, isolation_level=None)
+        conn.execute(
+            "UPDATE entries SET timestamp = ?, accessed = ? "
+            "WHERE namespace = ? AND key = ?",
+            (
+                now - seconds,
+                now - (accessed if accessed is not None else seconds),
+                namespace,
+                hashlib.md5(key.encode()).hexdigest(),
+            ),
+        )
+    else:
+        os.utime(
+            get_cache_path(namespace, key),
+            (now - (accessed if accessed is not None else seconds), now - seconds),
+        )
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def any_backend(request, temp_cache_dir):
+    set_cache_backend(request.param)
+    return get_cache_backend()
+
+
+class TestCacheGc:
+    """Tests for purging and size-budget eviction."""
+
+    @pytest.mark.unit
+    def test_purges_entries_past_namespace_ttl(self, any_backend):
+        """Good path: expired entries go, using each namespace's TTL."""
+        write_cache("crates", "old", "x")
+        write_cache("crates", "fresh", "x")
+        write_cache("fedora", "old", "x")
+        _age("crates", "old", DEFAULT_CACHE_TTL + 10)
+        _age("fedora", "old", FEDORA_REVISION_TTL + 10)
+
+        results = {r.namespace: r for r in gc_cache()}
+
+        assert results["crates"].expired == 1
+        assert results["fedora"].expired == 1
+        assert [info.namespace for info in any_backend.scan()] == ["crates"]
+        assert read_cache("crates", "fresh") == "x"
+        assert read_cache("crates", "old", ttl=10**9) is None
+
+    @pytest.mark.unit
+    def test_namespace_ttl_override(self, any_backend):
+        """Critical path: a runtime TTL keeps entries the default would purge."""
+        write_cache("crates", "old", "x")
+        _age("crates", "old", DEFAULT_CACHE_TTL + 10)
+        set_namespace_ttl("crates", 2 * DEFAULT_CACHE_TTL)
+
+        assert gc_cache("crates")[0].expired == 0
+
+        set_namespace_ttl("crates", None)
+        assert gc_cache("crates")[0].expired == 1
+
+    @pytest.mark.unit
+    def test_keeps_entries_of_feed_tracked_namespace(self, any_backend):
+        """Critical path: a stored feed state protects entries in later runs."""
+        write_cache("crates", "old", "x")
+        write_cache("crates", "older", "x")
+        _age("crates", "old", DEFAULT_CACHE_TTL + 10)
+        _age("crates", "older", 3 * DEFAULT_CACHE_TTL)
+        # Feed tracking started twice the default TTL ago, in an earlier run
+        write_cache(
+            FEED_STATE_NAMESPACE,
+            "crates",
+            {"baseline": time.time() - 2 * DEFAULT_CACHE_TTL},
+        )
+
+        result = gc_cache("crates")[0]
+
+        assert result.expired == 1
+        assert read_cache("crates", "old", ttl=10**9) == "x"
+
+    @pytest.mark.unit
+    def test_evicts_least_recently_accessed(self, any_backend):
+        """Critical path: over budget, the oldest accesses are evicted first."""
+        for key, accessed in [("a", 300), ("b", 100), ("c", 200)]:
+            write_cache("ns", key, "x" * 100)
+            _age("ns", key, 10, accessed=accessed)
+        total = sum(info.size for info in any_backend.scan("ns"))
+
+        results = gc_cache("ns", max_bytes=total - 1)
+
+        assert results[0].evicted == 1
+        assert {info.key for info in any_backend.scan("ns")} == {
+            hashlib.md5(k.encode()).hexdigest() for k in ("b", "c")
+        }
+
+    @pytest.mark.unit
+    def test_reads_refresh_access_time(self, any_backend):
+        """Critical path: reading an entry protects it from eviction."""
+        for key in ("a", "b"):
+            write_cache("ns", key, "x" * 100)
+            _age("ns", key, 10 * 3600)
+        configure_memory_cache()
+        read_cache("ns", "a")
+        total = sum(info.size for info in any_backend.scan("ns"))
+
+        gc_cache("ns", max_bytes=total - 1)
+
+        configure_memory_cache()
+        assert read_cache("ns", "a") is not None
+        assert read_cache("ns", "b") is None
+
+    @pytest.mark.unit
+    def test_configured_limits(self, temp_cache_dir, monkeypatch):
+        """Good path: limits come from set_cache_size_limit or the environment."""
+        monkeypatch.setenv("WOOLLY_CACHE_MAX_SIZE", "crates=1G, 200M")
+        set_cache_size_limit("pypi", 1024)
+
+        assert get_cache_size_limit("crates") == 1024**3
+        assert get_cache_size_limit("fedora") == 200 * 1024**2
+        assert get_cache_size_limit("pypi") == 1024
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "text,expected",
+        [("1048576", 1048576), ("64k", 65536), ("1.5G", 1610612736), ("2MB", 2097152)],
+    )
+    def test_parse_size(self, text, expected):
+        """Good path: sizes accept binary unit suffixes."""
+        assert parse_size(text) == expected
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("text", ["", "M", "lots", "1X"])
+    def test_parse_invalid_size(self, text):
+        """Bad path: malformed sizes are rejected."""
+        with pytest.raises(ValueError, match="Invalid size"):
+            parse_size(text)
+
+
+class TestCacheStats:
+    """Tests for the per-namespace usage report."""
+
+    @pytest.mark.unit
+    def test_counts_sizes_and_ages(self, any_backend):
+        """Good path: entries, bytes and age buckets per namespace."""
+        write_cache("crates", "a", "x")
+        write_cache("crates", "b", "y")
+        write_cache("pypi", "c", "z")
+        _age("crates", "b", 3 * 86400)
+
+        stats = {ns.namespace: ns for ns in cache_stats()}
+
+        assert stats["crates"].entries == 2
+        assert stats["crates"].size_bytes > 0
+        assert stats["crates"].ages["<1h"] == 1
+        assert stats["crates"].ages["<7d"] == 1
+        assert stats["pypi"].entries == 1
+
+    @pytest.mark.unit
+    def test_hit_ratio_persists_across_runs(self, temp_cache_dir):
+        """Critical path: hit/miss counts are flushed to disk and accumulated."""
+        write_cache("pypi", "a", "x")
+        read_cache("pypi", "a")
+        read_cache("pypi", "missing")
+        flush_cache_counters()
+        read_cache("pypi", "a")
+
+        (stats,) = cache_stats("pypi")
+
+        assert (stats.hits, stats.misses) == (2, 1)
+        assert stats.hit_ratio == pytest.approx(2 / 3)
+
+    @pytest.mark.unit
+    def test_peek_counts_no_miss(self, temp_cache_dir):
+        """Critical path: peeks count no misses, and hits only on request."""
+        write_cache("pypi", "a", "x")
+        assert peek_cache("pypi", "missing") is None
+        assert peek_cache("pypi", "a") == "x"
+        assert peek_cache("pypi", "a", count_hit=True) == "x"
+        flush_cache_counters()
+
+        (stats,) = cache_stats("pypi")
+
+        assert (stats.hits, stats.misses) == (1, 0)
+
+    @pytest.mark.unit
+    def test_empty_cache(self, temp_cache_dir):
+        """Bad path: no entries and no counters yield an empty report."""
+        assert cache_stats() == []
+
+
+class TestConcurrentWriters:
+    """Tests for atomic writes and shared-mode locking."""
+
+    @pytest.mark.unit
+    def test_json_write_leaves_no_temporary_files(self, temp_cache_dir):
+        """Good path: entries are renamed into place."""
+        write_cache("ns", "key", "old")
+        write_cache("ns", "key", "new")
+
+        assert [p.name for p in (temp_cache_dir / "ns").iterdir()] == [
+            get_cache_path("ns", "key").name
+        ]
+        assert read_cache("ns", "key") == "new"
+
+    @pytest.mark.unit
+    def test_failed_write_keeps_previous_entry(self, temp_cache_dir, mocker):
+        """Critical path: a write interrupted midway never truncates the entry."""
+        write_cache("ns", "key", "old")
+        mocker.patch("woolly.cache.os.replace", side_effect=OSError("disk full"))
+
+        with pytest.raises(OSError):
+            write_cache("ns", "key", "new")
+
+        configure_memory_cache()
+        assert read_cache("ns", "key") == "old"
+        assert len(list((temp_cache_dir / "ns").iterdir())) == 1
+
+    @pytest.mark.unit
+    def test_fill_lock_fetches_once_across_threads(self, temp_cache_dir):
+        """Critical path: in shared mode racing misses fetch the key once."""
+        set_cache_shared(True)
+        fetches = []
+
+        def fill():
+            with cache_fill_lock("ns", "key") as filled:
+                if filled is None:
+                    time.sleep(0.05)
+                    fetches.append(1)
+                    write_cache("ns", "key", "value")
+
+        threads = [threading.Thread(target=fill) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(fetches) == 1
+        assert read_cache("ns", "key") == "value"
+
+    @pytest.mark.unit
+    def test_fill_lock_is_a_no_op_by_default(self, temp_cache_dir):
+        """Good path: outside shared mode nothing is locked or re-read."""
+        write_cache("ns", "key", "value")
+
+        with cache_fill_lock("ns", "key") as filled:
+            assert filled is None
+            assert CacheLock("ns", "key", timeout=0).acquire()
+
+    @pytest.mark.unit
+    def test_shared_mode_from_environment(self, temp_cache_dir, monkeypatch):
+        """Good path: WOOLLY_CACHE_SHARED enables shared mode."""
+        monkeypatch.setenv("WOOLLY_CACHE_SHARED", "1")
+        write_cache("ns", "key", "value")
+
+        with cache_fill_lock("ns", "key") as filled:
+            assert filled == "value"
+
+    @pytest.mark.unit
+    @pytest.mark.skipif(sys.platform == "win32", reason="needs fcntl")
+    def test_lock_excludes_other_processes(self, temp_cache_dir):
+        """Critical path: a key locked by another process cannot be taken."""
+        holder = subprocess.Popen(
+            [
+                sys.executable,
+                "-c",
+                "import sys, woolly.cache as c;"
+                f"c.CACHE_DIR = c.Path({str(temp_cache_dir)!r});"
+                "lock = c.CacheLock('ns', 'key'); lock.acquire();"
+                "print('locked', flush=True); sys.stdin.readline()",
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        try:
+            assert holder.stdout.readline().strip() == "locked"
+            assert not CacheLock("ns", "key", timeout=0.2).acquire()
+            assert CacheLock("ns", "other-key", timeout=0.2).acquire()
+        finally:
+            holder.communicate("\n")
+
+        lock = CacheLock("ns", "key", timeout=5)
+        assert lock.acquire()
+        lock.release()
+
+
 class TestCacheConstants:
     """Tests for cache configuration constants."""
 
@@ -12,7 +12,12 @@ from unittest.mock import MagicMock
 import pytest
 from rich.tree import Tree
 
-from woolly.commands.check import TreeStats, _compute_stats_from_visited, build_tree
+from woolly.commands.check import (
+    TreeStats,
+    _compute_stats_from_visited,
+    build_tree,
+    check,
+)
 from woolly.languages.base import (
     Dependency,
     FedoraPackageStatus,
@@ -186,6 +191,20 @@ class TestBuildTree:
         # License info from mock_package_info is None, so no license marker
         assert "(None)" not in label
 
+    @pytest.mark.unit
+    def test_license_unavailable_in_label(self, provider):
+        """Critical path: a source without licenses is labelled as such."""
+        provider.packages["listed-pkg"] = PackageInfo(
+            name="listed-pkg", latest_version="1.0.0", license_unavailable=True
+        )
+        provider.fedora_status["listed-pkg"] = FedoraPackageStatus(
+            is_packaged=True, versions=["1.0.0"]
+        )
+
+        tree = build_tree(provider, "listed-pkg")
+
+        assert "(license unavailable)" in str(tree.label)
+
     @pytest.mark.unit
     def test_updates_progress_tracker(self, provider):
         """Good path: updates progress tracker when provided."""
@@ -438,3 +457,24 @@ class TestComputeStatsFromVisited:
         assert stats.optional_packaged == 1
         assert stats.optional_missing == 1
         assert "opt-missing" in stats.optional_missing_list
+
+
+class TestCheckWorkerPool:
+    """Tests for stopping the dnf worker pool."""
+
+    @pytest.mark.unit
+    def test_pool_shut_down_when_resolution_fails(self, temp_cache_dir, mocker):
+        """Bad path: the dnf workers are stopped even if resolution raises."""
+        provider = MockProvider()
+        provider.packages["root"] = PackageInfo(name="root", latest_version="1.0.0")
+        mocker.patch.object(provider, "fedora_metadata_revision", return_value=None)
+        mocker.patch("woolly.commands.check.get_provider", return_value=provider)
+        pool = mocker.patch("woolly.commands.check.DnfWorkerPool").return_value
+        mocker.patch(
+            "woolly.commands.check.resolve_graph", side_effect=RuntimeError("boom")
+        )
+
+        with pytest.raises(RuntimeError):
+            check("root", no_progress=True, dnf_workers=2)
+
+        pool.shutdown.assert_called_once()
@@ -1,5 +1,6 @@
 """
-Unit tests for other woolly commands (clear-cache, list-languages, list-formats).
+Unit tests for other woolly commands (clear-cache, cache, list-languages,
+list-formats, refresh-index).
 
 Tests cover:
 - Good path: command execution
@@ -10,10 +11,12 @@ from unittest.mock import MagicMock
 
 import pytest
 
-from woolly.cache import write_cache
+from woolly.cache import get_cache_path, write_cache
+from woolly.commands.cache import cache_gc_cmd, cache_stats_cmd
 from woolly.commands.clear_cache import clear_cache_cmd
 from woolly.commands.list_formats import list_formats_cmd
 from woolly.commands.list_languages import list_languages_cmd
+from woolly.commands.refresh_index import refresh_index_cmd
 
 
 class TestClearCacheCommand:
@@ -64,6 +67,62 @@ class TestClearCacheCommand:
         assert "No cache" in call_str
 
 
+class TestCacheCommand:
+    """Tests for the cache stats/gc subcommands."""
+
+    @pytest.mark.unit
+    def test_stats_lists_namespaces(self, temp_cache_dir, mocker):
+        """Good path: one table row per namespace."""
+        write_cache("crates", "key", "data")
+        write_cache("pypi", "key", "data")
+
+        mock_console = MagicMock()
+        mocker.patch("woolly.commands.cache.console", mock_console)
+
+        cache_stats_cmd()
+
+        table = mock_console.print.call_args[0][0]
+        assert table.row_count == 2
+
+    @pytest.mark.unit
+    def test_stats_handles_empty_cache(self, temp_cache_dir, mocker):
+        """Good path: reports when nothing is cached."""
+        mock_console = MagicMock()
+        mocker.patch("woolly.commands.cache.console", mock_console)
+
+        cache_stats_cmd()
+
+        assert "No cache entries" in str(mock_console.print.call_args_list)
+
+    @pytest.mark.unit
+    def test_gc_evicts_over_budget(self, temp_cache_dir, mocker):
+        """Critical path: --max-size evicts entries down to the budget."""
+        for key in ("a", "b", "c"):
+            write_cache("ns", key, "x" * 100)
+
+        mock_console = MagicMock()
+        mocker.patch("woolly.commands.cache.console", mock_console)
+
+        cache_gc_cmd(max_size="200")
+
+        remaining = [
+            key for key in ("a", "b", "c") if get_cache_path("ns", key).exists()
+        ]
+        assert len(remaining) == 1
+        assert "2 evicted" in str(mock_console.print.call_args_list)
+
+    @pytest.mark.unit
+    def test_gc_rejects_invalid_size(self, temp_cache_dir, mocker):
+        """Bad path: malformed --max-size exits with an error."""
+        mock_console = MagicMock()
+        mocker.patch("woolly.commands.cache.console", mock_console)
+
+        with pytest.raises(SystemExit) as exc_info:
+            cache_gc_cmd(max_size="lots")
+
+        assert exc_info.value.code == 1
+
+
 class TestListLanguagesCommand:
     """Tests for list_languages_cmd function."""
 
@@ -96,3 +155,63 @@ class TestListFormatsCommand:
         # The argument should be a Table
         call_args = mock_console.print.call_args[0][0]
         assert hasattr(call_args, "columns")  # Rich Table has columns
+
+
+class TestRefreshIndexCommand:
+    """Tests for refresh_index_cmd function."""
+
+    @pytest.mark.unit
+    def test_builds_index_for_target(self, temp_cache_dir, mocker):
+        """Good path: builds the index for the requested release and repos."""
+        mock_console = MagicMock()
+        mocker.patch("woolly.commands.refresh_index.console", mock_console)
+        mock_check_output = mocker.patch(
+            "subprocess.check_output",
+            return_value=b"rust-serde|1.0.200|crate(serde) = 1.0.200",
+        )
+
+        refresh_index_cmd(lang="rust", release="41", repos=("updates",))
+
+        cmd = mock_check_output.call_args[0][0]
+        assert "--releasever=41" in cmd
+        assert cmd[cmd.index("--repo") + 1] == "updates"
+        assert "Indexed 1" in str(mock_console.print.call_args_list)
+
+    @pytest.mark.unit
+    def test_fails_when_dnf_returns_nothing(self, temp_cache_dir, mocker):
+        """Bad path: exits non-zero when no provides were found."""
+        mocker.patch("woolly.commands.refresh_index.console", MagicMock())
+        mocker.patch("subprocess.check_output", return_value=b"")
+
+        with pytest.raises(SystemExit) as exc_info:
+            refresh_index_cmd(lang="rust")
+
+        assert exc_info.value.code == 1
+
+    @pytest.mark.unit
+    def test_indexes_local_repodata(self, temp_cache_dir, make_repodata, mocker):
+        """Good path: --repodata builds the index without running dnf."""
+        mock_console = MagicMock()
+        mocker.patch("woolly.commands.refresh_index.console", mock_console)
+        mock_check_output = mocker.patch("subprocess.check_output")
+
+        refresh_index_cmd(lang="rust", repodata=(str(make_repodata()),))
+
+        mock_check_output.assert_not_called()
+        assert "Indexed 3" in str(mock_console.print.call_args_list)
+
+    @pytest.mark.unit
+    def test_bad_repodata_exits(self, temp_cache_dir, tmp_path, mocker):
+        """Bad path: unreadable repodata exits non-zero."""
+        mocker.patch("woolly.commands.refresh_index.console", MagicMock())
+
+        with pytest.raises(SystemExit):
+            refresh_index_cmd(lang="rust", repodata=(str(tmp_path),))
+
+    @pytest.mark.unit
+    def test_unknown_language(self, mocker):
+        """Bad path: exits for an unknown language."""
+        mocker.patch("woolly.commands.refresh_index.console", MagicMock())
+
+        with pytest.raises(SystemExit):
+            refresh_index_cmd(lang="cobol")
@@ -0,0 +1,125 @@
+"""
+Unit tests for woolly.fedora.index module.
+
+Tests cover:
+- Good path: parsing repoquery records, index lookups
+- Critical path: continuation lines, versioned provides
+- Bad path: unknown names, output without provides
+"""
+
+import pytest
+
+from woolly.fedora import ProvidesIndex, parse_fedora_record, parse_provides_records
+
+DUMP = (
+    "rust-serde|1.0.200|crate(serde) = 1.0.200\n"
+    "crate(serde/default) = 1.0.200\n"
+    "rust-serde+derive-devel|1.0.200|crate(serde/derive) = 1.0.200\n"
+    "rust-syn1|1.0.109|crate(syn) = 1.0.109\n"
+    "rust-syn|2.0.60|crate(syn) = 2.0.60\n"
+    "rust-syn|2.0.60|rust-syn = 2.0.60"
+)
+
+
+class TestParseProvidesRecords:
+    """Tests for parse_provides_records function."""
+
+    @pytest.mark.unit
+    def test_parses_first_provide_on_record_line(self):
+        """Good path: the provide after NAME|VERSION is parsed."""
+        records = list(parse_provides_records(DUMP, "crate"))
+
+        name, record = records[0]
+        assert name == "serde"
+        assert record.package == "rust-serde"
+        assert record.package_version == "1.0.200"
+        assert record.provided_version == "1.0.200"
+
+    @pytest.mark.unit
+    def test_continuation_lines_belong_to_previous_record(self):
+        """Critical path: extra provides lines keep the package of their record."""
+        records = dict(parse_provides_records(DUMP, "crate"))
+
+        assert records["serde/default"].package == "rust-serde"
+
+    @pytest.mark.unit
+    def test_ignores_other_prefixes(self):
+        """Bad path: provides outside the prefix are skipped."""
+        names = [name for name, _ in parse_provides_records(DUMP, "crate")]
+
+        assert "rust-syn" not in names
+        assert names.count("syn") == 2
+
+    @pytest.mark.unit
+    def test_plain_name_version_lines_have_no_provides(self):
+        """Bad path: NAME|VERSION lines yield nothing on their own."""
+        assert list(parse_provides_records("rust-foo|1.0.0", "crate")) == []
+
+
+class TestProvidesIndex:
+    """Tests for ProvidesIndex model."""
+
+    @pytest.mark.unit
+    def test_lookup_packages(self):
+        """Good path: packages and versions providing a name."""
+        index = ProvidesIndex.from_repoquery_output("crate", DUMP)
+
+        assert index.lookup_packages("syn") == (
+            True,
+            ["1.0.109", "2.0.60"],
+            ["rust-syn", "rust-syn1"],
+        )
+
+    @pytest.mark.unit
+    def test_lookup_provided_versions(self):
+        """Good path: versions of the provide itself."""
+        index = ProvidesIndex.from_repoquery_output("crate", DUMP)
+
+        assert index.lookup_provided_versions("syn") == ["1.0.109", "2.0.60"]
+
+    @pytest.mark.unit
+    def test_unknown_name(self):
+        """Bad path: names without a provide are not packaged."""
+        index = ProvidesIndex.from_repoquery_output("crate", DUMP)
+
+        assert index.lookup_packages("tokio") == (False, [], [])
+        assert index.lookup_provided_versions("tokio") == []
+
+    @pytest.mark.unit
+    def test_round_trips_through_json(self):
+        """Critical path: the index survives the cache's JSON encoding."""
+        index = ProvidesIndex.from_repoquery_output("crate", DUMP)
+
+        restored = ProvidesIndex.model_validate(index.model_dump(mode="json"))
+
+        assert restored == index
+        assert len(restored) == 4
+
+
+class TestParseFedoraRecord:
+    """Tests for parse_fedora_record function."""
+
+    @pytest.mark.unit
+    def test_combines_packages_and_provides(self):
+        """Good path: one output yields packages, versions and provides."""
+        out = "\n".join(DUMP.split("\n")[3:5])
+
+        record = parse_fedora_record(out, "crate", "syn")
+
+        assert record.is_packaged is True
+        assert record.package_names == ["rust-syn", "rust-syn1"]
+        assert record.package_versions == ["1.0.109", "2.0.60"]
+        assert record.provided_versions == ["1.0.109", "2.0.60"]
+
+    @pytest.mark.unit
+    def test_plain_lines_count_as_packaged(self):
+        """Critical path: NAME|VERSION lines still mark the package as shipped."""
+        record = parse_fedora_record("rust-foo|1.0.0", "crate", "foo")
+
+        assert record.as_repoquery() == (True, ["1.0.0"], ["rust-foo"])
+        assert record.provided_versions == []
+
+    @pytest.mark.unit
+    def test_empty_output(self):
+        """Bad path: no output means not packaged."""
+        assert parse_fedora_record("", "crate", "foo").is_packaged is False
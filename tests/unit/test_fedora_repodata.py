@@ -0,0 +1,271 @@
+"""
+Unit tests for woolly.fedora.repodata and the repodata backend.
+
+Tests cover:
+- Good path: reading XML (plain, gzip, zstd) and SQLite primary metadata
+- Critical path: lookups served from repodata without running dnf
+- Bad path: missing or malformed repodata, remote URLs
+"""
+
+import subprocess
+import time
+
+import pytest
+
+from woolly.cache import FEDORA_CACHE_TTL, CacheEntry, get_cache_backend
+from woolly.fedora import RepodataBackend, RepodataError, read_repodata_index
+from woolly.fedora.backends import parse_repoinfo_revisions
+from woolly.fedora.repodata import (
+    find_repomd,
+    read_repomd_revision,
+    resolve_repo_path,
+)
+from woolly.languages.rust import RustProvider
+
+DNF4_REPOINFO = """\
+Repo-id            : fedora
+Repo-name          : Fedora 41 - x86_64
+Repo-revision      : 1729000000
+Repo-updated       : Tue 15 Oct 2024 12:00:00 PM UTC
+
+Repo-id            : updates
+Repo-name          : Fedora 41 - x86_64 - Updates
+Repo-revision      : 1739000000
+"""
+
+DNF5_REPOINFO = """\
+Repo ID              : fedora
+Name                 : Fedora 41 - x86_64
+Revision             : 1729000000
+"""
+
+
+class TestResolveRepoPath:
+    """Tests for repository location handling."""
+
+    @pytest.mark.unit
+    def test_accepts_file_url(self, tmp_path):
+        """Good path: file:// URLs map to local paths."""
+        assert resolve_repo_path(f"file://{tmp_path}") == tmp_path
+
+    @pytest.mark.unit
+    def test_rejects_remote_url(self):
+        """Bad path: http(s) locations are not read."""
+        with pytest.raises(RepodataError, match="file://"):
+            resolve_repo_path("https://example.com/repo")
+
+    @pytest.mark.unit
+    def test_finds_repomd_from_any_level(self, make_repodata):
+        """Good path: repo root, repodata dir and repomd.xml all work."""
+        root = make_repodata()
+        expected = root / "repodata" / "repomd.xml"
+
+        assert find_repomd(str(root)) == expected
+        assert find_repomd(str(root / "repodata")) == expected
+        assert find_repomd(str(expected)) == expected
+
+    @pytest.mark.unit
+    def test_missing_repomd(self, tmp_path):
+        """Bad path: directories without repodata are reported."""
+        with pytest.raises(RepodataError, match="repomd.xml"):
+            find_repomd(str(tmp_path))
+
+
+class TestReadRepodataIndex:
+    """Tests for read_repodata_index function."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("fmt", ["xml", "xml.gz", "xml.zst", "sqlite"])
+    def test_reads_every_format(self, make_repodata, fmt):
+        """Good path: every primary flavour yields the same index."""
+        root = make_repodata(fmt)
+
+        index = read_repodata_index([str(root)], "crate")
+
+        assert index.lookup_packages("serde") == (True, ["1.0.200"], ["rust-serde"])
+        assert index.lookup_provided_versions("syn") == ["1.0.109", "2.0.60"]
+        assert sorted(index.entries) == ["serde", "serde/default", "syn"]
+
+    @pytest.mark.unit
+    def test_skips_source_packages(self, make_repodata):
+        """Critical path: src.rpm provides are not reported as packaged."""
+        index = read_repodata_index([str(make_repodata())], "crate")
+
+        assert index.lookup_packages("tokio") == (False, [], [])
+
+    @pytest.mark.unit
+    def test_merges_several_repos(self, make_repodata):
+        """Good path: provides of all given repos are merged."""
+        base = make_repodata(name="fedora")
+        updates = make_repodata(
+            name="updates",
+            packages=[
+                ("rust-serde", "noarch", "1.0.210", [("crate(serde)", "1.0.210")])
+            ],
+        )
+
+        index = read_repodata_index([str(base), f"file://{updates}"], "crate")
+
+        assert index.lookup_packages("serde")[1] == ["1.0.200", "1.0.210"]
+
+    @pytest.mark.unit
+    def test_malformed_primary(self, make_repodata):
+        """Bad path: broken XML raises RepodataError."""
+        root = make_repodata("xml")
+        (root / "repodata" / "abc-primary.xml").write_text("<metadata><package>")
+
+        with pytest.raises(RepodataError, match="Malformed"):
+            read_repodata_index([str(root)], "crate")
+
+
+class TestRepodataBackend:
+    """Tests for providers using the repodata backend."""
+
+    @pytest.mark.unit
+    def test_lookups_never_run_dnf(self, temp_cache_dir, make_repodata, mocker):
+        """Critical path: packaging checks are answered from repodata."""
+        provider = RustProvider()
+        provider.fedora_backend = RepodataBackend([str(make_repodata())])
+        mock_check_output = mocker.patch("subprocess.check_output")
+
+        status = provider.check_fedora_packaging("serde")
+
+        assert status.is_packaged is True
+        assert status.package_names == ["rust-serde"]
+        assert provider.check_fedora_packaging("tokio").is_packaged is False
+        mock_check_output.assert_not_called()
+
+    @pytest.mark.unit
+    def test_index_cached_per_repodata(self, temp_cache_dir, make_repodata, mocker):
+        """Good path: the parsed index is cached separately per repo set."""
+        root = make_repodata()
+        provider = RustProvider()
+        provider.fedora_backend = RepodataBackend([str(root)])
+        provider.load_fedora_index()
+
+        read = mocker.patch("woolly.fedora.backends.read_repodata_index")
+        other = RustProvider()
+        other.fedora_backend = RepodataBackend([str(root)])
+        assert other.load_fedora_index() is not None
+        read.assert_not_called()
+
+        assert RustProvider().load_fedora_index() is None
+
+    @pytest.mark.unit
+    def test_default_backend_still_uses_dnf(self, temp_cache_dir, mocker):
+        """Good path: without repodata the dnf subprocess path is unchanged."""
+        mock_check_output = mocker.patch(
+            "subprocess.check_output", return_value=b"rust-serde|1.0.200"
+        )
+
+        assert RustProvider()._repoquery_package("serde")[0] is True
+        assert mock_check_output.call_count == 1
+
+    @pytest.mark.unit
+    def test_empty_repodata_marks_all_missing(self, temp_cache_dir, make_repodata):
+        """Bad path: a repo without matching provides packages nothing."""
+        provider = RustProvider()
+        provider.fedora_backend = RepodataBackend([str(make_repodata(packages=[]))])
+
+        assert provider._repoquery_package("serde") == (False, [], [])
+
+    @pytest.mark.unit
+    def test_unreadable_repodata_raises(self, temp_cache_dir, tmp_path, mocker):
+        """Bad path: errors surface instead of silently falling back to dnf."""
+        provider = RustProvider()
+        provider.fedora_backend = RepodataBackend([str(tmp_path / "missing")])
+        mocker.patch(
+            "subprocess.check_output",
+            side_effect=subprocess.CalledProcessError(1, "dnf"),
+        )
+
+        with pytest.raises(RepodataError):
+            provider._repoquery_package("serde")
+
+
+class TestMetadataRevision:
+    """Tests for keying Fedora answers by repository metadata revision."""
+
+    @pytest.mark.unit
+    def test_reads_repomd_revision(self, make_repodata):
+        """Good path: the <revision> element identifies the metadata."""
+        repomd = find_repomd(str(make_repodata()))
+
+        assert read_repomd_revision(repomd) == "1700000000"
+
+    @pytest.mark.unit
+    def test_checksum_without_revision(self, make_repodata):
+        """Critical path: metadata without <revision> is identified by checksum."""
+        repomd = find_repomd(str(make_repodata()))
+        repomd.write_text(repomd.read_text().replace("1700000000", ""))
+
+        assert read_repomd_revision(repomd).startswith("sha256:")
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("output", [DNF4_REPOINFO, DNF5_REPOINFO])
+    def test_parses_repoinfo(self, output):
+        """Good path: dnf4 and dnf5 repoinfo output are both understood."""
+        revisions = parse_repoinfo_revisions(output)
+
+        assert revisions["fedora"] == "1729000000"
+
+    @pytest.mark.unit
+    def test_new_revision_changes_cache_key(self, temp_cache_dir, make_repodata):
+        """Critical path: republished metadata is looked up under a new key."""
+        root = make_repodata()
+        provider = RustProvider()
+        provider.fedora_backend = RepodataBackend([str(root)])
+        before = provider._fedora_cache_key("record", "serde")
+
+        repomd = find_repomd(str(root))
+        repomd.write_text(repomd.read_text().replace("1700000000", "1800000000"))
+        other = RustProvider()
+        other.fedora_backend = RepodataBackend([str(root)])
+
+        assert "rev=" in before
+        assert other._fedora_cache_key("record", "serde") != before
+
+    @pytest.mark.unit
+    def test_answers_outlive_fixed_ttl(self, temp_cache_dir, mocker):
+        """Good path: answers for an unchanged revision skip the daily expiry."""
+        provider = RustProvider()
+        mocker.patch.object(provider, "fedora_metadata_revision", return_value="abc")
+        cache_key = provider._fedora_cache_key("record", "serde")
+        get_cache_backend().write_entry(
+            "fedora",
+            cache_key,
+            CacheEntry(
+                value={"is_packaged": True, "package_names": ["rust-serde"]},
+                timestamp=time.time() - 2 * FEDORA_CACHE_TTL,
+            ),
+        )
+        mock_check_output = mocker.patch("subprocess.check_output")
+
+        assert provider.check_fedora_packaging("serde").is_packaged is True
+        mock_check_output.assert_not_called()
+
+    @pytest.mark.unit
+    def test_dnf_repoinfo_checked_once(self, temp_cache_dir, mocker, dnf_revision):
+        """Critical path: dnf is asked for the revision once, then cached."""
+        mock_check_output = mocker.patch(
+            "subprocess.check_output", return_value=DNF4_REPOINFO.encode()
+        )
+
+        revision = RustProvider().fedora_metadata_revision()
+
+        assert revision is not None
+        assert RustProvider().fedora_metadata_revision() == revision
+        assert mock_check_output.call_count == 1
+        assert mock_check_output.call_args.args[0] == ["dnf", "repoinfo"]
+
+    @pytest.mark.unit
+    def test_dnf_without_revision_keeps_ttl(self, temp_cache_dir, mocker, dnf_revision):
+        """Bad path: no revision from dnf leaves the key unchanged."""
+        mocker.patch(
+            "subprocess.check_output",
+            side_effect=subprocess.CalledProcessError(1, "dnf"),
+        )
+        provider = RustProvider()
+
+        assert provider.fedora_metadata_revision() is None
+        assert provider._fedora_cache_suffix() == ""
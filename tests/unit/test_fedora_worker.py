@@ -0,0 +1,226 @@
+"""
+Unit tests for woolly.fedora.worker and woolly.fedora.pool modules.
+
+Tests cover:
+- Good path: line protocol, pooled queries over real pipes
+- Critical path: provider queries routed through the pool
+- Bad path: missing bindings, worker failures, fallback to dnf
+"""
+
+import io
+import sys
+import textwrap
+
+import pytest
+
+from woolly.fedora import pool as pool_mod
+from woolly.fedora.pool import DnfWorkerError, DnfWorkerPool
+from woolly.fedora.worker import handle_request, main, serve
+from woolly.languages.rust import RustProvider
+
+PACKAGES = [
+    ("rust-serde", "1.0.200", ["crate(serde) = 1.0.200", "rust-serde = 1.0.200"]),
+    ("rust-serde1", "1.0.100", ["crate(serde) = 1.0.100"]),
+]
+
+
+def fake_query(patterns):
+    return [pkg for pkg in PACKAGES if any(p in pkg[2][0] for p in patterns)]
+
+
+# A worker process answering from PACKAGES instead of real dnf metadata
+FAKE_WORKER = textwrap.dedent(
+    """
+    import sys
+    from woolly.fedora.worker import serve
+    packages = {packages!r}
+    def query(patterns):
+        return [p for p in packages if any(x in p[2][0] for x in patterns)]
+    print("READY fake", flush=True)
+    serve(query, sys.stdin, sys.stdout, {idle!r})
+    """
+)
+
+
+@pytest.fixture
+def fake_workers(mocker):
+    """Make pools spawn FAKE_WORKER processes; returns the spawn spy."""
+
+    def _command(release, repos, idle_timeout):
+        code = FAKE_WORKER.format(packages=PACKAGES, idle=idle_timeout)
+        return [sys.executable, "-c", code]
+
+    return mocker.patch.object(pool_mod, "_worker_command", side_effect=_command)
+
+
+class TestWorkerProtocol:
+    """Tests for the worker's request handling."""
+
+    @pytest.mark.unit
+    def test_whatprovides_lines(self):
+        """Good path: NAME|VERSION lines like the dnf queryformat."""
+        assert handle_request(fake_query, "whatprovides crate(serde)") == [
+            "OK 2",
+            "rust-serde|1.0.200",
+            "rust-serde1|1.0.100",
+        ]
+
+    @pytest.mark.unit
+    def test_provides_lines(self):
+        """Good path: every provide of the matching packages."""
+        lines = handle_request(fake_query, "provides crate(serde)")
+
+        assert lines[0] == "OK 3"
+        assert "crate(serde) = 1.0.100" in lines
+
+    @pytest.mark.unit
+    def test_records_lines(self):
+        """Good path: NAME|VERSION|PROVIDES records with continuation lines."""
+        lines = handle_request(fake_query, "records crate(serde)")
+
+        assert lines[1:3] == [
+            "rust-serde|1.0.200|crate(serde) = 1.0.200",
+            "rust-serde = 1.0.200",
+        ]
+
+    @pytest.mark.unit
+    def test_unknown_verb(self):
+        """Bad path: unknown verbs are reported, not fatal."""
+        assert handle_request(fake_query, "remove foo")[0].startswith("ERR")
+
+    @pytest.mark.unit
+    def test_query_errors_are_reported(self):
+        """Bad path: a failing query answers ERR and the worker keeps going."""
+
+        def broken(patterns):
+            raise RuntimeError("boom")
+
+        stdin = io.StringIO("whatprovides a\nwhatprovides b\n")
+        stdout = io.StringIO()
+        serve(broken, stdin, stdout)
+
+        assert stdout.getvalue().count("ERR RuntimeError: boom") == 2
+
+    @pytest.mark.unit
+    def test_main_without_bindings(self, mocker, capsys):
+        """Bad path: the worker exits with ERR when no bindings import."""
+
+        def missing(releasever, repos):
+            raise ImportError
+
+        mocker.patch(
+            "woolly.fedora.worker._LOADERS",
+            [("libdnf5", missing), ("dnf", missing)],
+        )
+
+        assert main([]) == 1
+        assert capsys.readouterr().out.startswith("ERR")
+
+
+class TestDnfWorkerPool:
+    """Tests for DnfWorkerPool using real worker processes."""
+
+    @pytest.mark.unit
+    def test_reuses_one_worker(self, fake_workers):
+        """Critical path: sequential queries share one loaded worker."""
+        pool = DnfWorkerPool(size=2)
+        try:
+            assert pool.query("whatprovides", ["crate(serde)"]).startswith(
+                "rust-serde|"
+            )
+            assert pool.query("whatprovides", ["crate(tokio)"]) == ""
+        finally:
+            pool.shutdown()
+
+        assert fake_workers.call_count == 1
+
+    @pytest.mark.unit
+    def test_respawns_after_idle_exit(self, fake_workers):
+        """Good path: a worker that idled out is replaced transparently."""
+        pool = DnfWorkerPool(size=1, idle_timeout=0.05)
+        try:
+            pool.query("whatprovides", ["crate(serde)"])
+            pool._idle[0].process.wait(timeout=5)
+            assert pool.query("whatprovides", ["crate(serde)"])
+        finally:
+            pool.shutdown()
+
+        assert fake_workers.call_count == 2
+
+    @pytest.mark.unit
+    def test_shutdown_stops_workers(self, fake_workers):
+        """Good path: shutdown reaps idle workers and refuses new queries."""
+        pool = DnfWorkerPool(size=1)
+        pool.query("whatprovides", ["crate(serde)"])
+        worker = pool._idle[0]
+
+        pool.shutdown()
+
+        assert not worker.alive
+        with pytest.raises(DnfWorkerError):
+            pool.query("whatprovides", ["crate(serde)"])
+
+    @pytest.mark.unit
+    def test_unavailable_when_worker_cannot_start(self, mocker):
+        """Bad path: a worker reporting ERR marks the pool unavailable."""
+        mocker.patch.object(
+            pool_mod,
+            "_worker_command",
+            return_value=[sys.executable, "-c", "print('ERR no bindings')"],
+        )
+        pool = DnfWorkerPool()
+
+        with pytest.raises(DnfWorkerError, match="no bindings"):
+            pool.query("whatprovides", ["crate(serde)"])
+        assert pool.unavailable == "no bindings"
+
+
+class TestProviderWorkerQueries:
+    """Tests for LanguageProvider queries through dnf workers."""
+
+    @pytest.mark.unit
+    def test_package_queries_use_workers(self, temp_cache_dir, fake_workers, mocker):
+        """Critical path: no dnf subprocess runs while workers answer."""
+        mock_check_output = mocker.patch("subprocess.check_output")
+        provider = RustProvider()
+        provider.dnf_workers = DnfWorkerPool(size=1)
+        try:
+            status = provider.check_fedora_packaging("serde")
+        finally:
+            provider.dnf_workers.shutdown()
+
+        assert status.is_packaged is True
+        assert status.versions == ["1.0.100", "1.0.200"]
+        assert status.package_names == ["rust-serde", "rust-serde1"]
+        mock_check_output.assert_not_called()
+
+    @pytest.mark.unit
+    def test_batch_queries_use_workers(self, temp_cache_dir, fake_workers, mocker):
+        """Good path: prefetching sends one records query to a worker."""
+        mock_check_output = mocker.patch("subprocess.check_output")
+        provider = RustProvider()
+        provider.dnf_workers = DnfWorkerPool(size=1)
+        try:
+            results = provider._repoquery_packages(["serde", "tokio"])
+        finally:
+            provider.dnf_workers.shutdown()
+
+        assert results["serde"][0] is True
+        assert results["tokio"] == (False, [], [])
+        mock_check_output.assert_not_called()
+
+    @pytest.mark.unit
+    def test_falls_back_to_dnf(self, temp_cache_dir, mocker):
+        """Bad path: unavailable workers fall back to dnf and are dropped."""
+        mock_check_output = mocker.patch(
+            "subprocess.check_output", return_value=b"rust-serde|1.0.200"
+        )
+        pool = mocker.MagicMock()
+        pool.query.side_effect = DnfWorkerError("no bindings")
+        pool.unavailable = "no bindings"
+        provider = RustProvider()
+        provider.dnf_workers = pool
+
+        assert provider._repoquery_package("serde")[0] is True
+        assert mock_check_output.call_count == 1
+        assert provider.dnf_workers is None
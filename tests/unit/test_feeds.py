@@ -0,0 +1,330 @@
+"""
+Unit tests for woolly.feeds module.
+
+Tests cover:
+- Good path: reading changes from the PyPI, crates.io and local feeds
+- Critical path: syncing state, feed-driven TTLs in providers
+- Bad path: feed gaps, unreadable feeds
+"""
+
+import json
+import time
+import xmlrpc.client
+
+import httpx
+import pytest
+
+from woolly.cache import (
+    DEFAULT_CACHE_TTL,
+    CacheEntry,
+    get_cache_backend,
+    write_cache,
+)
+from woolly.feeds import (
+    CratesIoChangeFeed,
+    FeedError,
+    FeedGapError,
+    FeedState,
+    FileChangeFeed,
+    PyPIChangeFeed,
+    feed_invalidation_enabled,
+    read_feed_state,
+    sync_change_feed,
+)
+from woolly.languages.rust import RustProvider
+
+DAY = 86400
+
+
+@pytest.fixture
+def feed_file(tmp_path):
+    """Write a local change feed and return a function updating it."""
+    path = tmp_path / "feed.json"
+
+    def write(serial, changes=(), first_serial=0):
+        path.write_text(
+            json.dumps(
+                {
+                    "serial": serial,
+                    "first_serial": first_serial,
+                    "changes": [list(change) for change in changes],
+                }
+            )
+        )
+        return FileChangeFeed(path)
+
+    return write
+
+
+class TestFileChangeFeed:
+    """Tests for the local stand-in feed."""
+
+    @pytest.mark.unit
+    def test_changes_since(self, feed_file):
+        """Good path: only changes after the cursor are reported."""
+        feed = feed_file(3, [(1, "old"), (2, "serde"), (3, "tokio"), (3, "serde")])
+
+        changes = feed.changes_since("1")
+
+        assert changes.names == ["serde", "tokio"]
+        assert changes.cursor == "3"
+        assert feed.latest_cursor() == "3"
+
+    @pytest.mark.unit
+    def test_gap(self, feed_file):
+        """Bad path: a cursor older than the feed raises FeedGapError."""
+        feed = feed_file(10, first_serial=5)
+
+        with pytest.raises(FeedGapError):
+            feed.changes_since("2")
+
+    @pytest.mark.unit
+    def test_missing_file(self, tmp_path):
+        """Bad path: an unreadable feed raises FeedError."""
+        with pytest.raises(FeedError):
+            FileChangeFeed(tmp_path / "missing.json").latest_cursor()
+
+
+class TestPyPIChangeFeed:
+    """Tests for the PyPI changelog feed."""
+
+    @pytest.mark.unit
+    def test_changes_since_serial(self, mocker):
+        """Good path: changelog events are read through XML-RPC."""
+        events = [
+            ("Django", "5.0", 1700000000, "new release", 101),
+            ("requests", "2.32", 1700000001, "add file", 103),
+        ]
+        body = xmlrpc.client.dumps((events,), methodresponse=True)
+        mock_post = mocker.patch(
+            "woolly.http.post",
+            return_value=httpx.Response(200, content=body.encode()),
+        )
+
+        changes = PyPIChangeFeed().changes_since("100")
+
+        assert changes.names == ["Django", "requests"]
+        assert changes.cursor == "103"
+        assert b"changelog_since_serial" in mock_post.call_args.kwargs["content"]
+
+    @pytest.mark.unit
+    def test_last_serial_header_advances_cursor(self, mocker):
+        """Critical path: an empty changelog still moves to X-PyPI-Last-Serial."""
+        body = xmlrpc.client.dumps(([],), methodresponse=True)
+        mocker.patch(
+            "woolly.http.post",
+            return_value=httpx.Response(
+                200, content=body.encode(), headers={"X-PyPI-Last-Serial": "120"}
+            ),
+        )
+
+        changes = PyPIChangeFeed().changes_since("100")
+
+        assert changes.names == []
+        assert changes.cursor == "120"
+
+    @pytest.mark.unit
+    def test_normalizes_names(self):
+        """Good path: names are compared in their PEP 503 form."""
+        assert PyPIChangeFeed().normalize("Foo_Bar.baz") == "foo-bar-baz"
+
+    @pytest.mark.unit
+    def test_http_error(self, mocker):
+        """Bad path: a failed request raises FeedError."""
+        mocker.patch("woolly.http.post", side_effect=httpx.ConnectError("offline"))
+
+        with pytest.raises(FeedError):
+            PyPIChangeFeed().latest_cursor()
+
+
+class TestCratesIoChangeFeed:
+    """Tests for the crates.io recent-updates feed."""
+
+    @staticmethod
+    def _pages(mocker, pages):
+        def get(url, **kwargs):
+            page = int(url.rsplit("=", 1)[1])
+            crates = pages[page - 1] if page <= len(pages) else []
+            return httpx.Response(200, json={"crates": crates})
+
+        return mocker.patch("woolly.http.get", side_effect=get)
+
+    @pytest.mark.unit
+    def test_changes_since(self, mocker):
+        """Good path: pages are read until a crate older than the cursor."""
+        self._pages(
+            mocker,
+            [
+                [
+                    {"name": "tokio", "updated_at": "2025-01-03T00:00:00+00:00"},
+                    {"name": "serde", "updated_at": "2025-01-02T00:00:00+00:00"},
+                ],
+                [
+                    {"name": "rand", "updated_at": "2025-01-01T12:00:00Z"},
+                    {"name": "old", "updated_at": "2025-01-01T00:00:00+00:00"},
+                ],
+            ],
+        )
+
+        changes = CratesIoChangeFeed().changes_since("2025-01-01T00:00:00+00:00")
+
+        assert changes.names == ["rand", "serde", "tokio"]
+        assert changes.cursor == "2025-01-03T00:00:00+00:00"
+
+    @pytest.mark.unit
+    def test_gap(self, mocker):
+        """Bad path: more changes than max_pages raise FeedGapError."""
+        self._pages(
+            mocker, [[{"name": "a", "updated_at": "2025-01-03T00:00:00+00:00"}]] * 3
+        )
+
+        with pytest.raises(FeedGapError):
+            CratesIoChangeFeed(max_pages=2).changes_since("2025-01-01T00:00:00+00:00")
+
+    @pytest.mark.unit
+    def test_normalizes_names(self):
+        """Good path: hyphens and underscores name the same crate."""
+        assert CratesIoChangeFeed().normalize("Serde_JSON") == "serde-json"
+
+
+class TestSyncChangeFeed:
+    """Tests for syncing the stored invalidation state."""
+
+    @pytest.mark.unit
+    def test_first_sync_starts_baseline(self, temp_cache_dir, feed_file):
+        """Good path: the first sync records the cursor and invalidates nothing."""
+        state = sync_change_feed("crates", feed_file(5, [(5, "serde")]))
+
+        assert state.cursor == "5"
+        assert state.invalidated == {}
+        assert read_feed_state("crates") == state
+
+    @pytest.mark.unit
+    def test_later_sync_records_changes(self, temp_cache_dir, feed_file):
+        """Critical path: changed packages are recorded and the cursor advances."""
+        sync_change_feed("crates", feed_file(5))
+
+        state = sync_change_feed("crates", feed_file(7, [(6, "Serde"), (7, "tokio")]))
+
+        assert state.cursor == "7"
+        assert set(state.invalidated) == {"serde", "tokio"}
+
+    @pytest.mark.unit
+    def test_gap_starts_new_baseline(self, temp_cache_dir, feed_file):
+        """Bad path: a gap drops the recorded changes and starts over."""
+        sync_change_feed("crates", feed_file(5))
+        sync_change_feed("crates", feed_file(6, [(6, "serde")]))
+
+        state = sync_change_feed("crates", feed_file(20, first_serial=10))
+
+        assert state.cursor == "20"
+        assert state.invalidated == {}
+
+    @pytest.mark.unit
+    def test_feed_error_keeps_state(self, temp_cache_dir, feed_file, tmp_path):
+        """Bad path: an unreadable feed raises and leaves the state alone."""
+        before = sync_change_feed("crates", feed_file(5))
+
+        with pytest.raises(FeedError):
+            sync_change_feed("crates", FileChangeFeed(tmp_path / "feed.json.bak"))
+
+        assert read_feed_state("crates") == before
+
+
+class TestFeedState:
+    """Tests for feed-driven TTLs."""
+
+    @pytest.mark.unit
+    def test_ttl(self):
+        """Critical path: only entries written before a change expire."""
+        now = 1000 * DAY
+        state = FeedState(
+            feed="file",
+            cursor="1",
+            baseline=now - 30 * DAY,
+            invalidated={"serde": now - DAY},
+        )
+
+        assert state.ttl("tokio", now) == 30 * DAY
+        assert state.ttl("serde", now) == DAY
+
+    @pytest.mark.unit
+    def test_recent_baseline_keeps_default_ttl(self):
+        """Good path: entries older than the baseline keep the fixed TTL."""
+        state = FeedState(feed="file", cursor="1", baseline=100.0)
+
+        assert state.ttl("tokio", 200.0) == DEFAULT_CACHE_TTL
+
+    @pytest.mark.unit
+    def test_disabled_by_default(self, temp_cache_dir, monkeypatch):
+        """Good path: feed invalidation is off unless enabled."""
+        assert feed_invalidation_enabled() is False
+
+        monkeypatch.setenv("WOOLLY_CACHE_FEED", "1")
+
+        assert feed_invalidation_enabled() is True
+
+
+class TestProviderChangeFeed:
+    """Tests for feed-driven invalidation of provider entries."""
+
+    @pytest.fixture
+    def provider(self, temp_cache_dir, feed_file):
+        """A Rust provider whose feed reports serde changed after the baseline."""
+        write_cache(
+            "feeds",
+            "crates",
+            FeedState(feed="file", cursor="1", baseline=time.time() - 60 * DAY),
+        )
+        provider = RustProvider()
+        provider.change_feed = feed_file(2, [(2, "serde")])
+        return provider
+
+    def _cache_info(self, provider, name, age):
+        key = provider._cache_key("info", name)
+        get_cache_backend().write_entry(
+            "crates",
+            key,
+            CacheEntry(
+                value={"crate": {"name": name, "newest_version": "1.0.0"}},
+                timestamp=time.time() - age,
+            ),
+        )
+
+    @pytest.mark.unit
+    def test_unchanged_package_outlives_ttl(self, provider, mocker):
+        """Good path: an old entry of an unchanged crate is still fresh."""
+        state = provider.apply_change_feed()
+        self._cache_info(provider, "tokio", 30 * DAY)
+        mock_get = mocker.patch("woolly.http.get")
+
+        assert state.invalidated.keys() == {"serde"}
+        assert provider.fetch_package_info("tokio").latest_version == "1.0.0"
+        mock_get.assert_not_called()
+
+    @pytest.mark.unit
+    def test_changed_package_is_refetched(
+        self, provider, mocker, make_httpx_response, mock_crates_io_response
+    ):
+        """Critical path: an entry written before its crate changed expires."""
+        self._cache_info(provider, "serde", 60)
+        provider.apply_change_feed()
+        mock_get = mocker.patch(
+            "woolly.http.get",
+            return_value=make_httpx_response(200, mock_crates_io_response),
+        )
+
+        provider.fetch_package_info("serde")
+
+        mock_get.assert_called_once()
+
+    @pytest.mark.unit
+    def test_without_feed_uses_fixed_ttl(self, provider, mocker):
+        """Bad path: without applying the feed, old entries expire as before."""
+        self._cache_info(provider, "tokio", 30 * DAY)
+        mock_get = mocker.patch(
+            "woolly.http.get", return_value=httpx.Response(404, json={})
+        )
+
+        assert provider.fetch_package_info("tokio") is None
+        mock_get.assert_called_once()
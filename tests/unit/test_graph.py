@@ -0,0 +1,76 @@
+"""
+Unit tests for woolly.graph module.
+
+Tests cover:
+- Good path: adding nodes and edges, adjacency lookups
+- Critical path: edge statuses, round-tripping through JSON
+- Bad path: empty graphs
+"""
+
+import pytest
+
+from woolly.graph import DependencyEdge, DependencyGraph, PackageNode, ReleaseStatus
+
+
+class TestDependencyGraph:
+    """Tests for DependencyGraph model."""
+
+    @pytest.mark.unit
+    def test_children_preserve_insertion_order(self, sample_graph):
+        """Good path: children are returned in dependency order."""
+        children = sample_graph.children("root-package")
+
+        assert [edge.child for edge in children] == ["dep-b", "dep-a"]
+
+    @pytest.mark.unit
+    def test_root_edge(self, sample_graph):
+        """Good path: the root edge has no parent."""
+        assert sample_graph.root_edge.child == "root-package"
+        assert sample_graph.root_edge.parent is None
+
+    @pytest.mark.unit
+    def test_status_for_each_edge_kind(self, sample_graph):
+        """Critical path: status is derived from edge kind and node fields."""
+        sample_graph.add_node(PackageNode(name="gone", found=False))
+
+        def status(**kwargs):
+            return sample_graph.status(DependencyEdge(**kwargs))
+
+        assert status(child="dep-a") == "packaged"
+        assert status(child="dep-b") == "not_packaged"
+        assert status(child="gone") == "not_found"
+        assert status(child="dep-a", kind="visited") == "visited"
+        assert status(child="deep", kind="max_depth") == "max_depth_reached"
+
+    @pytest.mark.unit
+    def test_round_trips_through_json(self, sample_graph):
+        """Critical path: adjacency is rebuilt when loading a dumped graph."""
+        loaded = DependencyGraph.model_validate_json(sample_graph.model_dump_json())
+
+        assert loaded.root_edge.child == "root-package"
+        assert [e.child for e in loaded.children("root-package")] == [
+            "dep-b",
+            "dep-a",
+        ]
+
+    @pytest.mark.unit
+    def test_release_statuses_round_trip(self, sample_graph):
+        """Critical path: per-release statuses survive a JSON round trip."""
+        sample_graph.releases = ["41", "42"]
+        sample_graph.nodes["dep-a"].releases["42"] = ReleaseStatus(
+            is_packaged=True, versions=["2.0.0"]
+        )
+
+        loaded = DependencyGraph.model_validate_json(sample_graph.model_dump_json())
+
+        assert loaded.releases == ["41", "42"]
+        assert loaded.nodes["dep-a"].releases["42"].versions == ["2.0.0"]
+        assert loaded.nodes["dep-b"].releases == {}
+
+    @pytest.mark.unit
+    def test_empty_graph(self):
+        """Bad path: an empty graph has no root edge or children."""
+        graph = DependencyGraph(root="nothing")
+
+        assert graph.root_edge is None
+        assert graph.children("nothing") == []
@@ -7,6 +7,7 @@ Tests cover:
 - Bad path: missing packages, subprocess failures
 """
 
+import asyncio
 import subprocess
 
 import pytest
@@ -421,6 +422,222 @@ class TestLanguageProviderRepoqueryPackage:
         assert mock_check_output.call_count == 2
 
 
+class TestLanguageProviderRepoqueryPackages:
+    """Tests for the batched LanguageProvider._repoquery_packages method."""
+
+    BATCH_OUTPUT = (
+        b"rust-foo|1.2.0|test(foo) = 1.2.0\n"
+        b"test(foo/default) = 1.2.0\n"
+        b"rust-foo+std-devel|1.2.0|test(foo/std) = 1.2.0\n"
+        b"rust-bar|0.3.1|test(bar) = 0.3.1\n"
+        b"rust-bar0.2|0.2.9|test(bar) = 0.2.9"
+    )
+
+    @pytest.mark.unit
+    def test_single_dnf_call_for_many_names(self, temp_cache_dir, mocker):
+        """Good path: one repoquery with a --whatprovides per name."""
+        provider = ConcreteProvider()
+        mock_check_output = mocker.patch(
+            "subprocess.check_output", return_value=self.BATCH_OUTPUT
+        )
+
+        provider._repoquery_packages(["foo", "bar", "baz"])
+
+        assert mock_check_output.call_count == 1
+        cmd = mock_check_output.call_args[0][0]
+        assert cmd.count("--whatprovides") == 3
+        assert "test(baz)" in cmd
+
+    @pytest.mark.unit
+    def test_maps_output_back_to_names(self, temp_cache_dir, mocker):
+        """Critical path: each record is attributed to the name it provides."""
+        provider = ConcreteProvider()
+        mocker.patch("subprocess.check_output", return_value=self.BATCH_OUTPUT)
+
+        results = provider._repoquery_packages(["foo", "bar", "baz"])
+
+        assert results["foo"] == (True, ["1.2.0"], ["rust-foo"])
+        assert results["bar"] == (True, ["0.2.9", "0.3.1"], ["rust-bar", "rust-bar0.2"])
+        assert results["baz"] == (False, [], [])
+
+    @pytest.mark.unit
+    def test_fills_single_package_cache(self, temp_cache_dir, mocker):
+        """Critical path: later single lookups are served from the cache."""
+        provider = ConcreteProvider()
+        mock_check_output = mocker.patch(
+            "subprocess.check_output", return_value=self.BATCH_OUTPUT
+        )
+
+        provider._repoquery_packages(["foo", "baz"])
+        assert provider._repoquery_package("foo") == (True, ["1.2.0"], ["rust-foo"])
+        assert provider._repoquery_package("baz") == (False, [], [])
+
+        assert mock_check_output.call_count == 1
+
+    @pytest.mark.unit
+    def test_skips_cached_names(self, temp_cache_dir, mocker):
+        """Good path: only uncached names are sent to dnf."""
+        provider = ConcreteProvider()
+        mock_check_output = mocker.patch(
+            "subprocess.check_output", return_value=self.BATCH_OUTPUT
+        )
+
+        provider._repoquery_packages(["foo"])
+        provider._repoquery_packages(["foo", "bar"])
+
+        cmd = mock_check_output.call_args[0][0]
+        assert "test(foo)" not in cmd
+        assert "test(bar)" in cmd
+
+    @pytest.mark.unit
+    def test_splits_large_batches(self, temp_cache_dir, mocker):
+        """Critical path: very long name lists are split into chunks."""
+        provider = ConcreteProvider()
+        mocker.patch("woolly.languages.base._DNF_BATCH_SIZE", 2)
+        mock_check_output = mocker.patch("subprocess.check_output", return_value=b"")
+
+        results = provider._repoquery_packages(["a", "b", "c", "d", "e"])
+
+        assert mock_check_output.call_count == 3
+        assert len(results) == 5
+
+    @pytest.mark.unit
+    def test_dnf_failure_marks_batch_not_packaged(self, temp_cache_dir, mocker):
+        """Bad path: a failing dnf run reports every name as not packaged."""
+        provider = ConcreteProvider()
+        mocker.patch(
+            "subprocess.check_output",
+            side_effect=subprocess.CalledProcessError(1, "dnf"),
+        )
+
+        results = provider._repoquery_packages(["foo", "bar"])
+
+        assert results == {"foo": (False, [], []), "bar": (False, [], [])}
+
+    @pytest.mark.unit
+    def test_prefetch_includes_alternative_names(self, temp_cache_dir, mocker):
+        """Good path: prefetch also queries the alternative names."""
+        provider = ConcreteProvider()
+        mocker.patch.object(provider, "get_alternative_names", return_value=["foo_alt"])
+        mock_check_output = mocker.patch("subprocess.check_output", return_value=b"")
+
+        provider.prefetch_fedora_packaging(["foo"])
+
+        cmd = mock_check_output.call_args[0][0]
+        assert "test(foo)" in cmd
+        assert "test(foo_alt)" in cmd
+
+    @pytest.mark.unit
+    def test_async_batch_matches_sync(self, temp_cache_dir, mocker):
+        """Good path: the async batch uses one subprocess and the same parser."""
+        provider = ConcreteProvider()
+        proc = mocker.AsyncMock()
+        proc.communicate.return_value = (self.BATCH_OUTPUT, b"")
+        proc.returncode = 0
+        create = mocker.patch(
+            "asyncio.create_subprocess_exec",
+            new_callable=mocker.AsyncMock,
+            return_value=proc,
+        )
+
+        results = asyncio.run(provider._arepoquery_packages(["foo", "bar"]))
+
+        assert create.await_count == 1
+        assert results["foo"] == (True, ["1.2.0"], ["rust-foo"])
+
+
+class TestLanguageProviderFedoraIndex:
+    """Tests for the local Fedora provides index."""
+
+    DUMP_OUTPUT = TestLanguageProviderRepoqueryPackages.BATCH_OUTPUT
+
+    @pytest.mark.unit
+    def test_refresh_runs_one_bulk_query(self, temp_cache_dir, mocker):
+        """Good path: the whole index is built with a single dnf call."""
+        provider = ConcreteProvider()
+        mock_check_output = mocker.patch(
+            "subprocess.check_output", return_value=self.DUMP_OUTPUT
+        )
+
+        index = provider.refresh_fedora_index()
+
+        assert mock_check_output.call_count == 1
+        assert "test(*)" in mock_check_output.call_args[0][0]
+        assert len(index) == 4
+
+    @pytest.mark.unit
+    def test_lookups_use_index_without_dnf(self, temp_cache_dir, mocker):
+        """Critical path: once built, lookups never spawn dnf."""
+        provider = ConcreteProvider()
+        mocker.patch("subprocess.check_output", return_value=self.DUMP_OUTPUT)
+        provider.refresh_fedora_index()
+
+        mock_check_output = mocker.patch("subprocess.check_output")
+        assert provider._repoquery_package("foo") == (True, ["1.2.0"], ["rust-foo"])
+        assert provider._repoquery_package("baz") == (False, [], [])
+        assert provider._get_provides_version("bar") == ["0.2.9", "0.3.1"]
+        assert provider._repoquery_packages(["foo", "baz"])["foo"][0] is True
+        mock_check_output.assert_not_called()
+
+    @pytest.mark.unit
+    def test_index_is_shared_through_cache(self, temp_cache_dir, mocker):
+        """Good path: a new provider instance loads the stored index."""
+        mocker.patch("subprocess.check_output", return_value=self.DUMP_OUTPUT)
+        ConcreteProvider().refresh_fedora_index()
+
+        mock_check_output = mocker.patch("subprocess.check_output")
+        assert ConcreteProvider()._repoquery_package("foo")[0] is True
+        mock_check_output.assert_not_called()
+
+    @pytest.mark.unit
+    def test_index_is_per_target(self, temp_cache_dir, mocker):
+        """Critical path: an index for one release is not used for another."""
+        provider = ConcreteProvider()
+        provider.fedora_release = "41"
+        mocker.patch("subprocess.check_output", return_value=self.DUMP_OUTPUT)
+        provider.refresh_fedora_index()
+
+        other = ConcreteProvider()
+        other.fedora_release = "42"
+        assert other.load_fedora_index() is None
+
+    @pytest.mark.unit
+    def test_refresh_keeps_fresh_index_unless_forced(self, temp_cache_dir, mocker):
+        """Good path: a fresh index is reused; force rebuilds it."""
+        provider = ConcreteProvider()
+        mock_check_output = mocker.patch(
+            "subprocess.check_output", return_value=self.DUMP_OUTPUT
+        )
+
+        provider.refresh_fedora_index()
+        provider.refresh_fedora_index()
+        assert mock_check_output.call_count == 1
+
+        provider.refresh_fedora_index(force=True)
+        assert mock_check_output.call_count == 2
+
+    @pytest.mark.unit
+    def test_empty_output_is_not_stored(self, temp_cache_dir, mocker):
+        """Bad path: a failed dump leaves lookups on the per-package path."""
+        provider = ConcreteProvider()
+        mocker.patch(
+            "subprocess.check_output",
+            side_effect=subprocess.CalledProcessError(1, "dnf"),
+        )
+
+        assert provider.refresh_fedora_index() is None
+        assert provider.load_fedora_index() is None
+
+    @pytest.mark.unit
+    def test_expired_index_is_ignored(self, temp_cache_dir, mocker):
+        """Bad path: an index past FEDORA_CACHE_TTL falls back to dnf."""
+        mocker.patch("subprocess.check_output", return_value=self.DUMP_OUTPUT)
+        ConcreteProvider().refresh_fedora_index()
+
+        mocker.patch("woolly.languages.base.FEDORA_CACHE_TTL", -1)
+        assert ConcreteProvider().load_fedora_index() is None
+
+
 class TestLanguageProviderBuildDnfRepoqueryCmd:
     """Tests for LanguageProvider._build_dnf_repoquery_cmd helper."""
 
@@ -570,6 +787,56 @@ class TestLanguageProviderCheckFedoraPackaging:
 
         assert status.is_packaged is True
 
+    @pytest.mark.unit
+    def test_single_dnf_call_per_package(self, temp_cache_dir, mocker):
+        """Critical path: packages, versions and provides come from one query."""
+        provider = ConcreteProvider()
+        mock_check_output = mocker.patch(
+            "subprocess.check_output",
+            return_value=(
+                b"rust-pkg|1.0.0|test(pkg) = 1.0.3\n"
+                b"test(pkg/default) = 1.0.3\n"
+                b"rust-pkg0.9|0.9.0|test(pkg) = 0.9.1"
+            ),
+        )
+
+        status = provider.check_fedora_packaging("pkg")
+
+        assert mock_check_output.call_count == 1
+        cmd = mock_check_output.call_args[0][0]
+        assert "%{NAME}|%{VERSION}|%{PROVIDES}" in cmd
+        assert status.versions == ["0.9.1", "1.0.3"]
+        assert status.package_names == ["rust-pkg", "rust-pkg0.9"]
+
+    @pytest.mark.unit
+    def test_caches_one_record(self, temp_cache_dir, mocker):
+        """Good path: the result is cached as a single fedora record."""
+        provider = ConcreteProvider()
+        mock_check_output = mocker.patch(
+            "subprocess.check_output",
+            return_value=b"rust-pkg|1.0.0|test(pkg) = 1.0.3",
+        )
+
+        provider.check_fedora_packaging("pkg")
+        assert provider._get_provides_version("pkg") == ["1.0.3"]
+        assert provider._repoquery_package("pkg") == (True, ["1.0.0"], ["rust-pkg"])
+
+        assert mock_check_output.call_count == 1
+        cache_files = list((temp_cache_dir / "fedora").iterdir())
+        assert len(cache_files) == 1
+
+    @pytest.mark.unit
+    def test_falls_back_to_package_versions(self, temp_cache_dir, mocker):
+        """Bad path: without versioned provides the package versions are used."""
+        provider = ConcreteProvider()
+        mocker.patch(
+            "subprocess.check_output", return_value=b"rust-pkg|1.0.0|test(pkg)"
+        )
+
+        status = provider.check_fedora_packaging("pkg")
+
+        assert status.versions == ["1.0.0"]
+
     @pytest.mark.unit
     def test_returns_not_packaged_when_not_found(self, temp_cache_dir, mocker):
         """Good path: returns not packaged when package not found."""
@@ -675,3 +942,113 @@ class TestLanguageProviderGetBuildDependencies:
         build_deps = provider.get_build_dependencies("nonexistent")
 
         assert build_deps == []
+
+
+class TestLanguageProviderAsync:
+    """Tests for the async counterparts on LanguageProvider."""
+
+    @staticmethod
+    def _mock_process(mocker, stdout=b"", returncode=0):
+        proc = mocker.MagicMock()
+        proc.communicate = mocker.AsyncMock(return_value=(stdout, b""))
+        proc.wait = mocker.AsyncMock(return_value=returncode)
+        proc.returncode = returncode
+        return proc
+
+    @pytest.mark.unit
+    def test_default_afetch_methods_delegate_to_sync(self):
+        """Good path: providers without native async fall back to threads."""
+        provider = ConcreteProvider()
+        provider._package_info = PackageInfo(name="pkg", latest_version="1.0.0")
+        provider._dependencies = [Dependency(name="dep", version_requirement="*")]
+
+        assert asyncio.run(provider.afetch_package_info("pkg")) == (
+            provider._package_info
+        )
+        assert asyncio.run(provider.afetch_dependencies("pkg", "1.0.0")) == (
+            provider._dependencies
+        )
+        assert asyncio.run(provider.afetch_features("pkg", "1.0.0")) == []
+
+    @pytest.mark.unit
+    def test_acheck_fedora_packaging_uses_async_subprocess(
+        self, temp_cache_dir, mocker
+    ):
+        """Good path: dnf runs through asyncio.create_subprocess_exec."""
+        provider = ConcreteProvider()
+        proc = self._mock_process(mocker, b"rust-pkg|1.0.0")
+        create = mocker.patch(
+            "asyncio.create_subprocess_exec",
+            new_callable=mocker.AsyncMock,
+            return_value=proc,
+        )
+        check_output = mocker.patch("subprocess.check_output")
+
+        status = asyncio.run(provider.acheck_fedora_packaging("pkg"))
+
+        assert status.is_packaged is True
+        assert status.package_names == ["rust-pkg"]
+        assert create.await_args is not None
+        assert create.await_args.args[:2] == ("dnf", "repoquery")
+        check_output.assert_not_called()
+
+    @pytest.mark.unit
+    def test_acheck_fedora_packaging_shares_sync_cache(self, temp_cache_dir, mocker):
+        """Critical path: async lookups reuse entries written by sync lookups."""
+        provider = ConcreteProvider()
+        mocker.patch("subprocess.check_output", return_value=b"rust-pkg|1.0.0")
+        provider.check_fedora_packaging("pkg")
+
+        create = mocker.patch(
+            "asyncio.create_subprocess_exec", new_callable=mocker.AsyncMock
+        )
+        status = asyncio.run(provider.acheck_fedora_packaging("pkg"))
+
+        assert status.is_packaged is True
+        create.assert_not_awaited()
+
+    @pytest.mark.unit
+    def test_arun_dnf_returns_empty_on_failure(self, temp_cache_dir, mocker):
+        """Bad path: non-zero exit is treated as empty output."""
+        provider = ConcreteProvider()
+        proc = self._mock_process(mocker, b"garbage", returncode=1)
+        mocker.patch(
+            "asyncio.create_subprocess_exec",
+            new_callable=mocker.AsyncMock,
+            return_value=proc,
+        )
+
+        status = asyncio.run(provider.acheck_fedora_packaging("pkg"))
+
+        assert status.is_packaged is False
+
+    @pytest.mark.unit
+    def test_arun_dnf_kills_process_on_timeout(self, temp_cache_dir, mocker):
+        """Bad path: a hung dnf process is killed and reported as empty."""
+        provider = ConcreteProvider()
+        proc = self._mock_process(mocker)
+        proc.communicate = mocker.AsyncMock(side_effect=asyncio.TimeoutError)
+        mocker.patch(
+            "asyncio.create_subprocess_exec",
+            new_callable=mocker.AsyncMock,
+            return_value=proc,
+        )
+
+        out = asyncio.run(provider._arun_dnf(["dnf", "repoquery"]))
+
+        assert out == ""
+        proc.kill.assert_called_once()
+
+    @pytest.mark.unit
+    def test_missing_dnf_is_not_packaged(self, temp_cache_dir, mocker):
+        """Bad path: a host without dnf reports packages as not packaged."""
+        provider = ConcreteProvider()
+        mocker.patch("subprocess.check_output", side_effect=FileNotFoundError("dnf"))
+        mocker.patch(
+            "asyncio.create_subprocess_exec",
+            new_callable=mocker.AsyncMock,
+            side_effect=FileNotFoundError("dnf"),
+        )
+
+        assert provider._run_dnf(["dnf", "repoquery"]) == ""
+        assert asyncio.run(provider._arun_dnf(["dnf", "repoquery"])) == ""
@@ -0,0 +1,238 @@
+"""
+Unit tests for woolly.languages.crates_dump module.
+
+Tests cover:
+- Good path: ingesting a dump, answering lookups from the store
+- Critical path: no HTTP, reusing and rebuilding the store
+- Bad path: unreadable dumps, missing tables, unknown crates
+"""
+
+import csv
+import io
+import json
+import os
+import tarfile
+
+import pytest
+
+from woolly.languages.crates_dump import (
+    CratesDump,
+    CratesDumpError,
+    default_dump_store,
+    ingest_crates_dump,
+    open_crates_dump,
+)
+from woolly.languages.rust import RustProvider
+
+CRATES = [
+    {
+        "created_at": "2015-01-01",
+        "description": "A serialization framework",
+        "homepage": "https://serde.rs",
+        "id": "1",
+        "name": "serde",
+        "readme": "x" * 200_000,
+        "repository": "https://github.com/serde-rs/serde",
+    },
+    {"id": "2", "name": "serde_derive", "description": "", "homepage": ""},
+    {"id": "3", "name": "Cc", "description": "", "homepage": ""},
+]
+
+VERSIONS = [
+    {"id": "10", "crate_id": "1", "num": "1.0.0", "license": "MIT", "yanked": "f"},
+    {
+        "id": "11",
+        "crate_id": "1",
+        "num": "1.0.200",
+        "license": "MIT OR Apache-2.0",
+        "yanked": "f",
+        "features": json.dumps({"std": [], "derive": ["serde_derive"]}),
+    },
+    {"id": "12", "crate_id": "1", "num": "1.0.201", "license": "MIT", "yanked": "t"},
+    {"id": "20", "crate_id": "2", "num": "1.0.200", "license": "MIT", "yanked": "f"},
+    {"id": "30", "crate_id": "3", "num": "1.0.90", "license": "MIT", "yanked": "f"},
+]
+
+DEPENDENCIES = [
+    {"id": "1", "version_id": "11", "crate_id": "2", "req": "=1.0.200", "optional": "t", "kind": "0"},
+    {"id": "2", "version_id": "11", "crate_id": "3", "req": "^1", "optional": "f", "kind": "1"},
+    {"id": "3", "version_id": "20", "crate_id": "3", "req": "^1", "optional": "f", "kind": "2"},
+]  # fmt: skip
+
+
+def _csv(rows) -> bytes:
+    fields = sorted({field for row in rows for field in row})
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=fields)
+    writer.writeheader()
+    writer.writerows(rows)
+    return out.getvalue().encode()
+
+
+@pytest.fixture
+def make_dump(tmp_path):
+    """Write a tiny synthetic db-dump.tar.gz and return its path."""
+
+    def _make_dump(tables=None, name="db-dump.tar.gz"):
+        tables = tables or {
+            "crates.csv": CRATES,
+            "versions.csv": VERSIONS,
+            "dependencies.csv": DEPENDENCIES,
+        }
+        path = tmp_path / name
+        with tarfile.open(path, "w:gz") as tar:
+            for member, rows in {"metadata.json": None, **tables}.items():
+                data = b"{}" if rows is None else _csv(rows)
+                info = tarfile.TarInfo(f"2025-01-01-020000/data/{member}")
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+        return path
+
+    return _make_dump
+
+
+@pytest.fixture
+def dump(make_dump, tmp_path):
+    """Lookups in the store of the synthetic dump."""
+    store = tmp_path / "dump.sqlite3"
+    ingest_crates_dump(make_dump(), store)
+    return CratesDump(store)
+
+
+class TestIngestCratesDump:
+    """Tests for building the store."""
+
+    @pytest.mark.unit
+    def test_ingests_tables(self, make_dump, tmp_path):
+        """Good path: every row of the three tables is stored."""
+        counts = ingest_crates_dump(make_dump(), tmp_path / "dump.sqlite3")
+
+        assert counts == {"crates": 3, "versions": 5, "dependencies": 3}
+        assert not list(tmp_path.glob(".*.tmp"))
+
+    @pytest.mark.unit
+    def test_missing_table(self, make_dump, tmp_path):
+        """Bad path: a dump without dependencies.csv is rejected."""
+        tarball = make_dump({"crates.csv": CRATES, "versions.csv": VERSIONS})
+        store = tmp_path / "dump.sqlite3"
+
+        with pytest.raises(CratesDumpError, match="dependencies"):
+            ingest_crates_dump(tarball, store)
+        assert not store.exists()
+
+    @pytest.mark.unit
+    def test_not_a_tarball(self, tmp_path):
+        """Bad path: an unreadable file raises CratesDumpError."""
+        tarball = tmp_path / "db-dump.tar.gz"
+        tarball.write_bytes(b"not a tarball")
+
+        with pytest.raises(CratesDumpError):
+            ingest_crates_dump(tarball, tmp_path / "dump.sqlite3")
+
+
+class TestCratesDumpLookups:
+    """Tests for answering lookups from the store."""
+
+    @pytest.mark.unit
+    def test_package_info(self, dump):
+        """Good path: crate fields and the latest version's license."""
+        info = dump.package_info("serde")
+
+        assert info.name == "serde"
+        assert info.latest_version == "1.0.200"
+        assert info.license == "MIT OR Apache-2.0"
+        assert info.homepage == "https://serde.rs"
+
+    @pytest.mark.unit
+    def test_names_are_canonicalized(self, dump):
+        """Critical path: case and '-'/'_' do not matter, as on crates.io."""
+        assert dump.package_info("serde-derive").name == "serde_derive"
+        assert dump.package_info("cc").name == "Cc"
+
+    @pytest.mark.unit
+    def test_dependencies(self, dump):
+        """Good path: dependencies name the real crate and decode the kind."""
+        deps = dump.dependencies("serde", "1.0.200")
+
+        assert [(d.name, d.version_requirement, d.optional, d.kind) for d in deps] == [
+            ("Cc", "^1", False, "build"),
+            ("serde_derive", "=1.0.200", True, "normal"),
+        ]
+
+    @pytest.mark.unit
+    def test_features(self, dump):
+        """Good path: the version's feature map, sorted by name."""
+        features = dump.features("serde", "1.0.200")
+
+        assert [(f.name, f.dependencies) for f in features] == [
+            ("derive", ["serde_derive"]),
+            ("std", []),
+        ]
+        assert dump.features("serde", "1.0.0") == []
+
+    @pytest.mark.unit
+    def test_unknown_crate_or_version(self, dump):
+        """Bad path: unknown crates and versions are not found."""
+        assert dump.package_info("nonexistent") is None
+        assert dump.dependencies("serde", "9.9.9") == []
+        assert dump.features("nonexistent", "1.0.0") == []
+
+
+class TestOpenCratesDump:
+    """Tests for reusing and rebuilding the store."""
+
+    @pytest.mark.unit
+    def test_reuses_store(self, temp_cache_dir, make_dump, mocker):
+        """Critical path: an unchanged tarball is not ingested again."""
+        tarball = make_dump()
+        open_crates_dump(tarball)
+        ingest = mocker.patch("woolly.languages.crates_dump.ingest_crates_dump")
+
+        dump = open_crates_dump(tarball)
+
+        ingest.assert_not_called()
+        assert dump.path == default_dump_store()
+        assert dump.package_info("serde") is not None
+
+    @pytest.mark.unit
+    def test_rebuilds_for_new_download(self, temp_cache_dir, make_dump):
+        """Good path: a replaced tarball is ingested again."""
+        tarball = make_dump()
+        open_crates_dump(tarball)
+
+        make_dump(
+            {
+                "crates.csv": CRATES[:1],
+                "versions.csv": VERSIONS[:1],
+                "dependencies.csv": [],
+            }
+        )
+        os.utime(tarball, ns=(0, 0))
+
+        assert open_crates_dump(tarball).package_info("cc") is None
+
+    @pytest.mark.unit
+    def test_missing_tarball(self, temp_cache_dir, tmp_path):
+        """Bad path: a missing tarball raises CratesDumpError."""
+        with pytest.raises(CratesDumpError):
+            open_crates_dump(tmp_path / "missing.tar.gz")
+
+
+class TestRustProviderCratesDump:
+    """Tests for RustProvider resolving from a dump."""
+
+    @pytest.mark.unit
+    def test_lookups_make_no_requests(self, temp_cache_dir, dump, mocker):
+        """Critical path: all lookups are answered without HTTP."""
+        mock_get = mocker.patch("woolly.http.get")
+        provider = RustProvider()
+        provider.crates_dump = dump
+
+        info = provider.fetch_package_info("serde")
+        deps = provider.get_normal_dependencies("serde", info.latest_version)
+        features = provider.fetch_features("serde", info.latest_version)
+
+        assert [d.name for d in deps] == []
+        assert [f.name for f in features] == ["derive", "std"]
+        assert len(provider.fetch_dependencies("serde", "1.0.200")) == 2
+        mock_get.assert_not_called()
@@ -0,0 +1,306 @@
+"""
+Unit tests for woolly.languages.crates_index module.
+
+Tests cover:
+- Good path: index paths, parsing index files, answering lookups from them
+- Critical path: one cached file per crate, version selection
+- Bad path: missing crates, unknown versions, malformed lines
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from woolly.cache import read_cache
+from woolly.languages.crates_index import (
+    SPARSE_INDEX_URL,
+    index_path,
+    latest_version,
+    parse_index_file,
+    version_key,
+)
+from woolly.languages.rust import RustProvider
+
+
+def _line(vers, deps=(), features=None, features2=None, yanked=False):
+    entry = {
+        "name": "serde",
+        "vers": vers,
+        "deps": list(deps),
+        "cksum": "0" * 64,
+        "features": features or {},
+        "yanked": yanked,
+    }
+    if features2 is not None:
+        entry["features2"] = features2
+        entry["v"] = 2
+    return json.dumps(entry)
+
+
+INDEX_FILE = "\n".join(
+    [
+        _line("1.0.0"),
+        _line(
+            "1.0.200",
+            deps=[
+                {
+                    "name": "serde_derive",
+                    "req": "^1.0",
+                    "features": [],
+                    "optional": True,
+                    "default_features": True,
+                    "target": None,
+                    "kind": "normal",
+                },
+                {
+                    "name": "derive2",
+                    "package": "serde_derive",
+                    "req": "=1.0.200",
+                    "features": [],
+                    "optional": False,
+                    "default_features": True,
+                    "target": None,
+                    "kind": "dev",
+                },
+                {"name": "cc", "req": "^1", "features": [], "optional": False},
+            ],
+            features={"default": ["std"], "std": []},
+            features2={"derive": ["dep:serde_derive"]},
+        ),
+        _line("1.0.201", yanked=True),
+        _line("2.0.0-alpha.1"),
+    ]
+)
+
+
+class TestIndexPath:
+    """Tests for the index file layout."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "name,path",
+        [
+            ("a", "1/a"),
+            ("cc", "2/cc"),
+            ("syn", "3/s/syn"),
+            ("serde", "se/rd/serde"),
+            ("Serde_JSON", "se/rd/serde_json"),
+        ],
+    )
+    def test_index_path(self, name, path):
+        """Good path: names map to their prefix directories, lowercased."""
+        assert index_path(name) == path
+
+
+class TestParseIndexFile:
+    """Tests for parsing a crate's index file."""
+
+    @pytest.mark.unit
+    def test_parses_versions(self):
+        """Good path: every line becomes a version with API-shaped dependencies."""
+        payload = parse_index_file(INDEX_FILE)
+
+        assert payload["name"] == "serde"
+        assert [v["vers"] for v in payload["versions"]] == [
+            "1.0.0",
+            "1.0.200",
+            "1.0.201",
+            "2.0.0-alpha.1",
+        ]
+        deps = payload["versions"][1]["deps"]
+        assert deps[1] == {
+            "crate_id": "serde_derive",
+            "req": "=1.0.200",
+            "optional": False,
+            "kind": "dev",
+        }
+        assert deps[2]["kind"] == "normal"
+
+    @pytest.mark.unit
+    def test_merges_features2(self):
+        """Critical path: features2 entries are merged into the feature map."""
+        features = parse_index_file(INDEX_FILE)["versions"][1]["features"]
+
+        assert features == {
+            "default": ["std"],
+            "std": [],
+            "derive": ["dep:serde_derive"],
+        }
+
+    @pytest.mark.unit
+    def test_skips_malformed_lines(self):
+        """Bad path: invalid lines are skipped; an empty file has no payload."""
+        payload = parse_index_file("not json\n\n" + _line("1.0.0"))
+
+        assert [v["vers"] for v in payload["versions"]] == ["1.0.0"]
+        assert parse_index_file("\n") is None
+
+
+class TestLatestVersion:
+    """Tests for picking the version to resolve."""
+
+    @pytest.mark.unit
+    def test_highest_stable_unyanked(self):
+        """Good path: pre-releases and yanked versions are skipped."""
+        assert latest_version(parse_index_file(INDEX_FILE)["versions"]) == "1.0.200"
+
+    @pytest.mark.unit
+    def test_semver_ordering(self):
+        """Critical path: versions compare numerically, not as strings."""
+        versions = ["0.9.0", "0.10.0", "0.10.0-rc.1", "0.10.0-rc.10", "0.10.0-rc.2"]
+
+        assert sorted(versions, key=version_key) == [
+            "0.9.0",
+            "0.10.0-rc.1",
+            "0.10.0-rc.2",
+            "0.10.0-rc.10",
+            "0.10.0",
+        ]
+
+    @pytest.mark.unit
+    def test_falls_back_when_nothing_stable(self):
+        """Bad path: only pre-releases, or only yanked versions, still resolve."""
+        pre = [{"vers": "1.0.0-beta.1"}, {"vers": "1.0.0-beta.2"}]
+        yanked = [{"vers": "0.1.0", "yanked": True}]
+
+        assert latest_version(pre) == "1.0.0-beta.2"
+        assert latest_version(yanked) == "0.1.0"
+        assert latest_version([]) is None
+
+
+class TestRustProviderSparseIndex:
+    """Tests for RustProvider answering lookups from the sparse index."""
+
+    @pytest.fixture
+    def provider(self, temp_cache_dir):
+        provider = RustProvider()
+        provider.sparse_index = SPARSE_INDEX_URL
+        return provider
+
+    @pytest.mark.unit
+    def test_answers_all_lookups_from_one_file(self, provider, mocker):
+        """Good path: info, dependencies and features cost one request."""
+        mock_get = mocker.patch(
+            "woolly.http.get", return_value=httpx.Response(200, text=INDEX_FILE)
+        )
+
+        info = provider.fetch_package_info("serde")
+        deps = provider.fetch_dependencies("serde", "1.0.200")
+        features = provider.fetch_features("serde", "1.0.200")
+
+        assert info.name == "serde"
+        assert info.latest_version == "1.0.200"
+        assert info.license is None
+        assert [(d.name, d.kind, d.optional) for d in deps] == [
+            ("serde_derive", "normal", True),
+            ("serde_derive", "dev", False),
+            ("cc", "normal", False),
+        ]
+        assert [f.name for f in features] == ["default", "derive", "std"]
+        mock_get.assert_called_once()
+        assert mock_get.call_args.args[0] == "https://index.crates.io/se/rd/serde"
+
+    @pytest.mark.unit
+    def test_caches_parsed_file_per_crate(self, provider, mocker):
+        """Critical path: the parsed file is cached once under an index key."""
+        mocker.patch(
+            "woolly.http.get",
+            return_value=httpx.Response(200, text=INDEX_FILE, headers={"ETag": "x"}),
+        )
+        provider.fetch_package_info("serde")
+
+        cached = read_cache("crates", provider._cache_key("index", "serde"))
+
+        assert len(cached["versions"]) == 4
+        assert read_cache("crates", provider._cache_key("info", "serde")) is None
+
+    @pytest.mark.unit
+    def test_root_license_from_api(self, provider, mocker):
+        """Critical path: the root keeps the index version and gets the API license."""
+        api = {
+            "crate": {
+                "name": "serde",
+                "newest_version": "1.0.201",
+                "license": "MIT OR Apache-2.0",
+            }
+        }
+
+        def get(url, **kwargs):
+            if url.startswith(SPARSE_INDEX_URL):
+                return httpx.Response(200, text=INDEX_FILE)
+            return httpx.Response(200, json=api)
+
+        mock_get = mocker.patch("woolly.http.get", side_effect=get)
+
+        info = provider.fetch_root_package_info("serde")
+
+        assert info.latest_version == "1.0.200"
+        assert info.license == "MIT OR Apache-2.0"
+        assert not info.license_unavailable
+        assert mock_get.call_args.args[0] == "https://crates.io/api/v1/crates/serde"
+
+    @pytest.mark.unit
+    def test_root_license_api_failure(self, provider, mocker):
+        """Bad path: an API error leaves the root without a license."""
+
+        def get(url, **kwargs):
+            if url.startswith(SPARSE_INDEX_URL):
+                return httpx.Response(200, text=INDEX_FILE)
+            return httpx.Response(503)
+
+        mocker.patch("woolly.http.get", side_effect=get)
+
+        info = provider.fetch_root_package_info("serde")
+
+        assert info.latest_version == "1.0.200"
+        assert info.license is None
+        assert info.license_unavailable
+
+    @pytest.mark.unit
+    def test_missing_crate(self, provider, mocker):
+        """Bad path: a 404 is cached as not found."""
+        mock_get = mocker.patch("woolly.http.get", return_value=httpx.Response(404))
+
+        assert provider.fetch_package_info("nonexistent") is None
+        assert provider.fetch_dependencies("nonexistent", "1.0.0") == []
+        mock_get.assert_called_once()
+
+    @pytest.mark.unit
+    def test_unknown_version(self, provider, mocker):
+        """Bad path: a version the index does not list has no dependencies."""
+        mocker.patch(
+            "woolly.http.get", return_value=httpx.Response(200, text=INDEX_FILE)
+        )
+
+        assert provider.fetch_dependencies("serde", "9.9.9") == []
+        assert provider.fetch_features("serde", "9.9.9") == []
+
+    @pytest.mark.unit
+    def test_server_error(self, provider, mocker):
+        """Bad path: other errors raise instead of caching the crate as missing."""
+        mocker.patch("woolly.http.get", return_value=httpx.Response(503))
+
+        with pytest.raises(RuntimeError):
+            provider.fetch_package_info("serde")
+
+    @pytest.mark.unit
+    def test_async_lookups(self, provider, mocker):
+        """Good path: the async path shares the cached index file."""
+        mock_aget = mocker.patch(
+            "woolly.http.aget",
+            new_callable=mocker.AsyncMock,
+            return_value=httpx.Response(200, text=INDEX_FILE),
+        )
+
+        async def lookups():
+            info = await provider.afetch_package_info("serde")
+            deps = await provider.afetch_dependencies("serde", info.latest_version)
+            return info, deps
+
+        info, deps = asyncio.run(lookups())
+
+        assert info.latest_version == "1.0.200"
+        assert len(deps) == 3
+        mock_aget.assert_awaited_once()
@@ -0,0 +1,213 @@
+"""
+Unit tests for woolly.languages.pypi_mirror module.
+
+Tests cover:
+- Good path: reading projects and releases from a mirror tree
+- Critical path: no HTTP and no cache entries, older releases from wheels
+- Bad path: missing projects, releases without wheels, invalid roots
+"""
+
+import json
+import os
+import zipfile
+
+import pytest
+
+from woolly.cache import read_cache
+from woolly.languages.pypi_mirror import PyPIMirror, PyPIMirrorError
+from woolly.languages.python import PythonProvider
+
+FILES = "https://files.pythonhosted.org/packages"
+
+
+def _metadata(version, requires=()):
+    lines = [
+        "Metadata-Version: 2.1",
+        "Name: Flask",
+        f"Version: {version}",
+        *(f"Requires-Dist: {req}" for req in requires),
+    ]
+    return "\n".join(lines) + "\n\nLong description.\n"
+
+
+@pytest.fixture
+def mirror_root(tmp_path):
+    """A bandersnatch-style mirror holding three releases of Flask."""
+    web = tmp_path / "mirror" / "web"
+    packages = web / "packages"
+
+    # 3.0.0: latest, described by the JSON document itself
+    # 2.0.0: wheel with a .metadata file next to it
+    # 1.0.0: wheel only; 0.1.0: sdist only
+    wheel_2 = packages / "aa/bb/flask-2.0.0-py3-none-any.whl"
+    wheel_2.parent.mkdir(parents=True)
+    wheel_2.write_bytes(b"not read")
+    (wheel_2.parent / (wheel_2.name + ".metadata")).write_text(
+        _metadata("2.0.0", ["click>=7.1.2"])
+    )
+    wheel_1 = packages / "cc/dd/Flask-1.0.0-py2.py3-none-any.whl"
+    wheel_1.parent.mkdir(parents=True)
+    with zipfile.ZipFile(wheel_1, "w") as wheel:
+        wheel.writestr("flask/__init__.py", "")
+        wheel.writestr(
+            "Flask-1.0.0.dist-info/METADATA",
+            _metadata("1.0.0", ["Werkzeug>=0.14", "click>=5.1"]),
+        )
+
+    project = {
+        "info": {
+            "name": "Flask",
+            "version": "3.0.0",
+            "summary": "A simple framework for building complex web applications.",
+            "license": "BSD-3-Clause",
+            "requires_dist": ["Werkzeug>=3.0.0", "blinker>=1.6.2"],
+            "provides_extra": [],
+        },
+        "releases": {
+            "3.0.0": [],
+            "2.0.0": [
+                {
+                    "filename": wheel_2.name,
+                    "url": f"{FILES}/aa/bb/{wheel_2.name}",
+                }
+            ],
+            "1.0.0": [
+                {"filename": "Flask-1.0.0.tar.gz", "url": f"{FILES}/ee/Flask.tar.gz"},
+                {
+                    "filename": wheel_1.name,
+                    "url": f"{FILES}/cc/dd/{wheel_1.name}",
+                },
+            ],
+            "0.1.0": [
+                {"filename": "Flask-0.1.0.tar.gz", "url": f"{FILES}/ff/Flask.tar.gz"}
+            ],
+        },
+    }
+    (web / "json").mkdir()
+    (web / "json" / "flask").write_text(json.dumps(project))
+    (web / "simple" / "flask").mkdir(parents=True)
+    return tmp_path / "mirror"
+
+
+class TestPyPIMirror:
+    """Tests for lookups in the mirror tree."""
+
+    @pytest.mark.unit
+    def test_project(self, mirror_root):
+        """Good path: the JSON document is found by normalized name."""
+        mirror = PyPIMirror(mirror_root)
+
+        assert mirror.project("Flask", "flask")["info"]["version"] == "3.0.0"
+        assert mirror.project("missing", "missing") is None
+
+    @pytest.mark.unit
+    def test_project_read_once(self, mirror_root, mocker):
+        """Critical path: repeated lookups reuse the parsed JSON document."""
+        mirror = PyPIMirror(mirror_root)
+        loads = mocker.spy(json, "loads")
+
+        mirror.project("Flask", "flask")
+        mirror.version_data("flask", "flask", "3.0.0")
+        mirror.version_data("flask", "flask", "2.0.0")
+
+        assert loads.call_count == 1
+
+    @pytest.mark.unit
+    def test_project_reread_when_changed(self, mirror_root):
+        """Good path: a document rewritten on disk is read again."""
+        mirror = PyPIMirror(mirror_root)
+        path = mirror_root / "web" / "json" / "flask"
+        project = mirror.project("Flask", "flask")
+
+        project["info"]["version"] = "3.1.0"
+        path.write_text(json.dumps(project))
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert mirror.project("Flask", "flask")["info"]["version"] == "3.1.0"
+
+    @pytest.mark.unit
+    def test_accepts_web_directory(self, mirror_root):
+        """Good path: the web/ directory itself is also a valid root."""
+        assert PyPIMirror(mirror_root / "web").web == mirror_root / "web"
+
+    @pytest.mark.unit
+    def test_version_data_sources(self, mirror_root):
+        """Critical path: older releases come from .metadata files or wheels."""
+        mirror = PyPIMirror(mirror_root)
+
+        latest = mirror.version_data("flask", "flask", "3.0.0")
+        sidecar = mirror.version_data("flask", "flask", "2.0.0")
+        wheel = mirror.version_data("flask", "flask", "1.0.0")
+
+        assert latest["info"]["requires_dist"][0] == "Werkzeug>=3.0.0"
+        assert sidecar["info"]["requires_dist"] == ["click>=7.1.2"]
+        assert wheel["info"]["requires_dist"] == ["Werkzeug>=0.14", "click>=5.1"]
+
+    @pytest.mark.unit
+    def test_simple_index_fallback(self, mirror_root):
+        """Good path: without a JSON document, wheels come from the simple index."""
+        (mirror_root / "web/json/flask").unlink()
+        (mirror_root / "web/simple/flask/index.v1_json").write_text(
+            json.dumps(
+                {
+                    "files": [
+                        {
+                            "filename": "flask-2.0.0-py3-none-any.whl",
+                            "url": "../../packages/aa/bb/flask-2.0.0-py3-none-any.whl",
+                        }
+                    ]
+                }
+            )
+        )
+
+        data = PyPIMirror(mirror_root).version_data("flask", "flask", "2.0.0")
+
+        assert data["info"]["requires_dist"] == ["click>=7.1.2"]
+
+    @pytest.mark.unit
+    def test_release_without_wheel(self, mirror_root):
+        """Bad path: sdist-only and unknown releases have no version data."""
+        mirror = PyPIMirror(mirror_root)
+
+        assert mirror.version_data("flask", "flask", "0.1.0") is None
+        assert mirror.version_data("flask", "flask", "9.9.9") is None
+
+    @pytest.mark.unit
+    def test_invalid_root(self, tmp_path):
+        """Bad path: a directory without json/ or simple/ is rejected."""
+        with pytest.raises(PyPIMirrorError):
+            PyPIMirror(tmp_path)
+
+
+class TestPythonProviderMirror:
+    """Tests for PythonProvider reading from a mirror."""
+
+    @pytest.fixture
+    def provider(self, temp_cache_dir, mirror_root):
+        provider = PythonProvider()
+        provider.mirror = PyPIMirror(mirror_root)
+        return provider
+
+    @pytest.mark.unit
+    def test_lookups_make_no_requests(self, provider, mocker):
+        """Critical path: lookups are answered from disk, bypassing the cache."""
+        mock_get = mocker.patch("woolly.http.get")
+
+        info = provider.fetch_package_info("Flask")
+        deps = provider.fetch_dependencies("Flask", "1.0.0")
+
+        assert info.latest_version == "3.0.0"
+        assert info.license == "BSD-3-Clause"
+        assert [d.name for d in deps] == ["werkzeug", "click"]
+        mock_get.assert_not_called()
+        assert read_cache("pypi", provider._cache_key("info", "Flask")) is None
+
+    @pytest.mark.unit
+    def test_missing_project(self, provider, mocker):
+        """Bad path: projects absent from the mirror are not found."""
+        mock_get = mocker.patch("woolly.http.get")
+
+        assert provider.fetch_package_info("missing") is None
+        assert provider.fetch_features("missing", "1.0") == []
+        mock_get.assert_not_called()
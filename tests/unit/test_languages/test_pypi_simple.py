@@ -0,0 +1,251 @@
+"""
+Unit tests for woolly.languages.pypi_simple module.
+
+Tests cover:
+- Good path: picking wheels, parsing core metadata, answering lookups
+- Critical path: one simple page per project, JSON API fallback
+- Bad path: digest mismatches, missing projects
+"""
+
+import asyncio
+import hashlib
+
+import httpx
+import pytest
+
+from woolly.languages.pypi_simple import (
+    SIMPLE_INDEX_URL,
+    SIMPLE_JSON_TYPE,
+    metadata_files,
+    parse_core_metadata,
+    wheel_version,
+)
+from woolly.languages.python import PythonProvider
+
+METADATA = """\
+Metadata-Version: 2.1
+Name: requests
+Version: 2.32.3
+Summary: Python HTTP for Humans.
+Home-page: https://requests.readthedocs.io
+License: Apache-2.0
+Classifier: License :: OSI Approved :: Apache Software License
+Requires-Dist: charset-normalizer<4,>=2
+Requires-Dist: idna<4,>=2.5
+Requires-Dist: PySocks!=1.5.7,>=1.5.6; extra == "socks"
+Provides-Extra: socks
+Provides-Extra: use-chardet-on-py3
+
+Requests is an HTTP library. Requires-Dist: not-a-header
+"""
+
+PAGE_URL = f"{SIMPLE_INDEX_URL}/requests/"
+
+
+def _page(files):
+    return {"meta": {"api-version": "1.1"}, "name": "requests", "files": files}
+
+
+def _file(filename, metadata=True, url=None):
+    return {
+        "filename": filename,
+        "url": url or f"https://files.example/{filename}",
+        "hashes": {},
+        "core-metadata": metadata,
+    }
+
+
+class TestWheelVersion:
+    """Tests for reading versions from file names."""
+
+    @pytest.mark.unit
+    def test_wheel_version(self):
+        """Good path: the version is the second part of a wheel name."""
+        assert wheel_version("requests-2.32.3-py3-none-any.whl") == "2.32.3"
+        assert wheel_version("my_pkg-1.0-1-cp312-cp312-linux_x86_64.whl") == "1.0"
+
+    @pytest.mark.unit
+    def test_not_a_wheel(self):
+        """Bad path: sdists and malformed names have no wheel version."""
+        assert wheel_version("requests-2.32.3.tar.gz") is None
+        assert wheel_version("broken.whl") is None
+
+
+class TestMetadataFiles:
+    """Tests for picking the wheel read per version."""
+
+    @pytest.mark.unit
+    def test_prefers_pure_wheels(self):
+        """Good path: a pure-Python wheel wins over platform wheels."""
+        files = metadata_files(
+            _page(
+                [
+                    _file("pkg-1.0-cp312-cp312-linux_x86_64.whl"),
+                    _file("pkg-1.0-py3-none-any.whl", {"sha256": "abc"}),
+                    _file("pkg-1.0.tar.gz"),
+                ]
+            ),
+            PAGE_URL,
+        )
+
+        assert files == {
+            "1.0": {
+                "url": "https://files.example/pkg-1.0-py3-none-any.whl.metadata",
+                "sha256": "abc",
+            }
+        }
+
+    @pytest.mark.unit
+    def test_relative_urls_and_old_key(self):
+        """Critical path: relative URLs resolve and the PEP 658 key is honoured."""
+        file = _file("pkg-2.0-py3-none-any.whl", url="../../files/pkg.whl#sha256=x")
+        del file["core-metadata"]
+        file["data-dist-info-metadata"] = True
+
+        files = metadata_files(_page([file]), PAGE_URL)
+
+        assert files["2.0"]["url"] == "https://pypi.org/files/pkg.whl.metadata"
+
+    @pytest.mark.unit
+    def test_skips_wheels_without_metadata(self):
+        """Bad path: wheels the index has no metadata for are not listed."""
+        files = metadata_files(
+            _page([_file("pkg-1.0-py3-none-any.whl", metadata=False)]), PAGE_URL
+        )
+
+        assert files == {}
+
+
+class TestParseCoreMetadata:
+    """Tests for parsing METADATA headers."""
+
+    @pytest.mark.unit
+    def test_parses_headers(self):
+        """Good path: headers map onto the JSON API info fields."""
+        info = parse_core_metadata(METADATA)["info"]
+
+        assert info["name"] == "requests"
+        assert info["version"] == "2.32.3"
+        assert info["license"] == "Apache-2.0"
+        assert info["requires_dist"] == [
+            "charset-normalizer<4,>=2",
+            "idna<4,>=2.5",
+            'PySocks!=1.5.7,>=1.5.6; extra == "socks"',
+        ]
+        assert info["provides_extra"] == ["socks", "use-chardet-on-py3"]
+
+    @pytest.mark.unit
+    def test_missing_headers(self):
+        """Bad path: absent multi-value headers become empty lists."""
+        info = parse_core_metadata("Name: bare\nVersion: 1.0\nLicense: UNKNOWN\n")[
+            "info"
+        ]
+
+        assert info["requires_dist"] == []
+        assert "license" not in info
+
+
+class TestPythonProviderSimpleIndex:
+    """Tests for PythonProvider reading wheel metadata."""
+
+    @pytest.fixture
+    def provider(self, temp_cache_dir):
+        provider = PythonProvider()
+        provider.simple_index = SIMPLE_INDEX_URL
+        return provider
+
+    @staticmethod
+    def _registry(mocker, metadata=METADATA, files=None):
+        digest = hashlib.sha256(metadata.encode()).hexdigest()
+        files = files or [
+            _file("requests-2.32.3-py3-none-any.whl", {"sha256": digest}),
+        ]
+
+        def get(url, **kwargs):
+            if url == PAGE_URL:
+                return httpx.Response(200, json=_page(files))
+            if url.endswith(".metadata"):
+                return httpx.Response(200, text=metadata)
+            return httpx.Response(
+                200, json={"info": {"name": "requests", "requires_dist": ["json-api"]}}
+            )
+
+        return mocker.patch("woolly.http.get", side_effect=get)
+
+    @pytest.mark.unit
+    def test_dependencies_from_metadata(self, provider, mocker):
+        """Good path: dependencies and extras come from the .metadata file."""
+        mock_get = self._registry(mocker)
+
+        deps = provider.fetch_dependencies("requests", "2.32.3")
+        features = provider.fetch_features("requests", "2.32.3")
+
+        assert [d.name for d in deps] == ["charset-normalizer", "idna", "pysocks"]
+        assert [(f.name, f.dependencies) for f in features] == [
+            ("socks", ["pysocks"]),
+            ("use-chardet-on-py3", []),
+        ]
+        urls = [c.args[0] for c in mock_get.call_args_list]
+        assert urls == [
+            PAGE_URL,
+            "https://files.example/requests-2.32.3-py3-none-any.whl.metadata",
+        ]
+        assert mock_get.call_args_list[0].kwargs["headers"] == {
+            "Accept": SIMPLE_JSON_TYPE
+        }
+
+    @pytest.mark.unit
+    def test_falls_back_to_json_api(self, provider, mocker):
+        """Critical path: a release without wheel metadata uses the JSON API."""
+        mock_get = self._registry(mocker, files=[_file("requests-2.32.3.tar.gz")])
+
+        deps = provider.fetch_dependencies("requests", "2.32.3")
+
+        assert [d.name for d in deps] == ["json-api"]
+        assert mock_get.call_args.args[0].endswith("/pypi/requests/2.32.3/json")
+
+    @pytest.mark.unit
+    def test_digest_mismatch_falls_back(self, provider, mocker):
+        """Bad path: metadata not matching the announced digest is not used."""
+        self._registry(
+            mocker,
+            files=[_file("requests-2.32.3-py3-none-any.whl", {"sha256": "0" * 64})],
+        )
+
+        deps = provider.fetch_dependencies("requests", "2.32.3")
+
+        assert [d.name for d in deps] == ["json-api"]
+
+    @pytest.mark.unit
+    def test_simple_page_cached_per_project(self, provider, mocker):
+        """Critical path: other versions reuse the cached project page."""
+        mock_get = self._registry(
+            mocker,
+            files=[
+                _file("requests-2.32.3-py3-none-any.whl"),
+                _file("requests-2.31.0-py3-none-any.whl"),
+            ],
+        )
+
+        provider.fetch_dependencies("requests", "2.32.3")
+        provider.fetch_dependencies("requests", "2.31.0")
+
+        urls = [c.args[0] for c in mock_get.call_args_list]
+        assert urls.count(PAGE_URL) == 1
+
+    @pytest.mark.unit
+    def test_async_dependencies(self, provider, mocker):
+        """Good path: the async path reads the same files."""
+
+        async def aget(url, **kwargs):
+            if url == PAGE_URL:
+                return httpx.Response(
+                    200, json=_page([_file("requests-2.32.3-py3-none-any.whl")])
+                )
+            return httpx.Response(200, text=METADATA)
+
+        mocker.patch("woolly.http.aget", side_effect=aget)
+
+        deps = asyncio.run(provider.afetch_dependencies("requests", "2.32.3"))
+
+        assert [d.name for d in deps] == ["charset-normalizer", "idna", "pysocks"]
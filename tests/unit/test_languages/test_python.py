@@ -7,8 +7,20 @@ Tests cover:
 - Bad path: 404 responses, API errors, malformed requirements
 """
 
+import asyncio
+
 import pytest
 
+from woolly.cache import (
+    configure_memory_cache,
+    get_cache_backend,
+    read_cache,
+    read_cache_entry,
+    set_stale_while_revalidate,
+    stale_reads,
+    wait_for_refreshes,
+    write_cache,
+)
 from woolly.languages.base import Dependency, FeatureInfo, PackageInfo
 from woolly.languages.python import PythonProvider
 
@@ -89,6 +101,61 @@ class TestPythonProviderFetchPackageInfo:
         assert mock_get.call_count == 1
 
 
+class TestPythonProviderCachedPayload:
+    """Tests for the trimmed payloads written to the cache."""
+
+    @pytest.mark.unit
+    def test_caches_info_projection(
+        self, temp_cache_dir, mocker, make_httpx_response, mock_pypi_response
+    ):
+        """Good path: releases, urls and unused info fields are not cached."""
+        provider = PythonProvider()
+        payload = {
+            **mock_pypi_response,
+            "info": {**mock_pypi_response["info"], "description": "x" * 10000},
+            "releases": {"2.31.0": [{"filename": "requests.whl"}] * 20},
+            "urls": [{"filename": "requests.whl"}],
+        }
+        mocker.patch("woolly.http.get", return_value=make_httpx_response(200, payload))
+
+        provider.fetch_package_info("requests")
+
+        cached = read_cache("pypi", provider._cache_key("info", "requests"))
+        assert set(cached) == {"info"}
+        assert "description" not in cached["info"]
+        assert cached["info"]["requires_dist"] == payload["info"]["requires_dist"]
+        assert provider.fetch_package_info("requests").license == "Apache-2.0"
+
+    @pytest.mark.unit
+    def test_caches_version_data_projection(
+        self, temp_cache_dir, mocker, make_httpx_response, mock_pypi_version_response
+    ):
+        """Good path: version data keeps the fields deps and extras need."""
+        provider = PythonProvider()
+        payload = {**mock_pypi_version_response, "urls": [{"filename": "x.whl"}]}
+        mocker.patch("woolly.http.get", return_value=make_httpx_response(200, payload))
+
+        data = provider._fetch_version_data("requests", "2.31.0")
+
+        assert set(data) == {"info"}
+        assert data["info"]["provides_extra"] == ["socks", "security"]
+
+    @pytest.mark.unit
+    def test_ignores_entries_from_older_schema(
+        self, temp_cache_dir, mocker, make_httpx_response, mock_pypi_response
+    ):
+        """Critical path: full payloads cached under the old key are not read."""
+        provider = PythonProvider()
+        write_cache("pypi", "info:requests", {"info": {"name": "stale"}})
+        mock_get = mocker.patch(
+            "woolly.http.get",
+            return_value=make_httpx_response(200, mock_pypi_response),
+        )
+
+        assert provider.fetch_package_info("requests").name == "requests"
+        mock_get.assert_called_once()
+
+
 class TestPythonProviderFetchDependencies:
     """Tests for PythonProvider.fetch_dependencies method."""
 
@@ -163,6 +230,70 @@ class TestPythonProviderFetchDependencies:
         assert deps == []
 
 
+class TestPythonProviderRevalidation:
+    """Tests for conditional requests on expired entries."""
+
+    @pytest.mark.unit
+    def test_not_modified_version_data(
+        self, temp_cache_dir, mocker, make_httpx_response, mock_pypi_response
+    ):
+        """Critical path: expired dependencies are rebuilt from revalidated data."""
+        provider = PythonProvider()
+        mocker.patch(
+            "woolly.http.get",
+            return_value=make_httpx_response(
+                200, mock_pypi_response, headers={"ETag": '"r1"'}
+            ),
+        )
+        expected = provider.fetch_dependencies("requests", "2.31.0")
+        for kind in ("deps", "version_data"):
+            key = provider._cache_key(kind, "requests", "2.31.0")
+            entry = read_cache_entry("pypi", key)
+            get_cache_backend().write_entry(
+                "pypi", key, entry.model_copy(update={"timestamp": 0})
+            )
+        configure_memory_cache()
+
+        not_modified = make_httpx_response(304)
+        mock_get = mocker.patch("woolly.http.get", return_value=not_modified)
+
+        assert provider.fetch_dependencies("requests", "2.31.0") == expected
+        assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"r1"'}
+        not_modified.json.assert_not_called()
+
+    @pytest.mark.unit
+    def test_stale_dependencies_refreshed_from_new_data(
+        self, temp_cache_dir, mocker, make_httpx_response, mock_pypi_response
+    ):
+        """Critical path: a stale answer is rebuilt from fetched, not stale, data."""
+        provider = PythonProvider()
+        mocker.patch(
+            "woolly.http.get",
+            return_value=make_httpx_response(200, mock_pypi_response),
+        )
+        expected = provider.fetch_dependencies("requests", "2.31.0")
+        for kind in ("deps", "version_data"):
+            key = provider._cache_key(kind, "requests", "2.31.0")
+            entry = read_cache_entry("pypi", key)
+            get_cache_backend().write_entry(
+                "pypi", key, entry.model_copy(update={"timestamp": 0})
+            )
+        configure_memory_cache()
+        set_stale_while_revalidate(True)
+
+        updated = dict(mock_pypi_response)
+        updated["info"] = {**mock_pypi_response["info"], "requires_dist": None}
+        mock_get = mocker.patch(
+            "woolly.http.get", return_value=make_httpx_response(200, updated)
+        )
+
+        assert provider.fetch_dependencies("requests", "2.31.0") == expected
+        assert wait_for_refreshes(timeout=5) == 0
+        mock_get.assert_called_once()
+        assert stale_reads() == {"pypi": 1}
+        assert provider.fetch_dependencies("requests", "2.31.0") == []
+
+
 class TestPythonProviderParseRequirement:
     """Tests for PythonProvider._parse_requirement method."""
 
@@ -549,3 +680,56 @@ class TestPythonProviderExtraGroupParsing:
         dep = provider._parse_requirement("typing-extensions; python_version < '3.8'")
 
         assert dep.group is None
+
+
+class TestPythonProviderAsync:
+    """Tests for PythonProvider async fetch methods."""
+
+    @pytest.mark.unit
+    def test_afetch_package_info(
+        self, temp_cache_dir, mocker, make_httpx_response, mock_pypi_response
+    ):
+        """Good path: async fetch goes through http.aget and parses the package."""
+        provider = PythonProvider()
+
+        response = make_httpx_response(200, mock_pypi_response)
+        mock_aget = mocker.patch(
+            "woolly.http.aget", new_callable=mocker.AsyncMock, return_value=response
+        )
+
+        info = asyncio.run(provider.afetch_package_info("requests"))
+
+        assert isinstance(info, PackageInfo)
+        assert info.name == "requests"
+        mock_aget.assert_awaited_once()
+
+    @pytest.mark.unit
+    def test_afetch_dependencies_matches_sync(
+        self, temp_cache_dir, mocker, make_httpx_response, mock_pypi_response
+    ):
+        """Critical path: async dependencies equal the sync result."""
+        provider = PythonProvider()
+
+        response = make_httpx_response(200, mock_pypi_response)
+        mocker.patch(
+            "woolly.http.aget", new_callable=mocker.AsyncMock, return_value=response
+        )
+        mock_get = mocker.patch("woolly.http.get", return_value=response)
+
+        async_deps = asyncio.run(provider.afetch_dependencies("requests", "2.31.0"))
+        sync_deps = provider.fetch_dependencies("requests", "2.31.0")
+
+        assert async_deps == sync_deps
+        mock_get.assert_not_called()
+
+    @pytest.mark.unit
+    def test_afetch_package_info_404(self, temp_cache_dir, mocker, make_httpx_response):
+        """Bad path: returns None for a package that does not exist."""
+        provider = PythonProvider()
+
+        response = make_httpx_response(404)
+        mocker.patch(
+            "woolly.http.aget", new_callable=mocker.AsyncMock, return_value=response
+        )
+
+        assert asyncio.run(provider.afetch_package_info("nonexistent")) is None
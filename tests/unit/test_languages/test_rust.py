@@ -7,10 +7,28 @@ Tests cover:
 - Bad path: 404 responses, API errors
 """
 
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
 import pytest
 
+from woolly.cache import (
+    cache_stats,
+    configure_memory_cache,
+    flush_cache_counters,
+    get_cache_backend,
+    read_cache,
+    read_cache_entry,
+    set_cache_shared,
+    set_stale_while_revalidate,
+    stale_reads,
+    wait_for_refreshes,
+    write_cache,
+)
 from woolly.languages.base import Dependency, FeatureInfo, PackageInfo
-from woolly.languages.rust import RustProvider
+from woolly.languages.rust import CRATES_API, CRATES_BATCH_SIZE, RustProvider
 
 
 class TestRustProviderAttributes:
@@ -107,6 +125,28 @@ class TestRustProviderFetchPackageInfo:
         assert result2 is None
         assert mock_get.call_count == 1
 
+    @pytest.mark.unit
+    def test_shared_cache_fetches_once(
+        self, temp_cache_dir, mocker, make_httpx_response, mock_crates_io_response
+    ):
+        """Critical path: in shared mode concurrent misses share one request."""
+        set_cache_shared(True)
+        provider = RustProvider()
+
+        response = make_httpx_response(200, mock_crates_io_response)
+
+        def slow_get(url, **kwargs):
+            time.sleep(0.05)
+            return response
+
+        mock_get = mocker.patch("woolly.http.get", side_effect=slow_get)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(provider.fetch_package_info, ["serde"] * 4))
+
+        assert mock_get.call_count == 1
+        assert {result.name for result in results} == {"serde"}
+
 
 class TestRustProviderFetchDependencies:
     """Tests for RustProvider.fetch_dependencies method."""
@@ -327,3 +367,490 @@ class TestRustProviderLicense:
         info = provider.fetch_package_info("no-license")
 
         assert info.license is None
+
+
+class TestRustProviderCachedPayload:
+    """Tests for the trimmed payloads written to the cache."""
+
+    @pytest.mark.unit
+    def test_caches_crate_projection(self, temp_cache_dir, mocker, make_httpx_response):
+        """Good path: only the crate fields woolly reads are cached."""
+        provider = RustProvider()
+        response_data = {
+            "crate": {
+                "name": "serde",
+                "newest_version": "1.0.200",
+                "description": "Serialization",
+                "downloads": 123456789,
+                "keywords": ["serde"],
+                "license": None,
+            },
+            "versions": [{"num": "1.0.200", "license": "MIT"}] * 50,
+            "keywords": [{"id": "serde"}],
+        }
+        mocker.patch(
+            "woolly.http.get", return_value=make_httpx_response(200, response_data)
+        )
+
+        provider.fetch_package_info("serde")
+
+        cached = read_cache("crates", provider._cache_key("info", "serde"))
+        assert cached == {
+            "crate": {
+                "name": "serde",
+                "newest_version": "1.0.200",
+                "description": "Serialization",
+                "license": "MIT",
+            }
+        }
+        assert provider.fetch_package_info("serde").license == "MIT"
+
+    @pytest.mark.unit
+    def test_caches_dependency_projection(
+        self, temp_cache_dir, mocker, make_httpx_response, mock_crates_io_deps_response
+    ):
+        """Good path: dependency records keep only the fields woolly reads."""
+        provider = RustProvider()
+        mocker.patch(
+            "woolly.http.get",
+            return_value=make_httpx_response(200, mock_crates_io_deps_response),
+        )
+
+        provider.fetch_dependencies("serde", "1.0.200")
+
+        cached = read_cache("crates", provider._cache_key("deps", "serde", "1.0.200"))
+        assert {field for dep in cached for field in dep} <= {
+            "crate_id",
+            "req",
+            "optional",
+            "kind",
+        }
+
+    @pytest.mark.unit
+    def test_ignores_entries_from_older_schema(
+        self, temp_cache_dir, mocker, make_httpx_response, mock_crates_io_response
+    ):
+        """Critical path: full payloads cached under the old key are not read."""
+        provider = RustProvider()
+        write_cache("crates", "info:serde", {"crate": {"name": "stale"}})
+        mock_get = mocker.patch(
+            "woolly.http.get",
+            return_value=make_httpx_response(200, mock_crates_io_response),
+        )
+
+        info = provider.fetch_package_info("serde")
+
+        assert info.name == "serde"
+        mock_get.assert_called_once()
+
+
+def _expire(namespace, key):
+    """Backdate a cached entry past every TTL, keeping its validators."""
+    entry = read_cache_entry(namespace, key)
+    get_cache_backend().write_entry(
+        namespace, key, entry.model_copy(update={"timestamp": 0})
+    )
+    configure_memory_cache()
+
+
+class TestRustProviderRevalidation:
+    """Tests for conditional requests on expired entries."""
+
+    @pytest.mark.unit
+    def test_not_modified_reuses_expired_entry(
+        self, temp_cache_dir, mocker, make_httpx_response, mock_crates_io_response
+    ):
+        """Critical path: a 304 restamps the entry without parsing a body."""
+        provider = RustProvider()
+        fresh = make_httpx_response(
+            200,
+            mock_crates_io_response,
+            headers={"ETag": '"abc"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"},
+        )
+        mocker.patch("woolly.http.get", return_value=fresh)
+        provider.fetch_package_info("serde")
+        cache_key = provider._cache_key("info", "serde")
+        _expire("crates", cache_key)
+
+        not_modified = make_httpx_response(304)
+        mock_get = mocker.patch("woolly.http.get", return_value=not_modified)
+        info = provider.fetch_package_info("serde")
+
+        assert info.name == "serde"
+        assert mock_get.call_args.kwargs["headers"] == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT",
+        }
+        not_modified.json.assert_not_called()
+        assert read_cache("crates", cache_key) is not None
+
+    @pytest.mark.unit
+    def test_changed_document_replaces_entry(
+        self, temp_cache_dir, mocker, make_httpx_response, mock_crates_io_deps_response
+    ):
+        """Good path: a 200 to a conditional request stores the new validators."""
+        provider = RustProvider()
+        mocker.patch(
+            "woolly.http.get",
+            return_value=make_httpx_response(
+                200, mock_crates_io_deps_response, headers={"ETag": '"v1"'}
+            ),
+        )
+        provider.fetch_dependencies("serde", "1.0.0")
+        cache_key = provider._cache_key("deps", "serde", "1.0.0")
+        _expire("crates", cache_key)
+
+        mocker.patch(
+            "woolly.http.get",
+            return_value=make_httpx_response(
+                200, {"dependencies": []}, headers={"ETag": '"v2"'}
+            ),
+        )
+
+        assert provider.fetch_dependencies("serde", "1.0.0") == []
+        assert read_cache_entry("crates", cache_key).etag == '"v2"'
+
+    @pytest.mark.unit
+    def test_entry_without_validators_is_fetched_unconditionally(
+        self, temp_cache_dir, mocker, make_httpx_response, mock_crates_io_response
+    ):
+        """Bad path: nothing to revalidate against sends a plain request."""
+        provider = RustProvider()
+        mock_get = mocker.patch(
+            "woolly.http.get",
+            return_value=make_httpx_response(200, mock_crates_io_response),
+        )
+        provider.fetch_package_info("serde")
+        _expire("crates", provider._cache_key("info", "serde"))
+
+        provider.fetch_package_info("serde")
+
+        assert mock_get.call_count == 2
+        assert mock_get.call_args.kwargs["headers"] == {}
+
+    @pytest.mark.unit
+    def test_async_not_modified(
+        self, temp_cache_dir, mocker, make_httpx_response, mock_crates_io_response
+    ):
+        """Critical path: the async path revalidates the same way."""
+        provider = RustProvider()
+        mocker.patch(
+            "woolly.http.get",
+            return_value=make_httpx_response(
+                200, mock_crates_io_response, headers={"ETag": '"abc"'}
+            ),
+        )
+        provider.fetch_package_info("serde")
+        _expire("crates", provider._cache_key("info", "serde"))
+
+        mock_aget = mocker.patch(
+            "woolly.http.aget",
+            new_callable=mocker.AsyncMock,
+            return_value=make_httpx_response(304),
+        )
+        info = asyncio.run(provider.afetch_package_info("serde"))
+
+        assert info.name == "serde"
+        assert mock_aget.call_args.kwargs["headers"] == {"If-None-Match": '"abc"'}
+
+
+class TestRustProviderStaleWhileRevalidate:
+    """Tests for answering from expired entries in stale mode."""
+
+    @pytest.mark.unit
+    def test_expired_entry_answered_and_refreshed(
+        self, temp_cache_dir, mocker, make_httpx_response, mock_crates_io_deps_response
+    ):
+        """Good path: the stale answer is instant and the refresh lands in cache."""
+        provider = RustProvider()
+        mocker.patch(
+            "woolly.http.get",
+            return_value=make_httpx_response(200, mock_crates_io_deps_response),
+        )
+        stale = provider.fetch_dependencies("serde", "1.0.0")
+        cache_key = provider._cache_key("deps", "serde", "1.0.0")
+        _expire("crates", cache_key)
+        set_stale_while_revalidate(True)
+
+        mock_get = mocker.patch(
+            "woolly.http.get",
+            return_value=make_httpx_response(200, {"dependencies": []}),
+        )
+
+        assert provider.fetch_dependencies("serde", "1.0.0") == stale
+        assert wait_for_refreshes(timeout=5) == 0
+        mock_get.assert_called_once()
+        assert stale_reads() == {"crates": 1}
+        assert provider.fetch_dependencies("serde", "1.0.0") == []
+
+    @pytest.mark.unit
+    def test_async_expired_entry_answered(
+        self, temp_cache_dir, mocker, make_httpx_response, mock_crates_io_response
+    ):
+        """Critical path: the async path serves stale without awaiting the network."""
+        provider = RustProvider()
+        mocker.patch(
+            "woolly.http.get",
+            return_value=make_httpx_response(200, mock_crates_io_response),
+        )
+        provider.fetch_package_info("serde")
+        _expire("crates", provider._cache_key("info", "serde"))
+        set_stale_while_revalidate(True)
+        mock_aget = mocker.patch("woolly.http.aget", new_callable=mocker.AsyncMock)
+
+        info = asyncio.run(provider.afetch_package_info("serde"))
+        wait_for_refreshes(timeout=5)
+
+        assert info.name == "serde"
+        mock_aget.assert_not_awaited()
+
+    @pytest.mark.unit
+    def test_missing_entry_still_fetched(
+        self, temp_cache_dir, mocker, make_httpx_response, mock_crates_io_response
+    ):
+        """Bad path: with nothing cached, stale mode fetches synchronously."""
+        set_stale_while_revalidate(True)
+        mock_get = mocker.patch(
+            "woolly.http.get",
+            return_value=make_httpx_response(200, mock_crates_io_response),
+        )
+
+        assert RustProvider().fetch_package_info("serde").name == "serde"
+        mock_get.assert_called_once()
+        assert stale_reads() == {}
+
+
+class TestRustProviderAsync:
+    """Tests for RustProvider async fetch methods."""
+
+    @pytest.mark.unit
+    def test_afetch_package_info(
+        self, temp_cache_dir, mocker, make_httpx_response, mock_crates_io_response
+    ):
+        """Good path: async fetch goes through http.aget and parses the crate."""
+        provider = RustProvider()
+
+        response = make_httpx_response(200, mock_crates_io_response)
+        mock_aget = mocker.patch(
+            "woolly.http.aget", new_callable=mocker.AsyncMock, return_value=response
+        )
+
+        info = asyncio.run(provider.afetch_package_info("serde"))
+
+        assert isinstance(info, PackageInfo)
+        assert info.name == "serde"
+        mock_aget.assert_awaited_once()
+
+    @pytest.mark.unit
+    def test_afetch_shares_cache_with_sync(
+        self, temp_cache_dir, mocker, make_httpx_response, mock_crates_io_response
+    ):
+        """Critical path: data cached by the sync path is reused by async."""
+        provider = RustProvider()
+
+        response = make_httpx_response(200, mock_crates_io_response)
+        mocker.patch("woolly.http.get", return_value=response)
+        mock_aget = mocker.patch("woolly.http.aget", new_callable=mocker.AsyncMock)
+
+        provider.fetch_package_info("serde")
+        info = asyncio.run(provider.afetch_package_info("serde"))
+
+        assert info.name == "serde"
+        mock_aget.assert_not_awaited()
+
+    @pytest.mark.unit
+    def test_afetch_dependencies(
+        self, temp_cache_dir, mocker, make_httpx_response, mock_crates_io_deps_response
+    ):
+        """Good path: async dependency fetch returns the same result as sync."""
+        provider = RustProvider()
+
+        response = make_httpx_response(200, mock_crates_io_deps_response)
+        mocker.patch(
+            "woolly.http.aget", new_callable=mocker.AsyncMock, return_value=response
+        )
+
+        deps = asyncio.run(provider.afetch_dependencies("serde", "1.0.200"))
+
+        assert [d.name for d in deps] == ["serde_derive", "proc-macro2"]
+
+    @pytest.mark.unit
+    def test_afetch_package_info_404(self, temp_cache_dir, mocker, make_httpx_response):
+        """Bad path: returns None for a crate that does not exist."""
+        provider = RustProvider()
+
+        response = make_httpx_response(404)
+        mocker.patch(
+            "woolly.http.aget", new_callable=mocker.AsyncMock, return_value=response
+        )
+
+        assert asyncio.run(provider.afetch_package_info("nonexistent")) is None
+
+
+class TestRustProviderBatchInfo:
+    """Tests for prefetching crate info with the multi-id listing."""
+
+    @pytest.fixture
+    def provider(self, temp_cache_dir):
+        provider = RustProvider()
+        provider.batch_info = True
+        return provider
+
+    @staticmethod
+    def _listing(*names):
+        return {
+            "crates": [
+                {
+                    "name": name,
+                    "newest_version": "1.0.0",
+                    "description": f"The {name} crate",
+                    "downloads": 1000,
+                }
+                for name in names
+            ]
+        }
+
+    @pytest.mark.unit
+    def test_one_request_per_level(self, provider, mocker, make_httpx_response):
+        """Good path: one listing answers every crate's info."""
+        mock_get = mocker.patch(
+            "woolly.http.get",
+            return_value=make_httpx_response(200, self._listing("serde_json", "tokio")),
+        )
+
+        provider.prefetch_package_info(["serde-json", "tokio", "tokio"])
+        info = provider.fetch_package_info("serde-json")
+        other = provider.fetch_package_info("tokio")
+
+        mock_get.assert_called_once()
+        url = mock_get.call_args.args[0]
+        assert url.startswith(f"{CRATES_API}?per_page=2&")
+        assert url.count("ids%5B%5D=") == 2
+        assert info.name == "serde_json"
+        assert info.license is None
+        assert info.license_unavailable
+        assert other.latest_version == "1.0.0"
+        assert (
+            "downloads"
+            not in read_cache("crates", provider._cache_key("listing", "tokio"))[
+                "crate"
+            ]
+        )
+
+    @pytest.mark.unit
+    def test_counts_one_lookup_per_crate(self, provider, mocker, make_httpx_response):
+        """Critical path: the prefetch scan adds no misses to the hit ratio."""
+        mocker.patch(
+            "woolly.http.get",
+            return_value=make_httpx_response(200, self._listing("serde")),
+        )
+
+        provider.prefetch_package_info(["serde"])
+        provider.fetch_package_info("serde")
+        flush_cache_counters()
+
+        (stats,) = cache_stats("crates")
+        assert (stats.hits, stats.misses) == (1, 0)
+
+    @pytest.mark.unit
+    def test_root_license_from_api(
+        self, provider, mocker, make_httpx_response, mock_crates_io_response
+    ):
+        """Good path: a listed root crate gets its license from the API."""
+        mocker.patch(
+            "woolly.http.get",
+            return_value=make_httpx_response(200, self._listing("serde")),
+        )
+        provider.prefetch_package_info(["serde"])
+        mocker.patch(
+            "woolly.http.get",
+            return_value=make_httpx_response(200, mock_crates_io_response),
+        )
+
+        info = provider.fetch_root_package_info("serde")
+
+        assert info.license == "MIT OR Apache-2.0"
+        assert not info.license_unavailable
+
+    @pytest.mark.unit
+    def test_chunks_and_skips_cached(self, provider, mocker, make_httpx_response):
+        """Critical path: cached crates are skipped and ids are chunked."""
+        write_cache("crates", provider._cache_key("info", "cached"), False)
+        names = [f"crate{i}" for i in range(CRATES_BATCH_SIZE + 1)]
+        mock_get = mocker.patch(
+            "woolly.http.get", return_value=make_httpx_response(200, {"crates": []})
+        )
+
+        provider.prefetch_package_info(["cached", *names])
+
+        urls = [c.args[0] for c in mock_get.call_args_list]
+        assert [url.count("ids%5B%5D=") for url in urls] == [CRATES_BATCH_SIZE, 1]
+        assert not any("=cached" in url for url in urls)
+
+    @pytest.mark.unit
+    def test_failures_fall_back(self, provider, mocker, make_httpx_response):
+        """Bad path: a failed listing leaves the per-crate fetch to run."""
+        mock_get = mocker.patch(
+            "woolly.http.get",
+            side_effect=[
+                httpx.ConnectError("down"),
+                make_httpx_response(
+                    200, {"crate": {"name": "a", "newest_version": "2"}}
+                ),
+            ],
+        )
+
+        provider.prefetch_package_info(["a"])
+        info = provider.fetch_package_info("a")
+
+        assert info.latest_version == "2"
+        assert mock_get.call_args.args[0] == f"{CRATES_API}/a"
+
+    @pytest.mark.unit
+    def test_listing_not_read_without_batch_info(
+        self, provider, mocker, make_httpx_response, mock_crates_io_response
+    ):
+        """Critical path: a later run without batching still gets the license."""
+        mocker.patch(
+            "woolly.http.get",
+            return_value=make_httpx_response(200, self._listing("serde")),
+        )
+        provider.prefetch_package_info(["serde"])
+        assert provider.fetch_package_info("serde").license is None
+
+        mock_get = mocker.patch(
+            "woolly.http.get",
+            return_value=make_httpx_response(200, mock_crates_io_response),
+        )
+        info = RustProvider().fetch_package_info("serde")
+
+        assert mock_get.call_args.args[0] == f"{CRATES_API}/serde"
+        assert info.license == "MIT OR Apache-2.0"
+
+    @pytest.mark.unit
+    def test_disabled_by_default(self, temp_cache_dir, mocker):
+        """Critical path: without batch_info (or with another source) no listing."""
+        mock_get = mocker.patch("woolly.http.get")
+        provider = RustProvider()
+
+        provider.prefetch_package_info(["serde"])
+        provider.batch_info = True
+        provider.sparse_index = "https://index.crates.io"
+        provider.prefetch_package_info(["serde"])
+
+        mock_get.assert_not_called()
+
+    @pytest.mark.unit
+    def test_async_prefetch(self, provider, mocker, make_httpx_response):
+        """Good path: the async path fills the same cache entries."""
+        mocker.patch(
+            "woolly.http.aget",
+            new_callable=mocker.AsyncMock,
+            return_value=make_httpx_response(200, self._listing("serde")),
+        )
+        mock_get = mocker.patch("woolly.http.get")
+
+        asyncio.run(provider.aprefetch_package_info(["serde"]))
+
+        assert provider.fetch_package_info("serde").name == "serde"
+        mock_get.assert_not_called()
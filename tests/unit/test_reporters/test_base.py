@@ -9,8 +9,8 @@ Tests cover:
 from datetime import datetime
 
 import pytest
-from rich.tree import Tree
 
+from woolly.graph import DependencyGraph
 from woolly.reporters.base import Reporter, ReportData, strip_markup
 
 
@@ -20,7 +20,7 @@ class TestReportData:
     @pytest.mark.unit
     def test_required_fields(self):
         """Good path: ReportData with required fields."""
-        tree = Tree("root")
+        graph = DependencyGraph(root="test")
         data = ReportData(
             root_package="test",
             language="Rust",
@@ -28,7 +28,7 @@ class TestReportData:
             total_dependencies=10,
             packaged_count=8,
             missing_count=2,
-            tree=tree,
+            graph=graph,
         )
 
         assert data.root_package == "test"
@@ -38,7 +38,7 @@ class TestReportData:
     @pytest.mark.unit
     def test_default_values(self):
         """Good path: default values are correct."""
-        tree = Tree("root")
+        graph = DependencyGraph(root="test")
         data = ReportData(
             root_package="test",
             language="Rust",
@@ -46,7 +46,7 @@ class TestReportData:
             total_dependencies=0,
             packaged_count=0,
             missing_count=0,
-            tree=tree,
+            graph=graph,
         )
 
         assert data.missing_packages == []
@@ -58,7 +58,7 @@ class TestReportData:
     @pytest.mark.unit
     def test_timestamp_is_set(self):
         """Good path: timestamp is set to current time by default."""
-        tree = Tree("root")
+        graph = DependencyGraph(root="test")
         before = datetime.now()
         data = ReportData(
             root_package="test",
@@ -67,7 +67,7 @@ class TestReportData:
             total_dependencies=0,
             packaged_count=0,
             missing_count=0,
-            tree=tree,
+            graph=graph,
         )
         after = datetime.now()
 
@@ -76,7 +76,7 @@ class TestReportData:
     @pytest.mark.unit
     def test_required_missing_packages_property(self):
         """Good path: required_missing_packages computed property works."""
-        tree = Tree("root")
+        graph = DependencyGraph(root="test")
         data = ReportData(
             root_package="test",
             language="Rust",
@@ -86,7 +86,7 @@ class TestReportData:
             missing_count=2,
             missing_packages=["pkg-a", "pkg-b", "optional-pkg"],
             optional_missing_packages=["optional-pkg"],
-            tree=tree,
+            graph=graph,
         )
 
         assert data.required_missing_packages == {"pkg-a", "pkg-b"}
@@ -94,7 +94,7 @@ class TestReportData:
     @pytest.mark.unit
     def test_optional_missing_set_property(self):
         """Good path: optional_missing_set computed property works."""
-        tree = Tree("root")
+        graph = DependencyGraph(root="test")
         data = ReportData(
             root_package="test",
             language="Rust",
@@ -103,7 +103,7 @@ class TestReportData:
             packaged_count=0,
             missing_count=2,
             optional_missing_packages=["opt-a", "opt-b"],
-            tree=tree,
+            graph=graph,
         )
 
         assert data.optional_missing_set == {"opt-a", "opt-b"}
@@ -111,7 +111,7 @@ class TestReportData:
     @pytest.mark.unit
     def test_unique_packaged_packages_property(self):
         """Good path: unique_packaged_packages computed property works."""
-        tree = Tree("root")
+        graph = DependencyGraph(root="test")
         data = ReportData(
             root_package="test",
             language="Rust",
@@ -120,7 +120,7 @@ class TestReportData:
             packaged_count=3,
             missing_count=0,
             packaged_packages=["pkg-a", "pkg-b", "pkg-a"],  # duplicates
-            tree=tree,
+            graph=graph,
         )
 
         assert data.unique_packaged_packages == {"pkg-a", "pkg-b"}
@@ -207,41 +207,6 @@ class TestReporterGetOutputFilename:
         assert filename.startswith("woolly_")
 
 
-class TestReporterTreeMethods:
-    """Tests for Reporter tree traversal methods."""
-
-    @pytest.mark.unit
-    def test_get_label_from_string(self):
-        """Good path: _get_label returns string directly."""
-        reporter = ConcreteReporter()
-
-        result = reporter._get_label("plain string")
-
-        assert result == "plain string"
-
-    @pytest.mark.unit
-    def test_get_label_from_tree(self):
-        """Good path: _get_label extracts label from Tree."""
-        reporter = ConcreteReporter()
-        tree = Tree("root label")
-
-        result = reporter._get_label(tree)
-
-        assert result == "root label"
-
-    @pytest.mark.unit
-    def test_get_children_returns_list(self):
-        """Good path: _get_children returns list of children."""
-        reporter = ConcreteReporter()
-        tree = Tree("root")
-        tree.add("child1")
-        tree.add("child2")
-
-        result = reporter._get_children(tree)
-
-        assert len(result) == 2
-
-
 class TestReporterWriteReport:
     """Tests for Reporter.write_report method."""
 
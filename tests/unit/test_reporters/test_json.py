@@ -3,13 +3,14 @@ Unit tests for woolly.reporters.json module.
 
 Tests cover:
 - Good path: JSON generation
-- Critical path: tree parsing, metadata structure
+- Critical path: graph conversion, metadata structure
 """
 
 import json
 
 import pytest
 
+from woolly.graph import DependencyEdge, PackageNode
 from woolly.reporters.json import JsonReporter, TreeNodeData
 
 
@@ -54,6 +55,16 @@ class TestJsonReporterGenerate:
         assert parsed["metadata"]["language"] == "Rust"
         assert parsed["metadata"]["registry"] == "crates.io"
 
+    @pytest.mark.unit
+    def test_includes_stale_answers(self, sample_report_data):
+        """Good path: the number of stale cache answers is in the metadata."""
+        sample_report_data.stale_answers = 3
+        reporter = JsonReporter()
+
+        parsed = json.loads(reporter.generate(sample_report_data))
+
+        assert parsed["metadata"]["stale_answers"] == 3
+
     @pytest.mark.unit
     def test_includes_summary(self, sample_report_data):
         """Good path: includes summary section."""
@@ -126,94 +137,92 @@ class TestJsonReporterGenerate:
         assert "2024-01-15" in timestamp
 
 
-class TestJsonReporterParseLabel:
-    """Tests for JsonReporter._parse_label method."""
+class TestJsonReporterGraphToModel:
+    """Tests for JsonReporter._graph_to_model method."""
 
     @pytest.fixture
     def reporter(self):
         return JsonReporter()
 
     @pytest.mark.unit
-    def test_returns_tree_node_data_model(self, reporter):
+    def test_returns_tree_node_data_model(self, reporter, sample_graph):
         """Good path: returns TreeNodeData model."""
-        label = "[bold]test[/bold]"
-
-        result = reporter._parse_label(label)
+        result = reporter._graph_to_model(sample_graph)
 
         assert isinstance(result, TreeNodeData)
+        assert result.name == "root-package"
 
     @pytest.mark.unit
-    def test_parses_packaged_label(self, reporter):
-        """Good path: parses packaged package label."""
-        # Note: Rich markup like [dim cyan] gets stripped, so package names
-        # in brackets are only detected if they're literal brackets
-        label = "[bold]serde[/bold] [dim]v1.0.200[/dim] • [green]✓ packaged[/green] [dim](1.0.200)[/dim]"
-
-        result = reporter._parse_label(label)
-
-        assert result.name == "serde"
-        assert result.version == "1.0.200"
-        assert result.status == "packaged"
-        assert "1.0.200" in result.fedora_versions
-
-    @pytest.mark.unit
-    def test_parses_label_with_license(self, reporter):
-        """Good path: parses label with license info."""
-        label = "[bold]serde[/bold] [dim]v1.0.200[/dim] [magenta](MIT OR Apache-2.0)[/magenta] • [green]✓ packaged[/green] [dim](1.0.200)[/dim]"
-
-        result = reporter._parse_label(label)
-
-        assert result.name == "serde"
-        assert result.version == "1.0.200"
-        assert result.license == "MIT OR Apache-2.0"
+    def test_packaged_node(self, reporter, sample_graph):
+        """Good path: packaged node carries typed Fedora fields."""
+        result = reporter._graph_to_model(sample_graph)
+        dep_a = result.dependencies[1]
+
+        assert dep_a.name == "dep-a"
+        assert dep_a.version == "2.0.0"
+        assert dep_a.license == "MIT"
+        assert dep_a.status == "packaged"
+        assert dep_a.is_packaged is True
+        assert dep_a.fedora_versions == ["2.0.0"]
+        assert dep_a.fedora_packages == ["rust-dep-a"]
+        assert dep_a.requirement == "^2"
 
     @pytest.mark.unit
-    def test_parses_not_packaged_label(self, reporter):
-        """Good path: parses not packaged package label."""
-        label = "[bold]missing-pkg[/bold] [dim]v2.0.0[/dim] • [red]✗ not packaged[/red]"
-
-        result = reporter._parse_label(label)
+    def test_not_packaged_node(self, reporter, sample_graph):
+        """Good path: not packaged node."""
+        result = reporter._graph_to_model(sample_graph)
+        dep_b = result.dependencies[0]
 
-        assert result.name == "missing-pkg"
-        assert result.status == "not_packaged"
+        assert dep_b.name == "dep-b"
+        assert dep_b.status == "not_packaged"
+        assert dep_b.is_packaged is False
 
     @pytest.mark.unit
-    def test_parses_visited_label(self, reporter):
-        """Good path: parses already visited label."""
-        label = "[dim]serde[/dim] [dim]v1.0.0[/dim] • [green]✓[/green] [dim](already visited)[/dim]"
+    def test_visited_node(self, reporter, sample_graph):
+        """Good path: visited edges are leaves with the cached status."""
+        sample_graph.add_edge(
+            DependencyEdge(parent="dep-b", child="dep-a", kind="visited")
+        )
 
-        result = reporter._parse_label(label)
+        result = reporter._graph_to_model(sample_graph)
+        visited = result.dependencies[0].dependencies[0]
 
-        assert result.status == "visited"
-        assert result.is_packaged is True
+        assert visited.status == "visited"
+        assert visited.is_packaged is True
+        assert visited.dependencies == []
 
     @pytest.mark.unit
-    def test_parses_not_found_label(self, reporter):
-        """Good path: parses not found label."""
-        label = "[bold red]unknown-pkg[/bold red] • [red]not found on crates.io[/red]"
+    def test_not_found_node(self, reporter, sample_graph):
+        """Bad path: packages missing from the registry."""
+        sample_graph.add_node(PackageNode(name="unknown-pkg", found=False))
+        sample_graph.add_edge(DependencyEdge(parent="dep-b", child="unknown-pkg"))
 
-        result = reporter._parse_label(label)
+        result = reporter._graph_to_model(sample_graph)
+        node = result.dependencies[0].dependencies[0]
 
-        assert result.status == "not_found"
+        assert node.status == "not_found"
+        assert "not found on crates.io" in node.raw
 
     @pytest.mark.unit
-    def test_parses_max_depth_label(self, reporter):
-        """Good path: parses max depth reached label."""
-        label = "[dim]deep-pkg (max depth reached)[/dim]"
+    def test_max_depth_node(self, reporter, sample_graph):
+        """Bad path: depth-limited edges."""
+        sample_graph.add_edge(
+            DependencyEdge(parent="dep-b", child="deep-pkg", kind="max_depth")
+        )
 
-        result = reporter._parse_label(label)
+        result = reporter._graph_to_model(sample_graph)
+        node = result.dependencies[0].dependencies[0]
 
-        assert result.status == "max_depth_reached"
+        assert node.status == "max_depth_reached"
+        assert node.name == "deep-pkg"
 
     @pytest.mark.unit
-    def test_strips_rich_markup(self, reporter):
-        """Critical path: strips all Rich markup from raw."""
-        label = "[bold][red]test[/red][/bold]"
+    def test_raw_has_no_markup(self, reporter, sample_graph):
+        """Critical path: raw labels are plain text."""
+        result = reporter._graph_to_model(sample_graph)
 
-        result = reporter._parse_label(label)
-
-        assert "[" not in result.raw
-        assert "]" not in result.raw
+        assert "[bold]" not in result.raw
+        assert "[/" not in result.dependencies[1].raw
 
 
 class TestJsonReporterMissingOnly:
@@ -265,3 +274,36 @@ class TestJsonReporterMissingOnly:
 
         assert len(parsed["missing_packages"]) > 0
         assert "missing-a" in parsed["missing_packages"]
+
+
+class TestJsonReporterReleaseMatrix:
+    """Tests for the per-release availability in JSON output."""
+
+    @pytest.mark.unit
+    def test_includes_release_matrix(self, release_report_data):
+        """Good path: releases, per-package statuses and counts are exported."""
+        output = json.loads(JsonReporter().generate(release_report_data))
+
+        assert output["releases"] == ["41", "42"]
+        rows = {row["name"]: row["releases"] for row in output["release_matrix"]}
+        assert rows["dep-a"]["41"]["is_packaged"] is False
+        assert rows["dep-a"]["42"]["versions"] == ["2.0.0"]
+        assert output["summary"]["packaged_by_release"] == {"41": 1, "42": 2}
+
+    @pytest.mark.unit
+    def test_dev_build_release(self, release_report_data):
+        """Critical path: the release dev/build deps used is only set for matrices."""
+        release_report_data.fedora_release = "41"
+
+        output = json.loads(JsonReporter().generate(release_report_data))
+
+        assert output["dev_build_release"] == "41"
+
+    @pytest.mark.unit
+    def test_empty_for_single_release(self, sample_report_data):
+        """Bad path: single-release reports carry an empty matrix."""
+        output = json.loads(JsonReporter().generate(sample_report_data))
+
+        assert output["releases"] == []
+        assert output["release_matrix"] == []
+        assert output["dev_build_release"] is None
@@ -56,6 +56,16 @@ class TestMarkdownReporterGenerate:
 
         assert "**Version:** 1.0.0" in result
 
+    @pytest.mark.unit
+    def test_stale_answers_flagged(self, sample_report_data):
+        """Good path: answers served from expired cache entries are flagged."""
+        reporter = MarkdownReporter()
+        assert "Served stale" not in reporter.generate(sample_report_data)
+
+        sample_report_data.stale_answers = 2
+
+        assert "**Served stale:** 2" in reporter.generate(sample_report_data)
+
     @pytest.mark.unit
     def test_includes_summary_table(self, sample_report_data):
         """Good path: includes summary table."""
@@ -121,18 +131,18 @@ class TestMarkdownReporterGenerate:
         assert "## Packaged Packages" not in result
 
 
-class TestMarkdownReporterTreeToText:
-    """Tests for MarkdownReporter._tree_to_text method."""
+class TestMarkdownReporterDependencyTree:
+    """Tests for the Markdown dependency tree section."""
 
     @pytest.mark.unit
-    def test_renders_tree_structure(self, sample_tree):
-        """Good path: renders tree with proper characters."""
+    def test_renders_tree_structure(self, sample_report_data):
+        """Good path: renders tree with proper characters and plain labels."""
         reporter = MarkdownReporter()
 
-        result = reporter._tree_to_text(sample_tree)
+        result = reporter.generate(sample_report_data)
 
-        # Should contain tree structure characters
-        assert "├──" in result or "└──" in result
+        assert "├── dep-b v1.5.0 • ✗ not packaged" in result
+        assert "└── dep-a v2.0.0 (MIT) • ✓ packaged (2.0.0) [rust-dep-a]" in result
 
 
 class TestMarkdownReporterMissingOnly:
@@ -198,3 +208,46 @@ class TestMarkdownReporterMissingOnly:
 
         assert "## Missing Packages" in result
         assert "- `missing-a`" in result
+
+
+class TestMarkdownReporterReleaseMatrix:
+    """Tests for the per-release availability table."""
+
+    @pytest.mark.unit
+    def test_renders_release_table(self, release_report_data):
+        """Good path: one column per release plus a packaged count row."""
+        result = MarkdownReporter().generate(release_report_data)
+
+        assert "## Availability by Release" in result
+        assert "| Package | 41 | 42 |" in result
+        assert "| `dep-a` | ✗ | ✓ 2.0.0 |" in result
+        assert "| **Packaged** | 1 | 2 |" in result
+
+    @pytest.mark.unit
+    def test_missing_only_hides_fully_packaged_rows(self, release_report_data):
+        """Good path: rows packaged in every release are dropped."""
+        release_report_data.missing_only = True
+
+        result = MarkdownReporter().generate(release_report_data)
+
+        assert "`root-package` | ✓" not in result
+        assert "| `dep-b` | ✗ | ✗ |" in result
+
+    @pytest.mark.unit
+    def test_dev_deps_marked_primary_release_only(self, release_report_data):
+        """Critical path: dev/build deps say which single release they used."""
+        release_report_data.fedora_release = "41"
+        release_report_data.dev_dependencies = [
+            {"name": "tokio-test", "version_requirement": "^0.4", "is_packaged": True}
+        ]
+
+        result = MarkdownReporter().generate(release_report_data)
+
+        assert "## Dev Dependencies\n\n_Checked against Fedora 41 only._" in result
+
+    @pytest.mark.unit
+    def test_no_table_for_single_release(self, sample_report_data):
+        """Bad path: single-release reports have no matrix."""
+        result = MarkdownReporter().generate(sample_report_data)
+
+        assert "Availability by Release" not in result
@@ -185,3 +185,37 @@ class TestStdoutReporterSideBySide:
         panel_count = sum(1 for obj in printed if isinstance(obj, Panel))
         # summary + missing_required + missing_optional + tree = 4 panels
         assert panel_count == 4
+
+
+class TestStdoutReporterReleaseMatrix:
+    """Tests for the per-release availability panel."""
+
+    @pytest.mark.unit
+    def test_prints_release_panel(self, release_report_data, mock_console):
+        """Good path: multi-release reports get an availability panel."""
+        StdoutReporter(console=mock_console).generate(release_report_data)
+
+        titles = [
+            str(obj.title)
+            for obj in _get_printed_objects(mock_console)
+            if isinstance(obj, Panel)
+        ]
+        assert any("Availability by Release" in t for t in titles)
+
+    @pytest.mark.unit
+    def test_panel_has_column_per_release(self, release_report_data):
+        """Good path: one column per release after the package column."""
+        reporter = StdoutReporter(console=Console())
+
+        panel = reporter._build_release_matrix_panel(release_report_data)
+
+        headers = [column.header for column in panel.renderable.columns]
+        assert headers == ["Package", "41", "42"]
+        assert panel.renderable.row_count == 3
+
+    @pytest.mark.unit
+    def test_no_panel_for_single_release(self, sample_report_data, mock_console):
+        """Bad path: single-release reports have no availability panel."""
+        StdoutReporter(console=mock_console).generate(sample_report_data)
+
+        assert "Availability by Release" not in _stringify_printed(mock_console)
@@ -2,10 +2,10 @@
 
 from datetime import datetime
 from pathlib import Path
-from unittest.mock import MagicMock
 
 import pytest
 
+from woolly.graph import DependencyGraph
 from woolly.reporters.base import ReportData
 from woolly.reporters.template import TemplateReporter
 
@@ -13,10 +13,6 @@ from woolly.reporters.template import TemplateReporter
 @pytest.fixture
 def sample_report_data():
     """Create sample report data for testing."""
-    mock_tree = MagicMock()
-    mock_tree.label = "test-package v1.0.0 • ✓ packaged"
-    mock_tree.children = []
-
     return ReportData(
         root_package="test-package",
         language="Rust",
@@ -26,7 +22,7 @@ def sample_report_data():
         missing_count=3,
         missing_packages=["missing1", "missing2", "missing3"],
         packaged_packages=["packaged1", "packaged2", "packaged3"],
-        tree=mock_tree,
+        graph=DependencyGraph(root="test-package"),
         max_depth=50,
         version="1.0.0",
         timestamp=datetime(2024, 1, 15, 10, 30, 0),
@@ -0,0 +1,125 @@
+"""
+Unit tests for woolly.reporters.tree module.
+
+Tests cover:
+- Good path: Rich and plain-text rendering from a DependencyGraph
+- Critical path: labels built without markup for file reports
+- Bad path: leaf-only and empty graphs
+"""
+
+import sys
+
+import pytest
+from rich.tree import Tree
+
+from woolly.graph import DependencyEdge, DependencyGraph, PackageNode
+from woolly.reporters.tree import format_label, render_rich_tree, render_text_tree
+
+
+class TestFormatLabel:
+    """Tests for format_label function."""
+
+    @pytest.mark.unit
+    def test_packaged_label_with_markup(self, sample_graph):
+        """Good path: Rich label for a packaged package."""
+        edge = sample_graph.children("root-package")[1]
+
+        label = format_label(sample_graph, edge)
+
+        assert "[bold]dep-a[/bold]" in label
+        assert "[magenta](MIT)[/magenta]" in label
+        assert "[green]✓ packaged[/green]" in label
+
+    @pytest.mark.unit
+    def test_plain_label(self, sample_graph):
+        """Critical path: plain labels contain no markup."""
+        edge = sample_graph.children("root-package")[1]
+
+        label = format_label(sample_graph, edge, markup=False)
+
+        assert label == "dep-a v2.0.0 (MIT) • ✓ packaged (2.0.0) [rust-dep-a]"
+
+    @pytest.mark.unit
+    def test_optional_visited_label(self, sample_graph):
+        """Good path: visited edges keep the optional marker."""
+        edge = DependencyEdge(child="dep-a", optional=True, kind="visited")
+
+        label = format_label(sample_graph, edge, markup=False)
+
+        assert label == "dep-a v2.0.0 (optional) • ✓ (already visited)"
+
+    @pytest.mark.unit
+    def test_fedora_package_names_survive_rich_rendering(self, sample_graph):
+        """Critical path: bracketed package names are escaped for Rich."""
+        edge = sample_graph.children("root-package")[1]
+        tree = Tree(format_label(sample_graph, edge))
+
+        assert "[rust-dep-a]" in tree.label and "\\[" in tree.label
+
+
+class TestRenderRichTree:
+    """Tests for render_rich_tree function."""
+
+    @pytest.mark.unit
+    def test_renders_children(self, sample_graph):
+        """Good path: expanded edges become Tree nodes."""
+        tree = render_rich_tree(sample_graph)
+
+        assert isinstance(tree, Tree)
+        assert len(tree.children) == 2
+
+    @pytest.mark.unit
+    def test_not_found_root_is_string(self):
+        """Bad path: a root missing from the registry renders as a label."""
+        graph = DependencyGraph(root="nope", registry="crates.io")
+        graph.add_node(PackageNode(name="nope", found=False))
+        graph.add_edge(DependencyEdge(child="nope"))
+
+        result = render_rich_tree(graph)
+
+        assert isinstance(result, str)
+        assert "not found on crates.io" in result
+
+
+class TestRenderTextTree:
+    """Tests for render_text_tree function."""
+
+    @pytest.mark.unit
+    def test_renders_box_drawing(self, sample_graph):
+        """Good path: plain-text tree with branch characters."""
+        text = render_text_tree(sample_graph)
+
+        assert text.splitlines() == [
+            "root-package v1.0.0 • ✓ packaged (1.0.0)",
+            "├── dep-b v1.5.0 • ✗ not packaged",
+            "└── dep-a v2.0.0 (MIT) • ✓ packaged (2.0.0) [rust-dep-a]",
+        ]
+
+    @pytest.mark.unit
+    def test_empty_graph(self):
+        """Bad path: an empty graph renders as an empty string."""
+        assert render_text_tree(DependencyGraph(root="x")) == ""
+
+    @pytest.mark.unit
+    def test_nested_prefixes(self, sample_graph):
+        """Good path: grandchildren get continuation prefixes."""
+        sample_graph.add_edge(
+            DependencyEdge(parent="dep-b", child="dep-a", kind="visited")
+        )
+
+        lines = render_text_tree(sample_graph).splitlines()
+
+        assert lines[2] == "│   └── dep-a v2.0.0 • ✓ (already visited)"
+
+    @pytest.mark.unit
+    def test_deep_graph(self):
+        """Critical path: very deep graphs render without recursion."""
+        graph = DependencyGraph(root="pkg-0")
+        depth = sys.getrecursionlimit() + 100
+        for i in range(depth):
+            graph.add_node(PackageNode(name=f"pkg-{i}", version="1.0"))
+            graph.add_edge(
+                DependencyEdge(parent=f"pkg-{i - 1}" if i else None, child=f"pkg-{i}")
+            )
+
+        assert len(render_text_tree(graph).splitlines()) == depth
@@ -0,0 +1,543 @@
+"""
+Unit tests for woolly.resolver module.
+
+Tests cover:
+- Good path: level-synchronous tree building, visited tracking
+- Critical path: deterministic output, concurrent frontier expansion
+- Bad path: missing packages, max depth
+"""
+
+import asyncio
+import random
+import sys
+import threading
+import time
+
+import pytest
+from rich.tree import Tree
+
+from woolly.languages.base import (
+    Dependency,
+    FedoraPackageStatus,
+    LanguageProvider,
+    PackageInfo,
+)
+from woolly.reporters.tree import render_rich_tree
+from woolly.resolver import (
+    annotate_releases,
+    aresolve_package,
+    build_graph,
+    build_tree,
+    resolve_graph,
+    resolve_graph_async,
+    resolve_package,
+    resolve_tree,
+    resolve_tree_async,
+)
+
+
+class MockProvider(LanguageProvider):
+    """Mock provider for testing."""
+
+    name = "mock"
+    display_name = "Mock"
+    registry_name = "mock.io"
+    fedora_provides_prefix = "mock"
+    cache_namespace = "mock"
+
+    def __init__(self):
+        self.packages = {}
+        self.dependencies = {}
+        self.fedora_status = {}
+
+    def add(self, name, deps=(), packaged=True, optional=()):
+        self.packages[name] = PackageInfo(name=name, latest_version="1.0.0")
+        self.dependencies[f"{name}:1.0.0"] = [
+            Dependency(name=d, version_requirement="*", optional=d in optional)
+            for d in deps
+        ]
+        self.fedora_status[name] = FedoraPackageStatus(
+            is_packaged=packaged, versions=["1.0.0"] if packaged else []
+        )
+
+    def fetch_package_info(self, package_name: str):
+        return self.packages.get(package_name)
+
+    def fetch_dependencies(self, package_name: str, version: str):
+        return self.dependencies.get(f"{package_name}:{version}", [])
+
+    def fetch_features(self, package_name: str, version: str):
+        return []
+
+    def check_fedora_packaging(self, package_name: str):
+        return self.fedora_status.get(
+            package_name, FedoraPackageStatus(is_packaged=False)
+        )
+
+    async def acheck_fedora_packaging(self, package_name: str):
+        return self.check_fedora_packaging(package_name)
+
+    def prefetch_fedora_packaging(self, package_names):
+        pass
+
+    async def aprefetch_fedora_packaging(self, package_names):
+        pass
+
+
+def _shape(node):
+    """Return a nested (label, children) structure for comparing trees."""
+    if isinstance(node, str):
+        return (node, [])
+    return (str(node.label), [_shape(child) for child in node.children])
+
+
+@pytest.fixture
+def provider():
+    """Provider with a small diamond-shaped graph.
+
+    root -> a, b
+    a    -> c, d
+    b    -> c
+    c    -> d
+    """
+    p = MockProvider()
+    p.add("root", deps=["a", "b"])
+    p.add("a", deps=["c", "d"])
+    p.add("b", deps=["c"], packaged=False)
+    p.add("c", deps=["d"])
+    p.add("d")
+    return p
+
+
+class TestResolvePackage:
+    """Tests for resolve_package function."""
+
+    @pytest.mark.unit
+    def test_fetches_info_status_and_deps(self, provider):
+        """Good path: returns everything needed for one node."""
+        resolved = resolve_package(provider, "a")
+
+        assert resolved.version == "1.0.0"
+        assert resolved.status is not None
+        assert resolved.status.is_packaged is True
+        assert [d[0] for d in resolved.dependencies] == ["c", "d"]
+
+    @pytest.mark.unit
+    def test_not_found(self, provider):
+        """Bad path: status is None when the package does not exist."""
+        resolved = resolve_package(provider, "nonexistent")
+
+        assert resolved.status is None
+        assert resolved.version is None
+
+
+class TestResolveTree:
+    """Tests for resolve_tree function."""
+
+    @pytest.mark.unit
+    def test_returns_tree_for_root(self, provider):
+        """Good path: returns a Tree whose root label matches build_tree."""
+        tree = resolve_tree(provider, "root")
+
+        assert isinstance(tree, Tree)
+        assert str(tree.label) == str(build_tree(provider, "root").label)
+
+    @pytest.mark.unit
+    def test_populates_visited(self, provider):
+        """Critical path: every reachable package ends up in visited."""
+        visited = {}
+
+        resolve_tree(provider, "root", visited=visited)
+
+        assert set(visited) == {"root", "a", "b", "c", "d"}
+        assert visited["b"] == (False, "1.0.0", False)
+        assert visited["d"] == (True, "1.0.0", False)
+
+    @pytest.mark.unit
+    def test_visited_order_is_breadth_first(self, provider):
+        """Critical path: visited is filled level by level in frontier order."""
+        visited = {}
+
+        resolve_tree(provider, "root", visited=visited)
+
+        assert list(visited) == ["root", "a", "b", "c", "d"]
+
+    @pytest.mark.unit
+    def test_expands_package_at_shallowest_occurrence(self, provider):
+        """Critical path: shared deps are expanded where first seen on a level."""
+        tree = resolve_tree(provider, "root")
+
+        a, b = tree.children
+        # a -> c, d are both expanded at depth 2
+        assert [isinstance(child, Tree) for child in a.children] == [True, True]
+        # b -> c is a duplicate on the same level
+        assert "already visited" in str(b.children[0].label)
+        # c -> d was already expanded on the previous level
+        c = a.children[0]
+        assert "already visited" in str(c.children[0].label)
+
+    @pytest.mark.unit
+    def test_output_is_deterministic_across_worker_counts(self, provider, mocker):
+        """Critical path: tree shape and visited do not depend on scheduling."""
+        original = provider.check_fedora_packaging
+
+        def jittery(package_name):
+            time.sleep(random.random() / 100)
+            return original(package_name)
+
+        mocker.patch.object(provider, "check_fedora_packaging", side_effect=jittery)
+
+        serial_visited, parallel_visited = {}, {}
+        serial = resolve_tree(provider, "root", visited=serial_visited, max_workers=1)
+        parallel = resolve_tree(
+            provider, "root", visited=parallel_visited, max_workers=8
+        )
+
+        assert _shape(serial) == _shape(parallel)
+        assert list(serial_visited.items()) == list(parallel_visited.items())
+
+    @pytest.mark.unit
+    def test_expands_frontier_concurrently(self, provider, mocker):
+        """Critical path: siblings on the same level are fetched in parallel."""
+        barrier = threading.Barrier(2, timeout=5)
+        original = provider.check_fedora_packaging
+
+        def wait_for_sibling(package_name):
+            if package_name in ("a", "b"):
+                barrier.wait()
+            return original(package_name)
+
+        mocker.patch.object(
+            provider, "check_fedora_packaging", side_effect=wait_for_sibling
+        )
+
+        # Would raise BrokenBarrierError if a and b were fetched serially
+        tree = resolve_tree(provider, "root", max_workers=2)
+
+        assert isinstance(tree, Tree)
+
+    @pytest.mark.unit
+    def test_not_found_root_returns_string(self, provider):
+        """Bad path: returns a label string for a package not in the registry."""
+        visited = {}
+
+        result = resolve_tree(provider, "nonexistent", visited=visited)
+
+        assert isinstance(result, str)
+        assert "not found" in result
+        assert visited["nonexistent"] == (False, None, False)
+
+    @pytest.mark.unit
+    def test_respects_max_depth(self, provider):
+        """Critical path: packages deeper than max_depth are not expanded."""
+        visited = {}
+
+        tree = resolve_tree(provider, "root", visited=visited, max_depth=1)
+
+        a = tree.children[0]
+        assert "max depth" in str(a.children[0].label)
+        assert set(visited) == {"root", "a", "b"}
+
+    @pytest.mark.unit
+    def test_excludes_dependencies_matching_pattern(self, provider):
+        """Good path: excluded deps are neither fetched nor rendered."""
+        visited = {}
+
+        tree = resolve_tree(provider, "root", visited=visited, exclude_patterns=["c"])
+
+        assert "c" not in visited
+        a = tree.children[0]
+        assert len(a.children) == 1
+        assert "d" in str(a.children[0].label)
+
+    @pytest.mark.unit
+    def test_marks_optional_dependencies(self):
+        """Good path: optional deps carry the optional marker and flag."""
+        p = MockProvider()
+        p.add("root", deps=["opt"], optional=["opt"])
+        p.add("opt")
+        visited = {}
+
+        tree = resolve_tree(p, "root", visited=visited, include_optional=True)
+
+        assert "(optional)" in str(tree.children[0].label)
+        assert visited["opt"][2] is True
+
+    @pytest.mark.unit
+    def test_respects_pre_populated_visited(self, provider):
+        """Good path: packages already in visited are not fetched again."""
+        visited = {"root": (True, "1.0.0", False)}
+
+        result = resolve_tree(provider, "root", visited=visited)
+
+        assert isinstance(result, str)
+        assert "already visited" in result
+
+
+class TestResolveGraphPrefetch:
+    """Tests for the per-level batched Fedora and registry prefetch."""
+
+    @pytest.mark.unit
+    def test_prefetches_each_level_once(self, provider, mocker):
+        """Good path: one prefetch per level with the claimed packages."""
+        spy = mocker.spy(provider, "prefetch_fedora_packaging")
+
+        resolve_graph(provider, "root")
+
+        assert [call.args[0] for call in spy.call_args_list] == [
+            ["root"],
+            ["a", "b"],
+            ["c", "d"],
+        ]
+
+    @pytest.mark.unit
+    def test_async_engine_prefetches_each_level(self, provider, mocker):
+        """Good path: the asyncio engine batches levels the same way."""
+        spy = mocker.spy(provider, "aprefetch_fedora_packaging")
+
+        resolve_graph_async(provider, "root")
+
+        assert spy.call_count == 3
+
+    @pytest.mark.unit
+    def test_prefetches_only_existing_packages(self, provider, mocker):
+        """Bad path: packages missing upstream get no Fedora lookup."""
+        spy = mocker.spy(provider, "prefetch_fedora_packaging")
+        async_spy = mocker.spy(provider, "aprefetch_fedora_packaging")
+
+        resolve_graph(provider, "nonexistent")
+        resolve_graph_async(provider, "nonexistent")
+
+        assert spy.call_args.args[0] == []
+        assert async_spy.call_args.args[0] == []
+
+    @pytest.mark.unit
+    def test_prefetches_package_info_each_level(self, provider, mocker):
+        """Good path: the registry prefetch gets the same per-level batches."""
+        spy = mocker.spy(provider, "prefetch_package_info")
+        async_spy = mocker.spy(provider, "aprefetch_package_info")
+
+        resolve_graph(provider, "root")
+        resolve_graph_async(provider, "root")
+
+        assert [call.args[0] for call in spy.call_args_list] == [
+            ["root"],
+            ["a", "b"],
+            ["c", "d"],
+        ]
+        assert async_spy.call_count == 3
+
+
+class TestResolveGraph:
+    """Tests for the structured graph produced by the resolvers."""
+
+    @pytest.mark.unit
+    def test_records_nodes_and_edges(self, provider):
+        """Good path: every package gets a node, every occurrence an edge."""
+        graph = resolve_graph(provider, "root")
+
+        assert set(graph.nodes) == {"root", "a", "b", "c", "d"}
+        assert graph.nodes["b"].is_packaged is False
+        assert [e.child for e in graph.children("root")] == ["a", "b"]
+        assert [(e.child, e.kind) for e in graph.children("b")] == [("c", "visited")]
+
+    @pytest.mark.unit
+    def test_edges_carry_requirement_and_optional(self):
+        """Good path: edges keep the requirement and optional flag."""
+        p = MockProvider()
+        p.add("root", deps=["opt"], optional=["opt"])
+        p.add("opt")
+
+        graph = resolve_graph(p, "root", include_optional=True)
+        edge = graph.children("root")[0]
+
+        assert edge.requirement == "*"
+        assert edge.optional is True
+
+    @pytest.mark.unit
+    def test_depth_first_graph_has_same_nodes(self, provider):
+        """Critical path: build_graph discovers the same packages."""
+        assert set(build_graph(provider, "root").nodes) == set(
+            resolve_graph(provider, "root").nodes
+        )
+
+    @pytest.mark.unit
+    def test_not_found_root(self, provider):
+        """Bad path: a missing root is recorded as a not-found node."""
+        graph = resolve_graph(provider, "nonexistent")
+
+        assert graph.status(graph.root_edge) == "not_found"
+
+
+class TestAnnotateReleases:
+    """Tests for the multi-release matrix annotation."""
+
+    @pytest.mark.unit
+    def test_records_status_per_release(self, provider, mocker):
+        """Good path: each release gets its own status without re-resolving."""
+        graph = resolve_graph(provider, "root")
+        fetch = mocker.spy(provider, "fetch_package_info")
+        seen = []
+
+        def check(self, name):
+            seen.append(self.fedora_release)
+            packaged = name != "b" or self.fedora_release == "42"
+            return FedoraPackageStatus(
+                is_packaged=packaged, versions=["1.0.0"] if packaged else []
+            )
+
+        mocker.patch.object(MockProvider, "check_fedora_packaging", check)
+        annotate_releases(provider, graph, ["41", "42"])
+
+        assert graph.releases == ["41", "42"]
+        assert graph.nodes["b"].releases["41"].is_packaged is False
+        assert graph.nodes["b"].releases["42"].versions == ["1.0.0"]
+        assert set(seen) == {"41", "42"}
+        fetch.assert_not_called()
+
+    @pytest.mark.unit
+    def test_prefetches_once_per_release(self, provider, mocker):
+        """Critical path: one batched prefetch per release."""
+        graph = resolve_graph(provider, "root")
+        spy = mocker.spy(provider, "prefetch_fedora_packaging")
+
+        annotate_releases(provider, graph, ["41", "42", "rawhide"])
+
+        assert spy.call_count == 3
+        assert sorted(spy.call_args_list[0].args[0]) == ["a", "b", "c", "d", "root"]
+
+    @pytest.mark.unit
+    def test_leaves_provider_release(self, provider, mocker):
+        """Critical path: the provider's own release is never changed."""
+        provider.fedora_release = "40"
+        graph = resolve_graph(provider, "root")
+        seen = []
+
+        def check(self, name):
+            seen.append(provider.fedora_release)
+            if self.fedora_release == "42":
+                raise RuntimeError("dnf failed")
+            return FedoraPackageStatus(is_packaged=True)
+
+        mocker.patch.object(MockProvider, "check_fedora_packaging", check)
+
+        annotate_releases(provider, graph, ["41"])
+        with pytest.raises(RuntimeError):
+            annotate_releases(provider, graph, ["42"])
+
+        assert provider.fedora_release == "40"
+        assert set(seen) == {"40"}
+
+    @pytest.mark.unit
+    def test_skips_not_found_packages(self, provider):
+        """Bad path: packages missing upstream get no release status."""
+        graph = resolve_graph(provider, "nonexistent")
+
+        annotate_releases(provider, graph, ["41"])
+
+        assert graph.nodes["nonexistent"].releases == {}
+
+
+class TestBuildGraphIterative:
+    """Tests for the explicit-stack depth-first traversal."""
+
+    @pytest.mark.unit
+    def test_depth_first_visit_order(self, provider):
+        """Critical path: packages are visited in recursive pre-order."""
+        visited = {}
+
+        build_graph(provider, "root", visited=visited)
+
+        assert list(visited) == ["root", "a", "c", "d", "b"]
+
+    @pytest.mark.unit
+    def test_visited_markers_match_recursive_walk(self, provider):
+        """Critical path: later occurrences become visited edges."""
+        graph = build_graph(provider, "root")
+
+        assert [(e.child, e.kind) for e in graph.children("a")] == [
+            ("c", "expanded"),
+            ("d", "visited"),
+        ]
+        assert [(e.child, e.kind) for e in graph.children("c")] == [("d", "expanded")]
+        assert [(e.child, e.kind) for e in graph.children("b")] == [("c", "visited")]
+
+    @pytest.mark.unit
+    def test_deep_chain_does_not_recurse(self):
+        """Critical path: chains deeper than the recursion limit resolve."""
+        depth = sys.getrecursionlimit() + 500
+        p = MockProvider()
+        for i in range(depth):
+            p.add(f"pkg-{i}", deps=[f"pkg-{i + 1}"])
+        p.add(f"pkg-{depth}")
+
+        graph = build_graph(p, "pkg-0", max_depth=depth + 1)
+        tree = render_rich_tree(graph)
+
+        assert len(graph.nodes) == depth + 1
+        assert isinstance(tree, Tree)
+
+    @pytest.mark.unit
+    def test_max_depth_on_chain(self):
+        """Bad path: the chain is cut off at max_depth."""
+        p = MockProvider()
+        for i in range(10):
+            p.add(f"pkg-{i}", deps=[f"pkg-{i + 1}"])
+
+        graph = build_graph(p, "pkg-0", max_depth=3)
+
+        assert set(graph.nodes) == {"pkg-0", "pkg-1", "pkg-2", "pkg-3"}
+        assert graph.children("pkg-3")[0].kind == "max_depth"
+
+
+class TestResolveTreeAsync:
+    """Tests for resolve_tree_async and aresolve_package."""
+
+    @pytest.mark.unit
+    def test_aresolve_package_matches_sync(self, provider):
+        """Good path: async resolution returns the same data as the sync one."""
+        resolved = asyncio.run(aresolve_package(provider, "a"))
+
+        assert resolved == resolve_package(provider, "a")
+
+    @pytest.mark.unit
+    def test_aresolve_package_not_found(self, provider):
+        """Bad path: status is None when the package does not exist."""
+        resolved = asyncio.run(aresolve_package(provider, "nonexistent"))
+
+        assert resolved.status is None
+
+    @pytest.mark.unit
+    def test_same_tree_as_threaded_engine(self, provider):
+        """Critical path: both engines produce identical trees and visited."""
+        threaded_visited, async_visited = {}, {}
+
+        threaded = resolve_tree(provider, "root", visited=threaded_visited)
+        async_tree = resolve_tree_async(provider, "root", visited=async_visited)
+
+        assert _shape(threaded) == _shape(async_tree)
+        assert list(threaded_visited.items()) == list(async_visited.items())
+
+    @pytest.mark.unit
+    def test_uses_async_provider_methods(self, provider, mocker):
+        """Good path: the async engine goes through the afetch_* methods."""
+        spy = mocker.spy(provider, "afetch_package_info")
+
+        resolve_tree_async(provider, "root")
+
+        assert {call.args[0] for call in spy.call_args_list} == {
+            "root",
+            "a",
+            "b",
+            "c",
+            "d",
+        }
+
+    @pytest.mark.unit
+    def test_closes_async_http_client(self, provider, mocker):
+        """Good path: the per-loop HTTP client is closed when done."""
+        aclose = mocker.patch("woolly.http.aclose", new_callable=mocker.AsyncMock)
+
+        resolve_tree_async(provider, "root")
+
+        aclose.assert_awaited_once()
@@ -1,18 +1,129 @@
 """
 Disk cache helpers for storing API and repoquery results.
+
+Entries are stored by a :class:`CacheBackend`.  The default
+:class:`JsonCacheBackend` keeps one ``<namespace>/<md5>.json`` file per
+key (``.bin`` for binary-encoded entries); :class:`SqliteCacheBackend` keeps every entry in a single SQLite
+database instead, which avoids one inode and one JSON parse of the
+envelope per entry on large caches.  The backend is chosen with the
+``WOOLLY_CACHE_BACKEND`` environment variable (``json`` or ``sqlite``)
+or :func:`set_cache_backend`; :func:`read_cache`, :func:`write_cache`
+and :func:`clear_cache` delegate to it.
+
+Each namespace picks an on-disk encoding (:func:`set_cache_encoding`):
+the JSON envelope, or a small binary header followed by a zlib/lzma
+compressed compact JSON or marshal payload, which is decoded without
+pydantic validation.  Entries are self-describing, so changing the
+encoding of a namespace does not invalidate what is already cached.
+
+Entries derived from an HTTP response also record its ``ETag`` and
+``Last-Modified`` headers, so that once they expire the registry can be
+asked whether the document changed (:func:`read_cache_entry`) and an
+unchanged one restamped in place (:func:`touch_cache`).
+
+In front of the backend sits a bounded in-process LRU of decoded
+entries (:class:`MemoryCache`), so a key read several times during one
+run only touches the disk once.
+
+Expired entries are not removed by reads; :func:`gc_cache` purges them
+and evicts the least recently accessed entries of namespaces over their
+size budget (:func:`set_cache_size_limit` or ``WOOLLY_CACHE_MAX_SIZE``),
+and :func:`cache_stats` reports usage and hit ratios per namespace.
+
+Writes are atomic (JSON files are written to a temporary file and
+renamed into place; SQLite writes are transactions), so concurrent
+readers never see a partial entry.  In shared mode
+(``WOOLLY_CACHE_SHARED=1`` or :func:`set_cache_shared`) a miss is filled
+under an advisory per-key :class:`CacheLock` (see :func:`cache_fill_lock`),
+so threads and sibling processes sharing the cache directory fetch each
+key once instead of racing to fetch it.
+
+In stale-while-revalidate mode (``WOOLLY_CACHE_STALE=1`` or
+:func:`set_stale_while_revalidate`), :func:`read_cache` answers from
+expired registry entries straight away when the caller can refresh them,
+and runs the refresh on a background worker pool; :func:`stale_reads`
+counts those answers and :func:`wait_for_refreshes` drains the pool.
 """
 
+import asyncio
 import hashlib
 import json
+import lzma
+import marshal
+import os
+import sqlite3
+import struct
+import tempfile
+import threading
 import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict, defaultdict
+from collections.abc import AsyncIterator, Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from contextlib import asynccontextmanager, contextmanager, suppress
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Optional, Union
 
 from pydantic import BaseModel, Field, ValidationError
 
+from woolly.debug import log
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
 CACHE_DIR = Path.home() / ".cache" / "woolly"
 DEFAULT_CACHE_TTL = 86400 * 7  # 7 days
 FEDORA_CACHE_TTL = 86400  # 1 day for Fedora repoquery data
+# Fedora data keyed by the repo metadata revision is only a safety bound away
+# from expiring: a new revision changes the keys.
+FEDORA_REVISION_TTL = DEFAULT_CACHE_TTL
+# How long a revision reported by ``dnf repoinfo`` is trusted
+FEDORA_REVISION_CHECK_TTL = 3600
+
+# TTL used to purge each namespace; DEFAULT_CACHE_TTL for the others
+NAMESPACE_TTLS: dict[str, int] = {"fedora": FEDORA_REVISION_TTL}
+
+# Namespace holding the change feed states (see woolly.feeds)
+FEED_STATE_NAMESPACE = "feeds"
+
+CACHE_BACKEND_ENV = "WOOLLY_CACHE_BACKEND"
+CACHE_ENCODING_ENV = "WOOLLY_CACHE_ENCODING"
+CACHE_MAX_SIZE_ENV = "WOOLLY_CACHE_MAX_SIZE"
+CACHE_STATS_NAME = "stats.json"
+CACHE_SHARED_ENV = "WOOLLY_CACHE_SHARED"
+CACHE_STALE_ENV = "WOOLLY_CACHE_STALE"
+
+# Namespaces whose expired entries may be served while being refreshed
+STALE_NAMESPACES = frozenset({"crates", "pypi"})
+DEFAULT_REFRESH_WORKERS = 4
+
+# Seconds to wait for another writer to fill a key before fetching it
+# anyway; covers a writer that hangs or was killed mid-fetch.
+CACHE_LOCK_TIMEOUT = 60.0
+_LOCK_POLL_INTERVAL = 0.05
+
+# Keys are hashed onto this many lock slots per namespace (byte ranges
+# of ``CACHE_DIR/<namespace>.lock``), so no lock file is left per key.
+_LOCK_SLOTS = 4096
+
+# Access times are only refreshed when older than this, so that reads
+# do not turn into writes.
+_ACCESS_RESOLUTION = 3600
+
+# (label, upper bound in seconds) of the age histogram buckets
+AGE_BUCKETS: list[tuple[str, float]] = [
+    ("<1h", 3600),
+    ("<1d", 86400),
+    ("<7d", 86400 * 7),
+    ("<30d", 86400 * 30),
+    ("older", float("inf")),
+]
+CACHE_DB_NAME = "cache.sqlite3"
+DEFAULT_MEMORY_CACHE_ENTRIES = 4096
 
 # Track which namespace directories have already been created so that
 # ``mkdir`` is only called once per namespace per process lifetime.
@@ -24,6 +135,54 @@ class CacheEntry(BaseModel):
 
     timestamp: float = Field(default_factory=time.time)
     value: Any
+    # HTTP validators of the response the value was derived from
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def expired(self, ttl: float) -> bool:
+        """Whether the entry is older than *ttl* seconds."""
+        return time.time() - self.timestamp > ttl
+
+
+class CacheEntryInfo(BaseModel):
+    """Bookkeeping data of one stored entry, as listed by a backend."""
+
+    namespace: str
+    key: str  # backend-level key (digest of the cache key)
+    size: int
+    timestamp: float
+    accessed: float
+
+
+class NamespaceStats(BaseModel):
+    """Usage of one cache namespace."""
+
+    namespace: str
+    entries: int = 0
+    size_bytes: int = 0
+    expired: int = 0
+    ages: dict[str, int] = Field(
+        default_factory=lambda: {label: 0 for label, _ in AGE_BUCKETS}
+    )
+    hits: int = 0
+    misses: int = 0
+    max_size: Optional[int] = None
+
+    @property
+    def hit_ratio(self) -> Optional[float]:
+        """Share of reads answered from the cache, if any were recorded."""
+        total = self.hits + self.misses
+        return self.hits / total if total else None
+
+
+class GcResult(BaseModel):
+    """What :func:`gc_cache` removed from one namespace."""
+
+    namespace: str
+    expired: int = 0
+    evicted: int = 0
+    freed_bytes: int = 0
+    remaining_bytes: int = 0
 
 
 def ensure_cache_dir() -> None:
@@ -35,10 +194,15 @@ def ensure_cache_dir() -> None:
     CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
 
+def _key_digest(key: str) -> str:
+    return hashlib.md5(key.encode()).hexdigest()
+
+
 def get_cache_path(namespace: str, key: str) -> Path:
     """Get path for a cache entry.
 
-    Namespace directories are only created once per process lifetime
+    Entries in a binary encoding get a ``.bin`` suffix, so tools reading
+    the ``.json`` files never see them.  Namespace directories are only created once per process lifetime
     to avoid repeated filesystem calls.
     """
     if namespace not in _ensured_namespaces:
@@ -47,31 +211,1476 @@ def get_cache_path(namespace: str, key: str) -> Path:
         ns_dir.mkdir(exist_ok=True)
         _ensured_namespaces.add(namespace)
 
-    safe_key = hashlib.md5(key.encode()).hexdigest()
-    return CACHE_DIR / namespace / f"{safe_key}.json"
+    suffix = _JSON_SUFFIX if get_cache_encoding(namespace) == "json" else _BINARY_SUFFIX
+    return CACHE_DIR / namespace / f"{_key_digest(key)}{suffix}"
 
 
-def read_cache(namespace: str, key: str, ttl: int = DEFAULT_CACHE_TTL) -> Optional[Any]:
-    """Read from disk cache if not expired."""
+def _entry_paths(namespace: str, key: str) -> tuple[Path, Path]:
+    """The path of an entry in the current encoding, then in the other one."""
     path = get_cache_path(namespace, key)
-    if not path.exists():
-        return None
+    other = _BINARY_SUFFIX if path.suffix == _JSON_SUFFIX else _JSON_SUFFIX
+    return path, path.with_suffix(other)
+
+
+def _atomic_write(path: Path, data: bytes, mtime: Optional[float] = None) -> None:
+    """
+    Replace *path* with *data* so readers see either version, never a mix.
+
+    Args:
+        path: Destination file.
+        data: New content.
+        mtime: Access and modification time to give the file, if any.
+    """
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        if mtime is not None:
+            os.utime(tmp, (mtime, mtime))
+        os.replace(tmp, path)
+    except BaseException:
+        with suppress(OSError):
+            os.unlink(tmp)
+        raise
+
+
+# ----------------------------------------------------------------
+# Encoding
+# ----------------------------------------------------------------
+
+# Binary entries: magic, format version, codec id and timestamp, then
+# (since version 2) the length-prefixed JSON of the HTTP validators, then
+# the compressed payload.
+_BINARY_MAGIC = b"WLYC"
+_BINARY_HEADER = struct.Struct(">4sBBd")
+_VALIDATORS_LENGTH = struct.Struct(">H")
+CACHE_FORMAT_VERSION = 2
+_VALIDATOR_FIELDS = ("etag", "last_modified")
+
+
+def _compact_json(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+# encoding name -> (codec id, encode, decode)
+_CODECS: dict[str, tuple[int, Callable[[Any], bytes], Callable[[bytes], Any]]] = {
+    "zlib": (
+        1,
+        lambda value: zlib.compress(_compact_json(value)),
+        lambda payload: json.loads(zlib.decompress(payload)),
+    ),
+    "lzma": (
+        2,
+        lambda value: lzma.compress(_compact_json(value)),
+        lambda payload: json.loads(lzma.decompress(payload)),
+    ),
+    "marshal": (
+        3,
+        lambda value: zlib.compress(marshal.dumps(value)),
+        lambda payload: marshal.loads(zlib.decompress(payload)),
+    ),
+}
+_DECODERS = {codec_id: decode for codec_id, _, decode in _CODECS.values()}
+
+CACHE_ENCODINGS = ("json", *_CODECS)
+
+# Registry payloads are the bulk of the cache; see the cache benchmark
+# in tests/functional for the numbers behind this choice.  marshal is
+# faster still but opt-in: its format may change between Python versions
+# and it is not safe on crafted data, e.g. in a shared cache directory.
+DEFAULT_CACHE_ENCODINGS: dict[str, str] = {"pypi": "zlib", "crates": "zlib"}
+
+_JSON_SUFFIX = ".json"
+_BINARY_SUFFIX = ".bin"
+_ENTRY_GLOBS = (f"*{_JSON_SUFFIX}", f"*{_BINARY_SUFFIX}")
+
+_namespace_encodings: dict[str, str] = {}
+
+
+def set_cache_encoding(namespace: str, encoding: str) -> None:
+    """
+    Choose how new entries of *namespace* are written.
+
+    Args:
+        namespace: Cache namespace.
+        encoding: One of ``CACHE_ENCODINGS``.
+
+    Raises:
+        ValueError: If the encoding is unknown.
+    """
+    if encoding not in CACHE_ENCODINGS:
+        raise ValueError(
+            f"Unknown cache encoding {encoding!r} "
+            f"(available: {', '.join(CACHE_ENCODINGS)})"
+        )
+    _namespace_encodings[namespace] = encoding
+
+
+def _env_cache_encodings() -> dict[str, str]:
+    """Parse ``WOOLLY_CACHE_ENCODING``: ``"marshal"`` or ``"pypi=marshal,crates=lzma"``.
+
+    A bare encoding applies to every namespace and is stored under ``"*"``;
+    unknown encodings are ignored.
+    """
+    encodings: dict[str, str] = {}
+    for item in os.environ.get(CACHE_ENCODING_ENV, "").split(","):
+        namespace, _, encoding = item.rpartition("=")
+        if encoding.strip() in CACHE_ENCODINGS:
+            encodings[namespace.strip() or "*"] = encoding.strip()
+    return encodings
+
+
+def get_cache_encoding(namespace: str) -> str:
+    """Get the encoding new entries of *namespace* are written with."""
+    if namespace in _namespace_encodings:
+        return _namespace_encodings[namespace]
+    env = _env_cache_encodings()
+    for name in (namespace, "*"):
+        if name in env:
+            return env[name]
+    return DEFAULT_CACHE_ENCODINGS.get(namespace, "json")
+
+
+def encode_entry(entry: CacheEntry, encoding: str = "json") -> bytes:
+    """
+    Serialize an entry.
+
+    Args:
+        entry: Entry to serialize.
+        encoding: One of ``CACHE_ENCODINGS``.
+
+    Returns:
+        The JSON envelope, or the binary header and compressed payload.
+    """
+    if encoding == "json":
+        return entry.model_dump_json(exclude_none=True).encode()
+    codec_id, encode, _ = _CODECS[encoding]
+    header = _BINARY_HEADER.pack(
+        _BINARY_MAGIC, CACHE_FORMAT_VERSION, codec_id, entry.timestamp
+    )
+    validators = {
+        name: getattr(entry, name)
+        for name in _VALIDATOR_FIELDS
+        if getattr(entry, name) is not None
+    }
+    block = _compact_json(validators) if validators else b""
+    return header + _VALIDATORS_LENGTH.pack(len(block)) + block + encode(entry.value)
+
+
+def decode_entry(data: bytes) -> Optional[CacheEntry]:
+    """
+    Deserialize an entry written by :func:`encode_entry` with any encoding.
+
+    Args:
+        data: Serialized entry.
+
+    Returns:
+        The entry, or None if the data is corrupted or was written by an
+        unknown format version.
+    """
+    if not data.startswith(_BINARY_MAGIC):
+        try:
+            return CacheEntry.model_validate_json(data)
+        except ValidationError:
+            return None
 
     try:
-        data = json.loads(path.read_text())
-        entry = CacheEntry.model_validate(data)
-        if time.time() - entry.timestamp > ttl:
-            return None  # Expired
+        _, version, codec_id, timestamp = _BINARY_HEADER.unpack_from(data)
+        decode = _DECODERS.get(codec_id)
+        if version not in (1, CACHE_FORMAT_VERSION) or decode is None:
+            return None
+        offset = _BINARY_HEADER.size
+        validators: dict[str, str] = {}
+        if version >= 2:
+            (length,) = _VALIDATORS_LENGTH.unpack_from(data, offset)
+            offset += _VALIDATORS_LENGTH.size
+            if length:
+                validators = json.loads(data[offset : offset + length])
+            offset += length
+        value = decode(data[offset:])
+    except (struct.error, zlib.error, lzma.LZMAError, ValueError, EOFError, TypeError):
+        return None
+    # Trusted data written by encode_entry: skip validation
+    return CacheEntry.model_construct(timestamp=timestamp, value=value, **validators)
+
+
+# ----------------------------------------------------------------
+# Backends
+# ----------------------------------------------------------------
+
+
+class CacheBackend(ABC):
+    """
+    Abstract storage for cache entries.
+
+    Attributes:
+        name: Short identifier used to select the backend (e.g., "json").
+    """
+
+    name: str
+
+    @abstractmethod
+    def read_entry(self, namespace: str, key: str) -> Optional[CacheEntry]:
+        """
+        Read an entry regardless of its age.
+
+        Args:
+            namespace: Cache namespace (e.g., "pypi", "fedora").
+            key: Entry key within the namespace.
+
+        Returns:
+            The entry, or None if missing or unreadable.
+        """
+        pass
+
+    @abstractmethod
+    def write_entry(self, namespace: str, key: str, entry: CacheEntry) -> None:
+        """
+        Store an entry, replacing any previous one.
+
+        Args:
+            namespace: Cache namespace.
+            key: Entry key within the namespace.
+            entry: Entry holding a JSON-serializable value.
+        """
+        pass
+
+    def read(self, namespace: str, key: str, ttl: int) -> Optional[Any]:
+        """
+        Read a value if present and not older than *ttl* seconds.
+
+        Args:
+            namespace: Cache namespace.
+            key: Entry key within the namespace.
+            ttl: Maximum age of the entry in seconds.
+
+        Returns:
+            The cached value, or None if missing, expired or unreadable.
+        """
+        entry = self.read_entry(namespace, key)
+        if entry is None or entry.expired(ttl):
+            return None
         return entry.value
-    except (json.JSONDecodeError, KeyError, ValidationError):
+
+    def write(self, namespace: str, key: str, value: Any) -> None:
+        """Store a value stamped with the current time."""
+        self.write_entry(namespace, key, CacheEntry(value=value))
+
+    @abstractmethod
+    def clear(self, namespace: Optional[str] = None) -> list[str]:
+        """
+        Delete cached entries.
+
+        Args:
+            namespace: Specific namespace to clear, or None for all.
+
+        Returns:
+            List of namespaces that were cleared.
+        """
+        pass
+
+    @abstractmethod
+    def scan(self, namespace: Optional[str] = None) -> Iterator[CacheEntryInfo]:
+        """
+        List stored entries without decoding them.
+
+        Args:
+            namespace: Specific namespace to list, or None for all.
+
+        Yields:
+            Size, write time and last access time of every entry.
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, namespace: str, keys: list[str]) -> None:
+        """
+        Delete entries listed by :meth:`scan`.
+
+        Args:
+            namespace: Cache namespace.
+            keys: Backend-level keys (``CacheEntryInfo.key``).
+        """
+        pass
+
+    def compact(self) -> None:
+        """Give the space of deleted entries back to the filesystem."""
+
+
+class JsonCacheBackend(CacheBackend):
+    """
+    One JSON file per entry under ``CACHE_DIR/<namespace>/``.
+
+    A file's mtime is its entry's timestamp and its atime the last access,
+    so :meth:`scan` only needs a ``stat`` per entry.
+    """
+
+    name = "json"
+
+    def read_entry(self, namespace: str, key: str) -> Optional[CacheEntry]:
+        # Entries written before the namespace's encoding changed keep
+        # the other suffix
+        for path in _entry_paths(namespace, key):
+            try:
+                data = path.read_bytes()
+                # atime is not reliably updated by reads (noatime/relatime)
+                st = path.stat()
+                now = time.time()
+                if now - st.st_atime > _ACCESS_RESOLUTION:
+                    os.utime(path, (now, st.st_mtime))
+            except OSError:
+                continue
+            return decode_entry(data)
         return None
 
+    def write_entry(self, namespace: str, key: str, entry: CacheEntry) -> None:
+        path, other = _entry_paths(namespace, key)
+        _atomic_write(
+            path,
+            encode_entry(entry, get_cache_encoding(namespace)),
+            mtime=entry.timestamp,
+        )
+        other.unlink(missing_ok=True)
+
+    def clear(self, namespace: Optional[str] = None) -> list[str]:
+        cleared = []
+
+        if namespace:
+            cache_path = CACHE_DIR / namespace
+            if cache_path.exists():
+                for pattern in _ENTRY_GLOBS:
+                    for f in cache_path.glob(pattern):
+                        f.unlink()
+                cleared.append(namespace)
+        else:
+            if CACHE_DIR.exists():
+                for ns_dir in CACHE_DIR.iterdir():
+                    if ns_dir.is_dir():
+                        for pattern in _ENTRY_GLOBS:
+                            for f in ns_dir.glob(pattern):
+                                f.unlink()
+                        cleared.append(ns_dir.name)
+
+        return cleared
+
+    def scan(self, namespace: Optional[str] = None) -> Iterator[CacheEntryInfo]:
+        if namespace:
+            ns_dirs = [CACHE_DIR / namespace]
+        elif CACHE_DIR.exists():
+            ns_dirs = sorted(p for p in CACHE_DIR.iterdir() if p.is_dir())
+        else:
+            ns_dirs = []
+        for ns_dir in ns_dirs:
+            paths = [path for pattern in _ENTRY_GLOBS for path in ns_dir.glob(pattern)]
+            for path in paths:
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue  # removed concurrently
+                yield CacheEntryInfo(
+                    namespace=ns_dir.name,
+                    key=path.stem,
+                    size=st.st_size,
+                    timestamp=st.st_mtime,
+                    accessed=st.st_atime,
+                )
+
+    def delete(self, namespace: str, keys: list[str]) -> None:
+        for key in keys:
+            for suffix in (_JSON_SUFFIX, _BINARY_SUFFIX):
+                (CACHE_DIR / namespace / f"{key}{suffix}").unlink(missing_ok=True)
+
+    def compact(self) -> None:
+        # Temporary files left behind by writers that were killed
+        cutoff = time.time() - _ACCESS_RESOLUTION
+        for path in CACHE_DIR.glob("*/.*.tmp"):
+            with suppress(OSError):
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    value NOT NULL,
+    accessed REAL NOT NULL DEFAULT 0,
+    etag TEXT,
+    last_modified TEXT,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class SqliteCacheBackend(CacheBackend):
+    """
+    All entries in one SQLite database (``CACHE_DIR/cache.sqlite3``).
+
+    The database runs in WAL mode so concurrent readers never block on a
+    writer.  Entries are keyed by ``(namespace, md5(key))``, the same
+    digest the JSON backend uses as file name, so that an existing JSON
+    cache is imported as is the first time the database is opened.
+    Each thread gets its own connection.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Args:
+            path: Database file; defaults to ``CACHE_DIR/cache.sqlite3``
+                resolved on every connection.
+        """
+        self._path = path
+        self._local = threading.local()
+
+    @property
+    def path(self) -> Path:
+        """Location of the database file."""
+        return self._path or CACHE_DIR / CACHE_DB_NAME
+
+    def _connect(self) -> sqlite3.Connection:
+        path = self.path
+        connections: dict[Path, sqlite3.Connection] = self._local.__dict__.setdefault(
+            "connections", {}
+        )
+        conn = connections.get(path)
+        if conn is not None:
+            return conn
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SQLITE_SCHEMA)
+        self._upgrade_schema(conn)
+        connections[path] = conn
+        self._migrate_json(conn, path.parent)
+        return conn
+
+    @staticmethod
+    def _upgrade_schema(conn: sqlite3.Connection) -> None:
+        """Add the columns missing from databases created by older versions."""
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(entries)")}
+            if "accessed" not in columns:
+                conn.execute(
+                    "ALTER TABLE entries ADD COLUMN accessed REAL NOT NULL DEFAULT 0"
+                )
+                conn.execute("UPDATE entries SET accessed = timestamp")
+            for column in _VALIDATOR_FIELDS:
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE entries ADD COLUMN {column} TEXT")
+
+    def _migrate_json(self, conn: sqlite3.Connection, cache_dir: Path) -> None:
+        """Import and remove the JSON files under *cache_dir*, once."""
+        with conn:
+            # BEGIN IMMEDIATE: only one process performs the import
+            conn.execute("BEGIN IMMEDIATE")
+            done = conn.execute(
+                "SELECT 1 FROM meta WHERE name = 'json_migrated'"
+            ).fetchone()
+            if done:
+                return
+            migrated: list[Path] = []
+            paths = [
+                path
+                for pattern in _ENTRY_GLOBS
+                for path in cache_dir.glob(f"*/{pattern}")
+            ]
+            for path in paths:
+                try:
+                    entry = decode_entry(path.read_bytes())
+                except OSError:
+                    continue
+                if entry is None:
+                    continue
+                namespace = path.parent.name
+                conn.execute(
+                    f"INSERT OR IGNORE INTO entries {self._INSERT_COLUMNS}",
+                    self._row(namespace, path.stem, entry),
+                )
+                migrated.append(path)
+            conn.execute(
+                "INSERT INTO meta VALUES ('json_migrated', ?)", (str(time.time()),)
+            )
+
+        for path in migrated:
+            path.unlink(missing_ok=True)
+        for ns_dir in {path.parent for path in migrated}:
+            try:
+                ns_dir.rmdir()
+            except OSError:
+                pass  # not empty
+
+    def read_entry(self, namespace: str, key: str) -> Optional[CacheEntry]:
+        digest = _key_digest(key)
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT timestamp, value, accessed, etag, last_modified FROM entries "
+                "WHERE namespace = ? AND key = ?",
+                (namespace, digest),
+            ).fetchone()
+            now = time.time()
+            if row is not None and now - row[2] > _ACCESS_RESOLUTION:
+                conn.execute(
+                    "UPDATE entries SET accessed = ? WHERE namespace = ? AND key = ?",
+                    (now, namespace, digest),
+                )
+        except sqlite3.DatabaseError:
+            return None
+        if row is None:
+            return None
+
+        timestamp, value, _, etag, last_modified = row
+        if isinstance(value, bytes):
+            return decode_entry(value)
+        try:
+            return CacheEntry.model_construct(
+                timestamp=timestamp,
+                value=json.loads(value),
+                etag=etag,
+                last_modified=last_modified,
+            )
+        except json.JSONDecodeError:
+            return None
+
+    @staticmethod
+    def _encode_value(namespace: str, entry: CacheEntry) -> Union[str, bytes]:
+        """JSON text of the value, or a binary entry (stored as a BLOB)."""
+        encoding = get_cache_encoding(namespace)
+        if encoding == "json":
+            return json.dumps(entry.value)
+        return encode_entry(entry, encoding)
+
+    _INSERT_COLUMNS = (
+        "(namespace, key, timestamp, value, accessed, etag, last_modified) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)"
+    )
+
+    def _row(self, namespace: str, digest: str, entry: CacheEntry) -> tuple:
+        """Column values of an entry, in ``_INSERT_COLUMNS`` order."""
+        return (
+            namespace,
+            digest,
+            entry.timestamp,
+            self._encode_value(namespace, entry),
+            entry.timestamp,
+            entry.etag,
+            entry.last_modified,
+        )
+
+    def write_entry(self, namespace: str, key: str, entry: CacheEntry) -> None:
+        self._connect().execute(
+            f"INSERT OR REPLACE INTO entries {self._INSERT_COLUMNS}",
+            self._row(namespace, _key_digest(key), entry),
+        )
+
+    def clear(self, namespace: Optional[str] = None) -> list[str]:
+        conn = self._connect()
+        if namespace:
+            cleared = conn.execute(
+                "SELECT DISTINCT namespace FROM entries WHERE namespace = ?",
+                (namespace,),
+            ).fetchall()
+            conn.execute("DELETE FROM entries WHERE namespace = ?", (namespace,))
+        else:
+            cleared = conn.execute(
+                "SELECT DISTINCT namespace FROM entries ORDER BY namespace"
+            ).fetchall()
+            conn.execute("DELETE FROM entries")
+        return [row[0] for row in cleared]
+
+    def scan(self, namespace: Optional[str] = None) -> Iterator[CacheEntryInfo]:
+        query = "SELECT namespace, key, length(value), timestamp, accessed FROM entries"
+        params: tuple[str, ...] = ()
+        if namespace:
+            query += " WHERE namespace = ?"
+            params = (namespace,)
+        for ns, key, size, timestamp, accessed in self._connect().execute(
+            query + " ORDER BY namespace", params
+        ):
+            yield CacheEntryInfo(
+                namespace=ns, key=key, size=size, timestamp=timestamp, accessed=accessed
+            )
+
+    def delete(self, namespace: str, keys: list[str]) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN")
+            conn.executemany(
+                "DELETE FROM entries WHERE namespace = ? AND key = ?",
+                [(namespace, key) for key in keys],
+            )
+
+    def compact(self) -> None:
+        conn = self._connect()
+        conn.execute("VACUUM")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+CACHE_BACKENDS: dict[str, type[CacheBackend]] = {
+    "json": JsonCacheBackend,
+    "sqlite": SqliteCacheBackend,
+}
+
+_backend: Optional[CacheBackend] = None
+
+
+def set_cache_backend(backend: Optional[Union[str, CacheBackend]]) -> None:
+    """
+    Select the cache backend used by the module-level helpers.
+
+    Args:
+        backend: A backend name from ``CACHE_BACKENDS``, an instance, or
+            None to go back to the ``WOOLLY_CACHE_BACKEND`` default.
+
+    Raises:
+        ValueError: If the name is unknown.
+    """
+    global _backend
+    if isinstance(backend, str):
+        if backend not in CACHE_BACKENDS:
+            raise ValueError(
+                f"Unknown cache backend {backend!r} "
+                f"(available: {', '.join(CACHE_BACKENDS)})"
+            )
+        backend = CACHE_BACKENDS[backend]()
+    _backend = backend
+
+
+def get_cache_backend() -> CacheBackend:
+    """Get the active cache backend, creating it from the environment."""
+    if _backend is None:
+        set_cache_backend(os.environ.get(CACHE_BACKEND_ENV) or "json")
+    return _backend
+
+
+# ----------------------------------------------------------------
+# Memory tier
+# ----------------------------------------------------------------
+
+
+class MemoryCacheStats(BaseModel):
+    """Counters of the in-process memory tier."""
+
+    hits: int = 0
+    misses: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+
+class MemoryCache:
+    """
+    Bounded LRU of decoded cache entries keyed by ``(namespace, key)``.
+
+    Values are shared between callers and must be treated as read-only.
+    The budget is a number of entries, a number of bytes (measured as the
+    length of the JSON-encoded value), or both; the least recently used
+    entries are evicted first.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = DEFAULT_MEMORY_CACHE_ENTRIES,
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        Args:
+            max_entries: Maximum number of entries, or None for no limit.
+            max_bytes: Maximum total size of the values, or None for no
+                limit.  Setting either limit to 0 disables the tier.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, str], tuple[CacheEntry, int]] = (
+            OrderedDict()
+        )
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the tier holds anything at all."""
+        return self.max_entries != 0 and self.max_bytes != 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, namespace: str, key: str) -> Optional[CacheEntry]:
+        """
+        Look up an entry and mark it as recently used.
+
+        Args:
+            namespace: Cache namespace.
+            key: Entry key within the namespace.
+
+        Returns:
+            The entry, or None (counted as a miss) if not held.
+        """
+        with self._lock:
+            item = self._entries.get((namespace, key))
+            if item is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((namespace, key))
+            self.hits += 1
+            return item[0]
+
+    def put(self, namespace: str, key: str, entry: CacheEntry) -> None:
+        """
+        Store an entry, evicting the least recently used ones over budget.
+
+        Args:
+            namespace: Cache namespace.
+            key: Entry key within the namespace.
+            entry: Entry to hold.
+        """
+        if not self.enabled:
+            return
+        size = len(json.dumps(entry.value)) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            self.discard(namespace, key)
+            return
+
+        with self._lock:
+            previous = self._entries.pop((namespace, key), None)
+            if previous is not None:
+                self._size -= previous[1]
+            self._entries[(namespace, key)] = (entry, size)
+            self._size += size
+            while (
+                self.max_entries is not None and len(self._entries) > self.max_entries
+            ) or (self.max_bytes is not None and self._size > self.max_bytes):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+
+    def discard(self, namespace: str, key: str) -> None:
+        """Forget one entry if held."""
+        with self._lock:
+            item = self._entries.pop((namespace, key), None)
+            if item is not None:
+                self._size -= item[1]
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Forget all entries, or those of one namespace."""
+        with self._lock:
+            if namespace is None:
+                self._entries.clear()
+                self._size = 0
+                return
+            for ns_key in [k for k in self._entries if k[0] == namespace]:
+                self._size -= self._entries.pop(ns_key)[1]
+
+    def stats(self) -> MemoryCacheStats:
+        """Snapshot of the hit/miss counters and current usage."""
+        with self._lock:
+            return MemoryCacheStats(
+                hits=self.hits,
+                misses=self.misses,
+                entries=len(self._entries),
+                size_bytes=self._size,
+            )
+
+
+_memory = MemoryCache()
+
+
+def configure_memory_cache(
+    max_entries: Optional[int] = DEFAULT_MEMORY_CACHE_ENTRIES,
+    max_bytes: Optional[int] = None,
+) -> MemoryCache:
+    """
+    Replace the memory tier with an empty one using a new budget.
+
+    Args:
+        max_entries: Maximum number of entries, or None for no limit.
+        max_bytes: Maximum total size of the values, or None for no limit.
+
+    Returns:
+        The new memory tier.
+    """
+    global _memory
+    _memory = MemoryCache(max_entries=max_entries, max_bytes=max_bytes)
+    return _memory
+
+
+def get_memory_cache() -> MemoryCache:
+    """Get the active in-process memory tier."""
+    return _memory
 
-def write_cache(namespace: str, key: str, value: Any) -> None:
-    """Write to disk cache."""
-    path = get_cache_path(namespace, key)
-    entry = CacheEntry(value=value)
-    path.write_text(entry.model_dump_json())
+
+# ----------------------------------------------------------------
+# Housekeeping
+# ----------------------------------------------------------------
+
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+_size_limits: dict[str, Optional[int]] = {}
+
+# namespace -> purge TTL set at runtime, e.g. by feed-driven invalidation
+_namespace_ttls: dict[str, float] = {}
+
+# namespace -> [hits, misses] recorded by read_cache since the last flush
+_counters: dict[str, list[int]] = defaultdict(lambda: [0, 0])
+_counters_lock = threading.Lock()
+
+
+def parse_size(text: str) -> int:
+    """
+    Parse a size such as ``"500M"``, ``"2G"``, ``"64k"`` or ``"1048576"``.
+
+    Args:
+        text: Number of bytes, optionally followed by K, M, G or T
+            (binary multiples, case-insensitive, optional trailing B).
+
+    Returns:
+        The size in bytes.
+
+    Raises:
+        ValueError: If the text is not a size.
+    """
+    value = text.strip().upper().removesuffix("B")
+    unit = value[-1:] if value[-1:] in _SIZE_UNITS else ""
+    number = value[: len(value) - len(unit)]
+    try:
+        return int(float(number) * _SIZE_UNITS[unit])
+    except ValueError:
+        raise ValueError(f"Invalid size {text!r}") from None
+
+
+def _env_size_limits() -> dict[str, int]:
+    """Parse ``WOOLLY_CACHE_MAX_SIZE``: ``"500M"`` or ``"crates=1G,pypi=200M"``.
+
+    A bare size applies to every namespace and is stored under ``"*"``.
+    """
+    limits: dict[str, int] = {}
+    for item in os.environ.get(CACHE_MAX_SIZE_ENV, "").split(","):
+        if not item.strip():
+            continue
+        namespace, _, size = item.rpartition("=")
+        limits[namespace.strip() or "*"] = parse_size(size)
+    return limits
+
+
+def set_cache_size_limit(namespace: str, max_bytes: Optional[int]) -> None:
+    """
+    Set the size budget :func:`gc_cache` enforces for a namespace.
+
+    Args:
+        namespace: Cache namespace, or ``"*"`` for the default of all
+            namespaces without their own limit.
+        max_bytes: Budget in bytes, or None for no limit.
+    """
+    _size_limits[namespace] = max_bytes
+
+
+def get_cache_size_limit(namespace: str) -> Optional[int]:
+    """Get the size budget of a namespace, or None if unlimited."""
+    for source in (_size_limits, _env_size_limits()):
+        for name in (namespace, "*"):
+            if name in source:
+                return source[name]
+    return None
+
+
+def set_namespace_ttl(namespace: str, ttl: Optional[float]) -> None:
+    """
+    Set the TTL after which :func:`gc_cache` purges a namespace's entries.
+
+    Args:
+        namespace: Cache namespace.
+        ttl: Maximum age in seconds, or None for the default.
+    """
+    if ttl is None:
+        _namespace_ttls.pop(namespace, None)
+    else:
+        _namespace_ttls[namespace] = ttl
+
+
+def feed_baseline_ttl(baseline: float, now: Optional[float] = None) -> float:
+    """
+    TTL keeping every entry written since a change feed's baseline.
+
+    Entries of packages the feed did not report stay fresh indefinitely;
+    older entries keep the default TTL.
+
+    Args:
+        baseline: When the feed started tracking the namespace.
+        now: Current time; defaults to :func:`time.time`.
+    """
+    now = time.time() if now is None else now
+    return max(float(DEFAULT_CACHE_TTL), now - baseline)
+
+
+def namespace_ttl(namespace: str) -> float:
+    """
+    Get the TTL after which :func:`gc_cache` purges a namespace's entries.
+
+    Namespaces tracked by a change feed use the stored feed state, so
+    runs without ``--feed`` (and ``woolly cache gc``) keep the entries
+    the feed keeps fresh.
+    """
+    if namespace in _namespace_ttls:
+        return _namespace_ttls[namespace]
+    state = read_cache_entry(FEED_STATE_NAMESPACE, namespace)
+    if state is not None and isinstance(state.value, dict):
+        baseline = state.value.get("baseline")
+        if isinstance(baseline, (int, float)):
+            return feed_baseline_ttl(baseline)
+    return NAMESPACE_TTLS.get(namespace, DEFAULT_CACHE_TTL)
+
+
+def _record_read(namespace: str, hit: bool) -> None:
+    with _counters_lock:
+        _counters[namespace][0 if hit else 1] += 1
+
+
+def _load_counters() -> dict[str, dict[str, int]]:
+    try:
+        data = json.loads((CACHE_DIR / CACHE_STATS_NAME).read_text())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def flush_cache_counters() -> None:
+    """Add the hit/miss counts of this process to ``CACHE_DIR/stats.json``."""
+    with _counters_lock:
+        pending = {ns: counts for ns, counts in _counters.items() if any(counts)}
+        _counters.clear()
+    if not pending:
+        return
+
+    ensure_cache_dir()
+    # Concurrent runs flush at the same time; don't lose their counts
+    with CacheLock("stats", CACHE_STATS_NAME):
+        totals = _load_counters()
+        for namespace, (hits, misses) in pending.items():
+            counts = totals.setdefault(namespace, {"hits": 0, "misses": 0})
+            counts["hits"] = counts.get("hits", 0) + hits
+            counts["misses"] = counts.get("misses", 0) + misses
+        _atomic_write(CACHE_DIR / CACHE_STATS_NAME, json.dumps(totals).encode())
+
+
+def cache_stats(namespace: Optional[str] = None) -> list[NamespaceStats]:
+    """
+    Report entry counts, sizes, ages and hit ratios per namespace.
+
+    Args:
+        namespace: Specific namespace to report, or None for all.
+
+    Returns:
+        One NamespaceStats per namespace, sorted by name.
+    """
+    flush_cache_counters()
+    now = time.time()
+    stats: dict[str, NamespaceStats] = {}
+    for info in get_cache_backend().scan(namespace):
+        ns = stats.get(info.namespace)
+        if ns is None:
+            ns = stats[info.namespace] = NamespaceStats(namespace=info.namespace)
+        ns.entries += 1
+        ns.size_bytes += info.size
+        age = now - info.timestamp
+        if age > namespace_ttl(info.namespace):
+            ns.expired += 1
+        for label, bound in AGE_BUCKETS:
+            if age < bound:
+                ns.ages[label] += 1
+                break
+
+    for name, counts in _load_counters().items():
+        if namespace and name != namespace:
+            continue
+        ns = stats.setdefault(name, NamespaceStats(namespace=name))
+        ns.hits = counts.get("hits", 0)
+        ns.misses = counts.get("misses", 0)
+    for ns in stats.values():
+        ns.max_size = get_cache_size_limit(ns.namespace)
+    return [stats[name] for name in sorted(stats)]
+
+
+def gc_cache(
+    namespace: Optional[str] = None,
+    max_bytes: Optional[int] = None,
+    compact: bool = False,
+) -> list[GcResult]:
+    """
+    Purge expired entries and enforce the size budgets.
+
+    Entries older than their namespace's TTL (see :data:`NAMESPACE_TTLS`)
+    are deleted first; then, while a namespace is over its budget, its
+    least recently accessed entries are evicted.
+
+    Args:
+        namespace: Specific namespace to collect, or None for all.
+        max_bytes: Budget overriding the configured ones, or None to use
+            :func:`get_cache_size_limit`.
+        compact: Also give freed space back to the filesystem (rewrites
+            the SQLite database).
+
+    Returns:
+        One GcResult per namespace, sorted by name.
+    """
+    backend = get_cache_backend()
+    by_namespace: dict[str, list[CacheEntryInfo]] = defaultdict(list)
+    for info in backend.scan(namespace):
+        by_namespace[info.namespace].append(info)
+
+    now = time.time()
+    results = []
+    for name in sorted(by_namespace):
+        infos = by_namespace[name]
+        ttl = namespace_ttl(name)
+        expired = [info for info in infos if now - info.timestamp > ttl]
+        kept = [info for info in infos if now - info.timestamp <= ttl]
+
+        evicted = []
+        limit = max_bytes if max_bytes is not None else get_cache_size_limit(name)
+        remaining = sum(info.size for info in kept)
+        if limit is not None:
+            for info in sorted(kept, key=lambda info: info.accessed):
+                if remaining <= limit:
+                    break
+                evicted.append(info)
+                remaining -= info.size
+
+        doomed = expired + evicted
+        if doomed:
+            backend.delete(name, [info.key for info in doomed])
+            _memory.clear(name)
+        results.append(
+            GcResult(
+                namespace=name,
+                expired=len(expired),
+                evicted=len(evicted),
+                freed_bytes=sum(info.size for info in doomed),
+                remaining_bytes=remaining,
+            )
+        )
+
+    if compact:
+        backend.compact()
+    return results
+
+
+def cache_size_limits_configured() -> bool:
+    """Whether any namespace has a size budget."""
+    return any(v is not None for v in _size_limits.values()) or bool(_env_size_limits())
+
+
+# ----------------------------------------------------------------
+# Concurrent writers
+# ----------------------------------------------------------------
+
+_shared: Optional[bool] = None
+
+# (lock file, slot) -> lock serializing the threads of this process;
+# POSIX record locks only exclude other processes.
+_slot_locks: dict[tuple[str, int], threading.Lock] = {}
+# Lock file -> descriptor, open for the life of the process: closing
+# any descriptor of a file drops every record lock the process holds on it.
+_lock_fds: dict[str, int] = {}
+_lock_registry_lock = threading.Lock()
+
+
+def set_cache_shared(enabled: Optional[bool]) -> None:
+    """
+    Turn shared (concurrent-writer) mode on or off.
+
+    Args:
+        enabled: Whether misses are filled under a per-key lock, or None
+            to go back to the ``WOOLLY_CACHE_SHARED`` default.
+    """
+    global _shared
+    _shared = enabled
+
+
+def cache_shared_enabled() -> bool:
+    """Whether shared (concurrent-writer) mode is on."""
+    if _shared is None:
+        return os.environ.get(CACHE_SHARED_ENV, "").lower() in ("1", "true", "yes")
+    return _shared
+
+
+class CacheLock:
+    """
+    Advisory exclusive lock on one cache key.
+
+    Threads of this process are serialized by an in-process lock and
+    other processes by a ``fcntl`` record lock on the key's slot of
+    ``CACHE_DIR/<namespace>.lock``.  Where ``fcntl`` is unavailable only
+    threads are serialized.  Unrelated keys hashed onto the same slot
+    share a lock, which costs some waiting but never correctness.
+    """
+
+    def __init__(self, namespace: str, key: str, timeout: float = CACHE_LOCK_TIMEOUT):
+        """
+        Args:
+            namespace: Cache namespace.
+            key: Entry key within the namespace.
+            timeout: Seconds :meth:`acquire` waits before giving up.
+        """
+        self.path = str(CACHE_DIR / f"{namespace}.lock")
+        self.slot = int(_key_digest(key)[:8], 16) % _LOCK_SLOTS
+        self.timeout = timeout
+        self.locked = False
+        with _lock_registry_lock:
+            self._thread_lock = _slot_locks.setdefault(
+                (self.path, self.slot), threading.Lock()
+            )
+
+    def _fd(self) -> Optional[int]:
+        if fcntl is None:
+            return None
+        with _lock_registry_lock:
+            fd = _lock_fds.get(self.path)
+            if fd is None:
+                try:
+                    ensure_cache_dir()
+                    fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                except OSError:
+                    return None  # read-only cache: threads only
+                _lock_fds[self.path] = fd
+            return fd
+
+    def acquire(self) -> bool:
+        """
+        Wait for the lock.
+
+        Returns:
+            True once held, False if it could not be taken within the
+            timeout.
+        """
+        deadline = time.monotonic() + self.timeout
+        if not self._thread_lock.acquire(timeout=self.timeout):
+            return False
+        fd = self._fd()
+        while fd is not None:
+            try:
+                fcntl.lockf(fd, fcntl.LOCK_EX | fcntl.LOCK_NB, 1, self.slot)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    self._thread_lock.release()
+                    return False
+                time.sleep(_LOCK_POLL_INTERVAL)
+        self.locked = True
+        return True
+
+    def release(self) -> None:
+        """Release the lock if held."""
+        if not self.locked:
+            return
+        fd = self._fd()
+        if fd is not None:
+            fcntl.lockf(fd, fcntl.LOCK_UN, 1, self.slot)
+        self.locked = False
+        self._thread_lock.release()
+
+    def __enter__(self) -> "CacheLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+def _lookup(namespace: str, key: str, ttl: int) -> Optional[CacheEntry]:
+    """Find an unexpired entry in the memory tier, then on disk."""
+    entry = _memory.get(namespace, key)
+    if entry is None or entry.expired(ttl):
+        # Another process may have refreshed what the memory tier holds
+        entry = get_cache_backend().read_entry(namespace, key)
+        if entry is not None:
+            _memory.put(namespace, key, entry)
+    if entry is None or entry.expired(ttl):
+        return None
+    return entry
+
+
+@contextmanager
+def cache_fill_lock(
+    namespace: str, key: str, ttl: int = DEFAULT_CACHE_TTL
+) -> Iterator[Optional[Any]]:
+    """
+    Fill a missed key at most once across threads and processes.
+
+    Outside shared mode this yields None straight away.  In shared mode
+    the key's :class:`CacheLock` is held for the duration of the block,
+    and the value another writer stored while this one waited is yielded,
+    so the caller only fetches if it is still None::
+
+        with cache_fill_lock("crates", key) as filled:
+            if filled is not None:
+                return parse(filled)
+            write_cache("crates", key, fetch())
+
+    Args:
+        namespace: Cache namespace.
+        key: Entry key within the namespace.
+        ttl: Maximum age of a value filled by another writer.
+
+    Yields:
+        The value stored meanwhile, or None.
+    """
+    if not cache_shared_enabled():
+        yield None
+        return
+    lock = CacheLock(namespace, key)
+    lock.acquire()
+    try:
+        entry = _lookup(namespace, key, ttl)
+        yield entry.value if entry is not None else None
+    finally:
+        lock.release()
+
+
+@asynccontextmanager
+async def acache_fill_lock(
+    namespace: str, key: str, ttl: int = DEFAULT_CACHE_TTL
+) -> AsyncIterator[Optional[Any]]:
+    """Async counterpart of :func:`cache_fill_lock`; waits off the event loop."""
+    if not cache_shared_enabled():
+        yield None
+        return
+    lock = CacheLock(namespace, key)
+    await asyncio.to_thread(lock.acquire)
+    try:
+        entry = _lookup(namespace, key, ttl)
+        yield entry.value if entry is not None else None
+    finally:
+        lock.release()
+
+
+# ----------------------------------------------------------------
+# Stale-while-revalidate
+# ----------------------------------------------------------------
+
+_stale_mode: Optional[bool] = None
+_refresh_pool: Optional[ThreadPoolExecutor] = None
+# (namespace, key) -> pending refresh, so a key is refreshed once at a time
+_refreshing: dict[tuple[str, str], Future] = {}
+# namespace -> answers served from expired entries
+_stale_served: dict[str, int] = defaultdict(int)
+_refresh_lock = threading.Lock()
+
+
+def set_stale_while_revalidate(enabled: Optional[bool]) -> None:
+    """
+    Turn stale-while-revalidate mode on or off.
+
+    Args:
+        enabled: Whether expired registry entries are served while being
+            refreshed, or None to go back to the ``WOOLLY_CACHE_STALE``
+            default.
+    """
+    global _stale_mode
+    _stale_mode = enabled
+
+
+def stale_while_revalidate_enabled() -> bool:
+    """Whether stale-while-revalidate mode is on."""
+    if _stale_mode is None:
+        return os.environ.get(CACHE_STALE_ENV, "").lower() in ("1", "true", "yes")
+    return _stale_mode
+
+
+def _run_refresh(namespace: str, key: str, refresh: Callable[[], Any]) -> None:
+    try:
+        refresh()
+    except Exception as e:  # keep serving the stale entry
+        log(
+            "Background refresh failed",
+            level="warning",
+            namespace=namespace,
+            key=key,
+            error=str(e),
+        )
+    finally:
+        with _refresh_lock:
+            _refreshing.pop((namespace, key), None)
+
+
+def _schedule_refresh(namespace: str, key: str, refresh: Callable[[], Any]) -> None:
+    global _refresh_pool
+    with _refresh_lock:
+        if (namespace, key) in _refreshing:
+            return
+        if _refresh_pool is None:
+            _refresh_pool = ThreadPoolExecutor(
+                max_workers=DEFAULT_REFRESH_WORKERS,
+                thread_name_prefix="woolly-refresh",
+            )
+        _refreshing[(namespace, key)] = _refresh_pool.submit(
+            _run_refresh, namespace, key, refresh
+        )
+
+
+def wait_for_refreshes(timeout: Optional[float] = None) -> int:
+    """
+    Wait for the scheduled background refreshes to finish.
+
+    Args:
+        timeout: Seconds to wait, or None to wait for all of them.
+
+    Returns:
+        Number of refreshes still pending when the wait ended.
+    """
+    with _refresh_lock:
+        pending = list(_refreshing.values())
+    if not pending:
+        return 0
+    _, not_done = wait_futures(pending, timeout=timeout)
+    return len(not_done)
+
+
+def stale_reads() -> dict[str, int]:
+    """Number of answers served from expired entries, per namespace."""
+    with _refresh_lock:
+        return dict(_stale_served)
+
+
+def reset_stale_reads() -> None:
+    """Start counting stale answers from zero."""
+    with _refresh_lock:
+        _stale_served.clear()
+
+
+# ----------------------------------------------------------------
+# Public helpers
+# ----------------------------------------------------------------
+
+
+def read_cache(
+    namespace: str,
+    key: str,
+    ttl: int = DEFAULT_CACHE_TTL,
+    refresh: Optional[Callable[[], Any]] = None,
+) -> Optional[Any]:
+    """
+    Read from the memory tier or disk cache if not expired.
+
+    Args:
+        namespace: Cache namespace.
+        key: Entry key within the namespace.
+        ttl: Maximum age of the entry in seconds.
+        refresh: Refetches the entry.  In stale-while-revalidate mode an
+            expired entry of a :data:`STALE_NAMESPACES` namespace is
+            returned anyway and *refresh* runs in the background.
+
+    Returns:
+        The cached value, or None on a miss.
+    """
+    entry = _lookup(namespace, key, ttl)
+    if (
+        entry is None
+        and refresh is not None
+        and namespace in STALE_NAMESPACES
+        and stale_while_revalidate_enabled()
+    ):
+        entry = read_cache_entry(namespace, key)
+        if entry is not None:
+            _schedule_refresh(namespace, key, refresh)
+            with _refresh_lock:
+                _stale_served[namespace] += 1
+    _record_read(namespace, hit=entry is not None)
+    return entry.value if entry is not None else None
+
+
+def peek_cache(
+    namespace: str,
+    key: str,
+    ttl: int = DEFAULT_CACHE_TTL,
+    count_hit: bool = False,
+) -> Optional[Any]:
+    """
+    Read an unexpired value without counting a miss.
+
+    For prefetch scans and fallback entries, which are not lookups of their
+    own: a miss is left to the lookup that follows, so hit ratios count
+    each lookup once.
+
+    Args:
+        namespace: Cache namespace.
+        key: Entry key within the namespace.
+        ttl: Maximum age of the entry in seconds.
+        count_hit: Count a hit, for a fallback entry answering the lookup.
+
+    Returns:
+        The cached value, or None on a miss.
+    """
+    entry = _lookup(namespace, key, ttl)
+    if entry is not None and count_hit:
+        _record_read(namespace, hit=True)
+    return entry.value if entry is not None else None
+
+
+def read_cache_entry(namespace: str, key: str) -> Optional[CacheEntry]:
+    """
+    Read an entry regardless of its age, e.g. to revalidate it.
+
+    Args:
+        namespace: Cache namespace.
+        key: Entry key within the namespace.
+
+    Returns:
+        The entry, or None if missing or unreadable.
+    """
+    entry = _memory.get(namespace, key)
+    if entry is None:
+        entry = get_cache_backend().read_entry(namespace, key)
+    return entry
+
+
+def write_cache(
+    namespace: str,
+    key: str,
+    value: Any,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+) -> None:
+    """
+    Write to disk cache and the memory tier.
+
+    Args:
+        namespace: Cache namespace.
+        key: Entry key within the namespace.
+        value: JSON-serializable value.
+        etag: ``ETag`` of the response the value was derived from.
+        last_modified: ``Last-Modified`` of that response.
+    """
+    entry = CacheEntry(value=value, etag=etag, last_modified=last_modified)
+    get_cache_backend().write_entry(namespace, key, entry)
+    _memory.put(namespace, key, entry)
+
+
+def touch_cache(namespace: str, key: str, entry: CacheEntry) -> CacheEntry:
+    """
+    Restamp an entry confirmed unchanged upstream (HTTP 304).
+
+    Args:
+        namespace: Cache namespace.
+        key: Entry key within the namespace.
+        entry: The entry that was revalidated.
+
+    Returns:
+        The entry with the current time as its timestamp.
+    """
+    entry = entry.model_copy(update={"timestamp": time.time()})
+    get_cache_backend().write_entry(namespace, key, entry)
+    _memory.put(namespace, key, entry)
+    return entry
 
 
 def clear_cache(namespace: Optional[str] = None) -> list[str]:
@@ -84,20 +1693,5 @@ def clear_cache(namespace: Optional[str] = None) -> list[str]:
     Returns:
         List of namespaces that were cleared.
     """
-    cleared = []
-
-    if namespace:
-        cache_path = CACHE_DIR / namespace
-        if cache_path.exists():
-            for f in cache_path.glob("*.json"):
-                f.unlink()
-            cleared.append(namespace)
-    else:
-        if CACHE_DIR.exists():
-            for ns_dir in CACHE_DIR.iterdir():
-                if ns_dir.is_dir():
-                    for f in ns_dir.glob("*.json"):
-                        f.unlink()
-                    cleared.append(ns_dir.name)
-
-    return cleared
+    _memory.clear(namespace)
+    return get_cache_backend().clear(namespace)
@@ -19,9 +19,11 @@ app = cyclopts.App(
 
 # Import and register commands
 # These imports must come after app is defined to avoid circular imports
+from woolly.commands.cache import cache_app  # noqa: E402, F401
 from woolly.commands.check import check  # noqa: E402, F401
 from woolly.commands.clear_cache import clear_cache_cmd  # noqa: E402, F401
 from woolly.commands.list_formats import list_formats_cmd  # noqa: E402, F401
 from woolly.commands.list_languages import list_languages_cmd  # noqa: E402, F401
+from woolly.commands.refresh_index import refresh_index_cmd  # noqa: E402, F401
 
 __all__ = ["app", "console"]
@@ -0,0 +1,137 @@
+"""
+Cache command - inspect and trim the disk cache.
+"""
+
+from typing import Annotated, Optional
+
+import cyclopts
+from rich import box
+from rich.table import Table
+
+from woolly.cache import (
+    AGE_BUCKETS,
+    CACHE_DIR,
+    cache_stats,
+    gc_cache,
+    get_cache_backend,
+    namespace_ttl,
+    parse_size,
+)
+from woolly.commands import app, console
+
+cache_app = cyclopts.App(name="cache", help="Inspect and trim the cache.")
+app.command(cache_app)
+
+
+def _format_size(size: int) -> str:
+    value = float(size)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if value < 1024 or unit == "GiB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{size} B"  # pragma: no cover
+
+
+def _format_duration(seconds: int) -> str:
+    if seconds % 86400 == 0:
+        return f"{seconds // 86400}d"
+    if seconds % 3600 == 0:
+        return f"{seconds // 3600}h"
+    return f"{seconds}s"
+
+
+@cache_app.command(name="stats")
+def cache_stats_cmd(
+    namespace: Annotated[
+        Optional[str],
+        cyclopts.Parameter(
+            ("--namespace", "-n"),
+            help="Only report this namespace (e.g., 'crates', 'pypi', 'fedora').",
+        ),
+    ] = None,
+):
+    """Show entry counts, sizes, ages and hit ratios per namespace.
+
+    Parameters
+    ----------
+    namespace
+        Namespace to report. Defaults to all namespaces.
+    """
+    stats = cache_stats(namespace)
+    if not stats:
+        console.print("[yellow]No cache entries[/yellow]")
+        return
+
+    table = Table(
+        title=f"Cache: {CACHE_DIR} ({get_cache_backend().name})", box=box.ROUNDED
+    )
+    table.add_column("Namespace", style="bold")
+    table.add_column("Entries", justify="right")
+    table.add_column("Size", justify="right")
+    table.add_column("Budget", justify="right", style="dim")
+    table.add_column("TTL", justify="right", style="dim")
+    table.add_column("Expired", justify="right")
+    for label, _ in AGE_BUCKETS:
+        table.add_column(label, justify="right", style="dim")
+    table.add_column("Hit ratio", justify="right")
+
+    for ns in stats:
+        ratio = f"{ns.hit_ratio:.0%}" if ns.hit_ratio is not None else "-"
+        table.add_row(
+            ns.namespace,
+            str(ns.entries),
+            _format_size(ns.size_bytes),
+            _format_size(ns.max_size) if ns.max_size is not None else "-",
+            _format_duration(namespace_ttl(ns.namespace)),
+            str(ns.expired),
+            *(str(ns.ages[label]) for label, _ in AGE_BUCKETS),
+            ratio,
+        )
+
+    console.print(table)
+
+
+@cache_app.command(name="gc")
+def cache_gc_cmd(
+    namespace: Annotated[
+        Optional[str],
+        cyclopts.Parameter(
+            ("--namespace", "-n"),
+            help="Only collect this namespace.",
+        ),
+    ] = None,
+    max_size: Annotated[
+        Optional[str],
+        cyclopts.Parameter(
+            ("--max-size", "-s"),
+            help="Size budget per namespace (e.g., '500M', '2G'). Defaults to WOOLLY_CACHE_MAX_SIZE.",
+        ),
+    ] = None,
+):
+    """Purge expired entries and evict least recently used ones over budget.
+
+    Parameters
+    ----------
+    namespace
+        Namespace to collect. Defaults to all namespaces.
+    max_size
+        Size budget applied to each collected namespace.
+    """
+    try:
+        max_bytes = parse_size(max_size) if max_size else None
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        raise SystemExit(1)
+
+    results = gc_cache(namespace, max_bytes=max_bytes, compact=True)
+    if not results:
+        console.print("[yellow]No cache entries[/yellow]")
+        return
+
+    for result in results:
+        console.print(
+            f"[bold]{result.namespace}[/bold]: removed {result.expired} expired "
+            f"and {result.evicted} evicted entries, "
+            f"freed {_format_size(result.freed_bytes)} "
+            f"[dim]({_format_size(result.remaining_bytes)} left)[/dim]"
+        )
@@ -2,24 +2,52 @@
 Check command - analyze package dependencies for Fedora availability.
 """
 
-import fnmatch
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Annotated, Optional
+from typing import Annotated, Literal, Optional
 
 import cyclopts
 from pydantic import BaseModel, Field
 from rich.panel import Panel
 from rich.text import Text
-from rich.tree import Tree
 
-from woolly.cache import CACHE_DIR
+from woolly.cache import (
+    CACHE_DIR,
+    cache_shared_enabled,
+    cache_size_limits_configured,
+    flush_cache_counters,
+    gc_cache,
+    get_cache_backend,
+    get_memory_cache,
+    reset_stale_reads,
+    set_namespace_ttl,
+    set_stale_while_revalidate,
+    stale_reads,
+    stale_while_revalidate_enabled,
+    wait_for_refreshes,
+)
 from woolly.commands import app, console
-from woolly.debug import get_log_file, log, log_package_check, setup_logger
+from woolly.debug import get_log_file, log, setup_logger
+from woolly.fedora import RepodataBackend, RepodataError
+from woolly.fedora.pool import DEFAULT_IDLE_TIMEOUT, DnfWorkerPool
+from woolly.feeds import FeedError, feed_invalidation_enabled, set_feed_invalidation
 from woolly.languages import get_available_languages, get_provider
 from woolly.languages.base import Dependency, FeatureInfo, LanguageProvider
+from woolly.languages.crates_dump import CratesDumpError, open_crates_dump
+from woolly.languages.crates_index import SPARSE_INDEX_URL
+from woolly.languages.pypi_mirror import PyPIMirror, PyPIMirrorError
+from woolly.languages.pypi_simple import SIMPLE_INDEX_URL
+from woolly.languages.python import PythonProvider
+from woolly.languages.rust import RustProvider
 from woolly.progress import ProgressTracker
 from woolly.reporters import ReportData, get_available_formats, get_reporter
+from woolly.resolver import (  # noqa: F401 - build_tree re-exported
+    DEFAULT_MAX_WORKERS,
+    annotate_releases,
+    build_tree,
+    resolve_graph,
+    resolve_graph_async,
+)
 
 
 class DevBuildDepStatus(BaseModel):
@@ -79,174 +107,6 @@ def _compute_stats_from_visited(visited: dict) -> TreeStats:
     return stats
 
 
-def build_tree(
-    provider: LanguageProvider,
-    package_name: str,
-    version: Optional[str] = None,
-    visited: Optional[dict] = None,
-    depth: int = 0,
-    max_depth: int = 50,
-    tracker: Optional[ProgressTracker] = None,
-    include_optional: bool = False,
-    is_optional_dep: bool = False,
-    exclude_patterns: Optional[list[str]] = None,
-):
-    """
-    Recursively build a dependency tree for a package.
-
-    Parameters
-    ----------
-    provider
-        The language provider to use.
-    package_name
-        Name of the package to analyze.
-    version
-        Specific version, or None for latest.
-    visited
-        Dict of already-visited packages mapping to their status.
-        Each value is a tuple ``(is_packaged, version, is_optional)``.
-    depth
-        Current recursion depth.
-    max_depth
-        Maximum recursion depth.
-    tracker
-        Optional progress tracker.
-    include_optional
-        If True, include optional dependencies in the analysis.
-    is_optional_dep
-        If True, this package is an optional dependency.
-    exclude_patterns
-        List of glob patterns to exclude from the dependency tree.
-
-    Returns
-    -------
-    Tree
-        Rich Tree object representing the dependency tree.
-    """
-    if visited is None:
-        visited = {}
-
-    optional_marker = " [yellow](optional)[/yellow]" if is_optional_dep else ""
-
-    if depth > max_depth:
-        log(f"Max depth reached for {package_name}", level="warning", depth=depth)
-        return f"[dim]{package_name}{optional_marker} (max depth reached)[/dim]"
-
-    if package_name in visited:
-        is_packaged, cached_version, _ = visited[package_name]
-        log_package_check(
-            package_name,
-            "Skip (already visited)",
-            result="packaged" if is_packaged else "not packaged",
-        )
-        if is_packaged:
-            return f"[dim]{package_name}[/dim] [dim]v{cached_version}[/dim]{optional_marker} • [green]✓[/green] [dim](already visited)[/dim]"
-        else:
-            return f"[dim]{package_name}[/dim]{optional_marker} • [red]✗[/red] [dim](already visited)[/dim]"
-
-    if tracker:
-        tracker.update(package_name)
-
-    log_package_check(package_name, "Fetching version", source=provider.registry_name)
-
-    # Fetch full package info to get version and license
-    pkg_info = None
-    if version is None:
-        pkg_info = provider.fetch_package_info(package_name)
-        if pkg_info is None:
-            visited[package_name] = (False, None, is_optional_dep)
-            log_package_check(
-                package_name, "Not found", source=provider.registry_name, result="error"
-            )
-            return (
-                f"[bold red]{package_name}[/bold red]{optional_marker} • "
-                f"[red]not found on {provider.registry_name}[/red]"
-            )
-        version = pkg_info.latest_version
-    else:
-        pkg_info = provider.fetch_package_info(package_name)
-
-    license_str = ""
-    if pkg_info and pkg_info.license:
-        license_str = f" [magenta]({pkg_info.license})[/magenta]"
-
-    log_package_check(package_name, "Checking Fedora", source="dnf repoquery")
-
-    # Check Fedora packaging status
-    status = provider.check_fedora_packaging(package_name)
-    visited[package_name] = (status.is_packaged, version, is_optional_dep)
-
-    if status.is_packaged:
-        log_package_check(
-            package_name,
-            "Fedora status",
-            result=f"packaged ({', '.join(status.versions)})",
-        )
-    else:
-        log_package_check(package_name, "Fedora status", result="not packaged")
-
-    if status.is_packaged:
-        ver_str = ", ".join(status.versions) if status.versions else "unknown"
-        pkg_str = ", ".join(status.package_names) if status.package_names else ""
-        label = (
-            f"[bold]{package_name}[/bold] [dim]v{version}[/dim]{license_str}{optional_marker} • "
-            f"[green]✓ packaged[/green] [dim]({ver_str})[/dim]"
-        )
-        if pkg_str:
-            label += f" [dim cyan][{pkg_str}][/dim cyan]"
-    else:
-        label = (
-            f"[bold]{package_name}[/bold] [dim]v{version}[/dim]{license_str}{optional_marker} • "
-            f"[red]✗ not packaged[/red]"
-        )
-
-    node = Tree(label)
-
-    # ALWAYS recurse into dependencies regardless of packaging status
-    log_package_check(
-        package_name, "Fetching dependencies", source=provider.registry_name
-    )
-
-    deps = provider.get_normal_dependencies(
-        package_name, version, include_optional=include_optional
-    )
-
-    log(f"Found {len(deps)} dependencies for {package_name}", deps=len(deps))
-
-    if tracker and deps:
-        tracker.update(package_name, discovered=len(deps))
-
-    for dep_name, _dep_req, dep_is_optional in deps:
-        # Skip dependencies matching exclude patterns
-        if exclude_patterns:
-            if any(fnmatch.fnmatch(dep_name, pattern) for pattern in exclude_patterns):
-                log(f"Filtered out dependency: {dep_name}", level="info", depth=depth)
-                continue
-
-        child = build_tree(
-            provider,
-            dep_name,
-            None,
-            visited,
-            depth + 1,
-            max_depth,
-            tracker,
-            include_optional=include_optional,
-            is_optional_dep=dep_is_optional,
-            exclude_patterns=exclude_patterns,
-        )
-        if isinstance(child, str):
-            node.add(child)
-        elif isinstance(child, Tree):
-            # Directly append Tree children to avoid wrapping
-            # Rich's add() would wrap the Tree in another node
-            node.children.append(child)
-        else:
-            node.add(child)
-
-    return node
-
-
 def _check_fedora_for_dep(
     provider: LanguageProvider, dep: Dependency
 ) -> DevBuildDepStatus:
@@ -347,12 +207,12 @@ def check(
         ),
     ] = None,
     release: Annotated[
-        Optional[str],
+        tuple[str, ...],
         cyclopts.Parameter(
             ("--release", "-R"),
-            help="Fedora release version to check against (e.g., '41', '42', 'rawhide').",
+            help="Fedora release version to check against (e.g., '41', '42', 'rawhide'). Can be specified multiple times to compare releases side by side.",
         ),
-    ] = None,
+    ] = (),
     repos: Annotated[
         tuple[str, ...],
         cyclopts.Parameter(
@@ -360,6 +220,96 @@ def check(
             help="Fedora repo(s) to query (e.g., 'fedora', 'updates', 'updates-testing'). Can be specified multiple times.",
         ),
     ] = (),
+    repodata: Annotated[
+        tuple[str, ...],
+        cyclopts.Parameter(
+            ("--repodata",),
+            help="Read Fedora provides from local repodata (directory or file:// URL) instead of dnf. Can be specified multiple times.",
+        ),
+    ] = (),
+    dnf_workers: Annotated[
+        int,
+        cyclopts.Parameter(
+            ("--dnf-workers",),
+            help="Answer Fedora queries from N persistent dnf worker processes (needs libdnf5/dnf Python bindings; 0 disables).",
+        ),
+    ] = 0,
+    dnf_worker_idle: Annotated[
+        float,
+        cyclopts.Parameter(
+            ("--dnf-worker-idle",),
+            help="Seconds an idle dnf worker is kept before it exits.",
+        ),
+    ] = DEFAULT_IDLE_TIMEOUT,
+    jobs: Annotated[
+        int,
+        cyclopts.Parameter(
+            ("--jobs", "-j"),
+            help="Number of packages to resolve concurrently.",
+        ),
+    ] = DEFAULT_MAX_WORKERS,
+    engine: Annotated[
+        Literal["threads", "asyncio"],
+        cyclopts.Parameter(
+            ("--engine",),
+            help="Resolution engine: 'threads' (worker pool) or 'asyncio' (single event loop).",
+        ),
+    ] = "threads",
+    stale: Annotated[
+        bool,
+        cyclopts.Parameter(
+            ("--stale",),
+            negative=(),
+            help="Answer from expired registry cache entries and refresh them in the background.",
+        ),
+    ] = False,
+    feed: Annotated[
+        bool,
+        cyclopts.Parameter(
+            ("--feed",),
+            negative=(),
+            help="Expire registry cache entries when the registry's change feed reports the package changed, instead of after a fixed TTL.",
+        ),
+    ] = False,
+    sparse_index: Annotated[
+        bool,
+        cyclopts.Parameter(
+            ("--sparse-index",),
+            negative=(),
+            help="Read crate versions, dependencies and features from the index.crates.io sparse index instead of the crates.io API; the index has no licenses, so dependencies report theirs as unavailable and only the root crate's comes from the API (Rust only).",
+        ),
+    ] = False,
+    crates_dump: Annotated[
+        Optional[Path],
+        cyclopts.Parameter(
+            ("--crates-dump",),
+            help="Resolve crates offline from a downloaded crates.io db-dump.tar.gz, ingested into a local store on first use (Rust only).",
+        ),
+    ] = None,
+    batch_info: Annotated[
+        bool,
+        cyclopts.Parameter(
+            ("--batch-info",),
+            negative=(),
+            help="Fetch the crates.io info of each dependency level with one multi-crate request per 100 crates; batched crates report their license as unavailable (Rust only).",
+        ),
+    ] = False,
+    simple_index: Annotated[
+        bool,
+        cyclopts.Parameter(
+            ("--simple-index",),
+            negative=(),
+            help="Read dependencies and extras from wheel metadata files listed by the PyPI simple index instead of the JSON API (Python only).",
+        ),
+    ] = False,
+    pypi_mirror: Annotated[
+        Optional[Path],
+        cyclopts.Parameter(
+            ("--pypi-mirror",),
+            env_var="WOOLLY_PYPI_MIRROR",
+            help="Read Python packages from a local bandersnatch-style PyPI mirror instead of PyPI (ignored for other languages).",
+        ),
+    ] = None,
 ):
     """Check if a package's dependencies are available in Fedora.
 
@@ -388,9 +338,44 @@ def check(
     template
         Path to a Jinja2 template file for custom report format.
     release
-        Fedora release version to check against (e.g., '41', 'rawhide').
+        Fedora release version(s) to check against (e.g., '41', 'rawhide').
+        With several releases the graph is resolved once and the report
+        gets one availability column per release.
     repos
         Fedora repo(s) to query (e.g., 'fedora', 'updates', 'updates-testing').
+    repodata
+        Local repositories whose metadata is read instead of running dnf.
+    dnf_workers
+        Number of persistent dnf worker processes (0 runs dnf per query).
+    dnf_worker_idle
+        Idle timeout of the dnf workers, in seconds.
+    jobs
+        Number of packages to resolve concurrently (threads engine).
+    engine
+        Resolution engine used to walk the dependency graph.
+    stale
+        Serve expired crates.io/PyPI cache entries immediately and refresh
+        them in the background for the next run.
+    feed
+        Invalidate registry cache entries from the registry's change feed
+        (PyPI changelog, crates.io recent updates) instead of a fixed TTL.
+    sparse_index
+        Answer crate lookups from one sparse index file per crate instead
+        of three crates.io API calls.  Dependency licenses are shown as
+        unavailable; the root's license is still fetched from the API.
+    crates_dump
+        crates.io database dump to resolve crates from without any HTTP
+        request; it is ingested once and re-ingested when the file changes.
+    batch_info
+        Fetch the info of every crate on a dependency level with the
+        ``/crates?ids[]=...`` listing instead of one call per crate.  The
+        listing has no licenses, so batched crates show them as unavailable.
+    simple_index
+        Read each release's dependencies from the few-KB ``.metadata``
+        file of one of its wheels (PEP 658) instead of the JSON API.
+    pypi_mirror
+        Root of a local PyPI mirror (JSON API tree and simple index) read
+        from disk, bypassing HTTP and the PyPI cache namespace.
     """
     # Get the language provider
     provider = get_provider(lang)
@@ -399,6 +384,36 @@ def check(
         console.print(f"Available languages: {', '.join(get_available_languages())}")
         raise SystemExit(1)
 
+    # Registry options only apply to one ecosystem
+    source_options = {
+        "--sparse-index": (sparse_index, RustProvider),
+        "--crates-dump": (crates_dump, RustProvider),
+        "--batch-info": (batch_info, RustProvider),
+        "--simple-index": (simple_index, PythonProvider),
+    }
+    for option, (value, provider_class) in source_options.items():
+        if value and not isinstance(provider, provider_class):
+            console.print(
+                f"[red]{option} is only supported for "
+                f"{provider_class.display_name}.[/red]"
+            )
+            raise SystemExit(1)
+    if sparse_index:
+        provider.sparse_index = SPARSE_INDEX_URL
+    if batch_info:
+        provider.batch_info = True
+    if simple_index:
+        provider.simple_index = SIMPLE_INDEX_URL
+    # The mirror may come from the environment, so other languages ignore it
+    if pypi_mirror and not isinstance(provider, PythonProvider):
+        pypi_mirror = None
+    if pypi_mirror:
+        try:
+            provider.mirror = PyPIMirror(pypi_mirror)
+        except PyPIMirrorError as e:
+            console.print(f"[red]Cannot use PyPI mirror: {e}[/red]")
+            raise SystemExit(1)
+
     # Get the reporter
     template_path = Path(template) if template else None
 
@@ -429,127 +444,239 @@ def check(
 
     # Configure Fedora release / repo targeting on the provider
     fedora_repos_list = list(repos) if repos else None
-    if release:
-        provider.fedora_release = release
+    releases = list(dict.fromkeys(release))
+    primary_release = releases[0] if releases else None
+    if primary_release:
+        provider.fedora_release = primary_release
     if fedora_repos_list:
         provider.fedora_repos = fedora_repos_list
-
-    # Initialize logging
-    setup_logger(debug=debug)
-    log(
-        "Analysis started",
-        package=package,
-        language=lang,
-        max_depth=max_depth,
-        include_optional=optional,
-        debug=debug,
-        report_format=report,
-        exclude_patterns=exclude_patterns,
-        fedora_release=release,
-        fedora_repos=fedora_repos_list,
-    )
-
-    # ── Fetch root package info once (reused for license, version,
-    #    features, and dev/build deps – avoids redundant calls) ──
-    root_info = provider.fetch_package_info(package)
-    root_license = root_info.license if root_info else None
-    resolved_version = version or (root_info.latest_version if root_info else None)
-
-    header = Text()
-    header.append(package, style="bold cyan")
-    header.append(f" ({provider.display_name})\n", style="dim")
-    header.append(f"Registry:  {provider.registry_name}\n", style="dim")
-    header.append(f"Cache:     {CACHE_DIR}", style="dim")
-    if release:
-        header.append("\n")
-        header.append(f"Release:   {release}", style="dim")
-    if fedora_repos_list:
-        header.append("\n")
-        header.append(f"Repos:     {', '.join(fedora_repos_list)}", style="dim")
-    if optional:
-        header.append("\n")
-        header.append("Including optional dependencies", style="yellow")
-    if exclude_patterns:
-        header.append("\n")
-        header.append(
-            f"Excluding dependencies matching: {', '.join(exclude_patterns)}",
-            style="yellow",
-        )
-
-    console.print()
-    console.print(
-        Panel(
-            header,
-            title="[bold]Analyzing Dependencies[/bold]",
-            border_style="blue",
-            padding=(0, 1),
+    worker_pool: Optional[DnfWorkerPool] = None
+    if repodata:
+        provider.fedora_backend = RepodataBackend(list(repodata))
+    elif dnf_workers > 0:
+        worker_pool = DnfWorkerPool(
+            size=dnf_workers,
+            idle_timeout=dnf_worker_idle,
+            release=primary_release,
+            repos=fedora_repos_list,
         )
-    )
-
-    tracker = None if no_progress else ProgressTracker(console)
-
-    if tracker:
-        tracker.start(f"Analyzing {provider.display_name} dependencies")
-
-    # Shared visited dict – build_tree populates it, then we derive stats.
-    visited: dict[str, tuple[bool, Optional[str], bool]] = {}
-
+        provider.dnf_workers = worker_pool
+    # Stop the dnf workers once all Fedora queries are done, even on errors
     try:
-        tree = build_tree(
-            provider,
-            package,
-            version,
-            visited=visited,
+        if stale:
+            set_stale_while_revalidate(True)
+        if feed:
+            set_feed_invalidation(True)
+        reset_stale_reads()
+
+        # Initialize logging
+        setup_logger(debug=debug)
+        log(
+            "Analysis started",
+            package=package,
+            language=lang,
             max_depth=max_depth,
-            tracker=tracker,
             include_optional=optional,
+            debug=debug,
+            report_format=report,
             exclude_patterns=exclude_patterns,
+            fedora_releases=releases or None,
+            fedora_repos=fedora_repos_list,
+            repodata=list(repodata) or None,
+            dnf_workers=dnf_workers,
+            jobs=jobs,
+            engine=engine,
+            stale=stale_while_revalidate_enabled(),
+            feed=feed_invalidation_enabled(),
+            sparse_index=sparse_index,
+            crates_dump=str(crates_dump) if crates_dump else None,
+            batch_info=batch_info,
+            simple_index=simple_index,
+            pypi_mirror=str(pypi_mirror) if pypi_mirror else None,
         )
-        if tracker:
-            tracker.finish()
-    finally:
-        if tracker:
-            tracker.stop()
-        log("Analysis complete")
 
-    console.print()
-
-    # ── Collect statistics directly from the visited dict ──
-    stats = _compute_stats_from_visited(visited)
+        # Read local repodata up front so a bad location fails fast
+        if repodata:
+            try:
+                provider.load_fedora_index()
+            except RepodataError as e:
+                console.print(f"[red]Cannot read repodata: {e}[/red]")
+                raise SystemExit(1)
+
+        # Ingest the crates.io dump up front (once per downloaded file)
+        if crates_dump:
+            try:
+                with console.status("[bold]Loading crates.io database dump...[/bold]"):
+                    provider.crates_dump = open_crates_dump(crates_dump)
+            except CratesDumpError as e:
+                console.print(f"[red]Cannot read crates.io dump: {e}[/red]")
+                raise SystemExit(1)
+
+        # Fedora answers are cached per repo metadata revision; look it up once
+        log("Fedora metadata revision", revision=provider.fedora_metadata_revision())
+
+        # Expire registry entries from the change feed instead of the fixed TTL
+        feed_state = None
+        if feed_invalidation_enabled():
+            try:
+                feed_state = provider.apply_change_feed()
+            except FeedError as e:
+                log(
+                    "Change feed unavailable, using fixed TTL",
+                    level="warning",
+                    error=str(e),
+                )
+            else:
+                if feed_state is not None:
+                    set_namespace_ttl(
+                        provider.cache_namespace, feed_state.default_ttl()
+                    )
+
+        # ── Fetch root package info once (reused for license, version,
+        #    features, and dev/build deps – avoids redundant calls) ──
+        root_info = provider.fetch_root_package_info(package)
+        root_license = root_info.license if root_info else None
+        root_license_unavailable = root_info.license_unavailable if root_info else False
+        resolved_version = version or (root_info.latest_version if root_info else None)
+
+        header = Text()
+        header.append(package, style="bold cyan")
+        header.append(f" ({provider.display_name})\n", style="dim")
+        registry = provider.registry_name
+        if crates_dump:
+            registry += f" (dump: {crates_dump})"
+        elif pypi_mirror:
+            registry += f" (mirror: {pypi_mirror})"
+        elif sparse_index:
+            registry += " (sparse index)"
+        elif simple_index:
+            registry += " (simple index)"
+        header.append(f"Registry:  {registry}\n", style="dim")
+        cache_mode = get_cache_backend().name
+        if cache_shared_enabled():
+            cache_mode += ", shared"
+        if stale_while_revalidate_enabled():
+            cache_mode += ", stale"
+        if feed_state is not None:
+            cache_mode += ", feed"
+        header.append(f"Cache:     {CACHE_DIR} ({cache_mode})", style="dim")
+        if releases:
+            header.append("\n")
+            header.append(f"Release:   {', '.join(releases)}", style="dim")
+        if fedora_repos_list:
+            header.append("\n")
+            header.append(f"Repos:     {', '.join(fedora_repos_list)}", style="dim")
+        if repodata:
+            header.append("\n")
+            header.append(f"Repodata:  {', '.join(repodata)}", style="dim")
+        if optional:
+            header.append("\n")
+            header.append("Including optional dependencies", style="yellow")
+        if exclude_patterns:
+            header.append("\n")
+            header.append(
+                f"Excluding dependencies matching: {', '.join(exclude_patterns)}",
+                style="yellow",
+            )
 
-    # Fetch features/extras for the root package
-    features: list[FeatureInfo] = []
-    if resolved_version:
-        features = provider.fetch_features(package, resolved_version)
+        console.print()
+        console.print(
+            Panel(
+                header,
+                title="[bold]Analyzing Dependencies[/bold]",
+                border_style="blue",
+                padding=(0, 1),
+            )
+        )
 
-    # ── Fetch dev and build deps in one call, check Fedora in parallel ──
-    dev_deps_status: list[DevBuildDepStatus] = []
-    build_deps_status: list[DevBuildDepStatus] = []
+        tracker = None if no_progress else ProgressTracker(console)
 
-    if resolved_version:
-        # Single fetch_dependencies call partitioned by kind
-        _normal, dev_deps, build_deps = provider.get_all_dependencies(
-            package, resolved_version, include_optional=optional
-        )
+        if tracker:
+            tracker.start(f"Analyzing {provider.display_name} dependencies")
+
+        # Shared visited dict – resolve_graph populates it, then we derive stats.
+        visited: dict[str, tuple[bool, Optional[str], bool]] = {}
+
+        try:
+            if engine == "asyncio":
+                graph = resolve_graph_async(
+                    provider,
+                    package,
+                    version,
+                    visited=visited,
+                    max_depth=max_depth,
+                    tracker=tracker,
+                    include_optional=optional,
+                    exclude_patterns=exclude_patterns,
+                )
+            else:
+                graph = resolve_graph(
+                    provider,
+                    package,
+                    version,
+                    visited=visited,
+                    max_depth=max_depth,
+                    tracker=tracker,
+                    include_optional=optional,
+                    exclude_patterns=exclude_patterns,
+                    max_workers=jobs,
+                )
+            if len(releases) > 1:
+                # Same upstream graph, Fedora lookups only for the other releases
+                annotate_releases(provider, graph, releases, max_workers=jobs)
+            # The root's license may come from a fuller source than its node's
+            root_node = graph.nodes.get(package)
+            if root_node is not None and root_node.license is None:
+                root_node.license = root_license
+                root_node.license_unavailable = root_license_unavailable
+            if tracker:
+                tracker.finish()
+        finally:
+            if tracker:
+                tracker.stop()
+            log("Analysis complete")
+
+        console.print()
+
+        # ── Collect statistics directly from the visited dict ──
+        stats = _compute_stats_from_visited(visited)
+
+        # Fetch features/extras for the root package
+        features: list[FeatureInfo] = []
+        if resolved_version:
+            features = provider.fetch_features(package, resolved_version)
+
+        # ── Fetch dev and build deps in one call, check Fedora in parallel ──
+        dev_deps_status: list[DevBuildDepStatus] = []
+        build_deps_status: list[DevBuildDepStatus] = []
+
+        if resolved_version:
+            # Single fetch_dependencies call partitioned by kind
+            _normal, dev_deps, build_deps = provider.get_all_dependencies(
+                package, resolved_version, include_optional=optional
+            )
 
-        all_devbuild: list[Dependency] = dev_deps + build_deps
-        if all_devbuild:
-            # Check Fedora status for dev/build deps in parallel
-            results: dict[str, DevBuildDepStatus] = {}
-            with ThreadPoolExecutor(max_workers=4) as executor:
-                future_to_dep = {
-                    executor.submit(_check_fedora_for_dep, provider, dep): dep
-                    for dep in all_devbuild
-                }
-                for future in as_completed(future_to_dep):
-                    dep = future_to_dep[future]
-                    results[dep.name] = future.result()
-
-            # Preserve original ordering
-            for dep in dev_deps:
-                dev_deps_status.append(results[dep.name])
-            for dep in build_deps:
-                build_deps_status.append(results[dep.name])
+            all_devbuild: list[Dependency] = dev_deps + build_deps
+            if all_devbuild:
+                # Check Fedora status for dev/build deps in parallel
+                results: dict[str, DevBuildDepStatus] = {}
+                with ThreadPoolExecutor(max_workers=4) as executor:
+                    future_to_dep = {
+                        executor.submit(_check_fedora_for_dep, provider, dep): dep
+                        for dep in all_devbuild
+                    }
+                    for future in as_completed(future_to_dep):
+                        dep = future_to_dep[future]
+                        results[dep.name] = future.result()
+
+                # Preserve original ordering
+                for dep in dev_deps:
+                    dev_deps_status.append(results[dep.name])
+                for dep in build_deps:
+                    build_deps_status.append(results[dep.name])
+    finally:
+        if worker_pool is not None:
+            worker_pool.shutdown()
 
     stats.dev_total = len(dev_deps_status)
     stats.dev_packaged = sum(1 for d in dev_deps_status if d.is_packaged)
@@ -568,7 +695,7 @@ def check(
         missing_count=stats.missing,
         missing_packages=stats.missing_list,
         packaged_packages=stats.packaged_list,
-        tree=tree,
+        graph=graph,
         max_depth=max_depth,
         version=version,
         include_optional=optional,
@@ -578,6 +705,7 @@ def check(
         optional_missing_packages=stats.optional_missing_list,
         missing_only=missing_only,
         root_license=root_license,
+        root_license_unavailable=root_license_unavailable,
         features=features,
         dev_dependencies=[d.model_dump() for d in dev_deps_status],
         build_dependencies=[d.model_dump() for d in build_deps_status],
@@ -587,8 +715,9 @@ def check(
         build_total=stats.build_total,
         build_packaged=stats.build_packaged,
         build_missing=stats.build_missing,
-        fedora_release=release,
+        fedora_release=primary_release,
         fedora_repos=fedora_repos_list,
+        stale_answers=sum(stale_reads().values()),
     )
 
     # Generate report
@@ -598,6 +727,16 @@ def check(
     else:
         reporter.generate(report_data)
 
+    log("Memory cache", **get_memory_cache().stats().model_dump())
+    if stale_reads():
+        log("Served stale", **stale_reads())
+    # Let the background refreshes land in the cache for the next run
+    wait_for_refreshes()
+    flush_cache_counters()
+    if cache_size_limits_configured():
+        for result in gc_cache():
+            log("Cache collected", **result.model_dump())
+
     # Show log file path
     log_file = get_log_file()
     if log_file:
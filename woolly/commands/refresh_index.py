@@ -0,0 +1,108 @@
+"""
+Refresh index command - build the local Fedora provides index.
+"""
+
+from typing import Annotated, Optional
+
+import cyclopts
+
+from woolly.cache import FEDORA_CACHE_TTL
+from woolly.commands import app, console
+from woolly.fedora import RepodataBackend, RepodataError
+from woolly.languages import get_available_languages, get_provider
+
+
+@app.command(name="refresh-index")
+def refresh_index_cmd(
+    lang: Annotated[
+        str,
+        cyclopts.Parameter(
+            ("--lang", "-l"),
+            help="Language/ecosystem. Use 'list-languages' to see options.",
+        ),
+    ] = "rust",
+    release: Annotated[
+        Optional[str],
+        cyclopts.Parameter(
+            ("--release", "-R"),
+            help="Fedora release version to index (e.g., '41', '42', 'rawhide').",
+        ),
+    ] = None,
+    repos: Annotated[
+        tuple[str, ...],
+        cyclopts.Parameter(
+            ("--repos",),
+            help="Fedora repo(s) to index (e.g., 'fedora', 'updates'). Can be specified multiple times.",
+        ),
+    ] = (),
+    repodata: Annotated[
+        tuple[str, ...],
+        cyclopts.Parameter(
+            ("--repodata",),
+            help="Index local repodata (directory or file:// URL) instead of querying dnf. Can be specified multiple times.",
+        ),
+    ] = (),
+    force: Annotated[
+        bool,
+        cyclopts.Parameter(
+            ("--force", "-f"),
+            negative=(),
+            help="Rebuild the index even if it has not expired yet.",
+        ),
+    ] = False,
+):
+    """Build the local Fedora provides index with one bulk dnf query.
+
+    Subsequent ``check`` runs for the same language, release and repos
+    answer Fedora lookups from this index until it expires.
+
+    Parameters
+    ----------
+    lang
+        Language/ecosystem whose provides are indexed.
+    release
+        Fedora release to index. Defaults to the system's repos.
+    repos
+        Fedora repos to index. Defaults to all enabled repos.
+    repodata
+        Local repositories whose metadata is indexed instead of dnf's.
+    force
+        Rebuild even if the existing index is still fresh.
+    """
+    provider = get_provider(lang)
+    if provider is None:
+        console.print(f"[red]Unknown language: {lang}[/red]")
+        console.print(f"Available languages: {', '.join(get_available_languages())}")
+        raise SystemExit(1)
+
+    if release:
+        provider.fedora_release = release
+    if repos:
+        provider.fedora_repos = list(repos)
+    if repodata:
+        provider.fedora_backend = RepodataBackend(list(repodata))
+    backend = provider.get_fedora_backend()
+
+    try:
+        with console.status(
+            f"[bold]Indexing {provider.fedora_provides_prefix}() provides...[/bold]"
+        ):
+            index = provider.refresh_fedora_index(force=force)
+    except RepodataError as e:
+        console.print(f"[red]Cannot read repodata: {e}[/red]")
+        raise SystemExit(1)
+
+    if index is None:
+        console.print(
+            f"[red]{backend.name} returned no provides; index not updated.[/red]"
+        )
+        raise SystemExit(1)
+
+    if provider.fedora_metadata_revision():
+        validity = "valid until the repo metadata changes"
+    else:
+        validity = f"valid for {FEDORA_CACHE_TTL // 3600}h"
+    console.print(
+        f"[green]Indexed {len(index)} {provider.fedora_provides_prefix}() provides "
+        f"for {provider.display_name}[/green] [dim]({validity})[/dim]"
+    )
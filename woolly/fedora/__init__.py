@@ -0,0 +1,29 @@
+"""
+Fedora repository metadata helpers.
+
+Structures shared by the ways woolly learns what Fedora provides, and
+the backends (dnf, local repodata) that produce them.
+"""
+
+from woolly.fedora.backends import DnfBackend, FedoraBackend, RepodataBackend
+from woolly.fedora.index import (
+    FedoraRecord,
+    ProvidesIndex,
+    ProvidesRecord,
+    parse_fedora_record,
+    parse_provides_records,
+)
+from woolly.fedora.repodata import RepodataError, read_repodata_index
+
+__all__ = [
+    "DnfBackend",
+    "FedoraBackend",
+    "FedoraRecord",
+    "ProvidesIndex",
+    "ProvidesRecord",
+    "RepodataBackend",
+    "RepodataError",
+    "parse_fedora_record",
+    "parse_provides_records",
+    "read_repodata_index",
+]
@@ -0,0 +1,177 @@
+"""
+Sources of Fedora packaging data.
+
+A :class:`FedoraBackend` builds the :class:`~woolly.fedora.index.ProvidesIndex`
+a :class:`~woolly.languages.base.LanguageProvider` consults for packaging
+checks.  The default :class:`DnfBackend` shells out to ``dnf repoquery``
+and also allows per-package queries when no index has been built;
+:class:`RepodataBackend` reads local repository metadata directly and
+needs neither dnf nor a network connection.
+"""
+
+import hashlib
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Optional
+
+from woolly.cache import FEDORA_REVISION_CHECK_TTL, read_cache, write_cache
+from woolly.fedora.index import ProvidesIndex
+from woolly.fedora.repodata import (
+    RepodataError,
+    find_repomd,
+    read_repodata_index,
+    read_repomd_revision,
+)
+
+if TYPE_CHECKING:
+    from woolly.languages.base import LanguageProvider
+
+
+class FedoraBackend(ABC):
+    """
+    Abstract source of Fedora provides.
+
+    Attributes:
+        name: Short identifier for the backend (e.g., "dnf", "repodata")
+        on_demand: If True, the index is built automatically on the first
+            lookup and every lookup is answered from it; otherwise lookups
+            without a prebuilt index fall back to per-package dnf queries.
+    """
+
+    name: str
+    on_demand: bool = False
+
+    @abstractmethod
+    def build_index(self, provider: "LanguageProvider") -> Optional[ProvidesIndex]:
+        """
+        Build the provides index for *provider*'s prefix and Fedora target.
+
+        Args:
+            provider: The language provider requesting the index.
+
+        Returns:
+            The index, or None if no provides could be retrieved.
+        """
+        pass
+
+    @property
+    def cache_tag(self) -> str:
+        """Cache-key fragment separating this backend's data from others'."""
+        return ""
+
+    def metadata_revision(self, provider: "LanguageProvider") -> Optional[str]:
+        """
+        Identify the current metadata of *provider*'s Fedora target.
+
+        Cached Fedora answers are keyed by it, so they are reused until
+        the repositories change.
+
+        Args:
+            provider: The language provider whose target is checked.
+
+        Returns:
+            A short digest of the repos' metadata revisions, or None if
+            unknown (cached answers then expire after a fixed TTL).
+        """
+        return None
+
+
+def revision_digest(revisions: dict[str, str]) -> Optional[str]:
+    """
+    Combine per-repository metadata revisions into one cache-key fragment.
+
+    Args:
+        revisions: Repository id (or location) to its revision.
+
+    Returns:
+        A short digest, or None if *revisions* is empty.
+    """
+    if not revisions:
+        return None
+    joined = "\n".join(f"{repo}={rev}" for repo, rev in sorted(revisions.items()))
+    return hashlib.sha256(joined.encode()).hexdigest()[:12]
+
+
+def parse_repoinfo_revisions(output: str) -> dict[str, str]:
+    """
+    Extract the metadata revision of each repository from ``dnf repoinfo``.
+
+    Both the dnf4 (``Repo-id``/``Repo-revision``) and the dnf5
+    (``Repo ID``/``Revision``) field names are understood.
+
+    Args:
+        output: ``dnf repoinfo`` output.
+
+    Returns:
+        Repository id to revision, for repos that report one.
+    """
+    revisions: dict[str, str] = {}
+    repo_id: Optional[str] = None
+    for line in output.splitlines():
+        field, sep, value = line.partition(":")
+        if not sep:
+            continue
+        field = field.strip().lower()
+        value = value.strip()
+        if field in ("repo-id", "repo id", "id"):
+            repo_id = value
+        elif field in ("repo-revision", "revision") and repo_id and value:
+            revisions[repo_id] = value
+    return revisions
+
+
+class DnfBackend(FedoraBackend):
+    """Query the system's dnf for the targeted release and repos."""
+
+    name = "dnf"
+
+    def build_index(self, provider: "LanguageProvider") -> Optional[ProvidesIndex]:
+        out = provider._run_dnf(provider._fedora_index_cmd())
+        if not out:
+            return None
+        return ProvidesIndex.from_repoquery_output(provider.fedora_provides_prefix, out)
+
+    def metadata_revision(self, provider: "LanguageProvider") -> Optional[str]:
+        # dnf loads the metadata to answer, so the answer is cached briefly
+        cache_key = f"revision:{provider._fedora_target_suffix()}"
+        cached = read_cache("fedora", cache_key, FEDORA_REVISION_CHECK_TTL)
+        if cached is not None:
+            return cached or None
+        try:
+            out = provider._run_dnf(provider._build_dnf_cmd("repoinfo", []))
+        except OSError:
+            return None  # no dnf here; queries will report it
+        revision = revision_digest(parse_repoinfo_revisions(out))
+        write_cache("fedora", cache_key, revision or "")
+        return revision
+
+
+class RepodataBackend(FedoraBackend):
+    """Read provides from local repository metadata (``repomd.xml``)."""
+
+    name = "repodata"
+    on_demand = True
+
+    def __init__(self, locations: list[str]):
+        """
+        Args:
+            locations: Repository roots, ``repodata`` directories or
+                ``file://`` URLs; their provides are merged.
+        """
+        self.locations = list(locations)
+
+    def build_index(self, provider: "LanguageProvider") -> Optional[ProvidesIndex]:
+        return read_repodata_index(self.locations, provider.fedora_provides_prefix)
+
+    @property
+    def cache_tag(self) -> str:
+        digest = hashlib.sha256("\n".join(self.locations).encode()).hexdigest()
+        return f"repodata={digest[:12]}"
+
+    def metadata_revision(self, provider: "LanguageProvider") -> Optional[str]:
+        revisions: dict[str, str] = {}
+        for location in self.locations:
+            try:
+                revisions[location] = read_repomd_revision(find_repomd(location))
+            except RepodataError:
+                return None  # build_index reports the error
+        return revision_digest(revisions)
@@ -0,0 +1,200 @@
+"""
+In-memory index of Fedora virtual provides.
+
+A :class:`ProvidesIndex` maps every ``prefix(name)`` provide of a Fedora
+target (release + repos) to the binary packages providing it, so
+packaging checks become dictionary lookups instead of a dnf run per
+package.  The same structure is used for a whole-repository dump and for
+the result of a single batched query.
+"""
+
+import re
+from collections.abc import Iterator
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+# Matches the leading version of a provide such as ``1.0.200`` in
+# ``crate(serde) = 1.0.200``; kept in sync with the historical
+# ``--provides`` regex so both code paths report the same versions.
+_PROVIDED_VERSION_RE = re.compile(r"[\d.]+")
+
+
+class ProvidesRecord(BaseModel):
+    """One binary package providing a ``prefix(name)`` capability."""
+
+    package: str
+    package_version: str
+    provided_version: Optional[str] = None
+
+
+def parse_provides_records(
+    out: str, prefix: str
+) -> Iterator[tuple[str, ProvidesRecord]]:
+    """
+    Parse ``%{NAME}|%{VERSION}|%{PROVIDES}`` repoquery output.
+
+    dnf prints the provides of a package one per line, so a record is a
+    ``name|version|first-provide`` line followed by continuation lines
+    holding the remaining provides.  Plain ``name|version`` lines are
+    accepted and carry no provides.
+
+    Args:
+        out: Raw dnf output.
+        prefix: Provides prefix to keep (e.g. ``"crate"``).
+
+    Yields:
+        ``(provided_name, record)`` for every ``prefix(provided_name)``
+        provide in the output.
+    """
+    provides_re = re.compile(rf"^{re.escape(prefix)}\((.+?)\)(?:\s*=\s*(\S+))?")
+    package = version = None
+    for line in out.split("\n"):
+        if "|" in line:
+            package, version, *rest = line.split("|", 2)
+            line = rest[0] if rest else ""
+        match = provides_re.match(line.strip())
+        if match and package is not None:
+            yield (
+                match.group(1),
+                ProvidesRecord(
+                    package=package,
+                    package_version=version,
+                    provided_version=match.group(2),
+                ),
+            )
+
+
+class FedoraRecord(BaseModel):
+    """What Fedora ships for one ``prefix(name)`` provide.
+
+    This is the single cached answer to a packaging check: the binary
+    packages providing the name, their versions, and the versions the
+    provide itself carries.
+    """
+
+    is_packaged: bool = False
+    package_versions: list[str] = Field(default_factory=list)
+    package_names: list[str] = Field(default_factory=list)
+    provided_versions: list[str] = Field(default_factory=list)
+
+    @classmethod
+    def from_records(cls, records: list[ProvidesRecord]) -> "FedoraRecord":
+        """Summarize the records of the packages providing one name."""
+        if not records:
+            return cls()
+        return cls(
+            is_packaged=True,
+            package_versions=sorted({r.package_version for r in records}),
+            package_names=sorted({r.package for r in records}),
+            provided_versions=_provided_versions(records),
+        )
+
+    def as_repoquery(self) -> tuple[bool, list[str], list[str]]:
+        """The (is_packaged, versions, packages) tuple of ``_repoquery_package``."""
+        return (self.is_packaged, self.package_versions, self.package_names)
+
+
+def _provided_versions(records: list[ProvidesRecord]) -> list[str]:
+    versions = set()
+    for record in records:
+        if record.provided_version:
+            match = _PROVIDED_VERSION_RE.match(record.provided_version)
+            if match:
+                versions.add(match.group(0))
+    return sorted(versions)
+
+
+def parse_fedora_record(out: str, prefix: str, name: str) -> FedoraRecord:
+    """
+    Parse the output of a ``--whatprovides prefix(name)`` query.
+
+    Every package dnf returned provides the queried name, so all of them
+    count, even ``NAME|VERSION`` lines without provides; the provided
+    versions come from the ``prefix(name) = version`` provides.
+
+    Args:
+        out: Raw ``%{NAME}|%{VERSION}|%{PROVIDES}`` output.
+        prefix: Provides prefix (e.g. ``"crate"``).
+        name: Normalized name that was queried.
+
+    Returns:
+        The FedoraRecord for *name*.
+    """
+    versions = set()
+    packages = set()
+    for line in out.split("\n"):
+        if "|" in line:
+            package, version, *_ = line.split("|", 2)
+            packages.add(package)
+            versions.add(version)
+    if not packages:
+        return FedoraRecord()
+
+    matching = [r for n, r in parse_provides_records(out, prefix) if n == name]
+    return FedoraRecord(
+        is_packaged=True,
+        package_versions=sorted(versions),
+        package_names=sorted(packages),
+        provided_versions=_provided_versions(matching),
+    )
+
+
+class ProvidesIndex(BaseModel):
+    """All ``prefix(name)`` provides of a Fedora target, keyed by name."""
+
+    prefix: str
+    entries: dict[str, list[ProvidesRecord]] = Field(default_factory=dict)
+
+    @classmethod
+    def from_repoquery_output(cls, prefix: str, out: str) -> "ProvidesIndex":
+        """Build an index from ``%{NAME}|%{VERSION}|%{PROVIDES}`` output."""
+        index = cls(prefix=prefix)
+        for name, record in parse_provides_records(out, prefix):
+            index.add(name, record)
+        return index
+
+    def add(self, name: str, record: ProvidesRecord) -> None:
+        """Record that ``record.package`` provides ``prefix(name)``."""
+        self.entries.setdefault(name, []).append(record)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def lookup(self, name: str) -> FedoraRecord:
+        """
+        Look up everything Fedora ships for ``prefix(name)``.
+
+        Args:
+            name: Normalized provided name.
+
+        Returns:
+            The FedoraRecord for *name* (not packaged if absent).
+        """
+        return FedoraRecord.from_records(self.entries.get(name, []))
+
+    def lookup_packages(self, name: str) -> tuple[bool, list[str], list[str]]:
+        """
+        Look up the packages providing ``prefix(name)``.
+
+        Args:
+            name: Normalized provided name.
+
+        Returns:
+            Tuple of (is_packaged, package_versions, package_names), the
+            same shape as ``LanguageProvider._repoquery_package``.
+        """
+        return self.lookup(name).as_repoquery()
+
+    def lookup_provided_versions(self, name: str) -> list[str]:
+        """
+        Look up the versions Fedora provides for ``prefix(name)``.
+
+        Args:
+            name: Normalized provided name.
+
+        Returns:
+            Sorted version strings, the same shape as
+            ``LanguageProvider._get_provides_version``.
+        """
+        return self.lookup(name).provided_versions
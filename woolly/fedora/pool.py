@@ -0,0 +1,271 @@
+"""
+Pool of persistent dnf query workers.
+
+A :class:`DnfWorkerPool` starts up to ``size`` :mod:`woolly.fedora.worker`
+processes for one Fedora target (release + repos) and hands queries to
+whichever is idle.  Workers are started lazily, exit on their own after
+``idle_timeout`` seconds without work (and are respawned on the next
+query), and are stopped by :meth:`DnfWorkerPool.shutdown`.
+
+If a worker cannot start (typically because the libdnf5/dnf bindings
+are not importable from this interpreter) the pool marks itself
+unavailable and callers fall back to running ``dnf repoquery``.
+"""
+
+import atexit
+import os
+import select
+import subprocess
+import sys
+import threading
+import time
+import weakref
+from typing import Optional
+
+# Seconds allowed for a worker to load the repository metadata.
+_WORKER_START_TIMEOUT = 300
+
+# Seconds allowed for a single query once the metadata is loaded.
+_WORKER_QUERY_TIMEOUT = 60
+
+DEFAULT_IDLE_TIMEOUT = 300.0
+
+# Pools still running at interpreter exit are shut down then.
+_live_pools: "weakref.WeakSet[DnfWorkerPool]" = weakref.WeakSet()
+
+
+class DnfWorkerError(Exception):
+    """Raised when a worker cannot be started or fails to answer."""
+
+
+def _worker_command(
+    release: Optional[str], repos: list[str], idle_timeout: Optional[float]
+) -> list[str]:
+    cmd = [sys.executable, "-m", "woolly.fedora.worker"]
+    if release:
+        cmd.append(f"--releasever={release}")
+    for repo in repos:
+        cmd.extend(["--repo", repo])
+    if idle_timeout is not None:
+        cmd.append(f"--idle-timeout={idle_timeout}")
+    return cmd
+
+
+class DnfWorker:
+    """One worker process and its end of the line protocol."""
+
+    def __init__(self, cmd: list[str], start_timeout: float = _WORKER_START_TIMEOUT):
+        """
+        Start the worker and wait until its metadata is loaded.
+
+        Args:
+            cmd: Command starting the worker process.
+            start_timeout: Seconds to wait for the ``READY`` line.
+
+        Raises:
+            DnfWorkerError: If the worker reports an error or never gets ready.
+        """
+        self._buffer = b""
+        try:
+            self.process = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as e:
+            raise DnfWorkerError(f"cannot start worker: {e}") from e
+
+        try:
+            # Bindings may print to stdout while loading; skip until a status
+            while True:
+                line = self._readline(start_timeout)
+                if line.startswith("READY"):
+                    self.bindings = line.partition(" ")[2]
+                    return
+                if line.startswith("ERR"):
+                    raise DnfWorkerError(line[4:] or "worker failed to start")
+        except DnfWorkerError:
+            self.close()
+            raise
+
+    @property
+    def alive(self) -> bool:
+        """Whether the process is still running (it exits when idle)."""
+        return self.process.poll() is None
+
+    def _readline(self, timeout: float) -> str:
+        deadline = time.monotonic() + timeout
+        fd = self.process.stdout.fileno()
+        while b"\n" not in self._buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise DnfWorkerError("worker timed out")
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                continue
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise DnfWorkerError("worker exited")
+            self._buffer += chunk
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return line.decode()
+
+    def request(
+        self, verb: str, patterns: list[str], timeout: float = _WORKER_QUERY_TIMEOUT
+    ) -> str:
+        """
+        Send one query and return its output.
+
+        Args:
+            verb: Protocol verb (see :mod:`woolly.fedora.worker`).
+            patterns: Provides patterns to query.
+            timeout: Seconds to wait for each reply line.
+
+        Returns:
+            The output lines joined with newlines, as dnf would print them.
+
+        Raises:
+            DnfWorkerError: If the worker died, timed out or reported an error.
+        """
+        try:
+            self.process.stdin.write(f"{verb} {' '.join(patterns)}\n".encode())
+            self.process.stdin.flush()
+        except OSError as e:
+            raise DnfWorkerError(f"worker exited: {e}") from e
+
+        status = self._readline(timeout)
+        if status.startswith("ERR"):
+            raise DnfWorkerError(status[4:])
+        if not status.startswith("OK "):
+            raise DnfWorkerError(f"unexpected reply {status!r}")
+        count = int(status[3:])
+        return "\n".join(self._readline(timeout) for _ in range(count))
+
+    def close(self) -> None:
+        """Ask the worker to exit (EOF on stdin) and reap it."""
+        if self.alive:
+            try:
+                self.process.stdin.close()
+                self.process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self.process.kill()
+                self.process.wait()
+        else:
+            self.process.wait()
+        if self.process.stdout:
+            self.process.stdout.close()
+
+
+class DnfWorkerPool:
+    """Up to ``size`` persistent workers for one Fedora target."""
+
+    def __init__(
+        self,
+        size: int = 2,
+        idle_timeout: Optional[float] = DEFAULT_IDLE_TIMEOUT,
+        release: Optional[str] = None,
+        repos: Optional[list[str]] = None,
+    ):
+        """
+        Args:
+            size: Maximum number of worker processes.
+            idle_timeout: Seconds a worker may sit idle before exiting,
+                or None to keep it until shutdown.
+            release: Fedora release the workers load (``--releasever``).
+            repos: Repos the workers load; all enabled repos if empty.
+        """
+        self.size = max(1, size)
+        self.idle_timeout = idle_timeout
+        self.release = release
+        self.repos = list(repos or [])
+        self.unavailable: Optional[str] = None
+        self._idle: list[DnfWorker] = []
+        self._count = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        _live_pools.add(self)
+
+    def serves(self, release: Optional[str], repos: Optional[list[str]]) -> bool:
+        """Whether the workers load the given Fedora target."""
+        return release == self.release and sorted(repos or []) == sorted(self.repos)
+
+    def _acquire(self) -> DnfWorker:
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise DnfWorkerError("worker pool is shut down")
+                if self.unavailable:
+                    raise DnfWorkerError(self.unavailable)
+                while self._idle:
+                    worker = self._idle.pop()
+                    if worker.alive:
+                        return worker
+                    # Exited after its idle timeout
+                    worker.close()
+                    self._count -= 1
+                if self._count < self.size:
+                    self._count += 1
+                    break
+                self._cond.wait()
+
+        # Start outside the lock: loading metadata takes a while
+        try:
+            return DnfWorker(
+                _worker_command(self.release, self.repos, self.idle_timeout)
+            )
+        except DnfWorkerError as e:
+            with self._cond:
+                self._count -= 1
+                self.unavailable = str(e)
+                self._cond.notify_all()
+            raise
+
+    def _release(self, worker: DnfWorker, healthy: bool) -> None:
+        with self._cond:
+            if healthy and not self._closed:
+                self._idle.append(worker)
+            else:
+                self._count -= 1
+                worker.close()
+            self._cond.notify()
+
+    def query(self, verb: str, patterns: list[str]) -> str:
+        """
+        Run a query on an idle worker, starting one if needed.
+
+        Args:
+            verb: Protocol verb (see :mod:`woolly.fedora.worker`).
+            patterns: Provides patterns to query.
+
+        Returns:
+            The query output, formatted like the equivalent dnf command.
+
+        Raises:
+            DnfWorkerError: If no worker could answer.
+        """
+        worker = self._acquire()
+        try:
+            out = worker.request(verb, patterns)
+        except DnfWorkerError:
+            self._release(worker, healthy=False)
+            raise
+        self._release(worker, healthy=True)
+        return out
+
+    def shutdown(self) -> None:
+        """Stop all idle workers; busy ones are stopped when they finish."""
+        with self._cond:
+            self._closed = True
+            workers, self._idle = self._idle, []
+            self._count -= len(workers)
+            self._cond.notify_all()
+        for worker in workers:
+            worker.close()
+        _live_pools.discard(self)
+
+
+@atexit.register
+def _shutdown_live_pools() -> None:
+    for pool in list(_live_pools):
+        pool.shutdown()
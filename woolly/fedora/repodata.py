@@ -0,0 +1,377 @@
+"""
+Read Fedora provides straight from repository metadata.
+
+A yum/dnf repository describes itself in ``repodata/repomd.xml``, which
+points at the ``primary`` metadata listing every package and its
+provides.  This module locates that file for a local repository (a
+directory or ``file://`` URL), decompresses it as needed and
+stream-parses the ``prefix(name)`` provides into a
+:class:`~woolly.fedora.index.ProvidesIndex` without spawning dnf.
+
+Both the XML flavour (``primary.xml`` optionally compressed with gzip,
+bzip2, xz or zstd) and the SQLite flavour (``primary.sqlite``) are
+supported; XML is preferred because it can be parsed incrementally.
+"""
+
+import bz2
+import gzip
+import hashlib
+import lzma
+import shutil
+import sqlite3
+import tempfile
+import xml.etree.ElementTree as ET
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Optional
+from urllib.parse import unquote, urlparse
+
+from woolly.fedora.index import ProvidesIndex, ProvidesRecord
+
+_REPO_NS = "{http://linux.duke.edu/metadata/repo}"
+_COMMON_NS = "{http://linux.duke.edu/metadata/common}"
+_RPM_NS = "{http://linux.duke.edu/metadata/rpm}"
+
+
+class RepodataError(Exception):
+    """Raised when repository metadata cannot be located or read."""
+
+
+# ----------------------------------------------------------------
+# Locating metadata
+# ----------------------------------------------------------------
+
+
+def resolve_repo_path(location: str) -> Path:
+    """
+    Turn a repository location into a local path.
+
+    Args:
+        location: A filesystem path or ``file://`` URL pointing at the
+            repository root, its ``repodata`` directory or ``repomd.xml``.
+
+    Returns:
+        The local path.
+
+    Raises:
+        RepodataError: If the URL scheme is not a local one.
+    """
+    parsed = urlparse(location)
+    if parsed.scheme == "file":
+        return Path(unquote(parsed.path))
+    if parsed.scheme:
+        raise RepodataError(
+            f"Unsupported repodata location {location!r}: "
+            "only local directories and file:// URLs are supported"
+        )
+    return Path(location)
+
+
+def find_repomd(location: str) -> Path:
+    """
+    Find the ``repomd.xml`` file of a local repository.
+
+    Args:
+        location: Repository root, ``repodata`` directory, ``repomd.xml``
+            path or ``file://`` URL to any of those.
+
+    Returns:
+        Path to ``repomd.xml``.
+
+    Raises:
+        RepodataError: If no ``repomd.xml`` can be found.
+    """
+    path = resolve_repo_path(location)
+    candidates = (
+        [path]
+        if path.is_file()
+        else [path / "repodata" / "repomd.xml", path / "repomd.xml"]
+    )
+    for candidate in candidates:
+        if candidate.is_file():
+            return candidate
+    raise RepodataError(f"No repodata/repomd.xml found at {location!r}")
+
+
+def read_repomd_revision(repomd_path: Path) -> str:
+    """
+    Read the revision of a repository's metadata.
+
+    Args:
+        repomd_path: Path to ``repomd.xml``.
+
+    Returns:
+        The ``<revision>`` of ``repomd.xml``, or a checksum of the file
+        when it has none.
+
+    Raises:
+        RepodataError: If the file cannot be read or is malformed.
+    """
+    try:
+        content = repomd_path.read_bytes()
+        root = ET.fromstring(content)
+    except (OSError, ET.ParseError) as e:
+        raise RepodataError(f"Cannot read {repomd_path}: {e}") from e
+    revision = (root.findtext(f"{_REPO_NS}revision") or "").strip()
+    return revision or f"sha256:{hashlib.sha256(content).hexdigest()}"
+
+
+def find_primary(repomd_path: Path) -> tuple[str, Path]:
+    """
+    Find the primary metadata file referenced by ``repomd.xml``.
+
+    Args:
+        repomd_path: Path to ``repomd.xml``.
+
+    Returns:
+        Tuple of (data type, path), where the type is ``"primary"`` for
+        XML or ``"primary_db"`` for SQLite.
+
+    Raises:
+        RepodataError: If the file is malformed or lists no primary data.
+    """
+    try:
+        root = ET.parse(repomd_path).getroot()
+    except ET.ParseError as e:
+        raise RepodataError(f"Malformed {repomd_path}: {e}") from e
+
+    hrefs: dict[str, str] = {}
+    for data in root.iter(f"{_REPO_NS}data"):
+        location = data.find(f"{_REPO_NS}location")
+        if location is not None and location.get("href"):
+            hrefs[data.get("type", "")] = location.get("href")
+
+    # repomd.xml lives in repodata/; hrefs are relative to the repo root
+    repo_root = repomd_path.parent.parent
+    for data_type in ("primary", "primary_db"):
+        if data_type in hrefs:
+            return data_type, repo_root / hrefs[data_type]
+    raise RepodataError(f"{repomd_path} does not reference primary metadata")
+
+
+# ----------------------------------------------------------------
+# Decompression
+# ----------------------------------------------------------------
+
+
+def _open_zstd(path: Path) -> IO[bytes]:
+    try:
+        from compression import zstd  # type: ignore[import-not-found]
+
+        return zstd.open(path, "rb")
+    except ImportError:
+        pass
+    try:
+        import zstandard  # type: ignore[import-not-found]
+    except ImportError as e:
+        raise RepodataError(
+            "Reading .zst repodata requires the 'zstandard' package. "
+            "Install with: pip install woolly[zstd]"
+        ) from e
+    return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+
+
+def open_metadata(path: Path) -> IO[bytes]:
+    """
+    Open a (possibly compressed) metadata file for streaming reads.
+
+    Args:
+        path: Path to the metadata file; the compression is picked from
+            its suffix (``.gz``, ``.bz2``, ``.xz``, ``.zst``).
+
+    Returns:
+        A binary file object yielding the decompressed content.
+
+    Raises:
+        RepodataError: If the file is missing.
+    """
+    if not path.is_file():
+        raise RepodataError(f"Metadata file not found: {path}")
+    suffix = path.suffix
+    if suffix == ".gz":
+        return gzip.open(path, "rb")
+    if suffix == ".bz2":
+        return bz2.open(path, "rb")
+    if suffix == ".xz":
+        return lzma.open(path, "rb")
+    if suffix == ".zst":
+        return _open_zstd(path)
+    return open(path, "rb")
+
+
+# ----------------------------------------------------------------
+# Parsing provides
+# ----------------------------------------------------------------
+
+
+def _strip_prefix(provide: str, prefix: str) -> Optional[str]:
+    """Return ``name`` for ``prefix(name)`` provides, None otherwise."""
+    head = f"{prefix}("
+    if provide.startswith(head) and provide.endswith(")"):
+        return provide[len(head) : -1]
+    return None
+
+
+def _provided_version(version: Optional[str], release: Optional[str]) -> Optional[str]:
+    if not version:
+        return None
+    return f"{version}-{release}" if release else version
+
+
+def iter_primary_xml(
+    stream: IO[bytes], prefix: str
+) -> Iterator[tuple[str, ProvidesRecord]]:
+    """
+    Stream-parse ``prefix(name)`` provides out of ``primary.xml``.
+
+    Each ``<package>`` element is discarded once handled, so memory use
+    stays flat regardless of the repository size.  Source packages are
+    skipped, matching what ``dnf repoquery`` reports by default.
+
+    Args:
+        stream: Decompressed ``primary.xml`` content.
+        prefix: Provides prefix to keep (e.g. ``"crate"``).
+
+    Yields:
+        ``(provided_name, record)`` for every matching provide.
+
+    Raises:
+        RepodataError: If the XML is malformed.
+    """
+    try:
+        for _event, elem in ET.iterparse(stream, events=("end",)):
+            if elem.tag != f"{_COMMON_NS}package":
+                continue
+            if elem.findtext(f"{_COMMON_NS}arch") != "src":
+                package = elem.findtext(f"{_COMMON_NS}name", "")
+                version_elem = elem.find(f"{_COMMON_NS}version")
+                package_version = (
+                    version_elem.get("ver", "") if version_elem is not None else ""
+                )
+                for entry in elem.iterfind(
+                    f"{_COMMON_NS}format/{_RPM_NS}provides/{_RPM_NS}entry"
+                ):
+                    name = _strip_prefix(entry.get("name", ""), prefix)
+                    if name is None:
+                        continue
+                    yield (
+                        name,
+                        ProvidesRecord(
+                            package=package,
+                            package_version=package_version,
+                            provided_version=_provided_version(
+                                entry.get("ver"), entry.get("rel")
+                            ),
+                        ),
+                    )
+            elem.clear()
+    except ET.ParseError as e:
+        raise RepodataError(f"Malformed primary metadata: {e}") from e
+
+
+def iter_primary_sqlite(
+    db_path: Path, prefix: str
+) -> Iterator[tuple[str, ProvidesRecord]]:
+    """
+    Read ``prefix(name)`` provides out of a ``primary.sqlite`` database.
+
+    Args:
+        db_path: Path to the uncompressed SQLite database.
+        prefix: Provides prefix to keep (e.g. ``"crate"``).
+
+    Yields:
+        ``(provided_name, record)`` for every matching provide.
+
+    Raises:
+        RepodataError: If the database cannot be queried.
+    """
+    head = f"{prefix}("
+    query = (
+        "SELECT pkg.name, pkg.version, prov.name, prov.version, prov.release "
+        "FROM provides AS prov JOIN packages AS pkg USING (pkgKey) "
+        "WHERE substr(prov.name, 1, ?) = ? AND pkg.arch != 'src'"
+    )
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    except sqlite3.Error as e:
+        raise RepodataError(f"Cannot open {db_path}: {e}") from e
+    try:
+        for package, package_version, provide, version, release in conn.execute(
+            query, (len(head), head)
+        ):
+            name = _strip_prefix(provide, prefix)
+            if name is None:
+                continue
+            yield (
+                name,
+                ProvidesRecord(
+                    package=package,
+                    package_version=package_version,
+                    provided_version=_provided_version(version, release),
+                ),
+            )
+    except sqlite3.Error as e:
+        raise RepodataError(f"Cannot read {db_path}: {e}") from e
+    finally:
+        conn.close()
+
+
+@contextmanager
+def _sqlite_file(path: Path) -> Iterator[Path]:
+    """Yield a path to an uncompressed copy of a (possibly compressed) database."""
+    if path.suffix == ".sqlite":
+        yield path
+        return
+    with tempfile.TemporaryDirectory(prefix="woolly-repodata-") as tmp:
+        target = Path(tmp) / "primary.sqlite"
+        with open_metadata(path) as src, open(target, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        yield target
+
+
+def iter_repo_provides(
+    location: str, prefix: str
+) -> Iterator[tuple[str, ProvidesRecord]]:
+    """
+    Iterate the ``prefix(name)`` provides of one local repository.
+
+    Args:
+        location: Repository root, ``repodata`` directory, ``repomd.xml``
+            path or ``file://`` URL to any of those.
+        prefix: Provides prefix to keep (e.g. ``"crate"``).
+
+    Yields:
+        ``(provided_name, record)`` for every matching provide.
+
+    Raises:
+        RepodataError: If the metadata cannot be located or read.
+    """
+    data_type, path = find_primary(find_repomd(location))
+    if data_type == "primary":
+        with open_metadata(path) as stream:
+            yield from iter_primary_xml(stream, prefix)
+    else:
+        with _sqlite_file(path) as db_path:
+            yield from iter_primary_sqlite(db_path, prefix)
+
+
+def read_repodata_index(locations: list[str], prefix: str) -> ProvidesIndex:
+    """
+    Build a provides index from one or more local repositories.
+
+    Args:
+        locations: Repository locations, see :func:`iter_repo_provides`.
+        prefix: Provides prefix to keep (e.g. ``"crate"``).
+
+    Returns:
+        The merged ProvidesIndex.
+
+    Raises:
+        RepodataError: If any repository cannot be read.
+    """
+    index = ProvidesIndex(prefix=prefix)
+    for location in locations:
+        for name, record in iter_repo_provides(location, prefix):
+            index.add(name, record)
+    return index
@@ -0,0 +1,232 @@
+"""
+Long-lived dnf query worker.
+
+Every ``dnf repoquery`` run loads the repository metadata from scratch,
+which dominates the cost of a packaging check.  This module is run as a
+separate process (``python -m woolly.fedora.worker``) that loads the
+metadata once through the libdnf5 or dnf Python bindings and then
+answers queries read from stdin, so the load is paid once per worker
+instead of once per query.
+
+Line protocol (UTF-8, one request per line)::
+
+    <verb> <pattern> [<pattern> ...]
+
+``verb`` selects the output format, mirroring the dnf command lines it
+replaces:
+
+- ``whatprovides``: ``NAME|VERSION`` lines
+  (``--whatprovides ... --queryformat %{NAME}|%{VERSION}``)
+- ``provides``: every provide of the matching packages
+  (``--provides --whatprovides ...``)
+- ``records``: ``NAME|VERSION|PROVIDES`` records
+  (``--queryformat %{NAME}|%{VERSION}|%{PROVIDES}``)
+
+The worker replies ``OK <n>`` followed by *n* lines, or ``ERR <message>``.
+On start-up it prints ``READY <bindings>`` once the metadata is loaded,
+or ``ERR <message>`` (and exits) if no bindings are available.  It exits
+on EOF or after ``--idle-timeout`` seconds without a request.
+"""
+
+import argparse
+import select
+import sys
+from collections.abc import Callable
+from typing import Optional, TextIO
+
+# (name, version, provides) of one binary package
+Package = tuple[str, str, list[str]]
+QueryFunc = Callable[[list[str]], list[Package]]
+
+VERBS = ("whatprovides", "provides", "records")
+
+
+# ----------------------------------------------------------------
+# Bindings
+# ----------------------------------------------------------------
+
+
+def _load_libdnf5(releasever: Optional[str], repos: list[str]) -> QueryFunc:
+    import libdnf5  # type: ignore[import-not-found]
+
+    base = libdnf5.base.Base()
+    base.load_config()
+    if releasever:
+        base.get_vars().set("releasever", releasever)
+    base.setup()
+    repo_sack = base.get_repo_sack()
+    repo_sack.create_repos_from_system_configuration()
+    if repos:
+        for repo in libdnf5.repo.RepoQuery(base):
+            if repo.get_id() in repos:
+                repo.enable()
+            else:
+                repo.disable()
+    repo_sack.load_repos(libdnf5.repo.Repo.Type_AVAILABLE)
+
+    def query(patterns: list[str]) -> list[Package]:
+        packages = libdnf5.rpm.PackageQuery(base)
+        packages.filter_provides(patterns)
+        packages.filter_arch(["src"], libdnf5.common.QueryCmp_NEQ)
+        return [
+            (
+                pkg.get_name(),
+                pkg.get_version(),
+                [reldep.to_string() for reldep in pkg.get_provides()],
+            )
+            for pkg in packages
+        ]
+
+    return query
+
+
+def _load_dnf(releasever: Optional[str], repos: list[str]) -> QueryFunc:
+    import dnf  # type: ignore[import-not-found]
+
+    base = dnf.Base()
+    base.conf.read()
+    if releasever:
+        base.conf.substitutions["releasever"] = releasever
+    base.read_all_repos()
+    if repos:
+        for repo in base.repos.all():
+            if repo.id in repos:
+                repo.enable()
+            else:
+                repo.disable()
+    base.fill_sack(load_system_repo=False)
+
+    def query(patterns: list[str]) -> list[Package]:
+        packages = (
+            base.sack.query()
+            .available()
+            .filter(provides=patterns)
+            .filter(arch__neq="src")
+        )
+        return [
+            (pkg.name, pkg.version, [str(reldep) for reldep in pkg.provides])
+            for pkg in packages
+        ]
+
+    return query
+
+
+_LOADERS: list[tuple[str, Callable[[Optional[str], list[str]], QueryFunc]]] = [
+    ("libdnf5", _load_libdnf5),
+    ("dnf", _load_dnf),
+]
+
+
+# ----------------------------------------------------------------
+# Protocol
+# ----------------------------------------------------------------
+
+
+def format_response(verb: str, packages: list[Package]) -> list[str]:
+    """
+    Format query results the way the equivalent dnf command prints them.
+
+    Args:
+        verb: One of :data:`VERBS`.
+        packages: Matching packages.
+
+    Returns:
+        Output lines.
+    """
+    lines: list[str] = []
+    for name, version, provides in packages:
+        if verb == "whatprovides":
+            lines.append(f"{name}|{version}")
+        elif verb == "provides":
+            lines.extend(provides)
+        else:
+            first, *rest = provides or [""]
+            lines.append(f"{name}|{version}|{first}")
+            lines.extend(rest)
+    return lines
+
+
+def handle_request(query: QueryFunc, line: str) -> list[str]:
+    """
+    Answer one protocol request.
+
+    Args:
+        query: Function returning the packages providing any pattern.
+        line: Request line.
+
+    Returns:
+        Response lines, starting with the ``OK``/``ERR`` status line.
+    """
+    verb, *patterns = line.split()
+    if verb not in VERBS:
+        return [f"ERR unknown verb {verb!r}"]
+    if not patterns:
+        return ["OK 0"]
+    try:
+        lines = format_response(verb, query(patterns))
+    except Exception as e:  # the worker must survive bad queries
+        return [f"ERR {type(e).__name__}: {e}".replace("\n", " ")]
+    return [f"OK {len(lines)}", *lines]
+
+
+def serve(
+    query: QueryFunc,
+    stdin: TextIO,
+    stdout: TextIO,
+    idle_timeout: Optional[float] = None,
+) -> None:
+    """
+    Answer requests from *stdin* until EOF or the idle timeout.
+
+    The client sends one request at a time and waits for the reply, so
+    nothing is left in stdin's buffer while waiting for the next line.
+
+    Args:
+        query: Function returning the packages providing any pattern.
+        stdin: Request stream.
+        stdout: Response stream.
+        idle_timeout: Seconds without a request before exiting, or None
+            to wait forever.
+    """
+    while True:
+        if idle_timeout is not None:
+            ready, _, _ = select.select([stdin], [], [], idle_timeout)
+            if not ready:
+                return
+        line = stdin.readline()
+        if not line:
+            return
+        if not line.strip():
+            continue
+        stdout.write("\n".join(handle_request(query, line)) + "\n")
+        stdout.flush()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Entry point of the worker process."""
+    parser = argparse.ArgumentParser(prog="python -m woolly.fedora.worker")
+    parser.add_argument("--releasever")
+    parser.add_argument("--repo", action="append", default=[])
+    parser.add_argument("--idle-timeout", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    errors: list[str] = []
+    for bindings, loader in _LOADERS:
+        try:
+            query = loader(args.releasever, args.repo)
+        except ImportError:
+            errors.append(f"{bindings} bindings not installed")
+            continue
+        except Exception as e:
+            errors.append(f"{bindings}: {e}".replace("\n", " "))
+            continue
+        print(f"READY {bindings}", flush=True)
+        serve(query, sys.stdin, sys.stdout, args.idle_timeout)
+        return 0
+
+    print(f"ERR {'; '.join(errors)}", flush=True)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,383 @@
+"""
+Registry change feeds driving cache invalidation.
+
+With a fixed TTL, registry entries are refetched every week whether
+or not the package changed.  A :class:`ChangeFeed` instead reports which
+packages changed upstream since a cursor: PyPI's changelog is keyed by
+its global serial (the counter ``X-PyPI-Last-Serial`` reports), and
+crates.io lists crates by their ``updated_at`` time.
+
+:func:`sync_change_feed` advances a namespace's :class:`FeedState` in
+the ``feeds`` cache namespace and records when each changed package was
+seen.  Entries of packages that did not change stay fresh indefinitely;
+entries written before the feed was first synced keep the default TTL.
+The stored state also sets the purge TTL of :func:`~woolly.cache.gc_cache`,
+so collections in runs without the feed keep those entries too.
+
+Feed invalidation is enabled with ``WOOLLY_CACHE_FEED=1`` or
+:func:`set_feed_invalidation`.
+"""
+
+import json
+import os
+import re
+import time
+import xmlrpc.client
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+import httpx
+from pydantic import BaseModel, Field
+
+from woolly import http
+from woolly.cache import (
+    FEED_STATE_NAMESPACE,
+    CacheLock,
+    feed_baseline_ttl,
+    read_cache_entry,
+    write_cache,
+)
+from woolly.debug import log, log_api_request
+
+CACHE_FEED_ENV = "WOOLLY_CACHE_FEED"
+FEED_NAMESPACE = FEED_STATE_NAMESPACE
+
+PYPI_XMLRPC = "https://pypi.org/pypi"
+CRATES_API = "https://crates.io/api/v1/crates"
+
+# Pages of recently updated crates read before giving up on catching up
+DEFAULT_CRATES_FEED_PAGES = 20
+
+# Above this many tracked packages the state is reset to a new baseline
+MAX_INVALIDATIONS = 100_000
+
+_feed_mode: Optional[bool] = None
+
+
+class FeedError(Exception):
+    """Raised when a change feed cannot be read."""
+
+
+class FeedGapError(FeedError):
+    """Raised when the feed no longer reaches back to the stored cursor."""
+
+
+class FeedChanges(BaseModel):
+    """Packages changed since a cursor, and the cursor to resume from."""
+
+    names: list[str] = Field(default_factory=list)
+    cursor: str
+
+
+class FeedState(BaseModel):
+    """
+    Invalidation state of one registry namespace.
+
+    Attributes:
+        feed: Name of the feed the cursor belongs to.
+        cursor: Feed position the next sync resumes from.
+        baseline: When tracking started; older entries keep the default TTL.
+        invalidated: Normalized package name to the time its change was seen.
+    """
+
+    feed: str
+    cursor: str
+    baseline: float
+    invalidated: dict[str, float] = Field(default_factory=dict)
+
+    def default_ttl(self, now: Optional[float] = None) -> float:
+        """TTL of entries whose package did not change since the baseline."""
+        return feed_baseline_ttl(self.baseline, now)
+
+    def ttl(self, name: str, now: Optional[float] = None) -> float:
+        """
+        TTL making an entry of *name* expire iff written before its last change.
+
+        Args:
+            name: Normalized package name.
+            now: Current time; defaults to :func:`time.time`.
+
+        Returns:
+            Maximum age in seconds for the package's entries.
+        """
+        now = time.time() if now is None else now
+        changed = self.invalidated.get(name)
+        if changed is None:
+            return self.default_ttl(now)
+        return max(0.0, now - changed)
+
+
+def set_feed_invalidation(enabled: Optional[bool]) -> None:
+    """
+    Turn feed-driven invalidation on or off.
+
+    Args:
+        enabled: Whether registry entries expire when their package
+            changes upstream, or None to go back to the
+            ``WOOLLY_CACHE_FEED`` default.
+    """
+    global _feed_mode
+    _feed_mode = enabled
+
+
+def feed_invalidation_enabled() -> bool:
+    """Whether feed-driven invalidation is on."""
+    if _feed_mode is None:
+        return os.environ.get(CACHE_FEED_ENV, "").lower() in ("1", "true", "yes")
+    return _feed_mode
+
+
+# ----------------------------------------------------------------
+# Feeds
+# ----------------------------------------------------------------
+
+
+class ChangeFeed(ABC):
+    """
+    Abstract source of upstream package changes.
+
+    Attributes:
+        name: Short identifier stored with the cursor (e.g., "pypi").
+    """
+
+    name: str
+
+    @abstractmethod
+    def latest_cursor(self) -> str:
+        """
+        Return the current end of the feed.
+
+        Raises:
+            FeedError: If the feed cannot be read.
+        """
+        pass
+
+    @abstractmethod
+    def changes_since(self, cursor: str) -> FeedChanges:
+        """
+        Return the packages changed after *cursor*.
+
+        Args:
+            cursor: A cursor returned by this feed.
+
+        Returns:
+            The changed package names and the cursor to resume from.
+
+        Raises:
+            FeedGapError: If the changes since *cursor* are no longer available.
+            FeedError: If the feed cannot be read.
+        """
+        pass
+
+    def normalize(self, name: str) -> str:
+        """Normalize a package name so feed and cache keys agree."""
+        return name.lower()
+
+
+class PyPIChangeFeed(ChangeFeed):
+    """PyPI changelog, read through the ``changelog_since_serial`` XML-RPC."""
+
+    name = "pypi"
+
+    def __init__(self, url: str = PYPI_XMLRPC):
+        self.url = url
+
+    def _call(self, method: str, *params) -> tuple[Any, httpx.Response]:
+        log_api_request("POST", f"{self.url} {method}")
+        body = xmlrpc.client.dumps(params, method).encode()
+        try:
+            r = http.post(self.url, content=body, headers={"Content-Type": "text/xml"})
+            if r.status_code != 200:
+                raise FeedError(f"PyPI {method} returned {r.status_code}")
+            (result,), _ = xmlrpc.client.loads(r.content)
+        except (httpx.HTTPError, xmlrpc.client.Error, ValueError) as e:
+            raise FeedError(f"PyPI {method} failed: {e}") from e
+        return result, r
+
+    def latest_cursor(self) -> str:
+        serial, _r = self._call("changelog_last_serial")
+        return str(serial)
+
+    def changes_since(self, cursor: str) -> FeedChanges:
+        # Entries are (name, version, timestamp, action, serial)
+        events, r = self._call("changelog_since_serial", int(cursor))
+        serials = [int(event[4]) for event in events]
+        header = r.headers.get("X-PyPI-Last-Serial", "")
+        if header.isdigit():
+            serials.append(int(header))
+        return FeedChanges(
+            names=sorted({event[0] for event in events}),
+            cursor=str(max([int(cursor), *serials])),
+        )
+
+    def normalize(self, name: str) -> str:
+        return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def _parse_time(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class CratesIoChangeFeed(ChangeFeed):
+    """crates.io crates listed by most recent ``updated_at``."""
+
+    name = "crates.io"
+
+    def __init__(
+        self, url: str = CRATES_API, max_pages: int = DEFAULT_CRATES_FEED_PAGES
+    ):
+        self.url = url
+        self.max_pages = max_pages
+
+    def _page(self, page: int) -> list[dict]:
+        url = f"{self.url}?sort=recent-updates&per_page=100&page={page}"
+        log_api_request("GET", url)
+        try:
+            r = http.get(url)
+        except httpx.HTTPError as e:
+            raise FeedError(f"crates.io recent updates failed: {e}") from e
+        if r.status_code != 200:
+            raise FeedError(f"crates.io recent updates returned {r.status_code}")
+        try:
+            return r.json().get("crates", [])
+        except ValueError as e:
+            raise FeedError(f"crates.io recent updates failed: {e}") from e
+
+    def latest_cursor(self) -> str:
+        crates = self._page(1)
+        if not crates:
+            raise FeedError("crates.io listed no recently updated crates")
+        return crates[0]["updated_at"]
+
+    def changes_since(self, cursor: str) -> FeedChanges:
+        since = _parse_time(cursor)
+        names: set[str] = set()
+        latest = cursor
+        for page in range(1, self.max_pages + 1):
+            crates = self._page(page)
+            for crate in crates:
+                updated = crate["updated_at"]
+                if _parse_time(updated) <= since:
+                    return FeedChanges(names=sorted(names), cursor=latest)
+                if _parse_time(updated) > _parse_time(latest):
+                    latest = updated
+                names.add(crate["name"])
+            if not crates:
+                return FeedChanges(names=sorted(names), cursor=latest)
+        raise FeedGapError(
+            f"more than {self.max_pages} pages of crates changed since {cursor}"
+        )
+
+    def normalize(self, name: str) -> str:
+        # crates.io treats '-' and '_' as the same crate name
+        return name.lower().replace("_", "-")
+
+
+class FileChangeFeed(ChangeFeed):
+    """
+    Local stand-in feed read from a JSON file.
+
+    The file holds ``{"serial": <int>, "changes": [[<serial>, <name>], ...]}``,
+    mimicking PyPI's changelog, plus an optional ``first_serial`` below
+    which changes are no longer listed.  It lets tests and offline runs
+    drive invalidation without a registry.
+    """
+
+    name = "file"
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def _load(self) -> dict:
+        try:
+            return json.loads(self.path.read_text())
+        except (OSError, ValueError) as e:
+            raise FeedError(f"Cannot read change feed {self.path}: {e}") from e
+
+    def latest_cursor(self) -> str:
+        data = self._load()
+        serials = [serial for serial, _name in data.get("changes", [])]
+        return str(max([data.get("serial", 0), *serials]))
+
+    def changes_since(self, cursor: str) -> FeedChanges:
+        data = self._load()
+        since = int(cursor)
+        if since < data.get("first_serial", 0):
+            raise FeedGapError(f"{self.path} starts after serial {since}")
+        changes = [(s, name) for s, name in data.get("changes", []) if s > since]
+        return FeedChanges(
+            names=sorted({name for _s, name in changes}),
+            cursor=str(max([since, *(s for s, _name in changes)])),
+        )
+
+
+# ----------------------------------------------------------------
+# Syncing
+# ----------------------------------------------------------------
+
+
+def read_feed_state(namespace: str) -> Optional[FeedState]:
+    """Return the stored invalidation state of *namespace*, if any."""
+    entry = read_cache_entry(FEED_NAMESPACE, namespace)
+    if entry is None:
+        return None
+    try:
+        return FeedState.model_validate(entry.value)
+    except ValueError:
+        return None
+
+
+def _new_state(feed: ChangeFeed, now: float) -> FeedState:
+    return FeedState(feed=feed.name, cursor=feed.latest_cursor(), baseline=now)
+
+
+def sync_change_feed(namespace: str, feed: ChangeFeed) -> FeedState:
+    """
+    Bring the invalidation state of *namespace* up to date with *feed*.
+
+    The first sync (or one after the feed lost track of the cursor)
+    starts a new baseline: entries written before it keep the default
+    TTL, since changes made before then are unknown.
+
+    Args:
+        namespace: Registry cache namespace (e.g. ``"pypi"``).
+        feed: Feed reporting that registry's changes.
+
+    Returns:
+        The updated state.
+
+    Raises:
+        FeedError: If the feed cannot be read; the stored state is kept.
+    """
+    with CacheLock(FEED_NAMESPACE, namespace):
+        now = time.time()
+        state = read_feed_state(namespace)
+        if state is None or state.feed != feed.name:
+            state = _new_state(feed, now)
+        else:
+            try:
+                changes = feed.changes_since(state.cursor)
+            except FeedGapError as e:
+                log(
+                    "Change feed gap, starting a new baseline",
+                    level="warning",
+                    error=str(e),
+                )
+                state = _new_state(feed, now)
+            else:
+                for name in changes.names:
+                    state.invalidated[feed.normalize(name)] = now
+                state.cursor = changes.cursor
+                if len(state.invalidated) > MAX_INVALIDATIONS:
+                    state = _new_state(feed, now)
+                log(
+                    "Change feed synced",
+                    namespace=namespace,
+                    feed=feed.name,
+                    changed=len(changes.names),
+                    cursor=state.cursor,
+                )
+        write_cache(FEED_NAMESPACE, namespace, state.model_dump())
+        return state
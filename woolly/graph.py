@@ -0,0 +1,116 @@
+"""
+Structured dependency graph.
+
+Resolution records what it finds into a :class:`DependencyGraph`: one
+:class:`PackageNode` per package with typed upstream and Fedora fields,
+and one :class:`DependencyEdge` per dependency occurrence carrying the
+version requirement and optional flag.  Reporters render from this model
+directly, so nothing has to parse formatted labels back into data.
+
+Each package is expanded at exactly one place in the traversal; edges
+pointing at a package that was expanded elsewhere are ``"visited"``
+edges, and edges cut off by the depth limit are ``"max_depth"`` edges.
+Following only ``"expanded"`` edges from :attr:`DependencyGraph.root_edge`
+therefore yields the same tree the resolver walked.
+
+When several Fedora releases are checked at once, each node also carries
+a :class:`ReleaseStatus` per release in :attr:`PackageNode.releases`, in
+the column order given by :attr:`DependencyGraph.releases`.
+"""
+
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field, PrivateAttr
+
+EdgeKind = Literal["expanded", "visited", "max_depth"]
+
+NodeStatus = Literal[
+    "packaged", "not_packaged", "not_found", "visited", "max_depth_reached"
+]
+
+
+class ReleaseStatus(BaseModel):
+    """Fedora availability of a package in one release."""
+
+    is_packaged: bool = False
+    versions: list[str] = Field(default_factory=list)
+    package_names: list[str] = Field(default_factory=list)
+
+
+class PackageNode(BaseModel):
+    """A package and its Fedora packaging status."""
+
+    name: str
+    version: Optional[str] = None
+    license: Optional[str] = None
+    license_unavailable: bool = False
+    found: bool = True
+    is_packaged: bool = False
+    fedora_versions: list[str] = Field(default_factory=list)
+    fedora_packages: list[str] = Field(default_factory=list)
+    releases: dict[str, ReleaseStatus] = Field(default_factory=dict)
+
+
+class DependencyEdge(BaseModel):
+    """A single occurrence of a dependency in the traversal.
+
+    The root package is reached through an edge whose ``parent`` is None.
+    """
+
+    parent: Optional[str] = None
+    child: str
+    requirement: Optional[str] = None
+    optional: bool = False
+    kind: EdgeKind = "expanded"
+
+
+class DependencyGraph(BaseModel):
+    """Packages and dependency edges discovered while resolving a root package."""
+
+    root: str
+    registry: str = ""
+    nodes: dict[str, PackageNode] = Field(default_factory=dict)
+    edges: list[DependencyEdge] = Field(default_factory=list)
+    releases: list[str] = Field(default_factory=list)
+
+    _children: dict[Optional[str], list[DependencyEdge]] = PrivateAttr(
+        default_factory=dict
+    )
+
+    def model_post_init(self, __context) -> None:
+        for edge in self.edges:
+            self._children.setdefault(edge.parent, []).append(edge)
+
+    def add_node(self, node: PackageNode) -> None:
+        """Add or replace the node for ``node.name``."""
+        self.nodes[node.name] = node
+
+    def add_edge(self, edge: DependencyEdge) -> None:
+        """Append an edge, preserving insertion order per parent."""
+        self.edges.append(edge)
+        self._children.setdefault(edge.parent, []).append(edge)
+
+    @property
+    def root_edge(self) -> Optional[DependencyEdge]:
+        """The edge leading to the root package, if resolution recorded one."""
+        edges = self._children.get(None)
+        return edges[0] if edges else None
+
+    def children(self, package_name: str) -> list[DependencyEdge]:
+        """Get the outgoing edges of *package_name* in dependency order."""
+        return self._children.get(package_name, [])
+
+    def node_for(self, edge: DependencyEdge) -> Optional[PackageNode]:
+        """Get the node an edge points at (None for depth-limited edges)."""
+        return self.nodes.get(edge.child)
+
+    def status(self, edge: DependencyEdge) -> NodeStatus:
+        """Get the display status of the package reached through *edge*."""
+        if edge.kind == "max_depth":
+            return "max_depth_reached"
+        if edge.kind == "visited":
+            return "visited"
+        node = self.nodes.get(edge.child)
+        if node is None or not node.found:
+            return "not_found"
+        return "packaged" if node.is_packaged else "not_packaged"
@@ -5,10 +5,24 @@ This module provides centralized HTTP configuration including
 the User-Agent header and common request settings.
 Uses a lazily-initialized ``httpx.Client`` for connection pooling
 and keep-alive across repeated requests to the same host.
+
+An asyncio counterpart (:func:`aget`) is backed by one
+``httpx.AsyncClient`` per event loop and bounds the number of
+in-flight requests per host.
+
+Cached responses are revalidated with conditional requests:
+:func:`conditional_headers` turns the validators stored with a cache
+entry into ``If-None-Match``/``If-Modified-Since`` headers, and
+:func:`response_validators` extracts them from a fresh response.
 """
 
-import httpx
+import asyncio
+import threading
+import weakref
 from importlib.metadata import version
+from typing import Optional
+
+import httpx
 
 # Version identifier for the User-Agent
 VERSION = version("woolly")
@@ -19,15 +33,30 @@ DEFAULT_HEADERS = {
     "User-Agent": f"woolly/{VERSION} ({PROJECT_URL})",
 }
 
+# Maximum number of concurrent async requests to a single host
+MAX_CONCURRENCY_PER_HOST = 16
+
 # Lazily-initialized shared client for connection pooling
 _client: httpx.Client | None = None
+_client_lock = threading.Lock()
+
+# Async clients and per-host limiters are bound to the event loop that
+# created them, so they are tracked per loop.
+_async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_host_semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
 
 
 def _get_client() -> httpx.Client:
-    """Return the shared ``httpx.Client``, creating it on first use."""
+    """Return the shared ``httpx.Client``, creating it on first use.
+
+    ``httpx.Client`` is thread-safe, so the same instance is shared by
+    the resolver's worker threads; the lock only guards creation.
+    """
     global _client
     if _client is None:
-        _client = httpx.Client(headers=DEFAULT_HEADERS)
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(headers=DEFAULT_HEADERS)
     return _client
 
 
@@ -51,3 +80,117 @@ def get(url: str, **kwargs) -> httpx.Response:
         merged_headers = {**DEFAULT_HEADERS, **headers}
         return client.get(url, headers=merged_headers, **kwargs)
     return client.get(url, **kwargs)
+
+
+def post(url: str, **kwargs) -> httpx.Response:
+    """
+    Make a POST request with default headers on the shared client.
+
+    Args:
+        url: The URL to request.
+        **kwargs: Additional arguments passed to ``client.post()``.
+
+    Returns:
+        httpx.Response object.
+    """
+    headers = kwargs.pop("headers", {})
+    return _get_client().post(url, headers={**DEFAULT_HEADERS, **headers}, **kwargs)
+
+
+def conditional_headers(
+    etag: Optional[str] = None, last_modified: Optional[str] = None
+) -> dict[str, str]:
+    """
+    Build the headers revalidating a previously fetched response.
+
+    Args:
+        etag: ``ETag`` of the previous response.
+        last_modified: ``Last-Modified`` of the previous response.
+
+    Returns:
+        ``If-None-Match``/``If-Modified-Since`` headers; empty if there
+        is nothing to revalidate against.
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def response_validators(response: httpx.Response) -> dict[str, str]:
+    """
+    Extract the validators of a response for :func:`conditional_headers`.
+
+    Args:
+        response: A response to cache.
+
+    Returns:
+        ``etag``/``last_modified`` keyword arguments for the headers the
+        server sent.
+    """
+    validators = {}
+    etag = response.headers.get("ETag")
+    if etag:
+        validators["etag"] = etag
+    last_modified = response.headers.get("Last-Modified")
+    if last_modified:
+        validators["last_modified"] = last_modified
+    return validators
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    """Return the ``httpx.AsyncClient`` for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            limits=httpx.Limits(max_keepalive_connections=MAX_CONCURRENCY_PER_HOST),
+        )
+        _async_clients[loop] = client
+    return client
+
+
+def _get_host_semaphore(host: str) -> asyncio.Semaphore:
+    """Return the per-host concurrency limiter for the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphores = _host_semaphores.setdefault(loop, {})
+    semaphore = semaphores.get(host)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENCY_PER_HOST)
+        semaphores[host] = semaphore
+    return semaphore
+
+
+async def aget(url: str, **kwargs) -> httpx.Response:
+    """
+    Async counterpart of :func:`get`.
+
+    At most :data:`MAX_CONCURRENCY_PER_HOST` requests to the same host
+    are in flight at once; additional requests wait for a free slot.
+
+    Args:
+        url: The URL to request.
+        **kwargs: Additional arguments passed to ``client.get()``.
+
+    Returns:
+        httpx.Response object.
+    """
+    headers = kwargs.pop("headers", {})
+    client = _get_async_client()
+    async with _get_host_semaphore(httpx.URL(url).host):
+        if headers:
+            merged_headers = {**DEFAULT_HEADERS, **headers}
+            return await client.get(url, headers=merged_headers, **kwargs)
+        return await client.get(url, **kwargs)
+
+
+async def aclose() -> None:
+    """Close the ``httpx.AsyncClient`` bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    _host_semaphores.pop(loop, None)
+    client = _async_clients.pop(loop, None)
+    if client is not None:
+        await client.aclose()
@@ -22,19 +22,86 @@ Example:
             ...
 """
 
-import re
+import asyncio
+import copy
 import subprocess
+import threading
+import weakref
 from abc import ABC, abstractmethod
-from typing import Literal, Optional
+from collections.abc import Callable
+from typing import Any, Literal, Optional, TypeVar
 
+import httpx
 from pydantic import BaseModel, Field
 
-from woolly.cache import FEDORA_CACHE_TTL, read_cache, write_cache
-from woolly.debug import log, log_cache_hit, log_cache_miss, log_command_output
+from woolly import http
+from woolly.cache import (
+    DEFAULT_CACHE_TTL,
+    FEDORA_CACHE_TTL,
+    FEDORA_REVISION_TTL,
+    CacheEntry,
+    acache_fill_lock,
+    cache_fill_lock,
+    read_cache,
+    read_cache_entry,
+    touch_cache,
+    write_cache,
+)
+from woolly.debug import (
+    log,
+    log_api_request,
+    log_api_response,
+    log_cache_hit,
+    log_cache_miss,
+    log_command_output,
+)
+from woolly.fedora import (
+    DnfBackend,
+    FedoraBackend,
+    FedoraRecord,
+    ProvidesIndex,
+    parse_fedora_record,
+)
+from woolly.fedora.pool import DnfWorkerError, DnfWorkerPool
+from woolly.feeds import ChangeFeed, FeedState, sync_change_feed
 
 # Default timeout (seconds) for dnf repoquery subprocess calls.
 _DNF_TIMEOUT = 60
 
+# Maximum number of provides patterns passed to a single batched repoquery,
+# keeping the command line well below the system argument limit.
+_DNF_BATCH_SIZE = 200
+
+# Maximum number of dnf processes spawned concurrently by the async API.
+# Each one loads the full repo metadata, so this is kept deliberately low.
+_DNF_MAX_CONCURRENCY = 4
+
+# One semaphore per event loop (semaphores cannot be shared across loops).
+_dnf_semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+# Serializes loading (or building) the provides index across worker threads.
+_fedora_index_lock = threading.Lock()
+
+# Serializes looking up the repository metadata revision.
+_fedora_revision_lock = threading.Lock()
+
+# Backend used by providers that have no ``fedora_backend`` configured.
+_DEFAULT_FEDORA_BACKEND = DnfBackend()
+
+
+T = TypeVar("T")
+
+
+def _get_dnf_semaphore() -> asyncio.Semaphore:
+    """Return the dnf concurrency limiter for the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphore = _dnf_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(_DNF_MAX_CONCURRENCY)
+        _dnf_semaphores[loop] = semaphore
+    return semaphore
+
 
 class PackageInfo(BaseModel):
     """Information about a package from an upstream registry."""
@@ -45,6 +112,8 @@ class PackageInfo(BaseModel):
     homepage: Optional[str] = None
     repository: Optional[str] = None
     license: Optional[str] = None
+    # Set when the source omits licenses, so None means unknown, not unlicensed
+    license_unavailable: bool = False
 
 
 class Dependency(BaseModel):
@@ -85,6 +154,8 @@ class LanguageProvider(ABC):
         registry_name: Name of the package registry (e.g., "crates.io", "PyPI")
         fedora_provides_prefix: Prefix used in Fedora provides (e.g., "crate", "python3dist")
         cache_namespace: Namespace for caching upstream registry data
+        cache_schema_version: Version of the cached registry payload shapes;
+            bumping it makes entries written by older versions unreachable
     """
 
     # Class attributes that must be defined by subclasses
@@ -93,11 +164,30 @@ class LanguageProvider(ABC):
     registry_name: str
     fedora_provides_prefix: str
     cache_namespace: str
+    cache_schema_version: int = 1
 
     # Optional Fedora targeting attributes (set at runtime)
     fedora_release: Optional[str] = None
     fedora_repos: Optional[list[str]] = None
 
+    # Source of Fedora provides; None means the system's dnf
+    fedora_backend: Optional[FedoraBackend] = None
+
+    # Persistent dnf workers answering queries instead of dnf subprocesses
+    dnf_workers: Optional[DnfWorkerPool] = None
+
+    # Source of upstream changes; None means registry_change_feed()
+    change_feed: Optional[ChangeFeed] = None
+
+    # Invalidation state set by apply_change_feed(); None uses the fixed TTL
+    _feed_state: Optional[FeedState] = None
+
+    # Provides indexes loaded by load_fedora_index(), keyed by cache key
+    _fedora_indexes: Optional[dict[str, Optional[ProvidesIndex]]] = None
+
+    # Metadata revisions looked up by fedora_metadata_revision(), per target
+    _fedora_revisions: Optional[dict[str, Optional[str]]] = None
+
     # ----------------------------------------------------------------
     # Abstract methods - MUST be implemented by subclasses
     # ----------------------------------------------------------------
@@ -143,10 +233,71 @@ class LanguageProvider(ABC):
         """
         pass
 
+    # ----------------------------------------------------------------
+    # Async counterparts - override for native async I/O
+    # ----------------------------------------------------------------
+
+    async def afetch_package_info(self, package_name: str) -> Optional[PackageInfo]:
+        """
+        Async counterpart of :meth:`fetch_package_info`.
+
+        The default implementation runs the blocking method in a worker
+        thread so that providers without native async support still work
+        with the asyncio resolution engine.
+        """
+        return await asyncio.to_thread(self.fetch_package_info, package_name)
+
+    async def afetch_dependencies(
+        self, package_name: str, version: str
+    ) -> list[Dependency]:
+        """Async counterpart of :meth:`fetch_dependencies`."""
+        return await asyncio.to_thread(self.fetch_dependencies, package_name, version)
+
+    async def afetch_features(
+        self, package_name: str, version: str
+    ) -> list[FeatureInfo]:
+        """Async counterpart of :meth:`fetch_features`."""
+        return await asyncio.to_thread(self.fetch_features, package_name, version)
+
     # ----------------------------------------------------------------
     # Concrete methods - shared implementation for all providers
     # ----------------------------------------------------------------
 
+    def fetch_root_package_info(self, package_name: str) -> Optional[PackageInfo]:
+        """
+        Fetch the information shown in the report header for the root.
+
+        Defaults to :meth:`fetch_package_info`; providers whose faster
+        sources omit fields (e.g. the license) fetch the full record here.
+
+        Args:
+            package_name: The name of the root package.
+
+        Returns:
+            PackageInfo if the package exists, None otherwise.
+        """
+        return self.fetch_package_info(package_name)
+
+    @staticmethod
+    def filter_normal_dependencies(
+        deps: list[Dependency], include_optional: bool = False
+    ) -> list[tuple[str, str, bool]]:
+        """
+        Keep only normal (runtime) dependencies as tuples.
+
+        Args:
+            deps: Dependencies as returned by :meth:`fetch_dependencies`.
+            include_optional: If True, include optional dependencies.
+
+        Returns:
+            List of tuples: (dependency_name, version_requirement, is_optional)
+        """
+        return [
+            (d.name, d.version_requirement, d.optional)
+            for d in deps
+            if d.kind == "normal" and (include_optional or not d.optional)
+        ]
+
     def get_latest_version(self, package_name: str) -> Optional[str]:
         """
         Get the latest version of a package.
@@ -188,11 +339,7 @@ class LanguageProvider(ABC):
                 return []
 
         deps = self.fetch_dependencies(package_name, version)
-        return [
-            (d.name, d.version_requirement, d.optional)
-            for d in deps
-            if d.kind == "normal" and (include_optional or not d.optional)
-        ]
+        return self.filter_normal_dependencies(deps, include_optional)
 
     def get_dev_dependencies(
         self,
@@ -270,11 +417,7 @@ class LanguageProvider(ABC):
 
         deps = self.fetch_dependencies(package_name, version)
 
-        normal = [
-            (d.name, d.version_requirement, d.optional)
-            for d in deps
-            if d.kind == "normal" and (include_optional or not d.optional)
-        ]
+        normal = self.filter_normal_dependencies(deps, include_optional)
         dev = [d for d in deps if d.kind == "dev"]
         build = [d for d in deps if d.kind == "build"]
 
@@ -330,7 +473,25 @@ class LanguageProvider(ABC):
     # Fedora repository query methods - shared implementation
     # ----------------------------------------------------------------
 
-    def _fedora_cache_suffix(self) -> str:
+    def for_fedora_release(self, release: str) -> "LanguageProvider":
+        """
+        Get a copy of this provider targeting another Fedora release.
+
+        The copy shares this provider's backend, worker pool and lookup
+        state; only ``fedora_release`` differs, so this provider keeps
+        its own target.
+
+        Args:
+            release: The Fedora release to target.
+
+        Returns:
+            The retargeted copy.
+        """
+        target = copy.copy(self)
+        target.fedora_release = release
+        return target
+
+    def _fedora_target_suffix(self) -> str:
         """
         Build a cache-key suffix that incorporates the targeted
         Fedora release and repo selection so that results for different
@@ -344,22 +505,65 @@ class LanguageProvider(ABC):
             parts.append(f"rel={self.fedora_release}")
         if self.fedora_repos:
             parts.append(f"repos={','.join(sorted(self.fedora_repos))}")
+        backend_tag = self.get_fedora_backend().cache_tag
+        if backend_tag:
+            parts.append(backend_tag)
         return ":".join(parts)
 
-    def _build_dnf_repoquery_cmd(self, extra_args: list[str]) -> list[str]:
+    def _fedora_cache_suffix(self) -> str:
+        """
+        Build the cache-key suffix of Fedora answers: the target suffix
+        plus, when known, the repos' metadata revision, so cached answers
+        are reused exactly until the repos change.
+
+        Returns:
+            A string suffix (may be empty when no targeting is set).
         """
-        Build the base ``dnf repoquery`` command, injecting
-        ``--releasever`` and ``--repo`` flags when Fedora targeting
-        attributes are set.
+        suffix = self._fedora_target_suffix()
+        revision = self.fedora_metadata_revision()
+        if not revision:
+            return suffix
+        return f"{suffix}:rev={revision}" if suffix else f"rev={revision}"
+
+    def fedora_metadata_revision(self) -> Optional[str]:
+        """
+        Get the metadata revision of the targeted Fedora repos.
+
+        Looked up from the backend once per target (release, repos and
+        backend) and kept for the provider's lifetime.
+
+        Returns:
+            A digest of the repos' revisions, or None if unknown.
+        """
+        backend = self.get_fedora_backend()
+        target = self._fedora_target_suffix()
+        with _fedora_revision_lock:
+            if self._fedora_revisions is None:
+                self._fedora_revisions = {}
+            if target not in self._fedora_revisions:
+                self._fedora_revisions[target] = backend.metadata_revision(self)
+            return self._fedora_revisions[target]
+
+    def _fedora_ttl(self) -> float:
+        """TTL of ``fedora`` entries: long when keyed by metadata revision."""
+        if self.fedora_metadata_revision():
+            return FEDORA_REVISION_TTL
+        return FEDORA_CACHE_TTL
+
+    def _build_dnf_cmd(self, subcommand: str, extra_args: list[str]) -> list[str]:
+        """
+        Build a ``dnf`` command, injecting ``--releasever`` and ``--repo``
+        flags when Fedora targeting attributes are set.
 
         Args:
+            subcommand: dnf subcommand (e.g. ``"repoquery"``).
             extra_args: Additional arguments appended after the base
                 command (e.g. ``["--whatprovides", pattern]``).
 
         Returns:
             Full command list ready for :func:`subprocess.check_output`.
         """
-        cmd = ["dnf", "repoquery"]
+        cmd = ["dnf", subcommand]
         if self.fedora_release:
             cmd.append(f"--releasever={self.fedora_release}")
         if self.fedora_repos:
@@ -368,38 +572,244 @@ class LanguageProvider(ABC):
         cmd.extend(extra_args)
         return cmd
 
-    def _repoquery_package(
-        self, package_name: str
-    ) -> tuple[bool, list[str], list[str]]:
+    def _build_dnf_repoquery_cmd(self, extra_args: list[str]) -> list[str]:
         """
-        Query Fedora for a package using the virtual provides pattern.
+        Build the base ``dnf repoquery`` command for the Fedora target.
 
         Args:
-            package_name: The name of the package to query.
+            extra_args: Additional arguments appended after the base
+                command (e.g. ``["--whatprovides", pattern]``).
 
         Returns:
-            Tuple of (is_packaged, versions_list, package_names)
+            Full command list ready for :func:`subprocess.check_output`.
+        """
+        return self._build_dnf_cmd("repoquery", extra_args)
+
+    def _cache_key(self, kind: str, *parts: str) -> str:
+        """Build a registry cache key tagged with the cache schema version."""
+        return ":".join((kind, f"v{self.cache_schema_version}", *parts))
+
+    def prefetch_package_info(self, package_names: list[str]) -> None:
+        """
+        Warm the registry cache with the info of many packages at once.
+
+        Registries with a multi-package endpoint override this so that the
+        :meth:`fetch_package_info` calls that follow are cache hits.  The
+        default does nothing.
+
+        Args:
+            package_names: Names of the packages about to be resolved.
+        """
+
+    async def aprefetch_package_info(self, package_names: list[str]) -> None:
+        """Async counterpart of :meth:`prefetch_package_info`."""
+
+    def registry_change_feed(self) -> Optional[ChangeFeed]:
+        """
+        Get the feed reporting this registry's changes.
+
+        Override this method to enable feed-driven invalidation.
+
+        Returns:
+            The registry's change feed, or None if it has none.
+        """
+        return None
+
+    def get_change_feed(self) -> Optional[ChangeFeed]:
+        """Get the change feed in use (the registry's unless configured)."""
+        return self.change_feed or self.registry_change_feed()
+
+    def apply_change_feed(self) -> Optional[FeedState]:
+        """
+        Sync the change feed and expire registry entries by it from now on.
+
+        Entries of packages the feed reports as changed expire; all
+        others stay fresh regardless of age.
+
+        Returns:
+            The synced state, or None if the registry has no feed.
+
+        Raises:
+            FeedError: If the feed cannot be read.
+        """
+        feed = self.get_change_feed()
+        if feed is None:
+            return None
+        self._feed_state = sync_change_feed(self.cache_namespace, feed)
+        self.change_feed = feed
+        return self._feed_state
+
+    def _registry_ttl(self, cache_key: str) -> float:
+        """TTL of a registry entry: fixed, or driven by the change feed."""
+        if self._feed_state is None or self.change_feed is None:
+            return DEFAULT_CACHE_TTL
+        # Keys built by _cache_key name the package after the schema tag
+        package = cache_key.split(":")[2]
+        return self._feed_state.ttl(self.change_feed.normalize(package))
+
+    def _cached_registry(
+        self,
+        cache_key: str,
+        url: str,
+        parse: Callable[[Any], T],
+        handle: Callable[[httpx.Response], T],
+        allow_stale: bool = True,
+        headers: Optional[dict[str, str]] = None,
+    ) -> T:
         """
+        Answer from the registry cache, fetching the document on a miss.
+
+        In stale-while-revalidate mode an expired entry is answered from
+        straight away and refetched in the background.
+
+        Args:
+            cache_key: Key of the entry in ``cache_namespace``.
+            url: Registry URL the entry is derived from.
+            parse: Builds the result from a cached value.
+            handle: Builds the result from a response, caching it.
+            allow_stale: Whether an expired entry may be answered from.
+            headers: Extra request headers (e.g. ``Accept``).
+
+        Returns:
+            The result of *parse* or *handle*.
+        """
+        cached = read_cache(
+            self.cache_namespace,
+            cache_key,
+            self._registry_ttl(cache_key),
+            refresh=(
+                lambda: self._fetch_registry(cache_key, url, parse, handle, headers)
+            )
+            if allow_stale
+            else None,
+        )
+        if cached is not None:
+            log_cache_hit(self.cache_namespace, cache_key)
+            return parse(cached)
+
+        log_cache_miss(self.cache_namespace, cache_key)
+        return self._fetch_registry(cache_key, url, parse, handle, headers)
+
+    async def _acached_registry(
+        self,
+        cache_key: str,
+        url: str,
+        parse: Callable[[Any], T],
+        handle: Callable[[httpx.Response], T],
+        headers: Optional[dict[str, str]] = None,
+    ) -> T:
+        """Async counterpart of :meth:`_cached_registry`.
+
+        Background refreshes use the blocking client on the refresh pool.
+        """
+        cached = read_cache(
+            self.cache_namespace,
+            cache_key,
+            self._registry_ttl(cache_key),
+            refresh=lambda: self._fetch_registry(
+                cache_key, url, parse, handle, headers
+            ),
+        )
+        if cached is not None:
+            log_cache_hit(self.cache_namespace, cache_key)
+            return parse(cached)
+
+        log_cache_miss(self.cache_namespace, cache_key)
+        return await self._afetch_registry(cache_key, url, parse, handle, headers)
+
+    def _fetch_registry(
+        self,
+        cache_key: str,
+        url: str,
+        parse: Callable[[Any], T],
+        handle: Callable[[httpx.Response], T],
+        headers: Optional[dict[str, str]] = None,
+    ) -> T:
+        """
+        Fetch the registry document behind a missed cache entry.
+
+        The fetch runs under :func:`~woolly.cache.cache_fill_lock`.  If the
+        expired entry recorded an ``ETag`` or ``Last-Modified`` header the
+        request is conditional, and a ``304 Not Modified`` restamps the
+        entry instead of downloading and parsing the document again.
+
+        Args:
+            cache_key: Key of the missed entry in ``cache_namespace``.
+            url: Registry URL the entry is derived from.
+            parse: Builds the result from a cached value.
+            handle: Builds the result from a response, caching it.
+            headers: Extra request headers (e.g. ``Accept``).
+
+        Returns:
+            The result of *parse* or *handle*.
+        """
+        with cache_fill_lock(self.cache_namespace, cache_key) as filled:
+            if filled is not None:
+                return parse(filled)
+            stale = read_cache_entry(self.cache_namespace, cache_key)
+            log_api_request("GET", url)
+            r = http.get(
+                url, headers={**(headers or {}), **self._revalidation_headers(stale)}
+            )
+            return self._finish_registry_fetch(cache_key, stale, r, parse, handle)
+
+    async def _afetch_registry(
+        self,
+        cache_key: str,
+        url: str,
+        parse: Callable[[Any], T],
+        handle: Callable[[httpx.Response], T],
+        headers: Optional[dict[str, str]] = None,
+    ) -> T:
+        """Async counterpart of :meth:`_fetch_registry`."""
+        async with acache_fill_lock(self.cache_namespace, cache_key) as filled:
+            if filled is not None:
+                return parse(filled)
+            stale = read_cache_entry(self.cache_namespace, cache_key)
+            log_api_request("GET", url)
+            r = await http.aget(
+                url, headers={**(headers or {}), **self._revalidation_headers(stale)}
+            )
+            return self._finish_registry_fetch(cache_key, stale, r, parse, handle)
+
+    @staticmethod
+    def _revalidation_headers(stale: Optional[CacheEntry]) -> dict[str, str]:
+        """Conditional request headers for an expired entry, if it has validators."""
+        if stale is None:
+            return {}
+        return http.conditional_headers(stale.etag, stale.last_modified)
+
+    def _finish_registry_fetch(
+        self,
+        cache_key: str,
+        stale: Optional[CacheEntry],
+        r: httpx.Response,
+        parse: Callable[[Any], T],
+        handle: Callable[[httpx.Response], T],
+    ) -> T:
+        """Reuse the revalidated entry on a 304, otherwise handle the response."""
+        if r.status_code == 304 and stale is not None:
+            log_api_response(304, None)
+            entry = touch_cache(self.cache_namespace, cache_key, stale)
+            return parse(entry.value)
+        return handle(r)
+
+    def _fedora_cache_key(self, kind: str, package_name: str) -> str:
+        """Build the ``fedora`` namespace cache key for a query."""
+        cache_key = f"{kind}:{self.name}:{package_name}"
         suffix = self._fedora_cache_suffix()
-        cache_key = f"repoquery:{self.name}:{package_name}"
         if suffix:
             cache_key += f":{suffix}"
-        cached = read_cache("fedora", cache_key, FEDORA_CACHE_TTL)
-        if cached is not None:
-            log_cache_hit("fedora", cache_key)
-            return tuple(cached)
+        return cache_key
 
-        log_cache_miss("fedora", cache_key)
-        provide_pattern = self.get_fedora_provides_pattern(package_name)
-        cmd = self._build_dnf_repoquery_cmd(
-            [
-                "--whatprovides",
-                provide_pattern,
-                "--queryformat",
-                "%{NAME}|%{VERSION}",
-            ]
-        )
+    def _run_dnf(self, cmd: list[str]) -> str:
+        """
+        Run a dnf command and return its stripped stdout.
 
+        Failures, timeouts and a missing dnf binary are logged and
+        reported as empty output, which callers treat (and cache) as
+        "not found".
+        """
         try:
             out = (
                 subprocess.check_output(
@@ -411,105 +821,406 @@ class LanguageProvider(ABC):
                 .decode()
                 .strip()
             )
-
-            log_command_output(" ".join(cmd), out, exit_code=0)
-
-            if not out:
-                result = (False, [], [])
-                write_cache("fedora", cache_key, list(result))
-                return result
-
-            versions = set()
-            packages = set()
-            for line in out.split("\n"):
-                if "|" in line:
-                    pkg, ver = line.split("|", 1)
-                    packages.add(pkg)
-                    versions.add(ver)
-
-            result = (True, sorted(versions), sorted(packages))
-            write_cache("fedora", cache_key, [result[0], result[1], result[2]])
-            return result
         except subprocess.TimeoutExpired:
             log(" ".join(cmd), level="warning", reason="timeout")
-            result = (False, [], [])
-            write_cache("fedora", cache_key, list(result))
-            return result
+            return ""
         except subprocess.CalledProcessError as e:
             log_command_output(" ".join(cmd), "", exit_code=e.returncode)
-            result = (False, [], [])
-            write_cache("fedora", cache_key, list(result))
-            return result
+            return ""
+        except OSError as e:
+            # dnf is not installed (or not runnable) on this host
+            log(" ".join(cmd), level="warning", reason=str(e))
+            return ""
+
+        log_command_output(" ".join(cmd), out, exit_code=0)
+        return out
+
+    async def _arun_dnf(self, cmd: list[str]) -> str:
+        """Async counterpart of :meth:`_run_dnf` using ``asyncio`` subprocesses."""
+        async with _get_dnf_semaphore():
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL,
+                )
+            except OSError as e:
+                log(" ".join(cmd), level="warning", reason=str(e))
+                return ""
+            try:
+                stdout, _ = await asyncio.wait_for(
+                    proc.communicate(), timeout=_DNF_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                log(" ".join(cmd), level="warning", reason="timeout")
+                return ""
 
-    def _get_provides_version(self, package_name: str) -> list[str]:
+        if proc.returncode != 0:
+            log_command_output(" ".join(cmd), "", exit_code=proc.returncode or 0)
+            return ""
+
+        out = stdout.decode().strip()
+        log_command_output(" ".join(cmd), out, exit_code=0)
+        return out
+
+    def _query_dnf(self, verb: str, patterns: list[str], cmd: list[str]) -> str:
         """
-        Get the actual package version provided by Fedora packages.
+        Run a provides query on the dnf worker pool, or as a dnf command.
 
         Args:
-            package_name: The name of the package.
+            verb: Worker protocol verb equivalent to *cmd*.
+            patterns: Provides patterns queried by *cmd*.
+            cmd: The ``dnf repoquery`` command used without workers.
 
         Returns:
-            List of version strings provided by Fedora packages.
+            The query output, formatted the same either way.
         """
-        suffix = self._fedora_cache_suffix()
-        cache_key = f"provides:{self.name}:{package_name}"
-        if suffix:
-            cache_key += f":{suffix}"
-        cached = read_cache("fedora", cache_key, FEDORA_CACHE_TTL)
-        if cached is not None:
-            log_cache_hit("fedora", cache_key)
-            return cached
-
-        log_cache_miss("fedora", cache_key)
-        provide_pattern = self.get_fedora_provides_pattern(package_name)
-        normalized = self.normalize_package_name(package_name)
-        cmd = self._build_dnf_repoquery_cmd(
+        pool = self.dnf_workers
+        # Workers only know the target they were started for
+        if pool is not None and pool.serves(self.fedora_release, self.fedora_repos):
+            try:
+                out = pool.query(verb, patterns)
+            except DnfWorkerError as e:
+                log("dnf worker query failed", level="warning", reason=str(e))
+                if pool.unavailable:
+                    # Don't retry a pool whose workers cannot start
+                    self.dnf_workers = None
+            else:
+                log_command_output(
+                    f"dnf-worker {verb} {' '.join(patterns)}", out, exit_code=0
+                )
+                return out
+        return self._run_dnf(cmd)
+
+    async def _aquery_dnf(self, verb: str, patterns: list[str], cmd: list[str]) -> str:
+        """Async counterpart of :meth:`_query_dnf`."""
+        pool = self.dnf_workers
+        if pool is not None and pool.serves(self.fedora_release, self.fedora_repos):
+            return await asyncio.to_thread(self._query_dnf, verb, patterns, cmd)
+        return await self._arun_dnf(cmd)
+
+    def _fedora_index_cmd(self) -> list[str]:
+        """Build the query dumping every ``prefix(*)`` provide of the target."""
+        return self._build_dnf_repoquery_cmd(
             [
-                "--provides",
                 "--whatprovides",
-                provide_pattern,
+                f"{self.fedora_provides_prefix}(*)",
+                "--queryformat",
+                "%{NAME}|%{VERSION}|%{PROVIDES}",
             ]
         )
 
-        try:
-            out = (
-                subprocess.check_output(
-                    cmd,
-                    stdin=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                    timeout=_DNF_TIMEOUT,
+    def get_fedora_backend(self) -> FedoraBackend:
+        """Get the backend providing Fedora data (dnf unless configured)."""
+        return self.fedora_backend or _DEFAULT_FEDORA_BACKEND
+
+    def _remember_fedora_index(
+        self, cache_key: str, index: Optional[ProvidesIndex]
+    ) -> None:
+        """Keep *index* in memory and, if it has entries, in the cache.
+
+        Must be called with ``_fedora_index_lock`` held.
+        """
+        if self._fedora_indexes is None:
+            self._fedora_indexes = {}
+        self._fedora_indexes[cache_key] = index
+        # Never store an empty index: it would mark everything missing
+        if index:
+            write_cache("fedora", cache_key, index.model_dump(mode="json"))
+
+    def load_fedora_index(self) -> Optional[ProvidesIndex]:
+        """
+        Load the local provides index for the current Fedora target.
+
+        The index is read from the ``fedora`` cache once per target and
+        kept in memory. It is keyed by the repos' metadata revision when
+        known, and otherwise follows ``FEDORA_CACHE_TTL``: an expired index
+        is ignored and lookups fall back to querying dnf. Backends that
+        build their index on demand (e.g. repodata) build it here instead.
+
+        Returns:
+            The ProvidesIndex, or None if none has been built (or it expired).
+        """
+        cache_key = self._fedora_cache_key("index", "*")
+        with _fedora_index_lock:
+            if self._fedora_indexes is not None and cache_key in self._fedora_indexes:
+                return self._fedora_indexes[cache_key]
+
+            cached = read_cache("fedora", cache_key, self._fedora_ttl())
+            index = ProvidesIndex.model_validate(cached) if cached is not None else None
+            backend = self.get_fedora_backend()
+            if index is None and backend.on_demand:
+                index = backend.build_index(self) or ProvidesIndex(
+                    prefix=self.fedora_provides_prefix
                 )
-                .decode()
-                .strip()
+            self._remember_fedora_index(cache_key, index)
+            return index
+
+    def refresh_fedora_index(self, force: bool = False) -> Optional[ProvidesIndex]:
+        """
+        Build the local provides index in one pass over the Fedora data.
+
+        With the default dnf backend every ``prefix(*)`` provide of the
+        targeted release and repos is dumped with a single query; the
+        result is stored in the ``fedora`` cache. An index built from the
+        current metadata revision (or, if unknown, within
+        ``FEDORA_CACHE_TTL``) is kept unless *force* is set.
+
+        Args:
+            force: Rebuild even if the current index has not expired.
+
+        Returns:
+            The index, or None if the backend returned nothing.
+        """
+        if not force:
+            index = self.load_fedora_index()
+            if index is not None:
+                return index
+
+        index = self.get_fedora_backend().build_index(self)
+        if not index:
+            return None
+
+        with _fedora_index_lock:
+            self._remember_fedora_index(self._fedora_cache_key("index", "*"), index)
+        return index
+
+    def _repoquery_batch_cmd(self, package_names: list[str]) -> list[str]:
+        """Build one ``--whatprovides`` query covering all *package_names*."""
+        args: list[str] = []
+        for package_name in package_names:
+            args.extend(
+                ["--whatprovides", self.get_fedora_provides_pattern(package_name)]
             )
+        args.extend(["--queryformat", "%{NAME}|%{VERSION}|%{PROVIDES}"])
+        return self._build_dnf_repoquery_cmd(args)
+
+    def _collect_repoquery_batch(
+        self, package_names: list[str]
+    ) -> tuple[dict[str, tuple[bool, list[str], list[str]]], list[list[str]]]:
+        """Split *package_names* into cached results and uncached chunks."""
+        results: dict[str, tuple[bool, list[str], list[str]]] = {}
+        missing: list[str] = []
+        index = self.load_fedora_index()
+        if index is not None:
+            for package_name in package_names:
+                results[package_name] = index.lookup_packages(
+                    self.normalize_package_name(package_name)
+                )
+            return results, []
+
+        for package_name in dict.fromkeys(package_names):
+            cache_key = self._fedora_cache_key("record", package_name)
+            cached = read_cache("fedora", cache_key, self._fedora_ttl())
+            if cached is not None:
+                log_cache_hit("fedora", cache_key)
+                results[package_name] = FedoraRecord.model_validate(
+                    cached
+                ).as_repoquery()
+            else:
+                log_cache_miss("fedora", cache_key)
+                missing.append(package_name)
+
+        chunks = [
+            missing[i : i + _DNF_BATCH_SIZE]
+            for i in range(0, len(missing), _DNF_BATCH_SIZE)
+        ]
+        return results, chunks
 
-            log_command_output(" ".join(cmd), out, exit_code=0)
+    def _store_repoquery_batch(
+        self,
+        chunk: list[str],
+        out: str,
+        results: dict[str, tuple[bool, list[str], list[str]]],
+    ) -> None:
+        """Map batched output back to each name in *chunk* and cache it."""
+        index = ProvidesIndex.from_repoquery_output(self.fedora_provides_prefix, out)
+        for package_name in chunk:
+            record = index.lookup(self.normalize_package_name(package_name))
+            write_cache(
+                "fedora",
+                self._fedora_cache_key("record", package_name),
+                record.model_dump(),
+            )
+            results[package_name] = record.as_repoquery()
 
-            if not out:
-                write_cache("fedora", cache_key, [])
-                return []
+    def _repoquery_packages(
+        self, package_names: list[str]
+    ) -> dict[str, tuple[bool, list[str], list[str]]]:
+        """
+        Query Fedora for many packages with as few dnf runs as possible.
+
+        Uncached names are looked up with one ``dnf repoquery`` carrying a
+        ``--whatprovides`` argument per name (in chunks of
+        ``_DNF_BATCH_SIZE``), and every result is written to the same
+        ``fedora`` cache entry :meth:`_repoquery_package` uses.
 
-            versions = set()
-            # Build pattern: prefix(normalized_name) = version
-            pattern = re.compile(
-                rf"{re.escape(self.fedora_provides_prefix)}\({re.escape(normalized)}\)\s*=\s*([\d.]+)"
+        Args:
+            package_names: Names to query.
+
+        Returns:
+            Mapping of each name to (is_packaged, versions_list, package_names).
+        """
+        results, chunks = self._collect_repoquery_batch(package_names)
+        for chunk in chunks:
+            out = self._query_dnf(
+                "records",
+                [self.get_fedora_provides_pattern(name) for name in chunk],
+                self._repoquery_batch_cmd(chunk),
             )
-            for line in out.split("\n"):
-                match = pattern.search(line)
-                if match:
-                    versions.add(match.group(1))
-
-            result = sorted(versions)
-            write_cache("fedora", cache_key, result)
-            return result
-        except subprocess.TimeoutExpired:
-            log(" ".join(cmd), level="warning", reason="timeout")
-            write_cache("fedora", cache_key, [])
-            return []
-        except subprocess.CalledProcessError as e:
-            log_command_output(" ".join(cmd), "", exit_code=e.returncode)
-            write_cache("fedora", cache_key, [])
-            return []
+            self._store_repoquery_batch(chunk, out, results)
+        return results
+
+    async def _arepoquery_packages(
+        self, package_names: list[str]
+    ) -> dict[str, tuple[bool, list[str], list[str]]]:
+        """Async counterpart of :meth:`_repoquery_packages`."""
+        results, chunks = self._collect_repoquery_batch(package_names)
+        outputs = await asyncio.gather(
+            *(
+                self._aquery_dnf(
+                    "records",
+                    [self.get_fedora_provides_pattern(name) for name in chunk],
+                    self._repoquery_batch_cmd(chunk),
+                )
+                for chunk in chunks
+            )
+        )
+        for chunk, out in zip(chunks, outputs):
+            self._store_repoquery_batch(chunk, out, results)
+        return results
+
+    def _fedora_lookup_names(self, package_names: list[str]) -> list[str]:
+        """Names :meth:`check_fedora_packaging` may query for *package_names*."""
+        names: list[str] = []
+        for package_name in package_names:
+            names.append(self.normalize_package_name(package_name))
+            names.extend(self.get_alternative_names(package_name))
+        return names
+
+    def prefetch_fedora_packaging(self, package_names: list[str]) -> None:
+        """
+        Warm the Fedora cache for many packages with one batched query.
+
+        Subsequent :meth:`check_fedora_packaging` calls for these packages
+        (including their alternative names) are answered from the cache.
+
+        Args:
+            package_names: Names of the packages about to be checked.
+        """
+        self._repoquery_packages(self._fedora_lookup_names(package_names))
+
+    async def aprefetch_fedora_packaging(self, package_names: list[str]) -> None:
+        """Async counterpart of :meth:`prefetch_fedora_packaging`."""
+        await self._arepoquery_packages(self._fedora_lookup_names(package_names))
+
+    def _fedora_record(self, package_name: str) -> FedoraRecord:
+        """
+        Look up what Fedora ships for one package.
+
+        One ``--whatprovides`` query returns the providing packages, their
+        versions and their provides together; the result is cached as a
+        single ``record`` entry in the ``fedora`` namespace.
+
+        Args:
+            package_name: The name of the package to query.
+
+        Returns:
+            The FedoraRecord for the package.
+        """
+        normalized = self.normalize_package_name(package_name)
+        index = self.load_fedora_index()
+        if index is not None:
+            return index.lookup(normalized)
+
+        cache_key = self._fedora_cache_key("record", package_name)
+        cached = read_cache("fedora", cache_key, self._fedora_ttl())
+        if cached is not None:
+            log_cache_hit("fedora", cache_key)
+            return FedoraRecord.model_validate(cached)
+
+        log_cache_miss("fedora", cache_key)
+        out = self._query_dnf(
+            "records",
+            [self.get_fedora_provides_pattern(package_name)],
+            self._repoquery_batch_cmd([package_name]),
+        )
+        record = parse_fedora_record(out, self.fedora_provides_prefix, normalized)
+        write_cache("fedora", cache_key, record.model_dump())
+        return record
+
+    async def _afedora_record(self, package_name: str) -> FedoraRecord:
+        """Async counterpart of :meth:`_fedora_record`."""
+        normalized = self.normalize_package_name(package_name)
+        index = self.load_fedora_index()
+        if index is not None:
+            return index.lookup(normalized)
+
+        cache_key = self._fedora_cache_key("record", package_name)
+        cached = read_cache("fedora", cache_key, self._fedora_ttl())
+        if cached is not None:
+            log_cache_hit("fedora", cache_key)
+            return FedoraRecord.model_validate(cached)
+
+        log_cache_miss("fedora", cache_key)
+        out = await self._aquery_dnf(
+            "records",
+            [self.get_fedora_provides_pattern(package_name)],
+            self._repoquery_batch_cmd([package_name]),
+        )
+        record = parse_fedora_record(out, self.fedora_provides_prefix, normalized)
+        write_cache("fedora", cache_key, record.model_dump())
+        return record
+
+    def _repoquery_package(
+        self, package_name: str
+    ) -> tuple[bool, list[str], list[str]]:
+        """
+        Query Fedora for a package using the virtual provides pattern.
+
+        Args:
+            package_name: The name of the package to query.
+
+        Returns:
+            Tuple of (is_packaged, versions_list, package_names)
+        """
+        return self._fedora_record(package_name).as_repoquery()
+
+    async def _arepoquery_package(
+        self, package_name: str
+    ) -> tuple[bool, list[str], list[str]]:
+        """Async counterpart of :meth:`_repoquery_package`."""
+        return (await self._afedora_record(package_name)).as_repoquery()
+
+    def _get_provides_version(self, package_name: str) -> list[str]:
+        """
+        Get the actual package version provided by Fedora packages.
+
+        Args:
+            package_name: The name of the package.
+
+        Returns:
+            List of version strings provided by Fedora packages.
+        """
+        return self._fedora_record(package_name).provided_versions
+
+    async def _aget_provides_version(self, package_name: str) -> list[str]:
+        """Async counterpart of :meth:`_get_provides_version`."""
+        return (await self._afedora_record(package_name)).provided_versions
+
+    @staticmethod
+    def _packaging_status(record: FedoraRecord) -> FedoraPackageStatus:
+        """Turn a FedoraRecord into the status reported to callers."""
+        if not record.is_packaged:
+            return FedoraPackageStatus(is_packaged=False, versions=[], package_names=[])
+        return FedoraPackageStatus(
+            is_packaged=True,
+            versions=record.provided_versions or record.package_versions,
+            package_names=record.package_names,
+        )
 
     def check_fedora_packaging(self, package_name: str) -> FedoraPackageStatus:
         """
@@ -524,28 +1235,26 @@ class LanguageProvider(ABC):
         Returns:
             FedoraPackageStatus with packaging information.
         """
-        normalized = self.normalize_package_name(package_name)
-        is_packaged, pkg_versions, packages = self._repoquery_package(normalized)
+        record = self._fedora_record(self.normalize_package_name(package_name))
 
         # Try alternative names if not found
-        if not is_packaged:
+        if not record.is_packaged:
             for alt_name in self.get_alternative_names(package_name):
-                is_packaged, pkg_versions, packages = self._repoquery_package(alt_name)
-                if is_packaged:
+                record = self._fedora_record(alt_name)
+                if record.is_packaged:
                     break
 
-        if is_packaged:
-            provided_versions = self._get_provides_version(normalized)
-            if not provided_versions:
-                provided_versions = pkg_versions
-            return FedoraPackageStatus(
-                is_packaged=True,
-                versions=provided_versions,
-                package_names=packages,
-            )
+        return self._packaging_status(record)
 
-        return FedoraPackageStatus(
-            is_packaged=False,
-            versions=[],
-            package_names=[],
-        )
+    async def acheck_fedora_packaging(self, package_name: str) -> FedoraPackageStatus:
+        """Async counterpart of :meth:`check_fedora_packaging`."""
+        record = await self._afedora_record(self.normalize_package_name(package_name))
+
+        # Try alternative names if not found
+        if not record.is_packaged:
+            for alt_name in self.get_alternative_names(package_name):
+                record = await self._afedora_record(alt_name)
+                if record.is_packaged:
+                    break
+
+        return self._packaging_status(record)
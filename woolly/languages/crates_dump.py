@@ -0,0 +1,435 @@
+"""
+Offline crates.io lookups from the database dump.
+
+crates.io publishes its whole database daily as ``db-dump.tar.gz``
+(https://crates.io/data-access).  :func:`ingest_crates_dump` streams the
+``crates.csv``, ``versions.csv`` and ``dependencies.csv`` members out
+of the tarball, without extracting it, into an indexed SQLite store,
+and :class:`CratesDump` answers
+:class:`~woolly.languages.rust.RustProvider` lookups from that store
+with no HTTP requests at all.
+
+:func:`open_crates_dump` builds the store on first use and rebuilds it
+when the tarball is replaced by a newer download.
+"""
+
+import codecs
+import csv
+import json
+import os
+import sqlite3
+import tarfile
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path, PurePosixPath
+from typing import Optional
+
+from woolly import cache
+from woolly.debug import log
+from woolly.languages.base import Dependency, FeatureInfo, PackageInfo
+from woolly.languages.crates_index import latest_version
+
+DUMP_DB_NAME = "crates-dump.sqlite3"
+
+# Bump when the store layout changes so older stores are rebuilt
+DUMP_SCHEMA_VERSION = 1
+
+# Rows inserted per executemany() batch while ingesting
+_INSERT_BATCH = 10_000
+
+# dependencies.csv encodes the kind as an integer
+_DEPENDENCY_KINDS = {"0": "normal", "1": "build", "2": "dev"}
+
+_DUMP_SCHEMA = """
+CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE crates (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    canonical TEXT NOT NULL,
+    description TEXT,
+    homepage TEXT,
+    repository TEXT
+);
+CREATE TABLE versions (
+    id INTEGER PRIMARY KEY,
+    crate_id INTEGER NOT NULL,
+    num TEXT NOT NULL,
+    license TEXT,
+    yanked INTEGER NOT NULL,
+    features TEXT
+);
+CREATE TABLE dependencies (
+    version_id INTEGER NOT NULL,
+    crate_id INTEGER NOT NULL,
+    req TEXT NOT NULL,
+    optional INTEGER NOT NULL,
+    kind TEXT NOT NULL
+);
+"""
+
+# Created after the bulk insert, which is much faster than maintaining them
+_DUMP_INDEXES = """
+CREATE INDEX crates_canonical ON crates (canonical);
+CREATE INDEX versions_crate ON versions (crate_id, num);
+CREATE INDEX dependencies_version ON dependencies (version_id);
+"""
+
+
+class CratesDumpError(Exception):
+    """Raised when a database dump cannot be read."""
+
+
+def _canonical(name: str) -> str:
+    # crates.io treats names case-insensitively and '-' like '_'
+    return name.lower().replace("_", "-")
+
+
+def _flag(value: str) -> int:
+    return 1 if value in ("t", "true", "1") else 0
+
+
+# ----------------------------------------------------------------
+# Ingestion
+# ----------------------------------------------------------------
+
+
+def _crate_rows(reader: csv.DictReader) -> Iterator[tuple]:
+    for row in reader:
+        yield (
+            int(row["id"]),
+            row["name"],
+            _canonical(row["name"]),
+            row.get("description") or None,
+            row.get("homepage") or None,
+            row.get("repository") or None,
+        )
+
+
+def _version_rows(reader: csv.DictReader) -> Iterator[tuple]:
+    for row in reader:
+        yield (
+            int(row["id"]),
+            int(row["crate_id"]),
+            row["num"],
+            row.get("license") or None,
+            _flag(row.get("yanked", "f")),
+            row.get("features") or None,
+        )
+
+
+def _dependency_rows(reader: csv.DictReader) -> Iterator[tuple]:
+    for row in reader:
+        yield (
+            int(row["version_id"]),
+            int(row["crate_id"]),
+            row.get("req") or "*",
+            _flag(row.get("optional", "f")),
+            _DEPENDENCY_KINDS.get(row.get("kind", "0"), "normal"),
+        )
+
+
+# Tarball member name to (table, row builder)
+_DUMP_TABLES = {
+    "crates.csv": ("crates", _crate_rows),
+    "versions.csv": ("versions", _version_rows),
+    "dependencies.csv": ("dependencies", _dependency_rows),
+}
+
+
+def _insert_rows(conn: sqlite3.Connection, table: str, rows: Iterator[tuple]) -> int:
+    """Insert *rows* into *table* in batches, returning how many there were."""
+    count = 0
+    batch: list[tuple] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= _INSERT_BATCH:
+            placeholders = ", ".join("?" * len(batch[0]))
+            conn.executemany(f"INSERT INTO {table} VALUES ({placeholders})", batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        placeholders = ", ".join("?" * len(batch[0]))
+        conn.executemany(f"INSERT INTO {table} VALUES ({placeholders})", batch)
+        count += len(batch)
+    return count
+
+
+def _source_stamp(tarball: Path) -> str:
+    """Identify a downloaded tarball by its size and modification time."""
+    stat = tarball.stat()
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def ingest_crates_dump(tarball: Path, store: Path) -> dict[str, int]:
+    """
+    Build the SQLite store of a crates.io database dump.
+
+    The CSV members are read sequentially from the compressed stream,
+    so the tarball is never extracted.  The store is written next to
+    *store* and moved into place once complete.
+
+    Args:
+        tarball: Path to ``db-dump.tar.gz``.
+        store: Path of the SQLite store to create or replace.
+
+    Returns:
+        Number of rows ingested per table.
+
+    Raises:
+        CratesDumpError: If the tarball cannot be read or lacks a table.
+    """
+    tarball = Path(tarball)
+    store = Path(store)
+    store.parent.mkdir(parents=True, exist_ok=True)
+    tmp = store.with_name(f".{store.name}.{os.getpid()}.tmp")
+    tmp.unlink(missing_ok=True)
+
+    # Crate READMEs exceed the csv module's default field size
+    csv.field_size_limit(2**31 - 1)
+    counts: dict[str, int] = {}
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.executescript(
+            "PRAGMA journal_mode=OFF; PRAGMA synchronous=OFF;" + _DUMP_SCHEMA
+        )
+        with tarfile.open(tarball, "r|*") as tar:
+            for member in tar:
+                name = PurePosixPath(member.name).name
+                if not member.isfile() or name not in _DUMP_TABLES:
+                    continue
+                table, rows = _DUMP_TABLES[name]
+                # Stream members are not seekable; decode lines as they are read
+                lines = codecs.iterdecode(tar.extractfile(member), "utf-8")
+                counts[table] = _insert_rows(conn, table, rows(csv.DictReader(lines)))
+        missing = [
+            table for table, _rows in _DUMP_TABLES.values() if table not in counts
+        ]
+        if missing:
+            raise CratesDumpError(f"{tarball} has no {', '.join(missing)} table")
+        conn.executescript(_DUMP_INDEXES)
+        conn.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [
+                ("schema", str(DUMP_SCHEMA_VERSION)),
+                ("source", _source_stamp(tarball)),
+                ("ingested", str(time.time())),
+            ],
+        )
+        conn.commit()
+    except (OSError, tarfile.TarError, csv.Error, KeyError, ValueError) as e:
+        conn.close()
+        tmp.unlink(missing_ok=True)
+        raise CratesDumpError(f"Cannot read crates.io dump {tarball}: {e}") from e
+    except BaseException:
+        conn.close()
+        tmp.unlink(missing_ok=True)
+        raise
+    conn.close()
+    os.replace(tmp, store)
+    log("crates.io dump ingested", tarball=str(tarball), store=str(store), **counts)
+    return counts
+
+
+# ----------------------------------------------------------------
+# Lookups
+# ----------------------------------------------------------------
+
+
+class CratesDump:
+    """
+    Read-only lookups in a store built by :func:`ingest_crates_dump`.
+
+    Each thread gets its own connection.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: The SQLite store.
+        """
+        self.path = Path(path)
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True)
+            self._local.conn = conn
+        return conn
+
+    def meta(self, name: str) -> Optional[str]:
+        """Return a value recorded when the store was built."""
+        try:
+            row = (
+                self._connect()
+                .execute("SELECT value FROM meta WHERE name = ?", (name,))
+                .fetchone()
+            )
+        except sqlite3.DatabaseError:
+            return None
+        return row[0] if row else None
+
+    def _crate(self, name: str) -> Optional[tuple]:
+        return (
+            self._connect()
+            .execute(
+                "SELECT id, name, description, homepage, repository FROM crates "
+                "WHERE canonical = ?",
+                (_canonical(name),),
+            )
+            .fetchone()
+        )
+
+    def _version(self, name: str, version: str) -> Optional[tuple]:
+        return (
+            self._connect()
+            .execute(
+                "SELECT versions.id, versions.features FROM versions "
+                "JOIN crates ON crates.id = versions.crate_id "
+                "WHERE crates.canonical = ? AND versions.num = ?",
+                (_canonical(name), version),
+            )
+            .fetchone()
+        )
+
+    def package_info(self, name: str) -> Optional[PackageInfo]:
+        """
+        Look up a crate.
+
+        The resolved version is picked like the sparse index's (highest
+        stable, non-yanked version) and its license is reported.
+
+        Args:
+            name: Crate name.
+
+        Returns:
+            PackageInfo, or None if the dump has no such crate.
+        """
+        crate = self._crate(name)
+        if crate is None:
+            return None
+        crate_id, crate_name, description, homepage, repository = crate
+        rows = (
+            self._connect()
+            .execute(
+                "SELECT num, yanked, license FROM versions WHERE crate_id = ?",
+                (crate_id,),
+            )
+            .fetchall()
+        )
+        licenses = {num: license for num, _yanked, license in rows}
+        latest = latest_version(
+            [{"vers": num, "yanked": bool(yanked)} for num, yanked, _ in rows]
+        )
+        if latest is None:
+            return None
+        return PackageInfo(
+            name=crate_name,
+            latest_version=latest,
+            description=description,
+            homepage=homepage,
+            repository=repository,
+            license=licenses.get(latest),
+        )
+
+    def dependencies(self, name: str, version: str) -> list[Dependency]:
+        """
+        Look up the dependencies of a crate version.
+
+        Args:
+            name: Crate name.
+            version: Exact version.
+
+        Returns:
+            The dependencies, empty if the version is not in the dump.
+        """
+        row = self._version(name, version)
+        if row is None:
+            return []
+        deps = (
+            self._connect()
+            .execute(
+                "SELECT crates.name, dependencies.req, dependencies.optional, "
+                "dependencies.kind FROM dependencies "
+                "JOIN crates ON crates.id = dependencies.crate_id "
+                "WHERE dependencies.version_id = ? ORDER BY crates.name",
+                (row[0],),
+            )
+            .fetchall()
+        )
+        return [
+            Dependency(
+                name=dep_name,
+                version_requirement=req,
+                optional=bool(optional),
+                kind=kind,
+            )
+            for dep_name, req, optional, kind in deps
+        ]
+
+    def features(self, name: str, version: str) -> list[FeatureInfo]:
+        """
+        Look up the features of a crate version.
+
+        Args:
+            name: Crate name.
+            version: Exact version.
+
+        Returns:
+            The features sorted by name, empty if the version is not in the dump.
+        """
+        row = self._version(name, version)
+        if row is None or not row[1]:
+            return []
+        try:
+            features = json.loads(row[1])
+        except ValueError:
+            return []
+        return [
+            FeatureInfo(name=feature, dependencies=deps)
+            for feature, deps in sorted(features.items())
+        ]
+
+
+def default_dump_store() -> Path:
+    """Location of the store built from a dump: ``CACHE_DIR/crates-dump.sqlite3``."""
+    return cache.CACHE_DIR / DUMP_DB_NAME
+
+
+def open_crates_dump(
+    tarball: Path, store: Optional[Path] = None, force: bool = False
+) -> CratesDump:
+    """
+    Open the store of a crates.io dump, ingesting the tarball if needed.
+
+    The store is rebuilt when the tarball's size or modification time
+    differ from the one it was built from.
+
+    Args:
+        tarball: Path to ``db-dump.tar.gz``.
+        store: SQLite store; defaults to :func:`default_dump_store`.
+        force: Rebuild even if the store is up to date.
+
+    Returns:
+        Lookups in the store.
+
+    Raises:
+        CratesDumpError: If the tarball cannot be read.
+    """
+    tarball = Path(tarball)
+    store = Path(store) if store else default_dump_store()
+    try:
+        stamp = _source_stamp(tarball)
+    except OSError as e:
+        raise CratesDumpError(f"Cannot read crates.io dump {tarball}: {e}") from e
+
+    if not force and store.exists():
+        dump = CratesDump(store)
+        if dump.meta("source") == stamp and dump.meta("schema") == str(
+            DUMP_SCHEMA_VERSION
+        ):
+            return dump
+
+    ingest_crates_dump(tarball, store)
+    return CratesDump(store)
@@ -0,0 +1,148 @@
+"""
+crates.io sparse index helpers.
+
+The sparse index at ``index.crates.io`` serves one newline-delimited
+JSON file per crate, with one line per published version holding its
+dependencies and feature map.  :class:`~woolly.languages.rust.RustProvider`
+can answer package info, dependency and feature lookups from that single
+file instead of three crates.io API calls.
+
+See https://doc.rust-lang.org/cargo/reference/registry-index.html for
+the file layout.
+"""
+
+import json
+from typing import Optional
+
+SPARSE_INDEX_URL = "https://index.crates.io"
+
+# Statuses the index uses for crates that do not exist (as cargo treats them)
+NOT_FOUND_STATUSES = (404, 410, 451)
+
+
+def index_path(name: str) -> str:
+    """
+    Return the path of a crate's file relative to the index root.
+
+    Names of one or two characters live under ``1/`` and ``2/``, three
+    character names under ``3/{first}/``, and longer names under their
+    first two and next two characters.
+
+    Args:
+        name: Crate name (matched case-insensitively).
+
+    Returns:
+        The relative path, e.g. ``se/rd/serde``.
+    """
+    name = name.lower()
+    if len(name) <= 2:
+        return f"{len(name)}/{name}"
+    if len(name) == 3:
+        return f"3/{name[0]}/{name}"
+    return f"{name[:2]}/{name[2:4]}/{name}"
+
+
+def _index_dependency(dep: dict) -> dict:
+    """Convert an index dependency to the shape of the API's dependency dicts."""
+    return {
+        # Renamed dependencies name the real crate in "package"
+        "crate_id": dep.get("package") or dep["name"],
+        "req": dep.get("req", "*"),
+        "optional": dep.get("optional", False),
+        "kind": dep.get("kind") or "normal",
+    }
+
+
+def parse_index_file(text: str) -> Optional[dict]:
+    """
+    Parse a crate's index file into the payload woolly caches.
+
+    Lines that are not valid JSON are skipped, as cargo does.
+
+    Args:
+        text: Contents of the index file.
+
+    Returns:
+        ``{"name": ..., "versions": [...]}`` where every version holds
+        ``vers``, ``yanked``, ``deps`` (API-shaped dependency dicts) and
+        ``features`` (``features`` and ``features2`` merged), or None if
+        the file lists no versions.
+    """
+    name = None
+    versions = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        name = entry.get("name", name)
+        versions.append(
+            {
+                "vers": entry["vers"],
+                "yanked": entry.get("yanked", False),
+                "deps": [_index_dependency(dep) for dep in entry.get("deps", [])],
+                "features": {
+                    **entry.get("features", {}),
+                    **entry.get("features2", {}),
+                },
+            }
+        )
+    if not versions:
+        return None
+    return {"name": name, "versions": versions}
+
+
+def _identifier_key(identifier: str) -> tuple:
+    # Numeric pre-release identifiers sort before alphanumeric ones
+    if identifier.isdigit():
+        return (0, int(identifier), "")
+    return (1, 0, identifier)
+
+
+def version_key(version: str) -> tuple:
+    """
+    Sort key ordering versions by semver precedence.
+
+    Build metadata is ignored and a pre-release sorts before its release.
+    """
+    version = version.split("+", 1)[0]
+    core, _, pre = version.partition("-")
+    numbers = []
+    for part in core.split("."):
+        numbers.append(int(part) if part.isdigit() else 0)
+    numbers.extend([0] * (3 - len(numbers)))
+    if not pre:
+        return (*numbers, 1, ())
+    return (*numbers, 0, tuple(_identifier_key(p) for p in pre.split(".")))
+
+
+def latest_version(versions: list[dict]) -> Optional[str]:
+    """
+    Pick the version woolly resolves when none is requested.
+
+    The index has no publish times, so this is the highest stable
+    version that is not yanked, falling back to the highest pre-release
+    and then to yanked versions when nothing else is left.
+
+    Args:
+        versions: Versions of a payload returned by :func:`parse_index_file`.
+
+    Returns:
+        The version string, or None if *versions* is empty.
+    """
+    available = [v["vers"] for v in versions if not v.get("yanked")]
+    stable = [v for v in available if "-" not in v.split("+", 1)[0]]
+    candidates = stable or available or [v["vers"] for v in versions]
+    if not candidates:
+        return None
+    return max(candidates, key=version_key)
+
+
+def find_version(payload: dict, version: str) -> Optional[dict]:
+    """Return the entry of *version* in an index payload, if listed."""
+    for entry in payload["versions"]:
+        if entry["vers"] == version:
+            return entry
+    return None
@@ -0,0 +1,166 @@
+"""
+Local PyPI mirror (bandersnatch layout) read straight from disk.
+
+A bandersnatch mirror keeps, under its ``web/`` directory, the JSON API
+document of every project (``json/{name}``, also ``pypi/{name}/json``),
+the simple index (``simple/{name}/``, with ``index.v1_json`` when PEP 691
+output is enabled) and the distribution files (``packages/...``).
+
+:class:`PyPIMirror` answers
+:class:`~woolly.languages.python.PythonProvider` lookups from those
+files.  The JSON documents only describe the latest release, so the
+metadata of other versions is read from the ``.metadata`` file next to
+one of their wheels or, failing that, from the ``METADATA`` member of
+the wheel itself (only that member is decompressed).  Parsed JSON
+documents are kept for the life of the :class:`PyPIMirror`, so the
+info, dependency and feature lookups of a project share one read.
+"""
+
+import json
+import zipfile
+from pathlib import Path
+from typing import Optional
+from urllib.parse import unquote, urlparse
+
+from woolly.languages.pypi_simple import parse_core_metadata, wheel_version
+
+
+class PyPIMirrorError(Exception):
+    """Raised when a mirror root does not look like a PyPI mirror."""
+
+
+class PyPIMirror:
+    """Lookups in a bandersnatch-style PyPI mirror."""
+
+    def __init__(self, root: Path):
+        """
+        Args:
+            root: Mirror directory, either the one holding ``web/`` or
+                ``web/`` itself.
+
+        Raises:
+            PyPIMirrorError: If neither holds a ``json`` or ``simple`` tree.
+        """
+        root = Path(root)
+        web = root / "web" if (root / "web").is_dir() else root
+        if not ((web / "json").is_dir() or (web / "simple").is_dir()):
+            raise PyPIMirrorError(f"{root} is not a PyPI mirror (no json/ or simple/)")
+        self.root = root
+        self.web = web
+        # Parsed JSON documents by path, with the mtime they were read at
+        self._documents: dict[Path, tuple[int, dict]] = {}
+
+    @staticmethod
+    def _names(name: str, normalized: str) -> list[str]:
+        return list(dict.fromkeys((normalized, name)))
+
+    def _read_json(self, path: Path) -> Optional[dict]:
+        """Read a JSON document, reusing the parsed one while it is unchanged."""
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            return None
+        cached = self._documents.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            data = json.loads(path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        self._documents[path] = (mtime, data)
+        return data
+
+    def project(self, name: str, normalized: str) -> Optional[dict]:
+        """
+        Read a project's JSON API document.
+
+        Args:
+            name: Project name as requested.
+            normalized: Its PEP 503 normalized form.
+
+        Returns:
+            The document, or None if the mirror does not carry it.
+        """
+        for candidate in self._names(name, normalized):
+            for path in (
+                self.web / "json" / candidate,
+                self.web / "pypi" / candidate / "json",
+            ):
+                data = self._read_json(path)
+                if data is not None:
+                    return data
+        return None
+
+    def _local_path(self, url: str, base: Path) -> Path:
+        """Map a file URL of the JSON API or simple index to the mirror."""
+        parsed = urlparse(url)
+        path = unquote(parsed.path)
+        if parsed.scheme or path.startswith("/"):
+            # Absolute URLs point into files.pythonhosted.org's packages/
+            _, _, rest = path.partition("/packages/")
+            return self.web / "packages" / rest
+        return (base / path).resolve()
+
+    def _wheels(self, project: Optional[dict], normalized: str, version: str):
+        """Yield the local paths of a version's wheels, pure-Python first."""
+        files: list[tuple[str, Path]] = []
+        if project is not None:
+            for file in (project.get("releases") or {}).get(version, []):
+                path = self._local_path(file.get("url", ""), self.web)
+                files.append((file.get("filename", ""), path))
+        if not files:
+            simple_dir = self.web / "simple" / normalized
+            page = self._read_json(simple_dir / "index.v1_json") or {}
+            for file in page.get("files", []):
+                filename = file.get("filename", "")
+                if wheel_version(filename) == version:
+                    files.append((filename, self._local_path(file["url"], simple_dir)))
+
+        wheels = [(f, p) for f, p in files if wheel_version(f) == version]
+        wheels.sort(key=lambda item: not item[0].endswith("-none-any.whl"))
+        for _filename, path in wheels:
+            yield path
+
+    @staticmethod
+    def _read_wheel_metadata(path: Path) -> Optional[str]:
+        """Read ``*.dist-info/METADATA`` from a wheel without unpacking it."""
+        try:
+            with zipfile.ZipFile(path) as wheel:
+                for member in wheel.namelist():
+                    parts = member.split("/")
+                    if (
+                        len(parts) == 2
+                        and parts[0].endswith(".dist-info")
+                        and parts[1] == "METADATA"
+                    ):
+                        return wheel.read(member).decode("utf-8")
+        except (OSError, zipfile.BadZipFile, UnicodeDecodeError):
+            return None
+        return None
+
+    def version_data(self, name: str, normalized: str, version: str) -> Optional[dict]:
+        """
+        Build the version data of a release from the mirror.
+
+        Args:
+            name: Project name as requested.
+            normalized: Its PEP 503 normalized form.
+            version: The release.
+
+        Returns:
+            ``{"info": {...}}`` shaped like the JSON API's, or None if
+            the mirror has no metadata for the release.
+        """
+        project = self.project(name, normalized)
+        if project is not None and project.get("info", {}).get("version") == version:
+            return project
+
+        for path in self._wheels(project, normalized, version):
+            metadata_path = path.with_name(path.name + ".metadata")
+            try:
+                text = metadata_path.read_text(encoding="utf-8")
+            except (OSError, UnicodeDecodeError):
+                text = self._read_wheel_metadata(path)
+            if text is not None:
+                return parse_core_metadata(text)
+        return None
@@ -0,0 +1,131 @@
+"""
+PyPI simple index (PEP 691) and core metadata (PEP 658/714) helpers.
+
+The JSON API's ``/pypi/{name}/{version}/json`` document lists every file
+of the release just to carry ``requires_dist`` and ``provides_extra``.
+The simple index instead lists a project's files, and for wheels it
+exposes the ``METADATA`` file on its own at ``<file URL>.metadata``:
+a few KB of RFC 822 headers with the same fields.
+
+:class:`~woolly.languages.python.PythonProvider` reads the project's
+simple page once, picks one wheel per version, and builds its version
+data from that wheel's core metadata.
+"""
+
+import hashlib
+from email.parser import HeaderParser
+from typing import Optional
+from urllib.parse import urljoin
+
+SIMPLE_INDEX_URL = "https://pypi.org/simple"
+
+# PEP 691 content type of the JSON simple index
+SIMPLE_JSON_TYPE = "application/vnd.pypi.simple.v1+json"
+
+# Core metadata headers to fields of the JSON API ``info`` object
+_SINGLE_FIELDS = {
+    "Name": "name",
+    "Version": "version",
+    "Summary": "summary",
+    "Home-page": "home_page",
+    "License": "license",
+    "License-Expression": "license_expression",
+}
+_MULTIPLE_FIELDS = {
+    "Classifier": "classifiers",
+    "Requires-Dist": "requires_dist",
+    "Provides-Extra": "provides_extra",
+}
+
+
+def wheel_version(filename: str) -> Optional[str]:
+    """
+    Return the version of a wheel from its file name.
+
+    Wheel names escape ``-`` in the project name, so the version is
+    always the second dash-separated part.
+
+    Args:
+        filename: A distribution file name.
+
+    Returns:
+        The version, or None if *filename* is not a wheel.
+    """
+    if not filename.endswith(".whl"):
+        return None
+    parts = filename[: -len(".whl")].split("-")
+    if len(parts) < 5:
+        return None
+    return parts[1]
+
+
+def _core_metadata(file: dict):
+    # PEP 714 renamed the PEP 658 key; older indexes only send the old one
+    if "core-metadata" in file:
+        return file["core-metadata"]
+    return file.get("data-dist-info-metadata", False)
+
+
+def metadata_files(data: dict, page_url: str) -> dict[str, dict]:
+    """
+    Pick the wheel whose core metadata is read for each version.
+
+    Pure-Python wheels are preferred; their metadata has no
+    platform-specific differences.
+
+    Args:
+        data: A PEP 691 JSON project page.
+        page_url: URL the page was fetched from (file URLs may be relative).
+
+    Returns:
+        Version to ``{"url": <metadata URL>, "sha256": <digest or None>}``,
+        for the versions that have a wheel with core metadata.
+    """
+    chosen: dict[str, dict] = {}
+    for file in data.get("files", []):
+        version = wheel_version(file.get("filename", ""))
+        metadata = _core_metadata(file)
+        if version is None or not metadata:
+            continue
+        pure = file["filename"].endswith("-none-any.whl")
+        if version in chosen and (chosen[version]["pure"] or not pure):
+            continue
+        url = urljoin(page_url, file["url"]).split("#", 1)[0]
+        chosen[version] = {
+            "url": f"{url}.metadata",
+            "sha256": metadata.get("sha256") if isinstance(metadata, dict) else None,
+            "pure": pure,
+        }
+    return {
+        version: {"url": entry["url"], "sha256": entry["sha256"]}
+        for version, entry in chosen.items()
+    }
+
+
+def verify_metadata(content: bytes, sha256: Optional[str]) -> bool:
+    """Whether a metadata file matches the digest the index announced."""
+    return sha256 is None or hashlib.sha256(content).hexdigest() == sha256
+
+
+def parse_core_metadata(text: str) -> dict:
+    """
+    Parse a core metadata file into version data.
+
+    Only the headers are parsed; the long description in the body is
+    skipped.
+
+    Args:
+        text: Contents of a ``METADATA`` file.
+
+    Returns:
+        ``{"info": {...}}`` shaped like a trimmed JSON API response.
+    """
+    headers = HeaderParser().parsestr(text, headersonly=True)
+    info = {}
+    for header, field in _SINGLE_FIELDS.items():
+        value = headers.get(header)
+        if value is not None and value != "UNKNOWN":
+            info[field] = value
+    for header, field in _MULTIPLE_FIELDS.items():
+        info[field] = headers.get_all(header) or []
+    return {"info": info}
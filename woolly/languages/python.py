@@ -2,24 +2,53 @@
 Python/PyPI language provider.
 
 This provider fetches package information from PyPI and checks
-Fedora repositories for Python packages.
+Fedora repositories for Python packages.  With ``simple_index`` set,
+dependencies and extras are read from the wheel core metadata the
+simple index exposes instead of the JSON API's release documents; with
+``mirror`` set, everything is read from a local PyPI mirror instead.
 """
 
 import re
-from typing import Optional
+from collections.abc import Callable
+from typing import Any, Optional
+
+import httpx
 
 from woolly import http
-from woolly.cache import DEFAULT_CACHE_TTL, read_cache, write_cache
+from woolly.cache import read_cache, write_cache
 from woolly.debug import (
-    log_api_request,
+    log,
     log_api_response,
     log_cache_hit,
     log_cache_miss,
 )
+from woolly.feeds import ChangeFeed, PyPIChangeFeed
 from woolly.languages.base import Dependency, FeatureInfo, LanguageProvider, PackageInfo
+from woolly.languages.pypi_mirror import PyPIMirror
+from woolly.languages.pypi_simple import (
+    SIMPLE_JSON_TYPE,
+    metadata_files,
+    parse_core_metadata,
+    verify_metadata,
+)
 
 PYPI_API = "https://pypi.org/pypi"
 
+# Fields of the JSON API ``info`` object that woolly reads; cached
+# payloads keep only these.
+_INFO_FIELDS = (
+    "name",
+    "version",
+    "summary",
+    "home_page",
+    "project_url",
+    "license",
+    "license_expression",
+    "classifiers",
+    "requires_dist",
+    "provides_extra",
+)
+
 
 class PythonProvider(LanguageProvider):
     """Provider for Python packages via PyPI."""
@@ -29,28 +58,43 @@ class PythonProvider(LanguageProvider):
     registry_name = "PyPI"
     fedora_provides_prefix = "python3dist"
     cache_namespace = "pypi"
+    cache_schema_version = 2
 
-    def fetch_package_info(self, package_name: str) -> Optional[PackageInfo]:
-        """Fetch package information from PyPI."""
-        cache_key = f"info:{package_name}"
-        cached = read_cache(self.cache_namespace, cache_key, DEFAULT_CACHE_TTL)
-        if cached is not None:
-            log_cache_hit(self.cache_namespace, cache_key)
-            if cached is False:  # Explicit "not found" cache
-                return None
-            return PackageInfo(
-                name=cached["info"]["name"],
-                latest_version=cached["info"]["version"],
-                description=cached["info"].get("summary"),
-                homepage=cached["info"].get("home_page"),
-                repository=cached["info"].get("project_url"),
-                license=self._extract_license(cached["info"]),
-            )
+    # Simple index root whose wheel metadata answers dependency lookups;
+    # None reads the JSON API
+    simple_index: Optional[str] = None
+
+    # Local mirror answering every registry lookup from disk, uncached
+    mirror: Optional[PyPIMirror] = None
 
-        log_cache_miss(self.cache_namespace, cache_key)
-        url = f"{PYPI_API}/{package_name}/json"
-        log_api_request("GET", url)
-        r = http.get(url)
+    @staticmethod
+    def _trim_payload(data: dict) -> dict:
+        """
+        Project a JSON API response onto the fields woolly reads.
+
+        The full document also lists every file of every release, which
+        runs to megabytes for projects like boto3 or numpy.
+        """
+        info = data.get("info") or {}
+        return {"info": {field: info[field] for field in _INFO_FIELDS if field in info}}
+
+    def _package_info_from_data(self, data) -> Optional[PackageInfo]:
+        """Build PackageInfo from a cached or fresh ``/pypi/{name}/json`` payload."""
+        if data is False:  # Explicit "not found" cache
+            return None
+        return PackageInfo(
+            name=data["info"]["name"],
+            latest_version=data["info"]["version"],
+            description=data["info"].get("summary"),
+            homepage=data["info"].get("home_page"),
+            repository=data["info"].get("project_url"),
+            license=self._extract_license(data["info"]),
+        )
+
+    def _handle_package_info_response(
+        self, package_name: str, cache_key: str, r: httpx.Response
+    ) -> Optional[PackageInfo]:
+        """Cache and parse a ``/pypi/{name}/json`` response."""
         log_api_response(r.status_code, r.text[:500] if r.text else None)
 
         if r.status_code == 404:
@@ -61,19 +105,205 @@ class PythonProvider(LanguageProvider):
                 f"Failed to fetch metadata for package {package_name}: {r.status_code}"
             )
 
-        data = r.json()
+        data = self._trim_payload(r.json())
+        write_cache(
+            self.cache_namespace, cache_key, data, **http.response_validators(r)
+        )
+        return self._package_info_from_data(data)
+
+    def _package_info_from_mirror(self, package_name: str) -> Optional[PackageInfo]:
+        """Build PackageInfo from the mirror's JSON API document."""
+        data = self.mirror.project(
+            package_name, self.normalize_package_name(package_name)
+        )
+        return self._package_info_from_data(
+            self._trim_payload(data) if data is not None else False
+        )
+
+    def _version_data_from_mirror(
+        self, package_name: str, version: str
+    ) -> Optional[dict]:
+        """Read a release's version data from the mirror."""
+        data = self.mirror.version_data(
+            package_name, self.normalize_package_name(package_name), version
+        )
+        return self._trim_payload(data) if data is not None else None
+
+    def fetch_package_info(self, package_name: str) -> Optional[PackageInfo]:
+        """Fetch package information from PyPI."""
+        if self.mirror is not None:
+            return self._package_info_from_mirror(package_name)
+        cache_key = self._cache_key("info", package_name)
+        return self._cached_registry(
+            cache_key,
+            f"{PYPI_API}/{package_name}/json",
+            self._package_info_from_data,
+            lambda r: self._handle_package_info_response(package_name, cache_key, r),
+        )
+
+    async def afetch_package_info(self, package_name: str) -> Optional[PackageInfo]:
+        """Async counterpart of :meth:`fetch_package_info`."""
+        if self.mirror is not None:
+            return self._package_info_from_mirror(package_name)
+        cache_key = self._cache_key("info", package_name)
+        return await self._acached_registry(
+            cache_key,
+            f"{PYPI_API}/{package_name}/json",
+            self._package_info_from_data,
+            lambda r: self._handle_package_info_response(package_name, cache_key, r),
+        )
+
+    def _handle_version_data_response(
+        self, cache_key: str, r: httpx.Response
+    ) -> Optional[dict]:
+        """Cache and parse a ``/pypi/{name}/{version}/json`` response."""
+        log_api_response(r.status_code, r.text[:500] if r.text else None)
+
+        if r.status_code != 200:
+            write_cache(self.cache_namespace, cache_key, False)
+            return None
+
+        data = self._trim_payload(r.json())
+        write_cache(
+            self.cache_namespace, cache_key, data, **http.response_validators(r)
+        )
+        return data
+
+    @staticmethod
+    def _version_data_from_cache(data) -> Optional[dict]:
+        """Return cached version data, or None for a cached "not found"."""
+        if data is False:  # Explicit "not found" cache
+            return None
+        return data
+
+    # ----------------------------------------------------------------
+    # Simple index
+    # ----------------------------------------------------------------
+
+    def _simple_page_url(self, package_name: str) -> str:
+        return f"{self.simple_index}/{self.normalize_package_name(package_name)}/"
+
+    def _handle_simple_response(
+        self, package_name: str, cache_key: str, r: httpx.Response
+    ):
+        """Cache the metadata files listed by a PEP 691 project page."""
+        log_api_response(r.status_code, r.text[:500] if r.text else None)
+
+        if r.status_code == 404:
+            write_cache(self.cache_namespace, cache_key, False)
+            return False
+        if r.status_code != 200:
+            raise RuntimeError(
+                f"Failed to fetch simple index page for {package_name}: {r.status_code}"
+            )
+
+        files = metadata_files(r.json(), self._simple_page_url(package_name))
+        write_cache(
+            self.cache_namespace, cache_key, files, **http.response_validators(r)
+        )
+        return files
+
+    def _simple_request(self, package_name: str) -> tuple[str, str, Callable]:
+        """Cache key, URL and response handler of a project's simple page."""
+        cache_key = self._cache_key("simple", package_name)
+        return (
+            cache_key,
+            self._simple_page_url(package_name),
+            lambda r: self._handle_simple_response(package_name, cache_key, r),
+        )
+
+    def _handle_core_metadata_response(
+        self, cache_key: str, sha256: Optional[str], r: httpx.Response
+    ) -> Optional[dict]:
+        """Cache and parse a wheel's ``.metadata`` file."""
+        log_api_response(r.status_code, r.text[:500] if r.text else None)
+
+        if r.status_code != 200:
+            write_cache(self.cache_namespace, cache_key, False)
+            return None
+        if not verify_metadata(r.content, sha256):
+            log("Core metadata digest mismatch", level="warning", key=cache_key)
+            return None
+
+        data = parse_core_metadata(r.text)
         write_cache(self.cache_namespace, cache_key, data)
+        return data
 
-        return PackageInfo(
-            name=data["info"]["name"],
-            latest_version=data["info"]["version"],
-            description=data["info"].get("summary"),
-            homepage=data["info"].get("home_page"),
-            repository=data["info"].get("project_url"),
-            license=self._extract_license(data["info"]),
+    def _core_metadata_request(
+        self, package_name: str, version: str, files
+    ) -> Optional[tuple[str, str, Callable]]:
+        """Cache key, URL and handler of a version's core metadata, if listed."""
+        entry = files.get(version) if files else None
+        if entry is None:
+            return None
+        cache_key = self._cache_key("metadata", package_name, version)
+        return (
+            cache_key,
+            entry["url"],
+            lambda r: self._handle_core_metadata_response(
+                cache_key, entry.get("sha256"), r
+            ),
+        )
+
+    def _fetch_core_metadata(
+        self, package_name: str, version: str, allow_stale: bool = True
+    ) -> Optional[dict]:
+        """
+        Build version data from a wheel's core metadata (PEP 658).
+
+        Args:
+            package_name: The name of the package.
+            version: The specific version to fetch.
+            allow_stale: Whether expired entries may be answered from.
+
+        Returns:
+            Version data shaped like the JSON API's, or None if the
+            version has no wheel with core metadata.
+        """
+        cache_key, url, handle = self._simple_request(package_name)
+        files = self._cached_registry(
+            cache_key,
+            url,
+            lambda cached: cached,
+            handle,
+            allow_stale=allow_stale,
+            headers={"Accept": SIMPLE_JSON_TYPE},
+        )
+        request = self._core_metadata_request(package_name, version, files)
+        if request is None:
+            return None
+        metadata_key, metadata_url, handle_metadata = request
+        return self._cached_registry(
+            metadata_key,
+            metadata_url,
+            self._version_data_from_cache,
+            handle_metadata,
+            allow_stale=allow_stale,
         )
 
-    def _fetch_version_data(self, package_name: str, version: str) -> Optional[dict]:
+    async def _afetch_core_metadata(
+        self, package_name: str, version: str
+    ) -> Optional[dict]:
+        """Async counterpart of :meth:`_fetch_core_metadata`."""
+        cache_key, url, handle = self._simple_request(package_name)
+        files = await self._acached_registry(
+            cache_key,
+            url,
+            lambda cached: cached,
+            handle,
+            headers={"Accept": SIMPLE_JSON_TYPE},
+        )
+        request = self._core_metadata_request(package_name, version, files)
+        if request is None:
+            return None
+        metadata_key, metadata_url, handle_metadata = request
+        return await self._acached_registry(
+            metadata_key, metadata_url, self._version_data_from_cache, handle_metadata
+        )
+
+    def _fetch_version_data(
+        self, package_name: str, version: str, allow_stale: bool = True
+    ) -> Optional[dict]:
         """
         Fetch the raw PyPI JSON response for a specific package version.
 
@@ -81,60 +311,93 @@ class PythonProvider(LanguageProvider):
         :meth:`fetch_dependencies` and :meth:`fetch_features` can share
         the same HTTP response without duplicating the request.
 
+        With ``simple_index`` set, the data is built from the release's
+        wheel metadata; releases without one fall back to the JSON API.
+
         Args:
             package_name: The name of the package.
             version: The specific version to fetch.
+            allow_stale: Whether an expired entry may be answered from in
+                stale-while-revalidate mode.
 
         Returns:
             Parsed JSON dict, or None on failure.
         """
-        cache_key = f"version_data:{package_name}:{version}"
-        cached = read_cache(self.cache_namespace, cache_key, DEFAULT_CACHE_TTL)
-        if cached is not None:
-            log_cache_hit(self.cache_namespace, cache_key)
-            if cached is False:  # Explicit "not found" cache
-                return None
-            return cached
+        if self.simple_index:
+            data = self._fetch_core_metadata(package_name, version, allow_stale)
+            if data is not None:
+                return data
+        cache_key = self._cache_key("version_data", package_name, version)
+        return self._cached_registry(
+            cache_key,
+            f"{PYPI_API}/{package_name}/{version}/json",
+            self._version_data_from_cache,
+            lambda r: self._handle_version_data_response(cache_key, r),
+            allow_stale=allow_stale,
+        )
 
-        log_cache_miss(self.cache_namespace, cache_key)
-        url = f"{PYPI_API}/{package_name}/{version}/json"
-        log_api_request("GET", url)
-        r = http.get(url)
-        log_api_response(r.status_code, r.text[:500] if r.text else None)
+    async def _afetch_version_data(
+        self, package_name: str, version: str
+    ) -> Optional[dict]:
+        """Async counterpart of :meth:`_fetch_version_data`."""
+        if self.simple_index:
+            data = await self._afetch_core_metadata(package_name, version)
+            if data is not None:
+                return data
+        cache_key = self._cache_key("version_data", package_name, version)
+        return await self._acached_registry(
+            cache_key,
+            f"{PYPI_API}/{package_name}/{version}/json",
+            self._version_data_from_cache,
+            lambda r: self._handle_version_data_response(cache_key, r),
+        )
 
-        if r.status_code != 200:
-            write_cache(self.cache_namespace, cache_key, False)
-            return None
+    def _refresh_from_version_data(
+        self,
+        build: Callable[[str, Optional[dict]], Any],
+        cache_key: str,
+        package_name: str,
+        version: str,
+    ) -> Callable[[], Any]:
+        """Build the background refresh of an entry derived from version data.
+
+        The version data itself must not be answered stale, or the
+        refreshed entry would be rebuilt from the same expired document.
+        """
+        return lambda: build(
+            cache_key,
+            self._fetch_version_data(package_name, version, allow_stale=False),
+        )
 
-        data = r.json()
-        write_cache(self.cache_namespace, cache_key, data)
-        return data
+    def _read_cached_dependencies(
+        self, cache_key: str, refresh: Optional[Callable[[], Any]] = None
+    ) -> Optional[list[Dependency]]:
+        """Return cached dependencies, or None on a cache miss."""
+        cached = read_cache(
+            self.cache_namespace,
+            cache_key,
+            self._registry_ttl(cache_key),
+            refresh=refresh,
+        )
+        if cached is None:
+            log_cache_miss(self.cache_namespace, cache_key)
+            return None
 
-    def fetch_dependencies(self, package_name: str, version: str) -> list[Dependency]:
-        """
-        Fetch dependencies for a specific package version.
+        log_cache_hit(self.cache_namespace, cache_key)
+        return [
+            Dependency(
+                name=d["name"],
+                version_requirement=d["version_requirement"],
+                optional=d.get("optional", False),
+                kind=d.get("kind", "normal"),
+                group=d.get("group"),
+            )
+            for d in cached
+        ]
 
-        PyPI provides dependencies in the `requires_dist` field.
-        """
-        cache_key = f"deps:{package_name}:{version}"
-        cached = read_cache(self.cache_namespace, cache_key, DEFAULT_CACHE_TTL)
-        if cached is not None:
-            log_cache_hit(self.cache_namespace, cache_key)
-            return [
-                Dependency(
-                    name=d["name"],
-                    version_requirement=d["version_requirement"],
-                    optional=d.get("optional", False),
-                    kind=d.get("kind", "normal"),
-                    group=d.get("group"),
-                )
-                for d in cached
-            ]
-
-        log_cache_miss(self.cache_namespace, cache_key)
-        data = self._fetch_version_data(package_name, version)
+    def _parse_dependencies(self, data: Optional[dict]) -> list[Dependency]:
+        """Parse the ``requires_dist`` of version data."""
         if data is None:
-            write_cache(self.cache_namespace, cache_key, [])
             return []
 
         requires_dist = data["info"].get("requires_dist") or []
@@ -144,6 +407,13 @@ class PythonProvider(LanguageProvider):
             parsed = self._parse_requirement(req)
             if parsed:
                 deps.append(parsed)
+        return deps
+
+    def _dependencies_from_version_data(
+        self, cache_key: str, data: Optional[dict]
+    ) -> list[Dependency]:
+        """Parse and cache dependencies from version data."""
+        deps = self._parse_dependencies(data)
 
         # Cache as dicts
         cache_data = [
@@ -160,26 +430,72 @@ class PythonProvider(LanguageProvider):
 
         return deps
 
-    def fetch_features(self, package_name: str, version: str) -> list[FeatureInfo]:
+    def fetch_dependencies(self, package_name: str, version: str) -> list[Dependency]:
         """
-        Fetch extras (groups) for a specific Python package version.
+        Fetch dependencies for a specific package version.
 
-        PyPI provides extras via `provides_extra` and links dependencies
-        to extras via `requires_dist` markers.
+        PyPI provides dependencies in the `requires_dist` field.
         """
-        cache_key = f"features:{package_name}:{version}"
-        cached = read_cache(self.cache_namespace, cache_key, DEFAULT_CACHE_TTL)
+        if self.mirror is not None:
+            return self._parse_dependencies(
+                self._version_data_from_mirror(package_name, version)
+            )
+        cache_key = self._cache_key("deps", package_name, version)
+        cached = self._read_cached_dependencies(
+            cache_key,
+            self._refresh_from_version_data(
+                self._dependencies_from_version_data, cache_key, package_name, version
+            ),
+        )
         if cached is not None:
-            log_cache_hit(self.cache_namespace, cache_key)
-            return [
-                FeatureInfo(name=f["name"], dependencies=f["dependencies"])
-                for f in cached
-            ]
+            return cached
 
-        log_cache_miss(self.cache_namespace, cache_key)
         data = self._fetch_version_data(package_name, version)
+        return self._dependencies_from_version_data(cache_key, data)
+
+    async def afetch_dependencies(
+        self, package_name: str, version: str
+    ) -> list[Dependency]:
+        """Async counterpart of :meth:`fetch_dependencies`."""
+        if self.mirror is not None:
+            return self._parse_dependencies(
+                self._version_data_from_mirror(package_name, version)
+            )
+        cache_key = self._cache_key("deps", package_name, version)
+        cached = self._read_cached_dependencies(
+            cache_key,
+            self._refresh_from_version_data(
+                self._dependencies_from_version_data, cache_key, package_name, version
+            ),
+        )
+        if cached is not None:
+            return cached
+
+        data = await self._afetch_version_data(package_name, version)
+        return self._dependencies_from_version_data(cache_key, data)
+
+    def _read_cached_features(
+        self, cache_key: str, refresh: Optional[Callable[[], Any]] = None
+    ) -> Optional[list[FeatureInfo]]:
+        """Return cached extras, or None on a cache miss."""
+        cached = read_cache(
+            self.cache_namespace,
+            cache_key,
+            self._registry_ttl(cache_key),
+            refresh=refresh,
+        )
+        if cached is None:
+            log_cache_miss(self.cache_namespace, cache_key)
+            return None
+
+        log_cache_hit(self.cache_namespace, cache_key)
+        return [
+            FeatureInfo(name=f["name"], dependencies=f["dependencies"]) for f in cached
+        ]
+
+    def _parse_features(self, data: Optional[dict]) -> list[FeatureInfo]:
+        """Parse the extras of version data and the dependencies they add."""
         if data is None:
-            write_cache(self.cache_namespace, cache_key, [])
             return []
 
         provides_extra = data["info"].get("provides_extra") or []
@@ -200,6 +516,13 @@ class PythonProvider(LanguageProvider):
             FeatureInfo(name=name, dependencies=sorted(deps))
             for name, deps in sorted(extras_map.items())
         ]
+        return features
+
+    def _features_from_version_data(
+        self, cache_key: str, data: Optional[dict]
+    ) -> list[FeatureInfo]:
+        """Parse and cache extras from version data."""
+        features = self._parse_features(data)
 
         # Cache as dicts
         cache_data = [
@@ -209,6 +532,51 @@ class PythonProvider(LanguageProvider):
 
         return features
 
+    def fetch_features(self, package_name: str, version: str) -> list[FeatureInfo]:
+        """
+        Fetch extras (groups) for a specific Python package version.
+
+        PyPI provides extras via `provides_extra` and links dependencies
+        to extras via `requires_dist` markers.
+        """
+        if self.mirror is not None:
+            return self._parse_features(
+                self._version_data_from_mirror(package_name, version)
+            )
+        cache_key = self._cache_key("features", package_name, version)
+        cached = self._read_cached_features(
+            cache_key,
+            self._refresh_from_version_data(
+                self._features_from_version_data, cache_key, package_name, version
+            ),
+        )
+        if cached is not None:
+            return cached
+
+        data = self._fetch_version_data(package_name, version)
+        return self._features_from_version_data(cache_key, data)
+
+    async def afetch_features(
+        self, package_name: str, version: str
+    ) -> list[FeatureInfo]:
+        """Async counterpart of :meth:`fetch_features`."""
+        if self.mirror is not None:
+            return self._parse_features(
+                self._version_data_from_mirror(package_name, version)
+            )
+        cache_key = self._cache_key("features", package_name, version)
+        cached = self._read_cached_features(
+            cache_key,
+            self._refresh_from_version_data(
+                self._features_from_version_data, cache_key, package_name, version
+            ),
+        )
+        if cached is not None:
+            return cached
+
+        data = await self._afetch_version_data(package_name, version)
+        return self._features_from_version_data(cache_key, data)
+
     def _extract_extra_name(self, req_string: str) -> Optional[str]:
         """
         Extract the extra name from a PEP 508 requirement string.
@@ -411,3 +779,7 @@ class PythonProvider(LanguageProvider):
             alternatives.append(alt_dot)
 
         return alternatives
+
+    def registry_change_feed(self) -> Optional[ChangeFeed]:
+        """Projects are invalidated from PyPI's serial-ordered changelog."""
+        return PyPIChangeFeed()
@@ -2,23 +2,48 @@
 Rust/crates.io language provider.
 
 This provider fetches package information from crates.io and checks
-Fedora repositories for Rust crate packages.
+Fedora repositories for Rust crate packages.  With ``sparse_index`` set,
+registry lookups are answered from the crate's sparse index file
+instead of the crates.io API; with ``crates_dump`` set, they are
+answered offline from an ingested crates.io database dump.  With
+``batch_info`` set, the info of every crate on a resolver level is
+fetched with one multi-id ``/crates?ids[]=...`` listing per
+``CRATES_BATCH_SIZE`` crates.
 """
 
+import asyncio
 from typing import Optional
+from urllib.parse import urlencode
+
+import httpx
 
 from woolly import http
-from woolly.cache import DEFAULT_CACHE_TTL, read_cache, write_cache
+from woolly.cache import peek_cache, write_cache
 from woolly.debug import (
+    log,
     log_api_request,
     log_api_response,
-    log_cache_hit,
-    log_cache_miss,
 )
+from woolly.feeds import ChangeFeed, CratesIoChangeFeed
 from woolly.languages.base import Dependency, FeatureInfo, LanguageProvider, PackageInfo
+from woolly.languages.crates_dump import CratesDump
+from woolly.languages.crates_index import (
+    NOT_FOUND_STATUSES,
+    find_version,
+    index_path,
+    latest_version,
+    parse_index_file,
+)
 
 CRATES_API = "https://crates.io/api/v1/crates"
 
+# Largest page of the crates listing, so the most ids one request can answer
+CRATES_BATCH_SIZE = 100
+
+# Fields of the API objects that woolly reads; cached payloads keep only these.
+_CRATE_FIELDS = ("name", "newest_version", "description", "homepage", "repository")
+_DEPENDENCY_FIELDS = ("crate_id", "req", "optional", "kind")
+
 
 class RustProvider(LanguageProvider):
     """Provider for Rust crates via crates.io."""
@@ -28,6 +53,18 @@ class RustProvider(LanguageProvider):
     registry_name = "crates.io"
     fedora_provides_prefix = "crate"
     cache_namespace = "crates"
+    cache_schema_version = 2
+
+    # Sparse index root answering registry lookups; None uses the crates.io API
+    sparse_index: Optional[str] = None
+
+    # Ingested database dump answering registry lookups without HTTP
+    crates_dump: Optional[CratesDump] = None
+
+    # Prefetch each resolver level's crate info with the multi-id listing.
+    # Listed crates carry no license, so batched crates report it as
+    # unavailable; they are cached as "listing" entries only this mode reads.
+    batch_info: bool = False
 
     @staticmethod
     def _extract_license(data: dict) -> Optional[str]:
@@ -48,40 +85,31 @@ class RustProvider(LanguageProvider):
 
         return None
 
-    def fetch_package_info(self, package_name: str) -> Optional[PackageInfo]:
-        """Fetch crate information from crates.io."""
-        cache_key = f"info:{package_name}"
-        cached = read_cache(self.cache_namespace, cache_key, DEFAULT_CACHE_TTL)
-        if cached is not None:
-            log_cache_hit(self.cache_namespace, cache_key)
-            if cached is False:  # Explicit "not found" cache
-                return None
-            return PackageInfo(
-                name=cached["crate"]["name"],
-                latest_version=cached["crate"]["newest_version"],
-                description=cached["crate"].get("description"),
-                homepage=cached["crate"].get("homepage"),
-                repository=cached["crate"].get("repository"),
-                license=self._extract_license(cached),
-            )
-
-        log_cache_miss(self.cache_namespace, cache_key)
-        url = f"{CRATES_API}/{package_name}"
-        log_api_request("GET", url)
-        r = http.get(url)
-        log_api_response(r.status_code, r.text[:500] if r.text else None)
+    @classmethod
+    def _trim_crate_payload(cls, data: dict) -> dict:
+        """
+        Project a ``/crates/{name}`` response onto the fields woolly reads.
 
-        if r.status_code == 404:
-            write_cache(self.cache_namespace, cache_key, False)
-            return None
-        if r.status_code != 200:
-            raise RuntimeError(
-                f"Failed to fetch metadata for crate {package_name}: {r.status_code}"
-            )
+        The license is resolved up front so the ``versions`` array, which
+        lists every published version, can be dropped.
+        """
+        crate = data.get("crate") or {}
+        trimmed = {field: crate[field] for field in _CRATE_FIELDS if field in crate}
+        trimmed["license"] = cls._extract_license(data)
+        return {"crate": trimmed}
 
-        data = r.json()
-        write_cache(self.cache_namespace, cache_key, data)
+    @staticmethod
+    def _trim_dependencies(deps: list[dict]) -> list[dict]:
+        """Keep only the dependency fields woolly reads."""
+        return [
+            {field: dep[field] for field in _DEPENDENCY_FIELDS if field in dep}
+            for dep in deps
+        ]
 
+    def _package_info_from_data(self, data) -> Optional[PackageInfo]:
+        """Build PackageInfo from a cached or fresh ``/crates/{name}`` payload."""
+        if data is False:  # Explicit "not found" cache
+            return None
         return PackageInfo(
             name=data["crate"]["name"],
             latest_version=data["crate"]["newest_version"],
@@ -91,36 +119,29 @@ class RustProvider(LanguageProvider):
             license=self._extract_license(data),
         )
 
-    def fetch_dependencies(self, package_name: str, version: str) -> list[Dependency]:
-        """Fetch dependencies for a specific crate version."""
-        cache_key = f"deps:{package_name}:{version}"
-        cached = read_cache(self.cache_namespace, cache_key, DEFAULT_CACHE_TTL)
-        if cached is not None:
-            log_cache_hit(self.cache_namespace, cache_key)
-            return [
-                Dependency(
-                    name=d["crate_id"],
-                    version_requirement=d["req"],
-                    optional=d.get("optional", False),
-                    kind=d.get("kind", "normal"),
-                )
-                for d in cached
-            ]
-
-        log_cache_miss(self.cache_namespace, cache_key)
-        url = f"{CRATES_API}/{package_name}/{version}/dependencies"
-        log_api_request("GET", url)
-        r = http.get(url)
+    def _handle_package_info_response(
+        self, package_name: str, cache_key: str, r: httpx.Response
+    ) -> Optional[PackageInfo]:
+        """Cache and parse a ``/crates/{name}`` response."""
         log_api_response(r.status_code, r.text[:500] if r.text else None)
 
+        if r.status_code == 404:
+            write_cache(self.cache_namespace, cache_key, False)
+            return None
         if r.status_code != 200:
-            write_cache(self.cache_namespace, cache_key, [])
-            return []
+            raise RuntimeError(
+                f"Failed to fetch metadata for crate {package_name}: {r.status_code}"
+            )
 
-        data = r.json()
-        deps = data.get("dependencies", [])
-        write_cache(self.cache_namespace, cache_key, deps)
+        data = self._trim_crate_payload(r.json())
+        write_cache(
+            self.cache_namespace, cache_key, data, **http.response_validators(r)
+        )
+        return self._package_info_from_data(data)
 
+    @staticmethod
+    def _dependencies_from_data(deps: list[dict]) -> list[Dependency]:
+        """Build Dependency objects from crates.io dependency dicts."""
         return [
             Dependency(
                 name=d["crate_id"],
@@ -131,21 +152,35 @@ class RustProvider(LanguageProvider):
             for d in deps
         ]
 
-    def fetch_features(self, package_name: str, version: str) -> list[FeatureInfo]:
-        """Fetch feature flags for a specific crate version from crates.io."""
-        cache_key = f"features:{package_name}:{version}"
-        cached = read_cache(self.cache_namespace, cache_key, DEFAULT_CACHE_TTL)
-        if cached is not None:
-            log_cache_hit(self.cache_namespace, cache_key)
-            return [
-                FeatureInfo(name=f["name"], dependencies=f["dependencies"])
-                for f in cached
-            ]
-
-        log_cache_miss(self.cache_namespace, cache_key)
-        url = f"{CRATES_API}/{package_name}/{version}"
-        log_api_request("GET", url)
-        r = http.get(url)
+    def _handle_dependencies_response(
+        self, cache_key: str, r: httpx.Response
+    ) -> list[Dependency]:
+        """Cache and parse a ``/crates/{name}/{version}/dependencies`` response."""
+        log_api_response(r.status_code, r.text[:500] if r.text else None)
+
+        if r.status_code != 200:
+            write_cache(self.cache_namespace, cache_key, [])
+            return []
+
+        data = r.json()
+        deps = self._trim_dependencies(data.get("dependencies", []))
+        write_cache(
+            self.cache_namespace, cache_key, deps, **http.response_validators(r)
+        )
+        return self._dependencies_from_data(deps)
+
+    @staticmethod
+    def _features_from_data(features: list[dict]) -> list[FeatureInfo]:
+        """Build FeatureInfo objects from cached feature dicts."""
+        return [
+            FeatureInfo(name=f["name"], dependencies=f["dependencies"])
+            for f in features
+        ]
+
+    def _handle_features_response(
+        self, cache_key: str, r: httpx.Response
+    ) -> list[FeatureInfo]:
+        """Cache and parse a ``/crates/{name}/{version}`` response."""
         log_api_response(r.status_code, r.text[:500] if r.text else None)
 
         if r.status_code != 200:
@@ -164,10 +199,361 @@ class RustProvider(LanguageProvider):
         cache_data = [
             {"name": f.name, "dependencies": f.dependencies} for f in features
         ]
-        write_cache(self.cache_namespace, cache_key, cache_data)
+        write_cache(
+            self.cache_namespace, cache_key, cache_data, **http.response_validators(r)
+        )
 
         return features
 
+    # ----------------------------------------------------------------
+    # Sparse index
+    # ----------------------------------------------------------------
+
+    def _index_request(self, package_name: str) -> tuple[str, str]:
+        """Cache key and URL of a crate's sparse index file."""
+        cache_key = self._cache_key("index", package_name.lower())
+        return cache_key, f"{self.sparse_index}/{index_path(package_name)}"
+
+    def _handle_index_response(
+        self, package_name: str, cache_key: str, r: httpx.Response
+    ):
+        """Cache and parse a crate's sparse index file."""
+        log_api_response(r.status_code, r.text[:500] if r.text else None)
+
+        if r.status_code in NOT_FOUND_STATUSES:
+            write_cache(self.cache_namespace, cache_key, False)
+            return False
+        if r.status_code != 200:
+            raise RuntimeError(
+                f"Failed to fetch index file for crate {package_name}: {r.status_code}"
+            )
+
+        payload = parse_index_file(r.text)
+        if payload is None:
+            payload = False
+        write_cache(
+            self.cache_namespace, cache_key, payload, **http.response_validators(r)
+        )
+        return payload
+
+    def _fetch_index(self, package_name: str):
+        """
+        Get a crate's parsed index file, fetching it once per crate.
+
+        Returns:
+            The payload built by
+            :func:`~woolly.languages.crates_index.parse_index_file`, or
+            False if the crate does not exist.
+        """
+        cache_key, url = self._index_request(package_name)
+        return self._cached_registry(
+            cache_key,
+            url,
+            lambda payload: payload,
+            lambda r: self._handle_index_response(package_name, cache_key, r),
+        )
+
+    async def _afetch_index(self, package_name: str):
+        """Async counterpart of :meth:`_fetch_index`."""
+        cache_key, url = self._index_request(package_name)
+        return await self._acached_registry(
+            cache_key,
+            url,
+            lambda payload: payload,
+            lambda r: self._handle_index_response(package_name, cache_key, r),
+        )
+
+    @staticmethod
+    def _package_info_from_index(payload) -> Optional[PackageInfo]:
+        """Build PackageInfo from an index payload (it carries no license)."""
+        if payload is False:
+            return None
+        return PackageInfo(
+            name=payload["name"],
+            latest_version=latest_version(payload["versions"]),
+            license_unavailable=True,
+        )
+
+    def _dependencies_from_index(self, payload, version: str) -> list[Dependency]:
+        """Build the dependencies of *version* from an index payload."""
+        entry = find_version(payload, version) if payload else None
+        if entry is None:
+            return []
+        return self._dependencies_from_data(entry["deps"])
+
+    @staticmethod
+    def _features_from_index(payload, version: str) -> list[FeatureInfo]:
+        """Build the features of *version* from an index payload."""
+        entry = find_version(payload, version) if payload else None
+        if entry is None:
+            return []
+        return [
+            FeatureInfo(name=name, dependencies=deps)
+            for name, deps in sorted(entry["features"].items())
+        ]
+
+    # ----------------------------------------------------------------
+    # Batched info
+    # ----------------------------------------------------------------
+
+    @staticmethod
+    def _canonical_name(package_name: str) -> str:
+        """crates.io treats names case-insensitively and ``-`` like ``_``."""
+        return package_name.lower().replace("_", "-")
+
+    def _batch_info_requests(
+        self, package_names: list[str]
+    ) -> list[tuple[dict[str, list[str]], str]]:
+        """
+        Group the crates without fresh cached info into listing requests.
+
+        Args:
+            package_names: Names of the crates about to be resolved.
+
+        Returns:
+            One ``(names, url)`` pair per chunk of ``CRATES_BATCH_SIZE``
+            crates, *names* mapping each canonical name to the names it
+            was requested as.
+        """
+        if not self.batch_info or self.crates_dump is not None or self.sparse_index:
+            return []
+
+        # Peek, so the lookups that follow are the only ones counted
+        missing: dict[str, list[str]] = {}
+        for package_name in dict.fromkeys(package_names):
+            if all(
+                peek_cache(self.cache_namespace, key, self._registry_ttl(key)) is None
+                for key in (
+                    self._cache_key("info", package_name),
+                    self._cache_key("listing", package_name),
+                )
+            ):
+                canonical = self._canonical_name(package_name)
+                missing.setdefault(canonical, []).append(package_name)
+
+        canonical_names = list(missing)
+        requests = []
+        for i in range(0, len(canonical_names), CRATES_BATCH_SIZE):
+            chunk = canonical_names[i : i + CRATES_BATCH_SIZE]
+            query = urlencode(
+                [("per_page", len(chunk)), *(("ids[]", name) for name in chunk)]
+            )
+            requests.append(
+                ({name: missing[name] for name in chunk}, f"{CRATES_API}?{query}")
+            )
+        return requests
+
+    def _handle_batch_info_response(
+        self, names: dict[str, list[str]], r: httpx.Response
+    ) -> None:
+        """
+        Cache the crates of a listing under the names they were requested as.
+
+        Entries go under ``listing`` keys, not the ``info`` ones of
+        ``/crates/{name}``: they lack the license, and runs without
+        ``batch_info`` must not answer from them.  Crates missing from the
+        listing are left uncached, so their :meth:`fetch_package_info`
+        falls back to ``/crates/{name}``.
+        """
+        log_api_response(r.status_code, r.text[:500] if r.text else None)
+        if r.status_code != 200:
+            log("Batched crate info failed", level="warning", status=r.status_code)
+            return
+
+        for crate in r.json().get("crates", []):
+            data = self._trim_crate_payload({"crate": crate})
+            for package_name in names.get(
+                self._canonical_name(crate.get("name", "")), []
+            ):
+                write_cache(
+                    self.cache_namespace, self._cache_key("listing", package_name), data
+                )
+
+    def _listed_package_info(self, package_name: str) -> Optional[PackageInfo]:
+        """
+        Build PackageInfo from a crate's listing entry, without its license.
+
+        Returns None when batching is off or the crate was not listed; only
+        a hit is counted, as the ``info`` lookup that follows counts a miss.
+        """
+        if not self.batch_info:
+            return None
+        cache_key = self._cache_key("listing", package_name)
+        listed = peek_cache(
+            self.cache_namespace,
+            cache_key,
+            self._registry_ttl(cache_key),
+            count_hit=True,
+        )
+        if listed is None:
+            return None
+        return self._package_info_from_data(listed).model_copy(
+            update={"license_unavailable": True}
+        )
+
+    def _fetch_batch_info(self, names: dict[str, list[str]], url: str) -> None:
+        """Run one listing request; failures leave the per-crate fetches."""
+        log_api_request("GET", url)
+        try:
+            r = http.get(url)
+        except httpx.HTTPError as e:
+            log("Batched crate info failed", level="warning", error=str(e))
+            return
+        self._handle_batch_info_response(names, r)
+
+    async def _afetch_batch_info(self, names: dict[str, list[str]], url: str) -> None:
+        """Async counterpart of :meth:`_fetch_batch_info`."""
+        log_api_request("GET", url)
+        try:
+            r = await http.aget(url)
+        except httpx.HTTPError as e:
+            log("Batched crate info failed", level="warning", error=str(e))
+            return
+        self._handle_batch_info_response(names, r)
+
+    def prefetch_package_info(self, package_names: list[str]) -> None:
+        """Fetch the info of uncached crates with multi-id listings."""
+        for names, url in self._batch_info_requests(package_names):
+            self._fetch_batch_info(names, url)
+
+    async def aprefetch_package_info(self, package_names: list[str]) -> None:
+        """Async counterpart of :meth:`prefetch_package_info`."""
+        await asyncio.gather(
+            *(
+                self._afetch_batch_info(names, url)
+                for names, url in self._batch_info_requests(package_names)
+            )
+        )
+
+    # ----------------------------------------------------------------
+    # Registry lookups
+    # ----------------------------------------------------------------
+
+    def fetch_package_info(self, package_name: str) -> Optional[PackageInfo]:
+        """Fetch crate information from crates.io."""
+        if self.crates_dump is not None:
+            return self.crates_dump.package_info(package_name)
+        if self.sparse_index:
+            return self._package_info_from_index(self._fetch_index(package_name))
+        listed = self._listed_package_info(package_name)
+        if listed is not None:
+            return listed
+        return self._fetch_api_package_info(package_name)
+
+    def _fetch_api_package_info(self, package_name: str) -> Optional[PackageInfo]:
+        """Fetch crate information from the ``/crates/{name}`` endpoint."""
+        cache_key = self._cache_key("info", package_name)
+        return self._cached_registry(
+            cache_key,
+            f"{CRATES_API}/{package_name}",
+            self._package_info_from_data,
+            lambda r: self._handle_package_info_response(package_name, cache_key, r),
+        )
+
+    def fetch_root_package_info(self, package_name: str) -> Optional[PackageInfo]:
+        """
+        Fetch the root crate's information, with its license.
+
+        The sparse index and the batched listing have no licenses, so when
+        the info came from either the root's license alone is looked up in
+        the crates.io API.
+        """
+        info = self.fetch_package_info(package_name)
+        if info is None or not info.license_unavailable:
+            return info
+        try:
+            api_info = self._fetch_api_package_info(package_name)
+        except (RuntimeError, httpx.HTTPError) as e:
+            log("Root license unavailable", level="warning", error=str(e))
+            return info
+        if api_info is None:
+            return info
+        return info.model_copy(
+            update={"license": api_info.license, "license_unavailable": False}
+        )
+
+    async def afetch_package_info(self, package_name: str) -> Optional[PackageInfo]:
+        """Async counterpart of :meth:`fetch_package_info`."""
+        if self.crates_dump is not None:
+            return self.crates_dump.package_info(package_name)
+        if self.sparse_index:
+            payload = await self._afetch_index(package_name)
+            return self._package_info_from_index(payload)
+        listed = self._listed_package_info(package_name)
+        if listed is not None:
+            return listed
+        cache_key = self._cache_key("info", package_name)
+        return await self._acached_registry(
+            cache_key,
+            f"{CRATES_API}/{package_name}",
+            self._package_info_from_data,
+            lambda r: self._handle_package_info_response(package_name, cache_key, r),
+        )
+
+    def fetch_dependencies(self, package_name: str, version: str) -> list[Dependency]:
+        """Fetch dependencies for a specific crate version."""
+        if self.crates_dump is not None:
+            return self.crates_dump.dependencies(package_name, version)
+        if self.sparse_index:
+            payload = self._fetch_index(package_name)
+            return self._dependencies_from_index(payload, version)
+        cache_key = self._cache_key("deps", package_name, version)
+        return self._cached_registry(
+            cache_key,
+            f"{CRATES_API}/{package_name}/{version}/dependencies",
+            self._dependencies_from_data,
+            lambda r: self._handle_dependencies_response(cache_key, r),
+        )
+
+    async def afetch_dependencies(
+        self, package_name: str, version: str
+    ) -> list[Dependency]:
+        """Async counterpart of :meth:`fetch_dependencies`."""
+        if self.crates_dump is not None:
+            return self.crates_dump.dependencies(package_name, version)
+        if self.sparse_index:
+            payload = await self._afetch_index(package_name)
+            return self._dependencies_from_index(payload, version)
+        cache_key = self._cache_key("deps", package_name, version)
+        return await self._acached_registry(
+            cache_key,
+            f"{CRATES_API}/{package_name}/{version}/dependencies",
+            self._dependencies_from_data,
+            lambda r: self._handle_dependencies_response(cache_key, r),
+        )
+
+    def fetch_features(self, package_name: str, version: str) -> list[FeatureInfo]:
+        """Fetch feature flags for a specific crate version from crates.io."""
+        if self.crates_dump is not None:
+            return self.crates_dump.features(package_name, version)
+        if self.sparse_index:
+            payload = self._fetch_index(package_name)
+            return self._features_from_index(payload, version)
+        cache_key = self._cache_key("features", package_name, version)
+        return self._cached_registry(
+            cache_key,
+            f"{CRATES_API}/{package_name}/{version}",
+            self._features_from_data,
+            lambda r: self._handle_features_response(cache_key, r),
+        )
+
+    async def afetch_features(
+        self, package_name: str, version: str
+    ) -> list[FeatureInfo]:
+        """Async counterpart of :meth:`fetch_features`."""
+        if self.crates_dump is not None:
+            return self.crates_dump.features(package_name, version)
+        if self.sparse_index:
+            payload = await self._afetch_index(package_name)
+            return self._features_from_index(payload, version)
+        cache_key = self._cache_key("features", package_name, version)
+        return await self._acached_registry(
+            cache_key,
+            f"{CRATES_API}/{package_name}/{version}",
+            self._features_from_data,
+            lambda r: self._handle_features_response(cache_key, r),
+        )
+
     def get_alternative_names(self, package_name: str) -> list[str]:
         """
         Get alternative names to try for crate lookup.
@@ -186,3 +572,7 @@ class RustProvider(LanguageProvider):
             alternatives.append(alt_hyphen)
 
         return alternatives
+
+    def registry_change_feed(self) -> Optional[ChangeFeed]:
+        """Crates are invalidated from crates.io's recently updated listing."""
+        return CratesIoChangeFeed()
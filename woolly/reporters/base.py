@@ -25,6 +25,11 @@ from typing import Any, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from woolly.graph import DependencyGraph, ReleaseStatus
+
+# Shown instead of a license when the registry source does not carry one
+LICENSE_UNAVAILABLE = "license unavailable"
+
 
 def strip_markup(text: str) -> str:
     """
@@ -53,6 +58,7 @@ class ReportData(BaseModel):
 
     # License
     root_license: Optional[str] = None
+    root_license_unavailable: bool = False
 
     # Statistics
     total_dependencies: int
@@ -83,13 +89,15 @@ class ReportData(BaseModel):
     # Features / extras
     features: list[Any] = Field(default_factory=list)
 
-    # Full tree for detailed reports
-    tree: Any  # Rich Tree object - not JSON serializable
+    # Full dependency graph for detailed reports
+    graph: DependencyGraph
 
     # Metadata
     timestamp: datetime = Field(default_factory=datetime.now)
     max_depth: int = 50
     version: Optional[str] = None
+    # Registry answers served from expired cache entries (stale mode)
+    stale_answers: int = 0
 
     # Fedora targeting
     fedora_release: Optional[str] = None
@@ -113,6 +121,43 @@ class ReportData(BaseModel):
         """Get the unique set of packaged packages."""
         return set(self.packaged_packages)
 
+    @cached_property
+    def release_matrix(self) -> list[tuple[str, dict[str, ReleaseStatus]]]:
+        """Get each package's availability per release, sorted by name.
+
+        Empty unless several releases were checked.  With ``missing_only``
+        only packages missing from at least one release are listed.
+        """
+        rows = []
+        for name, node in sorted(self.graph.nodes.items()):
+            if not node.releases:
+                continue
+            if self.missing_only and all(
+                status.is_packaged for status in node.releases.values()
+            ):
+                continue
+            rows.append((name, node.releases))
+        return rows
+
+    @cached_property
+    def dev_build_release(self) -> Optional[str]:
+        """Get the one release dev/build deps were checked against.
+
+        Set only for multi-release runs, where the rest of the report has a
+        column per release but dev/build deps use the primary release alone.
+        """
+        return self.fedora_release if self.graph.releases else None
+
+    @cached_property
+    def release_packaged_counts(self) -> dict[str, int]:
+        """Get the number of packages available in each checked release."""
+        counts = dict.fromkeys(self.graph.releases, 0)
+        for node in self.graph.nodes.values():
+            for release, status in node.releases.items():
+                if status.is_packaged:
+                    counts[release] = counts.get(release, 0) + 1
+        return counts
+
 
 class Reporter(ABC):
     """
@@ -180,59 +225,3 @@ class Reporter(ABC):
         output_path = output_dir / self.get_output_filename(data)
         output_path.write_text(content)
         return output_path
-
-    # ----------------------------------------------------------------
-    # Shared tree traversal utilities for subclasses
-    # ----------------------------------------------------------------
-
-    def _get_label(self, node) -> str:
-        """
-        Extract the label text from a tree node, handling nested Trees.
-
-        Args:
-            node: A Rich Tree node or string.
-
-        Returns:
-            The label text as a string.
-        """
-        # If it's a string, return it directly
-        if isinstance(node, str):
-            return node
-
-        # Try to get label attribute (Rich Tree has this)
-        if hasattr(node, "label"):
-            label = node.label
-            # If label is None, return empty string
-            if label is None:
-                return ""
-            # If label is another Tree-like object (has its own label), recurse
-            if hasattr(label, "label"):
-                return self._get_label(label)
-            # Otherwise convert to string
-            return str(label)
-
-        # Fallback - shouldn't happen
-        return str(node)
-
-    def _get_children(self, node) -> list:
-        """
-        Get all children from a tree node, flattening nested Trees.
-
-        Args:
-            node: A Rich Tree node.
-
-        Returns:
-            List of child nodes.
-        """
-        children = []
-
-        if hasattr(node, "children"):
-            for child in node.children:
-                # If the child's label is itself a Tree, use that Tree's children
-                if hasattr(child, "label") and hasattr(child.label, "children"):
-                    # The child is a wrapper around another tree
-                    children.append(child.label)
-                else:
-                    children.append(child)
-
-        return children
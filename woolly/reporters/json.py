@@ -4,12 +4,13 @@ JSON report generator.
 Generates a JSON file with structured data for machine consumption.
 """
 
-import re
 from typing import Optional
 
 from pydantic import BaseModel, Field
 
-from woolly.reporters.base import ReportData, Reporter, strip_markup
+from woolly.graph import DependencyEdge, DependencyGraph, ReleaseStatus
+from woolly.reporters.base import ReportData, Reporter
+from woolly.reporters.tree import format_label
 
 
 class TreeNodeData(BaseModel):
@@ -19,6 +20,8 @@ class TreeNodeData(BaseModel):
     name: Optional[str] = None
     version: Optional[str] = None
     license: Optional[str] = None
+    license_unavailable: bool = False
+    requirement: Optional[str] = None
     optional: bool = False
     status: Optional[str] = None
     is_packaged: Optional[bool] = None
@@ -36,10 +39,12 @@ class ReportMetadata(BaseModel):
     language: str
     registry: str
     license: Optional[str] = None
+    license_unavailable: bool = False
     version: Optional[str] = None
     max_depth: int
     include_optional: bool
     missing_only: bool = False
+    stale_answers: int = 0
 
 
 class DevBuildDepData(BaseModel):
@@ -59,6 +64,13 @@ class FeatureData(BaseModel):
     dependencies: list[str] = Field(default_factory=list)
 
 
+class ReleaseMatrixRow(BaseModel):
+    """Availability of one package in each checked Fedora release."""
+
+    name: str
+    releases: dict[str, ReleaseStatus] = Field(default_factory=dict)
+
+
 class ReportSummary(BaseModel):
     """Summary statistics for the JSON report."""
 
@@ -68,6 +80,7 @@ class ReportSummary(BaseModel):
     optional: "OptionalSummary"
     dev: "DevBuildSummary"
     build: "DevBuildSummary"
+    packaged_by_release: dict[str, int] = Field(default_factory=dict)
 
 
 class OptionalSummary(BaseModel):
@@ -97,6 +110,10 @@ class JsonReport(BaseModel):
     features: list[FeatureData] = Field(default_factory=list)
     dev_dependencies: list[DevBuildDepData] = Field(default_factory=list)
     build_dependencies: list[DevBuildDepData] = Field(default_factory=list)
+    # Release dev/build deps were checked against in multi-release runs
+    dev_build_release: Optional[str] = None
+    releases: list[str] = Field(default_factory=list)
+    release_matrix: list[ReleaseMatrixRow] = Field(default_factory=list)
     dependency_tree: TreeNodeData
 
 
@@ -153,10 +170,12 @@ class JsonReporter(Reporter):
                 language=data.language,
                 registry=data.registry,
                 license=data.root_license,
+                license_unavailable=data.root_license_unavailable,
                 version=data.version,
                 max_depth=data.max_depth,
                 include_optional=data.include_optional,
                 missing_only=data.missing_only,
+                stale_answers=data.stale_answers,
             ),
             summary=ReportSummary(
                 total_dependencies=data.total_dependencies,
@@ -177,6 +196,7 @@ class JsonReporter(Reporter):
                     packaged=data.build_packaged,
                     missing=data.build_missing,
                 ),
+                packaged_by_release=data.release_packaged_counts,
             ),
             missing_packages=sorted(data.required_missing_packages),
             missing_optional_packages=sorted(data.optional_missing_set),
@@ -187,88 +207,60 @@ class JsonReporter(Reporter):
             features=features_data,
             dev_dependencies=dev_deps_data,
             build_dependencies=build_deps_data,
-            dependency_tree=self._tree_to_model(data.tree),
+            dev_build_release=data.dev_build_release,
+            releases=data.graph.releases,
+            release_matrix=[
+                ReleaseMatrixRow(name=name, releases=releases)
+                for name, releases in data.release_matrix
+            ],
+            dependency_tree=self._graph_to_model(data.graph),
         )
 
         return report.model_dump_json(indent=2)
 
-    def _tree_to_model(self, tree) -> TreeNodeData:
-        """Convert Rich Tree to TreeNodeData model."""
-        label = self._get_label(tree)
-        node_data = self._parse_label(label)
-
-        # Get children using inherited method
-        children = self._get_children(tree)
-
-        if children:
-            node_data.dependencies = [self._tree_to_model(child) for child in children]
+    def _graph_to_model(self, graph: DependencyGraph) -> TreeNodeData:
+        """Convert the dependency graph to a nested TreeNodeData model."""
+        root_edge = graph.root_edge
+        if root_edge is None:
+            return TreeNodeData(raw="", name=graph.root)
+
+        root = self._edge_to_model(graph, root_edge)
+        # Iterative walk so deep graphs do not recurse in Python
+        stack = [(root_edge, root)]
+        while stack:
+            edge, node_data = stack.pop()
+            if edge.kind != "expanded":
+                continue
+            for child_edge in graph.children(edge.child):
+                child_data = self._edge_to_model(graph, child_edge)
+                node_data.dependencies.append(child_data)
+                stack.append((child_edge, child_data))
+        return root
+
+    def _edge_to_model(
+        self, graph: DependencyGraph, edge: DependencyEdge
+    ) -> TreeNodeData:
+        """Convert the package reached through *edge* to TreeNodeData.
+
+        Dependencies are filled in by :meth:`_graph_to_model`.
+        """
+        node = graph.node_for(edge)
+        status = graph.status(edge)
+
+        node_data = TreeNodeData(
+            raw=format_label(graph, edge, markup=False),
+            name=edge.child,
+            requirement=edge.requirement,
+            optional=edge.optional,
+            status=status,
+        )
+        if node is not None and status != "not_found":
+            node_data.version = node.version
+            node_data.is_packaged = node.is_packaged
+            if status != "visited":
+                node_data.license = node.license
+                node_data.license_unavailable = node.license_unavailable
+                node_data.fedora_versions = node.fedora_versions
+                node_data.fedora_packages = node.fedora_packages
 
         return node_data
-
-    def _parse_label(self, label: str) -> TreeNodeData:
-        """Parse a tree label into structured TreeNodeData."""
-        # Strip Rich markup using shared utility
-        clean_label = strip_markup(label)
-
-        node = TreeNodeData(raw=clean_label.strip())
-
-        # Check if this is an optional dependency
-        node.optional = "(optional)" in clean_label
-
-        # Try to extract license from the label (format: "(LICENSE)" before optional/status)
-        license_match = re.search(
-            r"v[\d.]+\s*\(([^)]+)\)\s*(?:\(optional\))?\s*•", clean_label
-        )
-        if license_match:
-            potential_license = license_match.group(1)
-            # Make sure it's not a version number or "optional"
-            if potential_license != "optional" and not re.match(
-                r"^[\d., ]+$", potential_license
-            ):
-                node.license = potential_license
-
-        # Try to extract package name and version
-        # Pattern: "package_name vX.Y.Z (LICENSE) (optional) • status" or "package_name vX.Y.Z • status"
-        match = re.match(
-            r"^(\S+)\s*(?:v([\d.]+))?\s*(?:\([^)]*\))?\s*(?:\(optional\))?\s*•\s*(.+)$",
-            clean_label.strip(),
-        )
-        if match:
-            node.name = match.group(1)
-            if match.group(2):
-                node.version = match.group(2)
-
-            status_text = match.group(3).strip()
-            if (
-                "packaged" in status_text.lower()
-                and "not packaged" not in status_text.lower()
-            ):
-                node.status = "packaged"
-                # Try to extract Fedora versions
-                ver_match = re.search(r"\(([\d., ]+)\)", status_text)
-                if ver_match:
-                    node.fedora_versions = [
-                        v.strip() for v in ver_match.group(1).split(",")
-                    ]
-                # Try to extract package names
-                pkg_match = re.search(r"\[([^\]]+)\]", status_text)
-                if pkg_match:
-                    node.fedora_packages = [
-                        p.strip() for p in pkg_match.group(1).split(",")
-                    ]
-            elif "not packaged" in status_text.lower():
-                node.status = "not_packaged"
-            elif "not found" in status_text.lower():
-                node.status = "not_found"
-            elif "already visited" in status_text.lower():
-                node.status = "visited"
-                node.is_packaged = "✓" in status_text
-        else:
-            # Simpler patterns
-            if "already visited" in clean_label:
-                node.status = "visited"
-                node.is_packaged = "✓" in clean_label
-            elif "max depth" in clean_label:
-                node.status = "max_depth_reached"
-
-        return node
@@ -4,7 +4,8 @@ Markdown report generator.
 Generates a markdown file with the full dependency analysis.
 """
 
-from woolly.reporters.base import ReportData, Reporter, strip_markup
+from woolly.reporters.base import LICENSE_UNAVAILABLE, ReportData, Reporter
+from woolly.reporters.tree import render_text_tree
 
 
 class MarkdownReporter(Reporter):
@@ -27,12 +28,16 @@ class MarkdownReporter(Reporter):
         lines.append(f"**Registry:** {data.registry}")
         if data.root_license:
             lines.append(f"**License:** {data.root_license}")
+        elif data.root_license_unavailable:
+            lines.append(f"**License:** _{LICENSE_UNAVAILABLE}_")
         if data.version:
             lines.append(f"**Version:** {data.version}")
         if data.include_optional:
             lines.append("**Include optional:** Yes")
         if data.missing_only:
             lines.append("**Missing only:** Yes")
+        if data.stale_answers:
+            lines.append(f"**Served stale:** {data.stale_answers}")
         lines.append("")
 
         # Summary
@@ -63,6 +68,28 @@ class MarkdownReporter(Reporter):
             lines.append(f"| Build - Missing | {data.build_missing} |")
         lines.append("")
 
+        # Availability per release
+        if data.graph.releases:
+            releases = data.graph.releases
+            lines.append("## Availability by Release")
+            lines.append("")
+            lines.append("| Package | " + " | ".join(releases) + " |")
+            lines.append("|---------|" + "|".join("---" for _ in releases) + "|")
+            for name, statuses in data.release_matrix:
+                cells = []
+                for release in releases:
+                    status = statuses.get(release)
+                    if status is None:
+                        cells.append("-")
+                    elif status.is_packaged:
+                        cells.append(f"✓ {', '.join(status.versions)}".strip())
+                    else:
+                        cells.append("✗")
+                lines.append(f"| `{name}` | " + " | ".join(cells) + " |")
+            counts = [str(data.release_packaged_counts.get(r, 0)) for r in releases]
+            lines.append("| **Packaged** | " + " | ".join(counts) + " |")
+            lines.append("")
+
         # Features / Extras
         if data.features:
             lines.append("## Features / Extras")
@@ -88,6 +115,9 @@ class MarkdownReporter(Reporter):
         if data.dev_dependencies:
             lines.append("## Dev Dependencies")
             lines.append("")
+            if data.dev_build_release:
+                lines.append(f"_Checked against Fedora {data.dev_build_release} only._")
+                lines.append("")
             lines.append("| Package | Version Req | Fedora Status |")
             lines.append("|---------|-------------|---------------|")
             for dep in data.dev_dependencies:
@@ -106,6 +136,9 @@ class MarkdownReporter(Reporter):
         if data.build_dependencies:
             lines.append("## Build Dependencies")
             lines.append("")
+            if data.dev_build_release:
+                lines.append(f"_Checked against Fedora {data.dev_build_release} only._")
+                lines.append("")
             lines.append("| Package | Version Req | Fedora Status |")
             lines.append("|---------|-------------|---------------|")
             for dep in data.build_dependencies:
@@ -157,35 +190,8 @@ class MarkdownReporter(Reporter):
             lines.append("## Dependency Tree")
             lines.append("")
             lines.append("```")
-            lines.append(self._tree_to_text(data.tree))
+            lines.append(render_text_tree(data.graph))
             lines.append("```")
             lines.append("")
 
         return "\n".join(lines)
-
-    def _tree_to_text(self, tree, prefix: str = "") -> str:
-        """Convert Rich Tree to plain text representation."""
-        lines = []
-
-        # Get label text (strip Rich markup) using inherited method and shared utility
-        label = self._get_label(tree)
-        label = strip_markup(label)
-
-        lines.append(label)
-
-        # Get children using inherited method
-        children = self._get_children(tree)
-
-        for i, child in enumerate(children):
-            is_last_child = i == len(children) - 1
-            child_prefix = "└── " if is_last_child else "├── "
-            continuation = "    " if is_last_child else "│   "
-
-            child_text = self._tree_to_text(child, prefix + continuation)
-            child_lines = child_text.split("\n")
-            lines.append(prefix + child_prefix + child_lines[0])
-            for line in child_lines[1:]:
-                if line:  # Skip empty lines
-                    lines.append(line)
-
-        return "\n".join(lines)
@@ -12,7 +12,8 @@ from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 
-from woolly.reporters.base import ReportData, Reporter
+from woolly.reporters.base import LICENSE_UNAVAILABLE, ReportData, Reporter
+from woolly.reporters.tree import render_rich_tree
 
 # Minimum terminal width for side-by-side layout
 _MIN_SIDE_BY_SIDE_WIDTH = 100
@@ -50,6 +51,8 @@ class StdoutReporter(Reporter):
         # License row at the top if available
         if data.root_license:
             table.add_row("License", f"[magenta]{data.root_license}[/magenta]")
+        elif data.root_license_unavailable:
+            table.add_row("License", f"[dim]{LICENSE_UNAVAILABLE}[/dim]")
 
         table.add_row("Total dependencies", str(data.total_dependencies))
         table.add_row(
@@ -80,9 +83,44 @@ class StdoutReporter(Reporter):
             table.add_row("[blue]  Packaged[/blue]", str(data.build_packaged))
             table.add_row("[blue]  Missing[/blue]", str(data.build_missing))
 
+        if data.stale_answers:
+            table.add_row("", "")
+            table.add_row("[dim]Served stale[/dim]", f"[dim]{data.stale_answers}[/dim]")
+
         title = f"[bold]Summary for [cyan]{data.root_package}[/cyan] ({data.language})[/bold]"
         return Panel(table, title=title, border_style="green", padding=(0, 1))
 
+    def _build_release_matrix_panel(self, data: ReportData) -> Panel:
+        """Build the panel with one availability column per Fedora release."""
+        table = Table(box=box.SIMPLE, expand=True, show_header=True, show_footer=True)
+        table.add_column("Package", style="bold", footer="Packaged")
+        for release in data.graph.releases:
+            table.add_column(
+                release,
+                justify="center",
+                footer=str(data.release_packaged_counts.get(release, 0)),
+            )
+
+        for name, releases in data.release_matrix:
+            cells = []
+            for release in data.graph.releases:
+                status = releases.get(release)
+                if status is None:
+                    cells.append("[dim]-[/dim]")
+                elif status.is_packaged:
+                    versions = ", ".join(status.versions)
+                    cells.append(f"[green]✓[/green] [dim]{versions}[/dim]")
+                else:
+                    cells.append("[red]✗[/red]")
+            table.add_row(name, *cells)
+
+        return Panel(
+            table,
+            title="[bold]Availability by Release[/bold]",
+            border_style="cyan",
+            padding=(0, 1),
+        )
+
     def _build_missing_required_panel(self, data: ReportData) -> Panel:
         """Build the panel for missing required packages."""
         required_missing = data.required_missing_packages
@@ -170,6 +208,10 @@ class StdoutReporter(Reporter):
         # ── Summary (full width) ──
         self.console.print(self._build_summary_panel(data))
 
+        # ── Per-release availability (full width, multi-release runs) ──
+        if data.graph.releases:
+            self.console.print(self._build_release_matrix_panel(data))
+
         # ── Missing packages: Required | Optional (side by side) ──
         if data.missing_packages:
             left = self._build_missing_required_panel(data)
@@ -178,14 +220,19 @@ class StdoutReporter(Reporter):
 
         # ── Dev | Build dependencies (side by side) ──
         if data.dev_dependencies or data.build_dependencies:
+            only = (
+                f" [dim](Fedora {data.dev_build_release} only)[/dim]"
+                if data.dev_build_release
+                else ""
+            )
             left = self._build_dep_panel(
                 data.dev_dependencies,
-                "[bold cyan]Dev Dependencies[/bold cyan]",
+                f"[bold cyan]Dev Dependencies[/bold cyan]{only}",
                 "cyan",
             )
             right = self._build_dep_panel(
                 data.build_dependencies,
-                "[bold blue]Build Dependencies[/bold blue]",
+                f"[bold blue]Build Dependencies[/bold blue]{only}",
                 "blue",
             )
             self._print_side_by_side(left, right)
@@ -198,7 +245,7 @@ class StdoutReporter(Reporter):
         if not data.missing_only:
             self.console.print(
                 Panel(
-                    data.tree,
+                    render_rich_tree(data.graph),
                     title="[bold]Dependency Tree[/bold]",
                     border_style="dim",
                     padding=(0, 1),
@@ -24,9 +24,13 @@ class TemplateReporter(Reporter):
             - language: Language/ecosystem name (e.g., "Rust", "Python")
             - registry: Registry name (e.g., "crates.io", "PyPI")
             - root_license: License of the root package (or None)
+            - root_license_unavailable: Whether the registry source had no
+              license for the root package
             - version: Package version (if specified)
             - timestamp: Formatted timestamp string (YYYY-MM-DD HH:MM:SS)
             - max_depth: Maximum recursion depth used
+            - stale_answers: Registry answers served from expired cache
+              entries (stale-while-revalidate mode)
 
         Statistics:
             - total_dependencies: Total number of dependencies analyzed
@@ -53,6 +57,14 @@ class TemplateReporter(Reporter):
             - packaged_packages: List of packaged package names
             - optional_missing_packages: List of missing optional package names
 
+        Multi-release runs (empty otherwise):
+            - releases: List of Fedora releases checked, in column order
+            - release_matrix: List of dicts with name and a per-release
+              status dict (is_packaged, versions, package_names)
+            - release_packaged_counts: Dict of release to packaged count
+            - dev_build_release: The only release dev/build deps were
+              checked against
+
         Flags:
             - missing_only: Whether missing-only mode was enabled
 
@@ -140,9 +152,11 @@ class TemplateReporter(Reporter):
             "language": data.language,
             "registry": data.registry,
             "root_license": data.root_license,
+            "root_license_unavailable": data.root_license_unavailable,
             "version": data.version,
             "timestamp": data.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
             "max_depth": data.max_depth,
+            "stale_answers": data.stale_answers,
             # Statistics
             "total_dependencies": data.total_dependencies,
             "packaged_count": data.packaged_count,
@@ -167,6 +181,20 @@ class TemplateReporter(Reporter):
             "missing_packages": sorted(data.required_missing_packages),
             "packaged_packages": sorted(data.unique_packaged_packages),
             "optional_missing_packages": sorted(data.optional_missing_set),
+            # Per-release availability (multi-release runs)
+            "releases": list(data.graph.releases),
+            "release_matrix": [
+                {
+                    "name": name,
+                    "releases": {
+                        release: status.model_dump()
+                        for release, status in releases.items()
+                    },
+                }
+                for name, releases in data.release_matrix
+            ],
+            "release_packaged_counts": data.release_packaged_counts,
+            "dev_build_release": data.dev_build_release,
             # Flags
             "missing_only": data.missing_only,
         }
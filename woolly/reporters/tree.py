@@ -0,0 +1,163 @@
+"""
+Dependency tree rendering.
+
+Turns a :class:`~woolly.graph.DependencyGraph` into a Rich ``Tree`` for
+console output or into plain text for file reports.  Labels are built
+from the typed node and edge fields, once per output format.
+"""
+
+from typing import Union
+
+from rich.tree import Tree
+
+from woolly.graph import DependencyEdge, DependencyGraph
+from woolly.reporters.base import LICENSE_UNAVAILABLE
+
+
+def _styled(text: str, style: str, markup: bool) -> str:
+    return f"[{style}]{text}[/{style}]" if markup else text
+
+
+def format_label(
+    graph: DependencyGraph, edge: DependencyEdge, markup: bool = True
+) -> str:
+    """
+    Format the label for the package reached through *edge*.
+
+    Args:
+        graph: The dependency graph the edge belongs to.
+        edge: The edge to describe.
+        markup: If True, include Rich markup; otherwise return plain text.
+
+    Returns:
+        The label text.
+    """
+    name = edge.child
+    optional_marker = (
+        " " + _styled("(optional)", "yellow", markup) if edge.optional else ""
+    )
+    status = graph.status(edge)
+
+    if status == "max_depth_reached":
+        return _styled(f"{name}{optional_marker} (max depth reached)", "dim", markup)
+
+    node = graph.node_for(edge)
+
+    if status == "visited":
+        visited_str = _styled("(already visited)", "dim", markup)
+        if node is not None and node.is_packaged:
+            return (
+                f"{_styled(name, 'dim', markup)} "
+                f"{_styled(f'v{node.version}', 'dim', markup)}{optional_marker} • "
+                f"{_styled('✓', 'green', markup)} {visited_str}"
+            )
+        return (
+            f"{_styled(name, 'dim', markup)}{optional_marker} • "
+            f"{_styled('✗', 'red', markup)} {visited_str}"
+        )
+
+    if status == "not_found":
+        return (
+            f"{_styled(name, 'bold red', markup)}{optional_marker} • "
+            f"{_styled(f'not found on {graph.registry}', 'red', markup)}"
+        )
+
+    license_str = ""
+    if node.license:
+        license_str = " " + _styled(f"({node.license})", "magenta", markup)
+    elif node.license_unavailable:
+        license_str = " " + _styled(f"({LICENSE_UNAVAILABLE})", "dim", markup)
+    head = (
+        f"{_styled(name, 'bold', markup)} "
+        f"{_styled(f'v{node.version}', 'dim', markup)}{license_str}{optional_marker} • "
+    )
+
+    if status == "not_packaged":
+        return head + _styled("✗ not packaged", "red", markup)
+
+    ver_str = ", ".join(node.fedora_versions) if node.fedora_versions else "unknown"
+    label = (
+        head
+        + _styled("✓ packaged", "green", markup)
+        + " "
+        + _styled(f"({ver_str})", "dim", markup)
+    )
+    if node.fedora_packages:
+        # Square brackets must be escaped to survive Rich markup
+        pkg_str = ", ".join(node.fedora_packages)
+        pkg_str = f"\\[{pkg_str}]" if markup else f"[{pkg_str}]"
+        label += " " + _styled(pkg_str, "dim cyan", markup)
+    return label
+
+
+def _is_leaf(graph: DependencyGraph, edge: DependencyEdge) -> bool:
+    return edge.kind != "expanded" or graph.status(edge) == "not_found"
+
+
+def render_rich_tree(graph: DependencyGraph) -> Union[Tree, str]:
+    """
+    Render the graph as a Rich Tree.
+
+    Args:
+        graph: The dependency graph to render.
+
+    Returns:
+        A Rich Tree, or a label string if the root has no children to show.
+    """
+    root_edge = graph.root_edge
+    if root_edge is None:
+        return ""
+    if _is_leaf(graph, root_edge):
+        return format_label(graph, root_edge)
+
+    root = Tree(format_label(graph, root_edge))
+    # Iterative pre-order walk; children are pushed in reverse so they
+    # are attached to their parent in dependency order.
+    stack = [(edge, root) for edge in reversed(graph.children(root_edge.child))]
+    while stack:
+        edge, parent = stack.pop()
+        label = format_label(graph, edge)
+        if _is_leaf(graph, edge):
+            parent.add(label)
+            continue
+        node = Tree(label)
+        # Rich's add() would wrap the Tree in another node
+        parent.children.append(node)
+        stack.extend((child, node) for child in reversed(graph.children(edge.child)))
+    return root
+
+
+def render_text_tree(graph: DependencyGraph) -> str:
+    """
+    Render the graph as plain text using box-drawing characters.
+
+    Args:
+        graph: The dependency graph to render.
+
+    Returns:
+        The tree as a multi-line string.
+    """
+    root_edge = graph.root_edge
+    if root_edge is None:
+        return ""
+
+    lines = [format_label(graph, root_edge, markup=False)]
+    stack: list[tuple[DependencyEdge, str]] = []
+
+    def push_children(edge: DependencyEdge, prefix: str) -> None:
+        if edge.kind != "expanded":
+            return
+        children = graph.children(edge.child)
+        for i in reversed(range(len(children))):
+            is_last_child = i == len(children) - 1
+            branch = "└── " if is_last_child else "├── "
+            stack.append((children[i], prefix + branch))
+
+    push_children(root_edge, "")
+    while stack:
+        edge, line_prefix = stack.pop()
+        lines.append(line_prefix + format_label(graph, edge, markup=False))
+        # Replace the branch marker with the matching continuation
+        continuation = "    " if line_prefix.endswith("└── ") else "│   "
+        push_children(edge, line_prefix[:-4] + continuation)
+    return "\n".join(lines)
@@ -0,0 +1,665 @@
+"""
+Dependency graph resolution.
+
+Three traversal strategies are provided:
+
+- :func:`build_graph` walks the graph depth-first, one package at a time.
+- :func:`resolve_graph` walks the graph level by level and expands the
+  whole frontier of each level concurrently on a bounded worker pool, so
+  registry fetches and Fedora lookups for sibling packages overlap.
+- :func:`resolve_graph_async` does the same on a single asyncio event loop.
+
+All return a :class:`~woolly.graph.DependencyGraph` and populate the
+shared *visited* dict with ``{package_name: (is_packaged, version, is_optional)}``.
+:func:`annotate_releases` then adds the Fedora status of every package
+in further releases without walking the registry graph again.
+:func:`build_tree`, :func:`resolve_tree` and :func:`resolve_tree_async`
+render the resulting graph as a Rich ``Tree`` (or a plain label string
+for leaves).
+"""
+
+import asyncio
+import fnmatch
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from woolly import http
+from woolly.debug import log, log_package_check
+from woolly.graph import DependencyEdge, DependencyGraph, PackageNode, ReleaseStatus
+from woolly.languages.base import FedoraPackageStatus, LanguageProvider, PackageInfo
+from woolly.progress import ProgressTracker
+from woolly.reporters.tree import render_rich_tree
+
+# Default number of worker threads used by resolve_graph.
+DEFAULT_MAX_WORKERS = 8
+
+
+class ResolvedPackage(BaseModel):
+    """Upstream and Fedora data fetched for a single package."""
+
+    name: str
+    version: Optional[str] = None
+    info: Optional[PackageInfo] = None
+    status: Optional[FedoraPackageStatus] = None
+    dependencies: list[tuple[str, str, bool]] = Field(default_factory=list)
+
+
+# ----------------------------------------------------------------
+# Graph recording helpers shared by all traversal strategies
+# ----------------------------------------------------------------
+
+
+def _record_max_depth(graph: DependencyGraph, edge: DependencyEdge, depth: int):
+    log(f"Max depth reached for {edge.child}", level="warning", depth=depth)
+    edge.kind = "max_depth"
+    graph.add_edge(edge)
+
+
+def _record_visited(graph: DependencyGraph, edge: DependencyEdge, visited: dict):
+    is_packaged, cached_version, _ = visited[edge.child]
+    log_package_check(
+        edge.child,
+        "Skip (already visited)",
+        result="packaged" if is_packaged else "not packaged",
+    )
+    # Packages visited by an earlier run have no node in this graph yet
+    if edge.child not in graph.nodes:
+        graph.add_node(
+            PackageNode(
+                name=edge.child,
+                version=cached_version,
+                found=cached_version is not None,
+                is_packaged=is_packaged,
+            )
+        )
+    edge.kind = "visited"
+    graph.add_edge(edge)
+
+
+def _record_package(
+    provider: LanguageProvider,
+    graph: DependencyGraph,
+    edge: DependencyEdge,
+    resolved: ResolvedPackage,
+):
+    status = resolved.status
+    if status is None:
+        log_package_check(
+            edge.child, "Not found", source=provider.registry_name, result="error"
+        )
+        graph.add_node(PackageNode(name=edge.child, found=False))
+    else:
+        if status.is_packaged:
+            log_package_check(
+                edge.child,
+                "Fedora status",
+                result=f"packaged ({', '.join(status.versions)})",
+            )
+        else:
+            log_package_check(edge.child, "Fedora status", result="not packaged")
+        graph.add_node(
+            PackageNode(
+                name=edge.child,
+                version=resolved.version,
+                license=resolved.info.license if resolved.info else None,
+                license_unavailable=(
+                    resolved.info.license_unavailable if resolved.info else False
+                ),
+                is_packaged=status.is_packaged,
+                fedora_versions=status.versions,
+                fedora_packages=status.package_names,
+            )
+        )
+    graph.add_edge(edge)
+
+
+def _is_excluded(
+    dep_name: str, exclude_patterns: Optional[list[str]], depth: int
+) -> bool:
+    if exclude_patterns and any(
+        fnmatch.fnmatch(dep_name, pattern) for pattern in exclude_patterns
+    ):
+        log(f"Filtered out dependency: {dep_name}", level="info", depth=depth)
+        return True
+    return False
+
+
+def _visited_entry(resolved: ResolvedPackage, is_optional: bool) -> tuple:
+    is_packaged = resolved.status.is_packaged if resolved.status else False
+    return (is_packaged, resolved.version, is_optional)
+
+
+# ----------------------------------------------------------------
+# Fetching a single package
+# ----------------------------------------------------------------
+
+
+def resolve_package(
+    provider: LanguageProvider,
+    package_name: str,
+    version: Optional[str] = None,
+    include_optional: bool = False,
+) -> ResolvedPackage:
+    """
+    Fetch everything needed to record one node of the graph.
+
+    This performs the registry lookups and the Fedora query for a single
+    package and is safe to run on a worker thread.
+
+    Args:
+        provider: The language provider to use.
+        package_name: Name of the package.
+        version: Specific version, or None for latest.
+        include_optional: If True, include optional dependencies.
+
+    Returns:
+        ResolvedPackage; ``status`` is None if the package was not found.
+    """
+    log_package_check(package_name, "Fetching version", source=provider.registry_name)
+    pkg_info = provider.fetch_package_info(package_name)
+    if version is None:
+        if pkg_info is None:
+            return ResolvedPackage(name=package_name)
+        version = pkg_info.latest_version
+
+    log_package_check(package_name, "Checking Fedora", source="dnf repoquery")
+    status = provider.check_fedora_packaging(package_name)
+
+    log_package_check(
+        package_name, "Fetching dependencies", source=provider.registry_name
+    )
+    deps = provider.get_normal_dependencies(
+        package_name, version, include_optional=include_optional
+    )
+    log(f"Found {len(deps)} dependencies for {package_name}", deps=len(deps))
+
+    return ResolvedPackage(
+        name=package_name,
+        version=version,
+        info=pkg_info,
+        status=status,
+        dependencies=deps,
+    )
+
+
+async def aresolve_package(
+    provider: LanguageProvider,
+    package_name: str,
+    version: Optional[str] = None,
+    include_optional: bool = False,
+) -> ResolvedPackage:
+    """Async counterpart of :func:`resolve_package`."""
+    log_package_check(package_name, "Fetching version", source=provider.registry_name)
+    pkg_info = await provider.afetch_package_info(package_name)
+    if version is None:
+        if pkg_info is None:
+            return ResolvedPackage(name=package_name)
+        version = pkg_info.latest_version
+
+    # Fedora and dependency lookups are independent of each other
+    log_package_check(package_name, "Checking Fedora", source="dnf repoquery")
+    log_package_check(
+        package_name, "Fetching dependencies", source=provider.registry_name
+    )
+    status, all_deps = await asyncio.gather(
+        provider.acheck_fedora_packaging(package_name),
+        provider.afetch_dependencies(package_name, version),
+    )
+    deps = provider.filter_normal_dependencies(all_deps, include_optional)
+    log(f"Found {len(deps)} dependencies for {package_name}", deps=len(deps))
+
+    return ResolvedPackage(
+        name=package_name,
+        version=version,
+        info=pkg_info,
+        status=status,
+        dependencies=deps,
+    )
+
+
+# ----------------------------------------------------------------
+# Depth-first traversal
+# ----------------------------------------------------------------
+
+
+def build_graph(
+    provider: LanguageProvider,
+    package_name: str,
+    version: Optional[str] = None,
+    visited: Optional[dict] = None,
+    depth: int = 0,
+    max_depth: int = 50,
+    tracker: Optional[ProgressTracker] = None,
+    include_optional: bool = False,
+    is_optional_dep: bool = False,
+    exclude_patterns: Optional[list[str]] = None,
+) -> DependencyGraph:
+    """
+    Build a dependency graph for a package, depth-first.
+
+    The walk uses an explicit stack rather than recursion: memory grows
+    with the number of pending sibling edges along the current path, and
+    arbitrarily deep graphs never raise ``RecursionError``.
+
+    Parameters
+    ----------
+    provider
+        The language provider to use.
+    package_name
+        Name of the package to analyze.
+    version
+        Specific version, or None for latest.
+    visited
+        Dict of already-visited packages mapping to their status.
+        Each value is a tuple ``(is_packaged, version, is_optional)``.
+    depth
+        Depth of the root package.
+    max_depth
+        Maximum depth to expand.
+    tracker
+        Optional progress tracker.
+    include_optional
+        If True, include optional dependencies in the analysis.
+    is_optional_dep
+        If True, the root package is an optional dependency.
+    exclude_patterns
+        List of glob patterns to exclude from the dependency tree.
+
+    Returns
+    -------
+    DependencyGraph
+        The packages and edges discovered from *package_name*.
+    """
+    if visited is None:
+        visited = {}
+
+    graph = DependencyGraph(root=package_name, registry=provider.registry_name)
+
+    # Explicit stack of (edge, version, depth) instead of recursion, so
+    # deep chains never hit the interpreter recursion limit.  Children
+    # are pushed in reverse to pop them in dependency order, which keeps
+    # the pre-order (and therefore the visited markers) of a recursive walk.
+    stack: list[tuple[DependencyEdge, Optional[str], int]] = [
+        (DependencyEdge(child=package_name, optional=is_optional_dep), version, depth)
+    ]
+
+    while stack:
+        edge, edge_version, edge_depth = stack.pop()
+        name = edge.child
+
+        if edge_depth > max_depth:
+            _record_max_depth(graph, edge, edge_depth)
+            continue
+
+        if name in visited:
+            _record_visited(graph, edge, visited)
+            continue
+
+        if tracker:
+            tracker.update(name)
+
+        resolved = resolve_package(
+            provider, name, edge_version, include_optional=include_optional
+        )
+        visited[name] = _visited_entry(resolved, edge.optional)
+        _record_package(provider, graph, edge, resolved)
+
+        # ALWAYS descend into dependencies regardless of packaging status
+        if tracker and resolved.dependencies:
+            tracker.update(name, discovered=len(resolved.dependencies))
+
+        children = [
+            (
+                DependencyEdge(
+                    parent=name,
+                    child=dep_name,
+                    requirement=dep_req,
+                    optional=dep_is_optional,
+                ),
+                None,
+                edge_depth + 1,
+            )
+            for dep_name, dep_req, dep_is_optional in resolved.dependencies
+            # Skip dependencies matching exclude patterns
+            if not _is_excluded(dep_name, exclude_patterns, edge_depth)
+        ]
+        stack.extend(reversed(children))
+
+    return graph
+
+
+# ----------------------------------------------------------------
+# Level-synchronous parallel traversal
+# ----------------------------------------------------------------
+
+
+class _FrontierItem(BaseModel):
+    """A dependency edge waiting to be expanded in the next level."""
+
+    edge: DependencyEdge
+    version: Optional[str] = None
+    depth: int
+
+
+def _existing_packages(
+    items: list[_FrontierItem], infos: Iterable[Optional[PackageInfo]]
+) -> list[str]:
+    """
+    Names of the frontier packages that exist upstream.
+
+    Only these get a Fedora lookup, as :func:`resolve_package` stops at a
+    package it cannot find.  A pinned version is resolved without the
+    package info, so such packages are kept either way.
+    """
+    return [
+        item.edge.child
+        for item, info in zip(items, infos)
+        if info is not None or item.version is not None
+    ]
+
+
+def _resolve_levels(
+    provider: LanguageProvider,
+    package_name: str,
+    version: Optional[str],
+    visited: dict,
+    max_depth: int,
+    tracker: Optional[ProgressTracker],
+    exclude_patterns: Optional[list[str]],
+    fetch_level: Callable[[list[_FrontierItem]], list[ResolvedPackage]],
+) -> DependencyGraph:
+    """
+    Drive the level-synchronous traversal.
+
+    *fetch_level* receives the packages to expand on the current level
+    and must return their :class:`ResolvedPackage` in the same order;
+    how the fetches are scheduled is up to the caller.
+    """
+    graph = DependencyGraph(root=package_name, registry=provider.registry_name)
+    frontier = [
+        _FrontierItem(edge=DependencyEdge(child=package_name), version=version, depth=0)
+    ]
+
+    while frontier:
+        # First occurrence of each unvisited package on this level
+        # gets expanded; the rest become "already visited" markers.
+        claimed: dict[str, int] = {}
+        for index, item in enumerate(frontier):
+            name = item.edge.child
+            if item.depth > max_depth:
+                continue
+            if name in visited or name in claimed:
+                continue
+            claimed[name] = index
+
+        results = (
+            dict(zip(claimed, fetch_level([frontier[i] for i in claimed.values()])))
+            if claimed
+            else {}
+        )
+
+        for name, index in claimed.items():
+            visited[name] = _visited_entry(results[name], frontier[index].edge.optional)
+
+        next_frontier: list[_FrontierItem] = []
+        for index, item in enumerate(frontier):
+            name = item.edge.child
+            if item.depth > max_depth:
+                _record_max_depth(graph, item.edge, item.depth)
+                continue
+            if claimed.get(name) != index:
+                _record_visited(graph, item.edge, visited)
+                continue
+
+            resolved = results[name]
+            if tracker:
+                tracker.update(name)
+            _record_package(provider, graph, item.edge, resolved)
+            if tracker and resolved.dependencies:
+                tracker.update(name, discovered=len(resolved.dependencies))
+
+            for dep_name, dep_req, dep_is_optional in resolved.dependencies:
+                if _is_excluded(dep_name, exclude_patterns, item.depth):
+                    continue
+                next_frontier.append(
+                    _FrontierItem(
+                        edge=DependencyEdge(
+                            parent=name,
+                            child=dep_name,
+                            requirement=dep_req,
+                            optional=dep_is_optional,
+                        ),
+                        depth=item.depth + 1,
+                    )
+                )
+
+        frontier = next_frontier
+
+    return graph
+
+
+def resolve_graph(
+    provider: LanguageProvider,
+    package_name: str,
+    version: Optional[str] = None,
+    visited: Optional[dict] = None,
+    max_depth: int = 50,
+    tracker: Optional[ProgressTracker] = None,
+    include_optional: bool = False,
+    exclude_patterns: Optional[list[str]] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> DependencyGraph:
+    """
+    Build a dependency graph breadth-first, one level at a time.
+
+    Every package first seen on a level is fetched concurrently on a
+    pool of *max_workers* threads, after a single batched Fedora query
+    for the whole level (see
+    :meth:`~woolly.languages.base.LanguageProvider.prefetch_fedora_packaging`)
+    and, where the registry supports it, a batched info fetch (see
+    :meth:`~woolly.languages.base.LanguageProvider.prefetch_package_info`).
+    Results are then applied in frontier
+    order (parent order, then dependency order), so the *visited* dict,
+    the graph and the edge ordering are deterministic regardless of
+    which fetch finishes first.
+
+    A package reachable through several paths is expanded where it is
+    first seen at the shallowest depth; every other occurrence gets a
+    ``"visited"`` edge.
+
+    Parameters
+    ----------
+    provider
+        The language provider to use.
+    package_name
+        Name of the root package.
+    version
+        Specific version of the root package, or None for latest.
+    visited
+        Dict of already-visited packages mapping to their status.
+        Each value is a tuple ``(is_packaged, version, is_optional)``.
+    max_depth
+        Maximum depth to expand.
+    tracker
+        Optional progress tracker.
+    include_optional
+        If True, include optional dependencies in the analysis.
+    exclude_patterns
+        List of glob patterns to exclude from the dependency tree.
+    max_workers
+        Maximum number of packages fetched concurrently.
+
+    Returns
+    -------
+    DependencyGraph
+        The packages and edges discovered from *package_name*.
+    """
+    if visited is None:
+        visited = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+
+        def fetch_level(items: list[_FrontierItem]) -> list[ResolvedPackage]:
+            # Batched registry and dnf queries for the whole level, not per package
+            names = [item.edge.child for item in items]
+            provider.prefetch_package_info(names)
+            infos = executor.map(provider.fetch_package_info, names)
+            provider.prefetch_fedora_packaging(_existing_packages(items, infos))
+            return list(
+                executor.map(
+                    lambda item: resolve_package(
+                        provider,
+                        item.edge.child,
+                        item.version,
+                        include_optional=include_optional,
+                    ),
+                    items,
+                )
+            )
+
+        return _resolve_levels(
+            provider,
+            package_name,
+            version,
+            visited,
+            max_depth,
+            tracker,
+            exclude_patterns,
+            fetch_level,
+        )
+
+
+def resolve_graph_async(
+    provider: LanguageProvider,
+    package_name: str,
+    version: Optional[str] = None,
+    visited: Optional[dict] = None,
+    max_depth: int = 50,
+    tracker: Optional[ProgressTracker] = None,
+    include_optional: bool = False,
+    exclude_patterns: Optional[list[str]] = None,
+) -> DependencyGraph:
+    """
+    Asyncio variant of :func:`resolve_graph`.
+
+    Each level is expanded with :func:`asyncio.gather` on a single event
+    loop using the provider's ``afetch_*`` and ``acheck_fedora_packaging``
+    methods.  Concurrency is bounded per registry host by
+    :func:`woolly.http.aget` and for dnf by the provider, so a whole
+    frontier of hundreds of packages can be in flight at once.
+
+    Takes the same parameters and returns the same graph as
+    :func:`resolve_graph` (minus ``max_workers``).
+    """
+    if visited is None:
+        visited = {}
+
+    loop = asyncio.new_event_loop()
+
+    async def gather_level(items: list[_FrontierItem]) -> list[ResolvedPackage]:
+        names = [item.edge.child for item in items]
+        await provider.aprefetch_package_info(names)
+        infos = await asyncio.gather(*map(provider.afetch_package_info, names))
+        await provider.aprefetch_fedora_packaging(_existing_packages(items, infos))
+        return await asyncio.gather(
+            *(
+                aresolve_package(
+                    provider,
+                    item.edge.child,
+                    item.version,
+                    include_optional=include_optional,
+                )
+                for item in items
+            )
+        )
+
+    def fetch_level(items: list[_FrontierItem]) -> list[ResolvedPackage]:
+        return loop.run_until_complete(gather_level(items))
+
+    try:
+        return _resolve_levels(
+            provider,
+            package_name,
+            version,
+            visited,
+            max_depth,
+            tracker,
+            exclude_patterns,
+            fetch_level,
+        )
+    finally:
+        loop.run_until_complete(http.aclose())
+        loop.run_until_complete(loop.shutdown_default_executor())
+        loop.close()
+
+
+# ----------------------------------------------------------------
+# Multi-release matrix
+# ----------------------------------------------------------------
+
+
+def annotate_releases(
+    provider: LanguageProvider,
+    graph: DependencyGraph,
+    releases: list[str],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> None:
+    """
+    Record the Fedora status of every package in the graph per release.
+
+    The upstream graph is reused as is: for each release only the Fedora
+    lookups run, starting with one batched query for all packages (see
+    :meth:`~woolly.languages.base.LanguageProvider.prefetch_fedora_packaging`),
+    so each extra release costs a bulk query or a set of index lookups
+    instead of a full traversal.
+
+    Parameters
+    ----------
+    provider
+        The language provider to use. Each release is checked on a copy
+        from :meth:`~woolly.languages.base.LanguageProvider.for_fedora_release`,
+        so its ``fedora_release`` is never changed.
+    graph
+        Graph returned by one of the resolvers; updated in place.
+    releases
+        Fedora releases to check, in report column order.
+    max_workers
+        Maximum number of packages checked concurrently.
+    """
+    names = [name for name, node in graph.nodes.items() if node.found]
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        for release in releases:
+            target = provider.for_fedora_release(release)
+            target.prefetch_fedora_packaging(names)
+            statuses = executor.map(target.check_fedora_packaging, names)
+            for name, status in zip(names, statuses):
+                graph.nodes[name].releases[release] = ReleaseStatus(
+                    is_packaged=status.is_packaged,
+                    versions=status.versions,
+                    package_names=status.package_names,
+                )
+            log("Release checked", release=release, packages=len(names))
+    graph.releases = list(releases)
+
+
+# ----------------------------------------------------------------
+# Rich Tree wrappers
+# ----------------------------------------------------------------
+
+
+def build_tree(*args, **kwargs):
+    """Run :func:`build_graph` and render the result as a Rich Tree."""
+    return render_rich_tree(build_graph(*args, **kwargs))
+
+
+def resolve_tree(*args, **kwargs):
+    """Run :func:`resolve_graph` and render the result as a Rich Tree."""
+    return render_rich_tree(resolve_graph(*args, **kwargs))
+
+
+def resolve_tree_async(*args, **kwargs):
+    """Run :func:`resolve_graph_async` and render the result as a Rich Tree."""
+    return render_rich_tree(resolve_graph_async(*args, **kwargs))